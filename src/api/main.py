@@ -3,6 +3,7 @@ Main FastAPI application for O*NET Skills Gap API.
 """
 import os
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends, HTTPException, status, Header
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
@@ -17,11 +18,50 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+from src.config.engine_registry import init_engine, dispose_engine, get_pool_metrics
+from src.config.offload import get_offload_metrics
+from src.config.llm_response_cache import get_llm_response_cache_status, clear_llm_response_caches
+from src.config.skill_gap_llm_jobs import init_skill_gap_llm_jobs, shutdown_skill_gap_llm_jobs, get_skill_gap_llm_job_metrics
+from src.config.gemini_rate_limiter import get_gemini_rate_limit_metrics
+from src.config.gemini_structured_output import get_llm_parse_metrics
+from src.config.http_session import close_http_session
+from src.config.llm_debug_sink import close_llm_debug_sink, get_llm_debug_sink_metrics
+from src.config.llm_prompt_budget import get_llm_prompt_metrics
+from src.config.schemas import LLM_Skill_Proficiency_Requests
+from src.functions.mysql_upgrade_tables import upgrade_table_schema
+from src.config.occupation_skill_cache import (
+    is_cache_enabled, init_occupation_skill_cache, clear_occupation_skill_cache, get_occupation_skill_cache_status
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Create the shared pooled database engine once on startup and dispose of it on shutdown.
+    The in-memory occupation/skill cache is loaded here too, so skill gap requests do not hit the database,
+    and the background worker pool for /skill-gap-llm jobs is started (requeueing unfinished jobs).
+    Tables created before the LLM proficiency cache columns existed are upgraded in place first.
+    """
+    engine = init_engine()
+    upgrade_result = upgrade_table_schema([LLM_Skill_Proficiency_Requests], engine)
+    if not upgrade_result["success"]:
+        logger.warning(f"LLM proficiency cache tables not upgraded, the database cache tier may fail: {upgrade_result['message']}")
+    if is_cache_enabled():
+        init_occupation_skill_cache(engine)
+    init_skill_gap_llm_jobs(engine)
+    yield
+    shutdown_skill_gap_llm_jobs()
+    clear_occupation_skill_cache()
+    clear_llm_response_caches()
+    close_http_session()
+    close_llm_debug_sink()
+    dispose_engine()
+
 # Create FastAPI app
 app = FastAPI(
     title="O*NET Skills Gap API",
     description="API for analyzing skill gaps between occupations using O*NET data",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware to allow cross-origin requests
@@ -96,6 +136,75 @@ async def health_check():
     """
     return {"status": "healthy"}
 
+@app.get("/health/db-pool", tags=["health"])
+async def db_pool_metrics():
+    """
+    Connection pool checkout/wait metrics for the shared database engine.
+    """
+    metrics = get_pool_metrics()
+    if not metrics["success"]:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=metrics["message"])
+    return metrics["result"]
+
+@app.get("/health/offload", tags=["health"])
+async def offload_metrics():
+    """
+    Worker thread limiter usage for blocking database and LLM calls.
+    """
+    return get_offload_metrics()["result"]
+
+@app.get("/health/occupation-skill-cache", tags=["health"])
+async def occupation_skill_cache_status():
+    """
+    Status of the in-memory occupation/skill cache (dataset version, size, hit/miss counters).
+    """
+    cache_status = get_occupation_skill_cache_status()
+    if not cache_status["success"]:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=cache_status["message"])
+    return cache_status["result"]
+
+@app.get("/health/llm-cache", tags=["health"])
+async def llm_cache_status():
+    """
+    Status of the LLM response cache memory tiers (size, hit/miss/eviction counters).
+    """
+    return get_llm_response_cache_status()["result"]
+
+@app.get("/health/skill-gap-llm-jobs", tags=["health"])
+async def skill_gap_llm_job_metrics():
+    """
+    Worker count and in-process queue size of the background /skill-gap-llm job executor.
+    """
+    return get_skill_gap_llm_job_metrics()["result"]
+
+@app.get("/health/gemini-rate-limit", tags=["health"])
+async def gemini_rate_limit_metrics():
+    """
+    Gemini call/retry counters and the state of the client-side rate and concurrency limits.
+    """
+    return get_gemini_rate_limit_metrics()["result"]
+
+@app.get("/health/llm-parse", tags=["health"])
+async def llm_parse_metrics():
+    """
+    How often each JSON parse strategy (schema-validated structured output or a repair step) produced an LLM reply.
+    """
+    return get_llm_parse_metrics()["result"]
+
+@app.get("/health/llm-debug-sink", tags=["health"])
+async def llm_debug_sink_metrics():
+    """
+    Configuration and counters of the background writer for LLM debug copies (queued, written, dropped, segments).
+    """
+    return get_llm_debug_sink_metrics()["result"]
+
+@app.get("/health/llm-prompts", tags=["health"])
+async def llm_prompt_metrics():
+    """
+    Prompt template in use, the input token budget and the estimated input tokens of the LLM prompts sent, per reply type.
+    """
+    return get_llm_prompt_metrics()["result"]
+
 if __name__ == "__main__":
     import uvicorn
     # Use port from environment variable if available, otherwise default to 8000
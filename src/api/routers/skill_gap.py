@@ -1,15 +1,32 @@
 """
 Router for skill gap analysis endpoints.
+
+The skill gap functions are blocking (SQLAlchemy, requests), so handlers run them in worker threads
+through run_db / run_llm instead of calling them on the event loop.
 """
-import logging, os
+import json
+import math
+import time
+import logging
 from typing import List, Dict, Any, Optional
-from fastapi import APIRouter, Query, HTTPException, status
+import anyio
+import anyio.from_thread
+from fastapi import APIRouter, Query, HTTPException, status, Depends
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from sqlalchemy.engine import Engine
 
 from src.functions.get_skills_gap import get_skills_gap
 from src.functions.get_skills_gap_by_lvl import get_skills_gap_by_lvl
 from src.functions.get_skills_gap_by_lvl_llm import get_skills_gap_by_lvl_llm
+from src.functions.get_skills_gap_by_lvl_batch import get_skills_gap_by_lvl_batch
+from src.functions.get_nearest_occupations import get_nearest_occupations
 from src.config.api_exception_handles import handle_exception, handle_custom_error
-from src.config.schemas import get_sqlalchemy_engine
+from src.config.engine_registry import get_engine
+from src.config.offload import run_db, run_llm
+from src.config.skill_gap_llm_jobs import (
+    TERMINAL_STATUSES, submit_skill_gap_llm_job, get_skill_gap_llm_job, wait_for_skill_gap_llm_job
+)
 
 
 # Configure logging
@@ -18,10 +35,49 @@ logger = logging.getLogger(__name__)
 # Create router
 router = APIRouter()
 
+# Upper bound on pairs per batch request, to keep a single request's matrix and response bounded
+MAX_BATCH_PAIRS = 10000
+
+# Upper bound on how long a job status request may long-poll
+MAX_JOB_WAIT_SECONDS = 30
+
+
+class OccupationPair(BaseModel):
+    from_occupation: str = Field(..., description="Source occupation O*NET-SOC code (e.g., '11-1011.00')")
+    to_occupation: str = Field(..., description="Target occupation O*NET-SOC code (e.g., '11-2021.00')")
+
+
+class SkillGapBatchRequest(BaseModel):
+    pairs: List[OccupationPair] = Field(..., min_length=1, max_length=MAX_BATCH_PAIRS)
+
+
+def _format_skill_gap_by_lvl_response(from_occupation: str, to_occupation: str, result: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape a get_skills_gap_by_lvl result as the /skill-gap-by-lvl API response."""
+    return {
+        "from_occupation": {
+            "code": from_occupation,
+            "title": result["result"]["from_occupation_title"]
+        },
+        "to_occupation": {
+            "code": to_occupation,
+            "title": result["result"]["to_occupation_title"]
+        },
+        "skill_gaps": [
+            {
+                "skill_name": gap["element_name"],
+                "element_id": gap["element_id"],
+                "from_proficiency": gap["from_data_value"],
+                "to_proficiency": gap["to_data_value"]
+            }
+            for gap in result["result"]["skill_gaps"]
+        ]
+    }
+
 @router.get("/skill-gap")
 async def get_occupation_skill_gap(
     from_occupation: str = Query(..., description="Source occupation O*NET-SOC code (e.g., '11-1011.00')"),
     to_occupation: str = Query(..., description="Target occupation O*NET-SOC code (e.g., '11-2021.00')"),
+    engine: Engine = Depends(get_engine),
 ):
     """
     Analyze the basic skill gap between two occupations.
@@ -32,6 +88,7 @@ async def get_occupation_skill_gap(
     Args:
         from_occupation: O*NET-SOC code for the source occupation
         to_occupation: O*NET-SOC code for the target occupation
+        engine: Shared pooled SQLAlchemy engine (injected dependency)
         
     Returns:
         JSON response with skill gap analysis:
@@ -49,23 +106,11 @@ async def get_occupation_skill_gap(
             ]
         }
     """
-    try:
-        engine = get_sqlalchemy_engine(
-            db_name=os.getenv("MYSQL_DATABASE"),
-            db_user=os.getenv("MYSQL_USER"),
-            db_password=os.getenv("MYSQL_PASSWORD"),
-            db_host=os.getenv("MYSQL_HOST"),
-            db_port=os.getenv("MYSQL_PORT")
-        )
-    except Exception as e:
-        logger.error(f"Error connecting to database: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error connecting to database: {e}")
-
     try:
         logger.info(f"Processing basic skill gap request: from={from_occupation}, to={to_occupation}")
         
         # Use the basic function without proficiency levels
-        result = get_skills_gap(from_occupation, to_occupation, engine=engine)
+        result = await run_db(get_skills_gap, from_occupation, to_occupation, engine=engine)
         
         if not result["success"]:
             logger.error(f"Error in get_skills_gap: {result['message']}")
@@ -104,6 +149,7 @@ async def get_occupation_skill_gap(
 async def get_occupation_skill_gap_by_level(
     from_occupation: str = Query(..., description="Source occupation O*NET-SOC code (e.g., '11-1011.00')"),
     to_occupation: str = Query(..., description="Target occupation O*NET-SOC code (e.g., '11-2021.00')"),
+    engine: Engine = Depends(get_engine),
 ):
     """
     Analyze the detailed skill gap between two occupations with proficiency levels.
@@ -114,6 +160,7 @@ async def get_occupation_skill_gap_by_level(
     Args:
         from_occupation: O*NET-SOC code for the source occupation
         to_occupation: O*NET-SOC code for the target occupation
+        engine: Shared pooled SQLAlchemy engine (injected dependency)
         
     Returns:
         JSON response with skill gap analysis:
@@ -137,23 +184,11 @@ async def get_occupation_skill_gap_by_level(
         }
     """
 
-    try:
-        engine = get_sqlalchemy_engine(
-            db_name=os.getenv("MYSQL_DATABASE"),
-            db_user=os.getenv("MYSQL_USER"),
-            db_password=os.getenv("MYSQL_PASSWORD"),
-            db_host=os.getenv("MYSQL_HOST"),
-            db_port=os.getenv("MYSQL_PORT")
-        )
-    except Exception as e:
-        logger.error(f"Error connecting to database: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error connecting to database: {e}")
-
     try:
         logger.info(f"Processing detailed skill gap request: from={from_occupation}, to={to_occupation}")
         
         # Use the enhanced function with proficiency levels
-        result = get_skills_gap_by_lvl(from_occupation, to_occupation, engine=engine)
+        result = await run_db(get_skills_gap_by_lvl, from_occupation, to_occupation, engine=engine)
         
         if not result["success"]:
             logger.error(f"Error in get_skills_gap_by_lvl: {result['message']}")
@@ -164,25 +199,7 @@ async def get_occupation_skill_gap_by_level(
             )
         
         # Transform the internal result structure to match the API response format
-        api_response = {
-            "from_occupation": {
-                "code": from_occupation,
-                "title": result["result"]["from_occupation_title"]
-            },
-            "to_occupation": {
-                "code": to_occupation,
-                "title": result["result"]["to_occupation_title"]
-            },
-            "skill_gaps": [
-                {
-                    "skill_name": gap["element_name"],
-                    "element_id": gap["element_id"],
-                    "from_proficiency": gap["from_data_value"],
-                    "to_proficiency": gap["to_data_value"]
-                }
-                for gap in result["result"]["skill_gaps"]
-            ]
-        }
+        api_response = _format_skill_gap_by_lvl_response(from_occupation, to_occupation, result)
         
         logger.info(f"Successfully processed detailed skill gap request. Found {len(api_response['skill_gaps'])} skill gaps.")
         return api_response
@@ -196,10 +213,144 @@ async def get_occupation_skill_gap_by_level(
         raise handle_exception(e)
 
 
+@router.post("/skill-gap-by-lvl/batch")
+async def get_occupation_skill_gap_by_level_batch(
+    request: SkillGapBatchRequest,
+    engine: Engine = Depends(get_engine),
+):
+    """
+    Analyze detailed skill gaps for many occupation pairs in one call.
+    
+    Occupations are fetched once per distinct code across the batch and all gaps are computed
+    in one vectorized pass. Results are streamed back as newline-delimited JSON (one line per
+    pair, in request order), each line shaped like the /skill-gap-by-lvl response.
+    
+    Args:
+        request: {"pairs": [{"from_occupation": str, "to_occupation": str}, ...]}
+        engine: Shared pooled SQLAlchemy engine (injected dependency)
+        
+    Returns:
+        application/x-ndjson stream. Each line is either the /skill-gap-by-lvl response for the pair,
+        or, if the pair failed:
+        {
+            "from_occupation": {"code": str},
+            "to_occupation": {"code": str},
+            "error": {"status_code": int, "detail": str}
+        }
+    """
+    try:
+        pairs = [(pair.from_occupation, pair.to_occupation) for pair in request.pairs]
+        logger.info(f"Processing batch skill gap request for {len(pairs)} pairs")
+        
+        batch_result = await run_db(get_skills_gap_by_lvl_batch, pairs, engine=engine)
+        logger.info(batch_result["message"])
+        
+    except Exception as e:
+        # Use the generic exception handler for unexpected errors
+        logger.exception(f"Unexpected error processing batch skill gap request: {str(e)}")
+        raise handle_exception(e)
+
+    def stream_lines():
+        for (from_occupation, to_occupation), result in zip(pairs, batch_result["result"]):
+            if result["success"]:
+                line = _format_skill_gap_by_lvl_response(from_occupation, to_occupation, result)
+            else:
+                line = {
+                    "from_occupation": {"code": from_occupation},
+                    "to_occupation": {"code": to_occupation},
+                    "error": {
+                        "status_code": status.HTTP_404_NOT_FOUND if "not found" in result["message"].lower() else status.HTTP_500_INTERNAL_SERVER_ERROR,
+                        "detail": result["message"]
+                    }
+                }
+            yield json.dumps(line) + "\n"
+
+    return StreamingResponse(stream_lines(), media_type="application/x-ndjson")
+
+
+@router.get("/nearest-occupations")
+async def get_nearest_occupation_transitions(
+    from_occupation: str = Query(..., description="Source occupation O*NET-SOC code (e.g., '11-1011.00')"),
+    metric: str = Query("sum", pattern="^(sum|count|weighted)$", description="Gap metric: 'sum' of level differences, 'count' of gap skills, or importance-'weighted' sum"),
+    limit: int = Query(10, ge=1, le=100, description="Number of occupations to return"),
+    offset: int = Query(0, ge=0, description="Number of ranked occupations to skip"),
+    engine: Engine = Depends(get_engine),
+):
+    """
+    Rank target occupations by the smallest skill gap from a source occupation.
+    
+    All occupations are scored in one vectorized pass over the in-memory occupation x skill matrix,
+    using the same gap rule as /skill-gap-by-lvl.
+    
+    Args:
+        from_occupation: O*NET-SOC code for the source occupation
+        metric: Gap metric used for ranking ('sum', 'count' or 'weighted')
+        limit: Page size
+        offset: Page start
+        engine: Shared pooled SQLAlchemy engine (injected dependency)
+        
+    Returns:
+        JSON response with the ranked page:
+        {
+            "from_occupation": {"code": str, "title": str},
+            "metric": str,
+            "total": int,
+            "limit": int,
+            "offset": int,
+            "occupations": [
+                {"code": str, "title": str, "score": float/int, "gap_count": int, "total_gap": float}
+            ]
+        }
+    """
+    try:
+        logger.info(f"Processing nearest occupations request: from={from_occupation}, metric={metric}, limit={limit}, offset={offset}")
+        
+        result = await run_db(get_nearest_occupations, from_occupation, metric=metric, limit=limit, offset=offset, engine=engine)
+        
+        if not result["success"]:
+            logger.error(f"Error in get_nearest_occupations: {result['message']}")
+            raise handle_custom_error(
+                status_code=status.HTTP_404_NOT_FOUND if "not found" in result["message"].lower() else status.HTTP_500_INTERNAL_SERVER_ERROR,
+                message=result["message"]
+            )
+        
+        logger.info(f"Successfully processed nearest occupations request. Returned {len(result['result']['occupations'])} occupations.")
+        return result["result"]
+        
+    except HTTPException:
+        # Re-raise HTTP exceptions
+        raise
+    except Exception as e:
+        # Use the generic exception handler for unexpected errors
+        logger.exception(f"Unexpected error processing nearest occupations request: {str(e)}")
+        raise handle_exception(e)
+
+
+async def _get_occupation_titles(from_occupation: str, to_occupation: str, engine: Engine) -> tuple:
+    """Titles of both occupations for the /skill-gap-llm responses, "Unknown" if they cannot be read."""
+    from_title = "Unknown"
+    to_title = "Unknown"
+    try:
+        # get_skills_gap_by_lvl_llm only returns the gap list, so read the titles separately
+        details_result = await run_db(get_skills_gap, from_occupation, to_occupation, engine)
+        if details_result["success"]:
+            from_title = details_result["result"]["from_occupation_title"]
+            to_title = details_result["result"]["to_occupation_title"]
+    except Exception as title_e:
+        logger.warning(f"Could not retrieve occupation titles for LLM gap response: {title_e}")
+    return from_title, to_title
+
+
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
 @router.get("/skill-gap-llm")
 async def get_occupation_skill_gap_llm(
     from_occupation: str = Query(..., description="Source occupation O*NET-SOC code (e.g., '11-1011.00')"),
     to_occupation: str = Query(..., description="Target occupation O*NET-SOC code (e.g., '11-2021.00')"),
+    engine: Engine = Depends(get_engine),
 ):
     """
     Analyze the detailed skill gap between two occupations with LLM-generated descriptions.
@@ -211,6 +362,7 @@ async def get_occupation_skill_gap_llm(
     Args:
         from_occupation: O*NET-SOC code for the source occupation
         to_occupation: O*NET-SOC code for the target occupation
+        engine: Shared pooled SQLAlchemy engine (injected dependency)
         
     Returns:
         JSON response with LLM-enhanced skill gap analysis:
@@ -235,22 +387,10 @@ async def get_occupation_skill_gap_llm(
         }
     """
 
-    try:
-        engine = get_sqlalchemy_engine(
-            db_name=os.getenv("MYSQL_DATABASE"),
-            db_user=os.getenv("MYSQL_USER"),
-            db_password=os.getenv("MYSQL_PASSWORD"),
-            db_host=os.getenv("MYSQL_HOST"),
-            db_port=os.getenv("MYSQL_PORT")
-        )
-    except Exception as e:
-        logger.error(f"Error connecting to database: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error connecting to database: {e}")
-
     try:
         logger.info(f"Processing LLM-enhanced skill gap request: from={from_occupation}, to={to_occupation}")
         
-        result = get_skills_gap_by_lvl_llm(from_occupation, to_occupation, engine=engine)
+        result = await run_llm(get_skills_gap_by_lvl_llm, from_occupation, to_occupation, engine=engine)
         
         if not result["success"]:
             logger.error(f"Error in get_skills_gap_by_lvl_llm: {result['message']}")
@@ -259,23 +399,7 @@ async def get_occupation_skill_gap_llm(
                 message=result["message"]
             )
         
-        # The result["result"] from get_skills_gap_by_lvl_llm is already a list of skill gap dicts
-        # We need to get the occupation titles from one of the earlier calls or from the message if available
-        # For now, let's assume titles are part of the message or make a small helper if needed
-        # This part might need refinement based on exact structure of successful message
-        
-        # Re-fetch basic occupation info for titles (can be optimized by get_skills_gap_by_lvl_llm returning them)
-        from_title = "Unknown"
-        to_title = "Unknown"
-        try:
-            # A bit inefficient, but ensures titles are present for the response
-            # This could be optimized by having get_skills_gap_by_lvl_llm return titles
-            from_details_res = get_skills_gap(from_occupation, to_occupation, engine) # or a get_occupation_details func
-            if from_details_res["success"]:
-                from_title = from_details_res["result"]["from_occupation_title"]
-                to_title = from_details_res["result"]["to_occupation_title"]
-        except Exception as title_e:
-            logger.warning(f"Could not retrieve occupation titles for LLM gap response: {title_e}")
+        from_title, to_title = await _get_occupation_titles(from_occupation, to_occupation, engine)
 
         api_response = {
             "from_occupation": {
@@ -298,4 +422,172 @@ async def get_occupation_skill_gap_llm(
     except Exception as e:
         # Use the generic exception handler for unexpected errors
         logger.exception(f"Unexpected error processing LLM skill gap request: {str(e)}")
-        raise handle_exception(e) 
\ No newline at end of file
+        raise handle_exception(e)
+
+
+@router.get("/skill-gap-llm/stream")
+async def stream_occupation_skill_gap_llm(
+    from_occupation: str = Query(..., description="Source occupation O*NET-SOC code (e.g., '11-1011.00')"),
+    to_occupation: str = Query(..., description="Target occupation O*NET-SOC code (e.g., '11-2021.00')"),
+    engine: Engine = Depends(get_engine),
+):
+    """
+    Server-sent event variant of /skill-gap-llm that pushes each skill gap as soon as it is complete.
+    
+    The gap analysis reply is streamed from Gemini and parsed incrementally, so the first gaps arrive
+    while the LLM is still writing the rest. Gaps served from the cache arrive together.
+    
+    Args:
+        from_occupation: O*NET-SOC code for the source occupation
+        to_occupation: O*NET-SOC code for the target occupation
+        engine: Shared pooled SQLAlchemy engine (injected dependency)
+        
+    Returns:
+        text/event-stream with the events:
+        - "gap": one skill gap object, shaped like the /skill-gap-llm skill_gaps items
+        - "done": {"from_occupation": {"code": str, "title": str}, "to_occupation": {"code": str, "title": str}, "skill_gap_count": int}
+        - "error": {"status_code": int, "detail": str}, sent instead of "done" if the analysis failed
+    """
+    logger.info(f"Processing streamed LLM-enhanced skill gap request: from={from_occupation}, to={to_occupation}")
+    send_stream, receive_stream = anyio.create_memory_object_stream(math.inf)
+
+    def on_gap(gap: Dict[str, Any]) -> None:
+        # Called from the worker thread running the pipeline
+        anyio.from_thread.run_sync(send_stream.send_nowait, gap)
+
+    async def stream_events():
+        outcome = {}
+
+        async def run_pipeline():
+            try:
+                outcome["result"] = await run_llm(
+                    get_skills_gap_by_lvl_llm, from_occupation, to_occupation, engine=engine, on_gap=on_gap
+                )
+            except Exception as e:
+                logger.exception(f"Unexpected error processing streamed LLM skill gap request: {str(e)}")
+                outcome["result"] = {"success": False, "message": f"Error in LLM-enhanced skill gap analysis: {str(e)}", "result": []}
+            finally:
+                await send_stream.aclose()
+
+        async with anyio.create_task_group() as task_group:
+            task_group.start_soon(run_pipeline)
+            async with receive_stream:
+                async for gap in receive_stream:
+                    yield _sse_event("gap", gap)
+
+        result = outcome["result"]
+        if not result["success"]:
+            logger.error(f"Error in get_skills_gap_by_lvl_llm: {result['message']}")
+            yield _sse_event("error", {
+                "status_code": status.HTTP_404_NOT_FOUND if "not found" in result["message"].lower() else status.HTTP_500_INTERNAL_SERVER_ERROR,
+                "detail": result["message"]
+            })
+            return
+
+        from_title, to_title = await _get_occupation_titles(from_occupation, to_occupation, engine)
+        logger.info(f"Successfully streamed LLM-enhanced skill gap request. Found {len(result['result'])} skill gaps.")
+        yield _sse_event("done", {
+            "from_occupation": {"code": from_occupation, "title": from_title},
+            "to_occupation": {"code": to_occupation, "title": to_title},
+            "skill_gap_count": len(result["result"])
+        })
+
+    return StreamingResponse(
+        stream_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/skill-gap-llm/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def submit_occupation_skill_gap_llm_job(request: OccupationPair):
+    """
+    Queue an LLM-enhanced skill gap analysis and return immediately.
+    
+    The get_skills_gap_by_lvl_llm pipeline runs on a bounded background worker pool. Job state and
+    the result are stored in the skill_gap_llm_jobs table, so the result can be fetched repeatedly
+    (and survives API restarts) without recomputation.
+    
+    Args:
+        request: {"from_occupation": str, "to_occupation": str}
+        
+    Returns:
+        JSON response (202 Accepted):
+        {
+            "job_id": str,
+            "status": "queued",
+            "created_at": str,
+            "status_url": str
+        }
+    """
+    try:
+        logger.info(f"Queueing LLM-enhanced skill gap job: from={request.from_occupation}, to={request.to_occupation}")
+        
+        created = await run_db(submit_skill_gap_llm_job, request.from_occupation, request.to_occupation)
+        
+        if not created["success"]:
+            logger.error(f"Error queueing skill gap LLM job: {created['message']}")
+            raise handle_custom_error(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, message=created["message"])
+        
+        return {**created["result"], "status_url": f"/api/v1/skill-gap-llm/jobs/{created['result']['job_id']}"}
+        
+    except HTTPException:
+        # Re-raise HTTP exceptions
+        raise
+    except Exception as e:
+        # Use the generic exception handler for unexpected errors
+        logger.exception(f"Unexpected error queueing LLM skill gap job: {str(e)}")
+        raise handle_exception(e)
+
+
+@router.get("/skill-gap-llm/jobs/{job_id}")
+async def get_occupation_skill_gap_llm_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, le=MAX_JOB_WAIT_SECONDS, description="Long-poll: seconds to wait for the job to finish before responding"),
+):
+    """
+    Fetch the state of a queued LLM-enhanced skill gap job, optionally long-polling until it finishes.
+    
+    Args:
+        job_id: Id returned by POST /skill-gap-llm/jobs
+        wait: Seconds to wait for a queued/running job to finish (0 returns immediately)
+        
+    Returns:
+        JSON response:
+        {
+            "job_id": str,
+            "status": "queued" | "running" | "succeeded" | "failed",
+            "from_occupation": str,
+            "to_occupation": str,
+            "created_at": str,
+            "started_at": str or null,
+            "finished_at": str or null,
+            "result": the /skill-gap-llm response once succeeded, else null,
+            "error": {"status_code": int, "detail": str} once failed, else null
+        }
+    """
+    try:
+        deadline = time.monotonic() + wait
+        job = await run_db(get_skill_gap_llm_job, job_id)
+        while job["success"] and job["result"] and job["result"]["status"] not in TERMINAL_STATUSES:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            await wait_for_skill_gap_llm_job(job_id, remaining)
+            job = await run_db(get_skill_gap_llm_job, job_id)
+        
+        if not job["success"]:
+            logger.error(f"Error reading skill gap LLM job: {job['message']}")
+            raise handle_custom_error(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, message=job["message"])
+        if job["result"] is None:
+            raise handle_custom_error(status_code=status.HTTP_404_NOT_FOUND, message=job["message"])
+        
+        return job["result"]
+        
+    except HTTPException:
+        # Re-raise HTTP exceptions
+        raise
+    except Exception as e:
+        # Use the generic exception handler for unexpected errors
+        logger.exception(f"Unexpected error reading LLM skill gap job: {str(e)}")
+        raise handle_exception(e)
@@ -0,0 +1,190 @@
+"""
+Process-wide SQLAlchemy engine registry for the API.
+
+The engine (and its connection pool) is created once, in the FastAPI lifespan, and handed to
+routes through the `get_engine` dependency. This avoids building and discarding a connection
+pool (and paying a full TCP + auth handshake to MySQL) on every HTTP request.
+
+Pool behaviour is configured through environment variables:
+    MYSQL_POOL_SIZE      Connections kept open in the pool (default: 5)
+    MYSQL_MAX_OVERFLOW   Extra connections allowed above pool size under load (default: 10)
+    MYSQL_POOL_TIMEOUT   Seconds to wait for a free connection before failing (default: 30)
+    MYSQL_POOL_RECYCLE   Seconds after which a connection is recycled (default: 1800)
+    MYSQL_POOL_PRE_PING  Test connections for liveness on checkout (default: true)
+"""
+import os
+import time
+import logging
+import threading
+from typing import Dict, Any, Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+from src.config.schemas import get_sqlalchemy_engine
+
+logger = logging.getLogger(__name__)
+
+_engine: Optional[Engine] = None
+_engine_lock = threading.Lock()
+
+_metrics_lock = threading.Lock()
+_metrics: Dict[str, float] = {
+    "connections_created": 0,
+    "checkouts": 0,
+    "checkins": 0,
+    "invalidations": 0,
+    "checkout_wait_seconds_total": 0.0,
+    "checkout_wait_seconds_max": 0.0,
+}
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait to check out a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - started
+            with _metrics_lock:
+                _metrics["checkout_wait_seconds_total"] += waited
+                _metrics["checkout_wait_seconds_max"] = max(_metrics["checkout_wait_seconds_max"], waited)
+
+
+def get_pool_settings() -> Dict[str, Any]:
+    """Read connection pool settings from environment variables."""
+    return {
+        "pool_size": int(os.getenv("MYSQL_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("MYSQL_MAX_OVERFLOW", "10")),
+        "pool_timeout": float(os.getenv("MYSQL_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("MYSQL_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": os.getenv("MYSQL_POOL_PRE_PING", "true").lower() in ("1", "true", "yes"),
+    }
+
+
+def _increment(metric: str) -> None:
+    with _metrics_lock:
+        _metrics[metric] += 1
+
+
+def _register_pool_events(engine: Engine) -> None:
+    event.listen(engine, "connect", lambda dbapi_conn, record: _increment("connections_created"))
+    event.listen(engine, "checkout", lambda dbapi_conn, record, proxy: _increment("checkouts"))
+    event.listen(engine, "checkin", lambda dbapi_conn, record: _increment("checkins"))
+    event.listen(engine, "invalidate", lambda dbapi_conn, record, exc: _increment("invalidations"))
+
+
+def init_engine(engine_url: Optional[str] = None) -> Engine:
+    """
+    Create the shared pooled engine. Called once from the FastAPI lifespan.
+
+    Args:
+        engine_url (Optional[str]): SQLAlchemy URL to connect to. If None, the MySQL URL is
+                                    built from the MYSQL_* environment variables.
+
+    Returns:
+        Engine: The shared engine.
+    """
+    global _engine
+    with _engine_lock:
+        if _engine is not None:
+            return _engine
+
+        settings = get_pool_settings()
+        if engine_url is None:
+            engine = get_sqlalchemy_engine(poolclass=InstrumentedQueuePool, **settings)
+        else:
+            engine = create_engine(engine_url, poolclass=InstrumentedQueuePool, **settings)
+
+        _register_pool_events(engine)
+        _engine = engine
+        logger.info(f"Shared database engine created with pool settings: {settings}")
+        return _engine
+
+
+def get_engine() -> Engine:
+    """
+    FastAPI dependency returning the shared engine.
+    The engine is created lazily if the lifespan has not initialised it (e.g. in scripts).
+    """
+    if _engine is None:
+        return init_engine()
+    return _engine
+
+
+def dispose_engine() -> None:
+    """Close all pooled connections and drop the shared engine. Called on API shutdown."""
+    global _engine
+    with _engine_lock:
+        if _engine is not None:
+            _engine.dispose()
+            logger.info("Shared database engine disposed.")
+        _engine = None
+
+
+def get_pool_metrics() -> Dict[str, Any]:
+    """
+    Return pool checkout/wait counters together with the live pool status.
+
+    Returns:
+        dict: {
+            "success": bool,
+            "message": str,
+            "result": {
+                "settings": dict,
+                "pool": {"size", "checked_in", "checked_out", "overflow"},
+                "counters": {"connections_created", "checkouts", "checkins", "invalidations",
+                             "checkout_wait_seconds_total", "checkout_wait_seconds_max",
+                             "checkout_wait_seconds_avg"}
+            }
+        }
+    """
+    if _engine is None:
+        return {"success": False, "message": "Shared database engine has not been initialised", "result": {}}
+
+    pool = _engine.pool
+    with _metrics_lock:
+        counters = dict(_metrics)
+    counters["checkout_wait_seconds_avg"] = (
+        counters["checkout_wait_seconds_total"] / counters["checkouts"] if counters["checkouts"] else 0.0
+    )
+
+    return {
+        "success": True,
+        "message": "Connection pool metrics retrieved",
+        "result": {
+            "settings": get_pool_settings(),
+            "pool": {
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+            },
+            "counters": counters,
+        }
+    }
+
+
+if __name__ == "__main__":
+    print("Minimalistic happy path example for the engine registry:")
+    print("This example uses a temporary SQLite file database in place of MySQL.")
+
+    import tempfile
+    from sqlalchemy import text
+
+    db_path = os.path.join(tempfile.mkdtemp(), "engine_registry_example.db")
+    engine = init_engine(f"sqlite:///{db_path}")
+
+    for _ in range(3):
+        with get_engine().connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+    metrics = get_pool_metrics()
+    print(f"\n  Success: {metrics['success']}")
+    print(f"  Pool: {metrics['result']['pool']}")
+    print(f"  Counters: {metrics['result']['counters']}")
+
+    dispose_engine()
+    print("\nExample finished.")
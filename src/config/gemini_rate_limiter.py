@@ -0,0 +1,224 @@
+"""
+Process-wide client-side rate limiting, adaptive concurrency and retry policy for Gemini calls.
+
+Every gemini_llm_request call in the process, from API requests, background jobs and batch nodes
+alike, goes through the same limiter:
+- a requests-per-minute and a tokens-per-minute token bucket (tokens are estimated from the prompt
+  before the call and settled against the reported usageMetadata afterwards)
+- an AIMD concurrency limit that halves on HTTP 429/503 and grows back on successful calls
+Failed calls with a retryable status (429, 500, 502, 503, 504), timeouts and connection errors are
+retried with full-jitter exponential backoff, or after the delay the server asks for (Retry-After
+header or RetryInfo retryDelay in the error body).
+
+Configuration through environment variables:
+    GEMINI_REQUESTS_PER_MINUTE       Request rate limit, 0 for none (default: 0)
+    GEMINI_TOKENS_PER_MINUTE         Token rate limit, 0 for none (default: 0)
+    GEMINI_MAX_CONCURRENCY           Upper bound and initial value of the concurrency limit (default: 8)
+    GEMINI_MIN_CONCURRENCY           Lower bound of the concurrency limit (default: 1)
+    GEMINI_MAX_RETRIES               Retries after the first attempt (default: 3)
+    GEMINI_BACKOFF_BASE_SECONDS      Backoff before the first retry, doubled per retry (default: 1)
+    GEMINI_BACKOFF_MAX_SECONDS       Longest backoff or honoured server delay (default: 30)
+    GEMINI_REQUEST_TIMEOUT_SECONDS   HTTP timeout of one attempt (default: 60)
+"""
+import os
+import random
+import threading
+from datetime import datetime, UTC
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+from src.config.rate_limiter import TokenBucket, AdaptiveConcurrencyLimiter
+
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+OVERLOAD_STATUS_CODES = (429, 503)
+
+_limiter: Optional["GeminiRateLimiter"] = None
+_lock = threading.Lock()
+
+
+def get_max_retries() -> int:
+    """Retries after the first attempt of a Gemini call."""
+    return int(os.getenv("GEMINI_MAX_RETRIES", "3"))
+
+
+def get_request_timeout() -> float:
+    """HTTP timeout in seconds of one Gemini call attempt."""
+    return float(os.getenv("GEMINI_REQUEST_TIMEOUT_SECONDS", "60"))
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of a text (about four characters per token)."""
+    return max(1, len(text) // 4)
+
+
+def parse_retry_after(header_value: Optional[str], error_body: Any = None) -> Optional[float]:
+    """
+    Delay in seconds requested by the server, or None if it did not ask for one.
+
+    Reads the Retry-After header (seconds or an HTTP date) and, failing that, the retryDelay
+    (e.g. "23s") of a google.rpc.RetryInfo entry in the JSON error body.
+    """
+    if header_value:
+        try:
+            return max(0.0, float(header_value))
+        except ValueError:
+            try:
+                return max(0.0, (parsedate_to_datetime(header_value) - datetime.now(UTC)).total_seconds())
+            except (TypeError, ValueError):
+                pass
+    if isinstance(error_body, dict):
+        details = (error_body.get("error") or {}).get("details") or []
+        for detail in details:
+            retry_delay = detail.get("retryDelay") if isinstance(detail, dict) else None
+            if isinstance(retry_delay, str) and retry_delay.endswith("s"):
+                try:
+                    return max(0.0, float(retry_delay[:-1]))
+                except ValueError:
+                    pass
+    return None
+
+
+def get_backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """
+    Seconds to wait before retry number attempt + 1: the server's requested delay if any,
+    otherwise a full-jitter exponential backoff. Both are capped at GEMINI_BACKOFF_MAX_SECONDS.
+    """
+    max_delay = float(os.getenv("GEMINI_BACKOFF_MAX_SECONDS", "30"))
+    if retry_after is not None:
+        return min(retry_after, max_delay)
+    base_delay = float(os.getenv("GEMINI_BACKOFF_BASE_SECONDS", "1"))
+    return random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+
+
+class GeminiRateLimiter:
+    """
+    Request rate, token rate and adaptive concurrency limits for one process, plus call/retry counters.
+
+    Args:
+        requests_per_minute (float): Request rate limit, 0 for none.
+        tokens_per_minute (float): Token rate limit, 0 for none.
+        max_concurrency (int): Upper bound and initial value of the concurrency limit.
+        min_concurrency (int): Lower bound of the concurrency limit.
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float, max_concurrency: int, min_concurrency: int = 1):
+        self.request_bucket = TokenBucket(requests_per_minute / 60)
+        # Allow one minute's worth of tokens at once so a single large prompt never waits forever
+        self.token_bucket = TokenBucket(tokens_per_minute / 60, capacity=max(1.0, tokens_per_minute))
+        self.concurrency = AdaptiveConcurrencyLimiter(max_limit=max_concurrency, min_limit=min_concurrency)
+        self._lock = threading.Lock()
+        self._stats = {
+            "calls": 0,
+            "attempts": 0,
+            "retries": 0,
+            "throttled_responses": 0,
+            "failed_attempts": 0,
+            "backoff_seconds_total": 0.0,
+            "estimated_tokens_total": 0,
+            "reported_tokens_total": 0
+        }
+
+    def start_call(self) -> None:
+        """Count a gemini_llm_request call (which may take several attempts)."""
+        with self._lock:
+            self._stats["calls"] += 1
+
+    def acquire(self, estimated_tokens: int) -> float:
+        """Wait for a concurrency slot, a request token and estimated_tokens. Returns the seconds spent waiting."""
+        waited = self.concurrency.acquire()
+        try:
+            waited += self.request_bucket.acquire()
+            waited += self.token_bucket.acquire(estimated_tokens)
+        except BaseException:
+            self.concurrency.release()
+            raise
+        with self._lock:
+            self._stats["attempts"] += 1
+            self._stats["estimated_tokens_total"] += estimated_tokens
+        return waited
+
+    def release(self, status_code: Optional[int] = None) -> None:
+        """Free the concurrency slot. status_code is None when the attempt raised (timeout, connection error)."""
+        overloaded = status_code in OVERLOAD_STATUS_CODES
+        with self._lock:
+            if overloaded:
+                self._stats["throttled_responses"] += 1
+            if status_code is None or status_code in RETRYABLE_STATUS_CODES:
+                self._stats["failed_attempts"] += 1
+        self.concurrency.release(overloaded=overloaded)
+
+    def record_token_usage(self, estimated_tokens: int, reported_tokens: Optional[int]) -> None:
+        """Settle the token bucket against the usage the API reported for a call."""
+        if not reported_tokens:
+            return
+        with self._lock:
+            self._stats["reported_tokens_total"] += reported_tokens
+        if reported_tokens > estimated_tokens:
+            self.token_bucket.debit(reported_tokens - estimated_tokens)
+
+    def record_retry(self, delay_seconds: float) -> None:
+        """Count a retry and the backoff before it."""
+        with self._lock:
+            self._stats["retries"] += 1
+            self._stats["backoff_seconds_total"] += delay_seconds
+
+    def stats(self) -> Dict[str, Any]:
+        """Return call/retry counters and the state of each limit."""
+        with self._lock:
+            counters = dict(self._stats)
+        counters["backoff_seconds_total"] = round(counters["backoff_seconds_total"], 3)
+        return {
+            **counters,
+            "requests_per_minute": self.request_bucket.stats(),
+            "tokens_per_minute": self.token_bucket.stats(),
+            "concurrency": self.concurrency.stats()
+        }
+
+
+def get_gemini_rate_limiter() -> GeminiRateLimiter:
+    """Return the process-wide Gemini limiter, creating it from the environment on first use."""
+    global _limiter
+    with _lock:
+        if _limiter is None:
+            _limiter = GeminiRateLimiter(
+                requests_per_minute=float(os.getenv("GEMINI_REQUESTS_PER_MINUTE", "0")),
+                tokens_per_minute=float(os.getenv("GEMINI_TOKENS_PER_MINUTE", "0")),
+                max_concurrency=int(os.getenv("GEMINI_MAX_CONCURRENCY", "8")),
+                min_concurrency=int(os.getenv("GEMINI_MIN_CONCURRENCY", "1"))
+            )
+        return _limiter
+
+
+def reset_gemini_rate_limiter() -> None:
+    """Drop the process-wide limiter so the next call recreates it from the environment."""
+    global _limiter
+    with _lock:
+        _limiter = None
+
+
+def get_gemini_rate_limit_metrics() -> Dict[str, Any]:
+    """
+    Return the Gemini call counters and limiter state of this process.
+
+    Returns:
+        dict: {"success": bool, "message": str, "result": GeminiRateLimiter.stats()}
+    """
+    return {
+        "success": True,
+        "message": "Gemini rate limiter metrics retrieved",
+        "result": get_gemini_rate_limiter().stats()
+    }
+
+
+if __name__ == "__main__":
+    print("Minimalistic happy path example for the Gemini rate limiter:")
+
+    limiter = get_gemini_rate_limiter()
+    limiter.start_call()
+    limiter.acquire(estimate_tokens("Assess the skills of a Chief Executive."))
+    limiter.release(status_code=429)
+    delay = get_backoff_delay(0, parse_retry_after("2"))
+    limiter.record_retry(delay)
+    print(f"\n  Backoff after 429 with Retry-After: 2 -> {delay}s")
+    print(f"  Metrics: {get_gemini_rate_limit_metrics()['result']}")
+    print("\nExample finished.")
@@ -0,0 +1,195 @@
+"""
+Schema-constrained JSON output for Gemini calls and counters for how LLM replies get parsed.
+
+With structured output on, gemini_llm_request sends responseMimeType "application/json" and the
+response schema of the expected reply type (RESPONSE_SCHEMAS, mirroring the output formats in the
+prompt generators). A reply that parses and validates against the schema is used as is; any other
+reply goes through the JSON repair strategies of _parse_llm_json_response. Every parsed reply is
+counted under the strategy that produced it, so the repair path can be watched in production.
+
+Configuration through environment variables:
+    GEMINI_STRUCTURED_OUTPUT   Request schema-constrained JSON output (default: true)
+"""
+import os
+import threading
+from typing import Any, Dict, Optional
+
+# Parse strategies in the order they are tried; "failed" counts replies no strategy could parse
+PARSE_STRATEGIES = (
+    "structured", "direct", "strip_fences", "regex_block", "escape_quotes", "trailing_commas", "failed"
+)
+
+_ASSESSED_SKILL_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "llm_skill_name": {"type": "STRING"},
+        "llm_assigned_proficiency_description": {"type": "STRING"},
+        "llm_assigned_proficiency_level": {"type": "NUMBER"},
+        "llm_explanation": {"type": "STRING"}
+    },
+    "required": ["llm_skill_name", "llm_assigned_proficiency_description", "llm_assigned_proficiency_level", "llm_explanation"],
+    "propertyOrdering": ["llm_skill_name", "llm_assigned_proficiency_description", "llm_assigned_proficiency_level", "llm_explanation"]
+}
+
+_SKILL_PROFICIENCY_ASSESSMENT_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "llm_onet_soc_code": {"type": "STRING"},
+        "llm_occupation_name": {"type": "STRING"},
+        "assessed_skills": {"type": "ARRAY", "items": _ASSESSED_SKILL_SCHEMA}
+    },
+    "required": ["llm_onet_soc_code", "llm_occupation_name", "assessed_skills"],
+    "propertyOrdering": ["llm_onet_soc_code", "llm_occupation_name", "assessed_skills"]
+}
+
+_SKILL_GAP_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "skill_name": {"type": "STRING"},
+        "from_proficiency_level": {"type": "NUMBER"},
+        "to_proficiency_level": {"type": "NUMBER"},
+        "gap_description": {"type": "STRING"}
+    },
+    "required": ["skill_name", "from_proficiency_level", "to_proficiency_level", "gap_description"],
+    "propertyOrdering": ["skill_name", "from_proficiency_level", "to_proficiency_level", "gap_description"]
+}
+
+# Response schemas per expected_response_type, in the OpenAPI subset accepted by generationConfig.responseSchema
+RESPONSE_SCHEMAS = {
+    "skill_proficiency": {
+        "type": "OBJECT",
+        "properties": {"skill_proficiency_assessment": _SKILL_PROFICIENCY_ASSESSMENT_SCHEMA},
+        "required": ["skill_proficiency_assessment"]
+    },
+    "batch_skill_proficiency": {
+        "type": "OBJECT",
+        "properties": {"skill_proficiency_assessments": {"type": "ARRAY", "items": _SKILL_PROFICIENCY_ASSESSMENT_SCHEMA}},
+        "required": ["skill_proficiency_assessments"]
+    },
+    "skill_gap_analysis": {
+        "type": "OBJECT",
+        "properties": {
+            "skill_gap_analysis": {
+                "type": "OBJECT",
+                "properties": {
+                    "from_occupation": {"type": "STRING"},
+                    "to_occupation": {"type": "STRING"},
+                    "skill_gaps": {"type": "ARRAY", "items": _SKILL_GAP_SCHEMA}
+                },
+                "required": ["from_occupation", "to_occupation", "skill_gaps"],
+                "propertyOrdering": ["from_occupation", "to_occupation", "skill_gaps"]
+            }
+        },
+        "required": ["skill_gap_analysis"]
+    }
+}
+
+_PYTHON_TYPES = {
+    "OBJECT": dict,
+    "ARRAY": list,
+    "STRING": str,
+    "NUMBER": (int, float),
+    "INTEGER": int,
+    "BOOLEAN": bool
+}
+
+_parse_counts = {strategy: 0 for strategy in PARSE_STRATEGIES}
+_lock = threading.Lock()
+
+
+def is_structured_output_enabled() -> bool:
+    """Whether Gemini calls request schema-constrained JSON output."""
+    return os.getenv("GEMINI_STRUCTURED_OUTPUT", "true").lower() in ("1", "true", "yes")
+
+
+def get_response_schema(expected_response_type: str) -> Optional[Dict[str, Any]]:
+    """Response schema for an expected_response_type, or None if there is none."""
+    return RESPONSE_SCHEMAS.get(expected_response_type)
+
+
+def get_structured_generation_config(expected_response_type: str) -> Dict[str, Any]:
+    """
+    generationConfig fields requesting schema-constrained JSON output, or an empty dict when
+    structured output is disabled or the reply type has no schema.
+    """
+    schema = get_response_schema(expected_response_type)
+    if schema is None or not is_structured_output_enabled():
+        return {}
+    return {"responseMimeType": "application/json", "responseSchema": schema}
+
+
+def matches_schema(value: Any, schema: Dict[str, Any]) -> bool:
+    """Check a parsed reply against a response schema (types and required properties)."""
+    expected_type = _PYTHON_TYPES.get(schema.get("type"))
+    if expected_type is None:
+        return True
+    # bool is an int subclass, but never a valid NUMBER/INTEGER
+    if not isinstance(value, expected_type) or (isinstance(value, bool) and schema["type"] != "BOOLEAN"):
+        return False
+    if schema["type"] == "OBJECT":
+        if any(key not in value for key in schema.get("required", [])):
+            return False
+        return all(
+            matches_schema(value[key], property_schema)
+            for key, property_schema in schema.get("properties", {}).items()
+            if key in value
+        )
+    if schema["type"] == "ARRAY" and "items" in schema:
+        return all(matches_schema(item, schema["items"]) for item in value)
+    return True
+
+
+def record_parse_strategy(strategy: str) -> None:
+    """Count one LLM reply parsed by strategy (one of PARSE_STRATEGIES)."""
+    with _lock:
+        _parse_counts[strategy] += 1
+
+
+def reset_llm_parse_metrics() -> None:
+    """Reset the parse strategy counters (used by tests)."""
+    with _lock:
+        for strategy in _parse_counts:
+            _parse_counts[strategy] = 0
+
+
+def get_llm_parse_metrics() -> Dict[str, Any]:
+    """
+    Return how often each parse strategy produced the JSON of an LLM reply in this process.
+
+    Returns:
+        dict: {
+            "success": bool,
+            "message": str,
+            "result": {
+                "structured_output_enabled": bool,
+                "replies": int,                  # Replies parsed or given up on
+                "repaired": int,                 # Replies that needed a repair strategy beyond a direct parse
+                "strategies": {strategy: int}    # Counts per entry of PARSE_STRATEGIES
+            }
+        }
+    """
+    with _lock:
+        counts = dict(_parse_counts)
+    return {
+        "success": True,
+        "message": "LLM reply parse metrics retrieved",
+        "result": {
+            "structured_output_enabled": is_structured_output_enabled(),
+            "replies": sum(counts.values()),
+            "repaired": sum(counts[strategy] for strategy in ("strip_fences", "regex_block", "escape_quotes", "trailing_commas")),
+            "strategies": counts
+        }
+    }
+
+
+if __name__ == "__main__":
+    print("Minimalistic happy path example for Gemini structured output:")
+
+    reply = {"skill_gap_analysis": {"from_occupation": "A", "to_occupation": "B", "skill_gaps": [
+        {"skill_name": "Programming", "from_proficiency_level": 2, "to_proficiency_level": 6, "gap_description": "Learn to program"}
+    ]}}
+    print(f"\n  generationConfig fields: {list(get_structured_generation_config('skill_gap_analysis'))}")
+    print(f"  Reply matches schema: {matches_schema(reply, get_response_schema('skill_gap_analysis'))}")
+    record_parse_strategy("structured")
+    print(f"  Metrics: {get_llm_parse_metrics()['result']}")
+    print("\nExample finished.")
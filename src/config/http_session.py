@@ -0,0 +1,73 @@
+"""
+Shared keep-alive HTTP session for the external integrations (Gemini API, O*NET web services).
+
+Module-level requests.get/post open a new connection, including a new TLS handshake, on every call.
+get_http_session returns one pooled requests.Session per process, so repeated calls to the same host
+reuse an open connection. The session is recreated after a fork, because a child process must
+not share the parent's sockets.
+
+Configuration through environment variables:
+    HTTP_POOL_CONNECTIONS         Hosts with a cached connection pool (default: 10)
+    HTTP_POOL_MAXSIZE             Connections kept open per host, sized for concurrent callers (default: 20)
+    HTTP_CONNECT_TIMEOUT_SECONDS  TCP/TLS connect timeout (default: 10)
+    ONET_API_TIMEOUT_SECONDS      Read timeout of O*NET web service calls (default: 30)
+"""
+import os
+import threading
+from typing import Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+
+_session: Optional[requests.Session] = None
+_session_pid: Optional[int] = None
+_lock = threading.Lock()
+
+
+def get_connect_timeout() -> float:
+    """Connect timeout in seconds for external HTTP calls."""
+    return float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "10"))
+
+
+def get_onet_api_timeout() -> Tuple[float, float]:
+    """(connect, read) timeout for O*NET web service calls."""
+    return get_connect_timeout(), float(os.getenv("ONET_API_TIMEOUT_SECONDS", "30"))
+
+
+def create_http_session() -> requests.Session:
+    """Create a requests.Session whose connection pools are sized from the environment."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=int(os.getenv("HTTP_POOL_CONNECTIONS", "10")),
+        pool_maxsize=int(os.getenv("HTTP_POOL_MAXSIZE", "20"))
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_http_session() -> requests.Session:
+    """Return this process's shared pooled session, creating it on first use (and after a fork)."""
+    global _session, _session_pid
+    with _lock:
+        if _session is None or _session_pid != os.getpid():
+            _session = create_http_session()
+            _session_pid = os.getpid()
+        return _session
+
+
+def close_http_session() -> None:
+    """Close the shared session and its pooled connections. The next get_http_session call opens a new one."""
+    global _session, _session_pid
+    with _lock:
+        session, _session, _session_pid = _session, None, None
+    if session is not None:
+        session.close()
+
+
+if __name__ == "__main__":
+    print("Minimalistic happy path example for the shared HTTP session:")
+
+    session = get_http_session()
+    print(f"\n  Same session on second call: {get_http_session() is session}")
+    close_http_session()
+    print("\nExample finished.")
@@ -0,0 +1,103 @@
+"""
+Incremental parser that yields the items of one JSON array while the surrounding document is still
+being received.
+
+Used by the streaming Gemini request to hand out each "assessed_skills" / "skill_gaps" item as soon
+as its closing brace arrives, instead of waiting for the whole reply. The complete reply is still
+parsed (with the usual repair strategies) once the stream ends; this parser only makes items
+available earlier and skips any item it cannot decode.
+"""
+import json
+import re
+from typing import Any, Dict, List
+
+
+class IncrementalJsonArrayParser:
+    """
+    Collects text chunks and returns the objects of the first array stored under `array_key`,
+    each as soon as it is complete.
+
+    Args:
+        array_key (str): Name of the array member whose items are returned (e.g. "skill_gaps").
+    """
+
+    def __init__(self, array_key: str):
+        self.array_key = array_key
+        self._key_pattern = re.compile(r'"' + re.escape(array_key) + r'"\s*:\s*\[')
+        self._buffer = ""
+        self._position = None  # Scan position inside the array, None until the array has started
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._item_start = None
+        self.finished = False
+        self.items_parsed = 0
+        self.items_skipped = 0
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Add a chunk of text and return the array items completed by it, in order."""
+        self._buffer += chunk
+        if self.finished:
+            return []
+
+        if self._position is None:
+            match = self._key_pattern.search(self._buffer)
+            if match is None:
+                return []
+            self._position = match.end()
+
+        items = []
+        buffer = self._buffer
+        position = self._position
+        while position < len(buffer):
+            char = buffer[position]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                if self._depth == 0:
+                    self._item_start = position
+                self._depth += 1
+            elif char in "}]":
+                if self._depth == 0:
+                    # The closing bracket of the array itself
+                    self.finished = True
+                    break
+                self._depth -= 1
+                if self._depth == 0:
+                    self._append_item(buffer[self._item_start:position + 1], items)
+                    self._item_start = None
+            position += 1
+
+        self._position = position
+        return items
+
+    def _append_item(self, item_text: str, items: List[Dict[str, Any]]) -> None:
+        try:
+            item = json.loads(item_text)
+        except json.JSONDecodeError:
+            self.items_skipped += 1
+            return
+        if isinstance(item, dict):
+            self.items_parsed += 1
+            items.append(item)
+        else:
+            self.items_skipped += 1
+
+
+if __name__ == "__main__":
+    print("Minimalistic happy path example for IncrementalJsonArrayParser:")
+
+    parser = IncrementalJsonArrayParser("skill_gaps")
+    text = '{"skill_gap_analysis": {"skill_gaps": [{"skill_name": "Programming"}, {"skill_name": "Writing"}]}}'
+    for start in range(0, len(text), 20):
+        for item in parser.feed(text[start:start + 20]):
+            print(f"\n  Item complete after {start + 20} characters: {item}")
+    print(f"  Finished: {parser.finished}")
+    print("\nExample finished.")
@@ -0,0 +1,297 @@
+"""
+Non-blocking sink for debug copies of LLM prompts and replies.
+
+gemini_llm_request hands every reply to the process-wide sink with submit(), which only samples the
+record and puts it on a bounded in-memory queue. A background thread writes the queue out, so the
+request path never touches the file system. Records that do not fit in a full queue are dropped
+and counted rather than slowing the caller down.
+
+The default "jsonl" sink writes one JSON object per line into gzip-compressed segments
+(llm_debug_<timestamp>_<pid>_<sequence>.jsonl.gz). A segment is closed and a new one started once it
+holds LLM_DEBUG_SEGMENT_MAX_BYTES of uncompressed JSON, and the oldest segments are deleted while the
+directory holds more than LLM_DEBUG_MAX_TOTAL_BYTES. Other sinks can be installed with
+set_llm_debug_sink() (anything with submit/flush/close/stats), or the "none" sink turns debug copies off.
+
+Configuration through environment variables:
+    LLM_DEBUG_SINK                Sink type: "jsonl" or "none" (default: jsonl)
+    LLM_DEBUG_DIR                 Directory of the JSONL segments (default: llm_debug_responses)
+    LLM_DEBUG_SAMPLE_RATE         Fraction of replies recorded, 0 to 1 (default: 1)
+    LLM_DEBUG_SEGMENT_MAX_BYTES   Uncompressed bytes per segment before rotating (default: 16777216)
+    LLM_DEBUG_MAX_TOTAL_BYTES     Compressed bytes kept on disk, oldest segments deleted first (default: 268435456)
+    LLM_DEBUG_QUEUE_SIZE          Records waiting to be written before new ones are dropped (default: 1000)
+"""
+import os
+import gzip
+import json
+import queue
+import random
+import logging
+import threading
+import zlib
+from datetime import datetime, UTC
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_PREFIX = "llm_debug_"
+SEGMENT_SUFFIX = ".jsonl.gz"
+
+_sink = None
+_sink_pid: Optional[int] = None
+_lock = threading.Lock()
+
+
+class NullDebugSink:
+    """Sink that discards every record."""
+
+    def submit(self, record: Dict[str, Any]) -> bool:
+        return False
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {"sink": "none"}
+
+
+class JsonlGzipDebugSink:
+    """
+    Writes sampled records from a bounded queue to rotating gzip-compressed JSONL segments on a
+    background thread.
+
+    Args:
+        directory (str): Directory of the segments, created on the first write.
+        sample_rate (float): Fraction of submitted records that are kept.
+        segment_max_bytes (int): Uncompressed bytes written to a segment before a new one is started.
+        max_total_bytes (int): Compressed bytes of closed segments kept in the directory.
+        queue_size (int): Records waiting to be written before new ones are dropped.
+    """
+
+    def __init__(self, directory: str, sample_rate: float = 1.0, segment_max_bytes: int = 16 * 1024 * 1024,
+                 max_total_bytes: int = 256 * 1024 * 1024, queue_size: int = 1000):
+        self.directory = os.path.abspath(directory)
+        self.sample_rate = sample_rate
+        self.segment_max_bytes = segment_max_bytes
+        self.max_total_bytes = max_total_bytes
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._stats_lock = threading.Lock()
+        self._stats = {"submitted": 0, "sampled_out": 0, "dropped": 0, "rejected_closed": 0, "written": 0, "write_errors": 0,
+                       "segments_created": 0, "segments_deleted": 0}
+        self._segment = None
+        self._segment_path: Optional[str] = None
+        self._segment_bytes = 0
+        self._sequence = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="llm-debug-sink", daemon=True)
+        self._thread.start()
+
+    def submit(self, record: Dict[str, Any]) -> bool:
+        """Queue a record for writing (subject to sampling). Never blocks; returns whether it was queued."""
+        with self._stats_lock:
+            self._stats["submitted"] += 1
+            if self._closed:
+                self._stats["rejected_closed"] += 1
+                return False
+            if random.random() >= self.sample_rate:
+                self._stats["sampled_out"] += 1
+                return False
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            with self._stats_lock:
+                self._stats["dropped"] += 1
+            return False
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Wait until every queued record has been written and the open segment is flushed to disk (it stays open)."""
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return
+        done.wait(timeout)
+
+    def close(self) -> None:
+        """Write the remaining records, close the current segment and stop the writer thread."""
+        with self._stats_lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the configuration, queue size and record/segment counters."""
+        with self._stats_lock:
+            counters = dict(self._stats)
+        return {
+            "sink": "jsonl",
+            "directory": self.directory,
+            "sample_rate": self.sample_rate,
+            "segment_max_bytes": self.segment_max_bytes,
+            "max_total_bytes": self.max_total_bytes,
+            "queued": self._queue.qsize(),
+            "current_segment": self._segment_path,
+            **counters
+        }
+
+    def _run(self) -> None:
+        while True:
+            try:
+                item = self._queue.get(timeout=1.0)
+            except queue.Empty:
+                # Idle: push what was written so far to disk, so a crash loses at most a partial gzip trailer
+                self._sync_segment()
+                continue
+            if item is None:
+                self._close_segment()
+                return
+            if isinstance(item, threading.Event):
+                self._sync_segment()
+                item.set()
+                continue
+            try:
+                self._write(item)
+            except Exception as e:
+                with self._stats_lock:
+                    self._stats["write_errors"] += 1
+                logger.warning(f"Could not write LLM debug record: {e}")
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        line = (json.dumps(record, default=str) + "\n").encode("utf-8")
+        if self._segment is None:
+            self._open_segment()
+        self._segment.write(line)
+        self._segment_bytes += len(line)
+        with self._stats_lock:
+            self._stats["written"] += 1
+        if self._segment_bytes >= self.segment_max_bytes:
+            self._close_segment()
+            self._enforce_total_size()
+
+    def _open_segment(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        self._sequence += 1
+        timestamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%S")
+        self._segment_path = os.path.join(self.directory, f"{SEGMENT_PREFIX}{timestamp}_{os.getpid()}_{self._sequence:04d}{SEGMENT_SUFFIX}")
+        self._segment = gzip.open(self._segment_path, "wb")
+        self._segment_bytes = 0
+        with self._stats_lock:
+            self._stats["segments_created"] += 1
+
+    def _sync_segment(self) -> None:
+        if self._segment is not None:
+            try:
+                self._segment.flush(zlib.Z_SYNC_FLUSH)
+            except Exception as e:
+                logger.warning(f"Could not flush LLM debug segment: {e}")
+
+    def _close_segment(self) -> None:
+        if self._segment is not None:
+            try:
+                self._segment.close()
+            except Exception as e:
+                logger.warning(f"Could not close LLM debug segment: {e}")
+            self._segment = None
+            self._segment_path = None
+
+    def _enforce_total_size(self) -> None:
+        try:
+            segments = sorted(
+                (entry for entry in os.scandir(self.directory)
+                 if entry.name.startswith(SEGMENT_PREFIX) and entry.name.endswith(SEGMENT_SUFFIX)),
+                key=lambda entry: entry.stat().st_mtime
+            )
+            total = sum(entry.stat().st_size for entry in segments)
+            for entry in segments:
+                if total <= self.max_total_bytes:
+                    break
+                total -= entry.stat().st_size
+                os.remove(entry.path)
+                with self._stats_lock:
+                    self._stats["segments_deleted"] += 1
+        except OSError as e:
+            logger.warning(f"Could not enforce the LLM debug size cap: {e}")
+
+
+def create_llm_debug_sink():
+    """Build the sink configured by the LLM_DEBUG_* environment variables."""
+    sink_type = os.getenv("LLM_DEBUG_SINK", "jsonl").lower()
+    if sink_type == "none":
+        return NullDebugSink()
+    if sink_type != "jsonl":
+        logger.warning(f"Unknown LLM_DEBUG_SINK '{sink_type}', debug copies are disabled")
+        return NullDebugSink()
+    return JsonlGzipDebugSink(
+        directory=os.getenv("LLM_DEBUG_DIR", "llm_debug_responses"),
+        sample_rate=float(os.getenv("LLM_DEBUG_SAMPLE_RATE", "1")),
+        segment_max_bytes=int(os.getenv("LLM_DEBUG_SEGMENT_MAX_BYTES", str(16 * 1024 * 1024))),
+        max_total_bytes=int(os.getenv("LLM_DEBUG_MAX_TOTAL_BYTES", str(256 * 1024 * 1024))),
+        queue_size=int(os.getenv("LLM_DEBUG_QUEUE_SIZE", "1000"))
+    )
+
+
+def get_llm_debug_sink():
+    """
+    Return the process-wide debug sink, creating it on first use. A forked worker process gets its
+    own sink, since the parent's writer thread does not survive a fork.
+    """
+    global _sink, _sink_pid
+    with _lock:
+        if _sink is None or _sink_pid != os.getpid():
+            _sink = create_llm_debug_sink()
+            _sink_pid = os.getpid()
+        return _sink
+
+
+def set_llm_debug_sink(sink) -> None:
+    """Install a custom sink (any object with submit/flush/close/stats) for this process."""
+    global _sink, _sink_pid
+    with _lock:
+        previous = _sink if _sink_pid == os.getpid() else None
+        _sink, _sink_pid = sink, os.getpid()
+    if previous is not None and previous is not sink:
+        previous.close()
+
+
+def close_llm_debug_sink() -> None:
+    """Write out pending records and close the sink; the next get_llm_debug_sink() creates a new one."""
+    global _sink, _sink_pid
+    with _lock:
+        sink = _sink if _sink_pid == os.getpid() else None
+        _sink, _sink_pid = None, None
+    if sink is not None:
+        sink.close()
+
+
+def get_llm_debug_sink_metrics() -> Dict[str, Any]:
+    """
+    Return the configuration and counters of this process's debug sink.
+
+    Returns:
+        dict: {"success": bool, "message": str, "result": sink.stats()}
+    """
+    return {
+        "success": True,
+        "message": "LLM debug sink metrics retrieved",
+        "result": get_llm_debug_sink().stats()
+    }
+
+
+if __name__ == "__main__":
+    print("Minimalistic happy path example for the LLM debug sink:")
+
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as example_dir:
+        sink = JsonlGzipDebugSink(example_dir, segment_max_bytes=200)
+        for position in range(3):
+            sink.submit({"request_id": f"example-{position}", "prompt": "Assess these skills", "response_text": "{}"})
+        sink.close()
+        print(f"\n  Segments: {sorted(os.listdir(example_dir))}")
+        print(f"  Stats: {sink.stats()}")
+    print("\nExample finished.")
@@ -0,0 +1,139 @@
+"""
+Prompt template selection, input token budget and prompt size counters for the LLM prompts.
+
+The prompt generators render either the "full" template (long instruction blocks and an annotated
+JSON example) or the "compact" one (one-line instructions and the bare reply shape; with structured
+output on, Gemini enforces the reply schema anyway). Each generator reports the estimated input
+tokens of its prompt. Skill proficiency work whose prompt would exceed LLM_PROMPT_MAX_INPUT_TOKENS
+is split: batches take fewer occupations, and a single occupation's skills are assessed in several
+requests (see split_occupation_to_prompt_budget in batch_skill_proficiency_request).
+
+gemini_llm_request counts the estimated input tokens of every prompt it sends, per reply type.
+
+Configuration through environment variables:
+    LLM_PROMPT_TEMPLATE           Prompt template: "full" or "compact" (default: full)
+    LLM_PROMPT_MAX_INPUT_TOKENS   Estimated input token budget of one proficiency prompt (default: 4000)
+"""
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+PROMPT_TEMPLATES = ("full", "compact")
+
+T = TypeVar("T")
+
+_prompt_stats: Dict[str, Dict[str, int]] = {}
+_lock = threading.Lock()
+
+
+def get_prompt_template(template: Optional[str] = None) -> str:
+    """Resolve a template name, defaulting to LLM_PROMPT_TEMPLATE; unknown names fall back to "full"."""
+    template = (template or os.getenv("LLM_PROMPT_TEMPLATE", "full")).lower()
+    return template if template in PROMPT_TEMPLATES else "full"
+
+
+def get_prompt_max_input_tokens() -> int:
+    """Estimated input token budget of one skill proficiency prompt."""
+    return int(os.getenv("LLM_PROMPT_MAX_INPUT_TOKENS", "4000"))
+
+
+def split_to_token_budget(
+    items: List[T],
+    item_tokens: Callable[[T], int],
+    overhead_tokens: int,
+    max_tokens: int
+) -> List[List[T]]:
+    """
+    Split items, in order, into chunks whose overhead_tokens plus item tokens stay within max_tokens.
+    An item that exceeds the budget on its own gets a chunk of its own; an empty list gives one empty chunk.
+    """
+    chunks, current_chunk, current_tokens = [], [], overhead_tokens
+    for item in items:
+        tokens = item_tokens(item)
+        if current_chunk and current_tokens + tokens > max_tokens:
+            chunks.append(current_chunk)
+            current_chunk, current_tokens = [], overhead_tokens
+        current_chunk.append(item)
+        current_tokens += tokens
+    if current_chunk or not chunks:
+        chunks.append(current_chunk)
+    return chunks
+
+
+def record_prompt_tokens(expected_response_type: str, estimated_tokens: int) -> None:
+    """Count one prompt sent to the LLM with its estimated input tokens."""
+    with _lock:
+        stats = _prompt_stats.setdefault(expected_response_type, {"prompts": 0, "estimated_input_tokens": 0, "max_input_tokens": 0})
+        stats["prompts"] += 1
+        stats["estimated_input_tokens"] += estimated_tokens
+        stats["max_input_tokens"] = max(stats["max_input_tokens"], estimated_tokens)
+
+
+def record_prompt_split(expected_response_type: str) -> None:
+    """Count one unit of work split into several prompts to stay within the input budget."""
+    with _lock:
+        stats = _prompt_stats.setdefault(expected_response_type, {"prompts": 0, "estimated_input_tokens": 0, "max_input_tokens": 0})
+        stats["splits"] = stats.get("splits", 0) + 1
+
+
+def reset_llm_prompt_metrics() -> None:
+    """Reset the prompt counters (used by tests)."""
+    with _lock:
+        _prompt_stats.clear()
+
+
+def get_llm_prompt_metrics() -> Dict[str, Any]:
+    """
+    Return the prompt template configuration and the estimated input tokens of the prompts sent in this process.
+
+    Returns:
+        dict: {
+            "success": bool,
+            "message": str,
+            "result": {
+                "template": str,
+                "max_input_tokens": int,
+                "by_response_type": {
+                    expected_response_type: {
+                        "prompts": int,
+                        "estimated_input_tokens": int,       # Sum over all prompts
+                        "average_input_tokens": float,
+                        "max_input_tokens": int,
+                        "splits": int                        # Work split into several prompts
+                    }
+                }
+            }
+        }
+    """
+    with _lock:
+        by_response_type = {
+            response_type: {
+                "prompts": stats["prompts"],
+                "estimated_input_tokens": stats["estimated_input_tokens"],
+                "average_input_tokens": round(stats["estimated_input_tokens"] / stats["prompts"], 1) if stats["prompts"] else 0.0,
+                "max_input_tokens": stats["max_input_tokens"],
+                "splits": stats.get("splits", 0)
+            }
+            for response_type, stats in _prompt_stats.items()
+        }
+    return {
+        "success": True,
+        "message": "LLM prompt metrics retrieved",
+        "result": {
+            "template": get_prompt_template(),
+            "max_input_tokens": get_prompt_max_input_tokens(),
+            "by_response_type": by_response_type
+        }
+    }
+
+
+if __name__ == "__main__":
+    print("Minimalistic happy path example for the LLM prompt budget:")
+
+    example_skills = ["Reading Comprehension", "Active Listening", "Writing", "Speaking", "Mathematics"]
+    chunks = split_to_token_budget(example_skills, lambda skill_name: len(skill_name) // 4 + 1, overhead_tokens=10, max_tokens=20)
+    print(f"\n  Template: {get_prompt_template()}")
+    print(f"  Skill chunks within 20 tokens: {chunks}")
+    record_prompt_tokens("skill_proficiency", 180)
+    print(f"  Metrics: {get_llm_prompt_metrics()['result']}")
+    print("\nExample finished.")
@@ -0,0 +1,104 @@
+"""
+Configuration and in-process memory tiers for the LLM response caches.
+
+Both caches have two tiers: a TTL/LRU memory tier in this process and a MySQL tier.
+- Skill proficiency assessments are looked up in the LLM_Skill_Proficiency_Requests/Replies tables
+  by (occupation, model, prompt template hash, skill set hash). See cached_skill_proficiency_request.
+- Skill gap analyses are looked up in LLM_Skill_Gap_Analysis_Cache by a hash of the model, the
+  prompt template and both assessed skill profiles. See cached_skill_gap_analysis_request.
+
+Configuration through environment variables:
+    LLM_PROFICIENCY_CACHE_ENABLED        Serve repeated proficiency assessments from the cache (default: true)
+    LLM_PROFICIENCY_CACHE_TTL_SECONDS    Maximum age of a reused assessment (default: 604800, one week)
+    LLM_PROFICIENCY_CACHE_SIZE           Entries kept in the memory tier (default: 512)
+    LLM_GAP_ANALYSIS_CACHE_ENABLED       Serve repeated gap analyses from the cache (default: true)
+    LLM_GAP_ANALYSIS_CACHE_TTL_SECONDS   Maximum age of a reused gap analysis (default: 604800, one week)
+    LLM_GAP_ANALYSIS_CACHE_SIZE          Entries kept in the memory tier (default: 1024)
+"""
+import os
+import threading
+from typing import Any, Dict, Optional
+
+from src.config.ttl_lru_cache import TTLLRUCache
+
+_proficiency_memory_cache: Optional[TTLLRUCache] = None
+_gap_analysis_memory_cache: Optional[TTLLRUCache] = None
+_lock = threading.Lock()
+
+
+def is_proficiency_cache_enabled() -> bool:
+    """Whether skill proficiency assessments are read from and written to the cache."""
+    return os.getenv("LLM_PROFICIENCY_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+
+
+def get_proficiency_cache_ttl() -> float:
+    """Maximum age in seconds of a cached skill proficiency assessment."""
+    return float(os.getenv("LLM_PROFICIENCY_CACHE_TTL_SECONDS", "604800"))
+
+
+def get_proficiency_memory_cache() -> TTLLRUCache:
+    """Return the process-wide memory tier for skill proficiency assessments, creating it on first use."""
+    global _proficiency_memory_cache
+    with _lock:
+        if _proficiency_memory_cache is None:
+            _proficiency_memory_cache = TTLLRUCache(
+                maxsize=int(os.getenv("LLM_PROFICIENCY_CACHE_SIZE", "512")),
+                ttl_seconds=get_proficiency_cache_ttl()
+            )
+        return _proficiency_memory_cache
+
+
+def is_gap_analysis_cache_enabled() -> bool:
+    """Whether skill gap analyses are read from and written to the cache."""
+    return os.getenv("LLM_GAP_ANALYSIS_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+
+
+def get_gap_analysis_cache_ttl() -> float:
+    """Maximum age in seconds of a cached skill gap analysis."""
+    return float(os.getenv("LLM_GAP_ANALYSIS_CACHE_TTL_SECONDS", "604800"))
+
+
+def get_gap_analysis_memory_cache() -> TTLLRUCache:
+    """Return the process-wide memory tier for skill gap analyses, creating it on first use."""
+    global _gap_analysis_memory_cache
+    with _lock:
+        if _gap_analysis_memory_cache is None:
+            _gap_analysis_memory_cache = TTLLRUCache(
+                maxsize=int(os.getenv("LLM_GAP_ANALYSIS_CACHE_SIZE", "1024")),
+                ttl_seconds=get_gap_analysis_cache_ttl()
+            )
+        return _gap_analysis_memory_cache
+
+
+def clear_llm_response_caches() -> None:
+    """Drop the memory tiers, so the next lookup re-reads the configuration and the database."""
+    global _proficiency_memory_cache, _gap_analysis_memory_cache
+    with _lock:
+        _proficiency_memory_cache = None
+        _gap_analysis_memory_cache = None
+
+
+def get_llm_response_cache_status() -> Dict[str, Any]:
+    """
+    Report whether the LLM response caches are enabled and the memory tier counters.
+
+    Returns:
+        dict: {"success": bool, "message": str, "result": {"skill_proficiency": {...}, "skill_gap_analysis": {...}}},
+              each with "enabled", "maxsize", "ttl_seconds", "size", "hits", "misses", "evictions"
+    """
+    return {
+        "success": True,
+        "message": "LLM response cache status retrieved",
+        "result": {
+            "skill_proficiency": {"enabled": is_proficiency_cache_enabled(), **get_proficiency_memory_cache().stats()},
+            "skill_gap_analysis": {"enabled": is_gap_analysis_cache_enabled(), **get_gap_analysis_memory_cache().stats()}
+        }
+    }
+
+
+if __name__ == "__main__":
+    print("Minimalistic happy path example for the LLM response cache configuration:")
+    get_proficiency_memory_cache().set(("11-1011.00", "gemini-2.0-flash", "template", "skills"), {"reply_data": []})
+    print(f"\n  Status: {get_llm_response_cache_status()['result']}")
+    clear_llm_response_caches()
+    print("\nExample finished.")
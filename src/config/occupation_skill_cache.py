@@ -0,0 +1,207 @@
+"""
+Process-wide read-through cache of the occupation/skill matrix for the API.
+
+The matrix (see load_occupation_skill_matrix) is loaded once in the FastAPI lifespan and used by
+get_occupations_and_skills, so skill gap requests are answered without any database round trip.
+Staleness is detected through the 'occupation_skills' stamp in Dataset_Versions, which the
+transform node writes after rebuilding Occupation_Skills. The stamp is re-checked at most once per
+check interval; when it changes the matrix is reloaded. If the load at startup failed (e.g. MySQL not
+ready yet, or no ETL run so far), it is retried at the same interval until it succeeds.
+
+Configuration through environment variables:
+    OCCUPATION_SKILL_CACHE_ENABLED        Load the cache at API startup (default: true)
+    OCCUPATION_SKILL_CACHE_CHECK_SECONDS  Seconds between dataset version checks (default: 30)
+"""
+import os
+import time
+import logging
+import threading
+from decimal import Decimal
+from typing import Dict, Any, List, Optional
+import numpy as np
+from sqlalchemy.engine import Engine
+
+from src.functions.load_occupation_skill_matrix import load_occupation_skill_matrix
+from src.functions.get_dataset_version import get_dataset_version
+
+logger = logging.getLogger(__name__)
+
+_matrix: Optional[Dict[str, Any]] = None
+_engine: Optional[Engine] = None
+_last_version_check = 0.0
+_cache_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "reloads": 0}
+
+
+def is_cache_enabled() -> bool:
+    """Whether the API should load the occupation/skill cache at startup."""
+    return os.getenv("OCCUPATION_SKILL_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+
+
+def _check_interval() -> float:
+    return float(os.getenv("OCCUPATION_SKILL_CACHE_CHECK_SECONDS", "30"))
+
+
+def init_occupation_skill_cache(engine: Engine) -> Dict[str, Any]:
+    """
+    Load the occupation/skill matrix and keep it for the lifetime of the process.
+
+    Args:
+        engine (Engine): Engine used for the initial load and for later version checks.
+
+    Returns:
+        dict: The load_occupation_skill_matrix response (the matrix itself is not echoed back).
+    """
+    global _matrix, _engine, _last_version_check
+    load_result = load_occupation_skill_matrix(engine=engine)
+    with _cache_lock:
+        _engine = engine
+        _last_version_check = time.monotonic()
+        if load_result["success"]:
+            _matrix = load_result["result"]
+            _stats["reloads"] += 1
+            logger.info(load_result["message"])
+        else:
+            logger.warning(f"Occupation skill cache not loaded, requests will use the database: {load_result['message']}")
+    return {"success": load_result["success"], "message": load_result["message"], "result": {}}
+
+
+def clear_occupation_skill_cache() -> None:
+    """Drop the cached matrix. Called on API shutdown."""
+    global _matrix, _engine
+    with _cache_lock:
+        _matrix = None
+        _engine = None
+
+
+def _refresh_if_stale() -> None:
+    global _matrix, _last_version_check
+    with _cache_lock:
+        if _engine is None or time.monotonic() - _last_version_check < _check_interval():
+            return
+        _last_version_check = time.monotonic()
+        engine = _engine
+        cached_version = _matrix["version"] if _matrix is not None else None
+        retry_initial_load = _matrix is None
+
+    if retry_initial_load:
+        load_result = load_occupation_skill_matrix(engine=engine)
+        if load_result["success"]:
+            with _cache_lock:
+                if _engine is engine:
+                    _matrix = load_result["result"]
+                    _stats["reloads"] += 1
+            logger.info(f"Occupation skill cache loaded after startup: {load_result['message']}")
+        else:
+            logger.warning(f"Occupation skill cache still not loaded, requests will use the database: {load_result['message']}")
+        return
+
+    version_result = get_dataset_version('occupation_skills', engine=engine)
+    if not version_result["success"] or version_result["result"]["version"] == cached_version:
+        return
+
+    logger.info(f"Dataset version changed from {cached_version} to {version_result['result']['version']}, reloading cache")
+    load_result = load_occupation_skill_matrix(engine=engine)
+    if load_result["success"]:
+        with _cache_lock:
+            _matrix = load_result["result"]
+            _stats["reloads"] += 1
+    else:
+        # Serving stale data is safer than serving nothing; the next check retries the reload
+        logger.warning(f"Occupation skill cache reload failed: {load_result['message']}")
+
+
+def get_occupation_skill_matrix() -> Optional[Dict[str, Any]]:
+    """Return the current matrix (after a version check if one is due), or None if the cache is not loaded."""
+    _refresh_if_stale()
+    return _matrix
+
+
+def _listed_columns(matrix: Dict[str, Any], row: int) -> np.ndarray:
+    """Columns of the skills listed for an occupation, in the occupation's original skill order."""
+    columns = np.flatnonzero(~np.isnan(matrix["proficiency"][row]))
+    return columns[np.argsort(matrix["skill_position"][row, columns], kind="stable")]
+
+
+def get_cached_occupations(occupation_codes: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Look up occupations in the cache. Only occupations with at least one skill are returned,
+    so callers can fall back to the database/API path for everything else.
+
+    Args:
+        occupation_codes (List[str]): O*NET SOC codes to look up.
+
+    Returns:
+        dict: {occupation_code: {"onet_id", "name", "skills": [{"skill_element_id", "skill_name", "proficiency_level"}]}}
+              in the same shape as get_occupation_and_skills' occupation_data.
+    """
+    matrix = get_occupation_skill_matrix()
+    if matrix is None:
+        return {}
+
+    found = {}
+    for code in occupation_codes:
+        row = matrix["occupation_index"].get(code)
+        levels = matrix["proficiency"][row] if row is not None else None
+        if levels is None or np.isnan(levels).all():
+            continue
+        found[code] = {
+            "onet_id": code,
+            "name": matrix["occupation_titles"][row],
+            "skills": [
+                {
+                    "skill_element_id": matrix["element_ids"][column],
+                    "skill_name": matrix["element_names"][column],
+                    # Same DECIMAL(5,2) value the database would return
+                    "proficiency_level": Decimal(f"{levels[column]:.2f}")
+                }
+                for column in _listed_columns(matrix, row)
+            ]
+        }
+
+    with _cache_lock:
+        _stats["hits"] += len(found)
+        _stats["misses"] += len(occupation_codes) - len(found)
+    return found
+
+
+def get_occupation_skill_cache_status() -> Dict[str, Any]:
+    """
+    Report whether the cache is loaded, its dataset version, size and hit/miss counters.
+
+    Returns:
+        dict: {"success": bool, "message": str, "result": {"loaded", "version", "occupations", "skills", "hits", "misses", "reloads"}}
+    """
+    with _cache_lock:
+        matrix = _matrix
+        stats = dict(_stats)
+    if matrix is None:
+        return {"success": False, "message": "Occupation skill cache is not loaded", "result": {"loaded": False, **stats}}
+    return {
+        "success": True,
+        "message": "Occupation skill cache is loaded",
+        "result": {
+            "loaded": True,
+            "version": matrix["version"],
+            "occupations": len(matrix["occupation_codes"]),
+            "skills": len(matrix["element_ids"]),
+            **stats
+        }
+    }
+
+
+if __name__ == "__main__":
+    print("Minimalistic happy path example for the occupation skill cache:")
+    print("This example assumes a populated database with O*NET data and configured environment variables.")
+
+    from src.config.schemas import get_sqlalchemy_engine
+
+    init_result = init_occupation_skill_cache(get_sqlalchemy_engine())
+    print(f"\n  Init: {init_result['message']}")
+    cached = get_cached_occupations(["11-1011.00"])
+    for code, occupation in cached.items():
+        print(f"  {code}: {occupation['name']} ({len(occupation['skills'])} skills)")
+    print(f"  Status: {get_occupation_skill_cache_status()['result']}")
+
+    clear_occupation_skill_cache()
+    print("\nExample finished.")
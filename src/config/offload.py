@@ -0,0 +1,88 @@
+"""
+Bounded worker-thread offload for blocking calls made from async API handlers.
+
+The skill gap functions use blocking SQLAlchemy (mysql-connector) and `requests` (O*NET API, Gemini).
+Calling them directly inside `async def` routes blocks the event loop for every client. Routes
+therefore run them through `run_db` / `run_llm`, which execute the call in a worker thread.
+
+Database work and LLM work get separate capacity limiters. Slow LLM calls can then only occupy
+the LLM slots, and never starve the fast database-backed endpoints.
+
+Configuration through environment variables:
+    API_DB_THREADS   Concurrent blocking database calls (default: MYSQL_POOL_SIZE + MYSQL_MAX_OVERFLOW)
+    API_LLM_THREADS  Concurrent blocking LLM calls (default: 8)
+"""
+import os
+import functools
+from typing import Any, Callable, Dict, Optional
+import anyio
+import anyio.to_thread
+
+from src.config.engine_registry import get_pool_settings
+
+_limiters: Dict[str, anyio.CapacityLimiter] = {}
+
+
+def get_limiter_sizes() -> Dict[str, int]:
+    """Read the worker thread limits from environment variables."""
+    pool_settings = get_pool_settings()
+    return {
+        "db": int(os.getenv("API_DB_THREADS", str(pool_settings["pool_size"] + pool_settings["max_overflow"]))),
+        "llm": int(os.getenv("API_LLM_THREADS", "8")),
+    }
+
+
+def _get_limiter(kind: str) -> anyio.CapacityLimiter:
+    # Created lazily: a CapacityLimiter has to be created while an event loop is running
+    limiter: Optional[anyio.CapacityLimiter] = _limiters.get(kind)
+    if limiter is None:
+        limiter = anyio.CapacityLimiter(get_limiter_sizes()[kind])
+        _limiters[kind] = limiter
+    return limiter
+
+
+async def run_db(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a blocking database-bound call in a worker thread, limited to API_DB_THREADS at a time."""
+    return await anyio.to_thread.run_sync(functools.partial(func, *args, **kwargs), limiter=_get_limiter("db"))
+
+
+async def run_llm(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a blocking LLM-bound call in a worker thread, limited to API_LLM_THREADS at a time."""
+    return await anyio.to_thread.run_sync(functools.partial(func, *args, **kwargs), limiter=_get_limiter("llm"))
+
+
+def get_offload_metrics() -> Dict[str, Any]:
+    """
+    Return the configured limits and current usage of the worker thread limiters.
+
+    Returns:
+        dict: {"success": bool, "message": str, "result": {"db": {...}, "llm": {...}}}
+    """
+    sizes = get_limiter_sizes()
+    result = {}
+    for kind, size in sizes.items():
+        limiter = _limiters.get(kind)
+        result[kind] = {
+            "total_tokens": limiter.total_tokens if limiter else size,
+            "borrowed_tokens": limiter.borrowed_tokens if limiter else 0,
+            "waiting": limiter.statistics().tasks_waiting if limiter else 0,
+        }
+    return {"success": True, "message": "Worker thread limiter metrics retrieved", "result": result}
+
+
+if __name__ == "__main__":
+    print("Minimalistic happy path example for the blocking call offload:")
+
+    import time
+
+    async def example():
+        started = time.perf_counter()
+        async with anyio.create_task_group() as task_group:
+            for _ in range(3):
+                task_group.start_soon(run_llm, time.sleep, 0.2)
+            task_group.start_soon(run_db, time.sleep, 0.2)
+        print(f"\n  Four 0.2s blocking calls finished in {time.perf_counter() - started:.2f}s")
+        print(f"  Metrics: {get_offload_metrics()['result']}")
+
+    anyio.run(example)
+    print("\nExample finished.")
@@ -0,0 +1,160 @@
+"""
+Thread-safe client-side limiters used to keep LLM calls under the provider's quota:
+- TokenBucket: average rate limit with bursts (requests or tokens per second)
+- AdaptiveConcurrencyLimiter: AIMD concurrency limit that shrinks when the provider signals overload
+"""
+import time
+import threading
+from typing import Any, Dict
+
+
+class TokenBucket:
+    """
+    Allows `rate_per_second` acquisitions per second on average, with bursts of up to `capacity`.
+
+    Args:
+        rate_per_second (float): Refill rate in tokens per second. 0 or less disables limiting.
+        capacity (float): Maximum tokens held, i.e. the largest burst. Defaults to one second of tokens (at least 1).
+    """
+
+    def __init__(self, rate_per_second: float, capacity: float = None):
+        self.rate_per_second = rate_per_second
+        self.capacity = capacity if capacity is not None else max(1.0, rate_per_second)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._stats = {"acquired": 0, "waited_seconds_total": 0.0}
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_second)
+        self._updated = now
+
+    def acquire(self, amount: float = 1) -> float:
+        """
+        Block until `amount` tokens are available and take them. Returns the seconds spent waiting.
+        An amount larger than the capacity waits for a full bucket and leaves it in debt.
+        """
+        if self.rate_per_second <= 0:
+            with self._lock:
+                self._stats["acquired"] += amount
+            return 0.0
+        required = min(amount, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= required:
+                    self._tokens -= amount
+                    self._stats["acquired"] += amount
+                    self._stats["waited_seconds_total"] += waited
+                    return waited
+                sleep_for = (required - self._tokens) / self.rate_per_second
+            time.sleep(sleep_for)
+            waited += sleep_for
+
+    def debit(self, amount: float) -> None:
+        """Take `amount` tokens without waiting, e.g. to settle the difference between an estimate and actual usage."""
+        if self.rate_per_second <= 0:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= amount
+            self._stats["acquired"] += amount
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the configured rate and acquisition counters."""
+        with self._lock:
+            return {"rate_per_second": self.rate_per_second, "capacity": self.capacity, **self._stats}
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Concurrency limit adjusted with AIMD (additive increase, multiplicative decrease).
+
+    Each successful call raises the limit by 1/limit, i.e. by about one per round of `limit` calls.
+    A call that ends in an overload signal (e.g. HTTP 429/503) multiplies the limit by
+    decrease_factor. Overloads within decrease_cooldown_seconds of the last decrease are counted but
+    do not shrink the limit again, so one burst of rejected in-flight calls counts as a single event.
+
+    Args:
+        max_limit (int): Upper bound and initial value of the limit.
+        min_limit (int): Lower bound of the limit. Defaults to 1.
+        decrease_factor (float): Multiplier applied on overload. Defaults to 0.5.
+        decrease_cooldown_seconds (float): Minimum time between two decreases. Defaults to 1.
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1, decrease_factor: float = 0.5, decrease_cooldown_seconds: float = 1.0):
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.decrease_factor = decrease_factor
+        self.decrease_cooldown_seconds = decrease_cooldown_seconds
+        self._limit = float(self.max_limit)
+        self._in_flight = 0
+        self._last_decrease = float("-inf")
+        self._condition = threading.Condition()
+        self._stats = {"acquired": 0, "overloads": 0, "decreases": 0, "waited_seconds_total": 0.0}
+
+    @property
+    def limit(self) -> int:
+        """Current number of calls allowed in flight."""
+        return int(self._limit)
+
+    def acquire(self) -> float:
+        """Block until a slot is free and take it. Returns the seconds spent waiting."""
+        started = time.monotonic()
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                self._condition.wait()
+            self._in_flight += 1
+            waited = time.monotonic() - started
+            self._stats["acquired"] += 1
+            self._stats["waited_seconds_total"] += waited
+            return waited
+
+    def release(self, overloaded: bool = False) -> None:
+        """Free a slot and adjust the limit from the call's outcome."""
+        with self._condition:
+            self._in_flight -= 1
+            now = time.monotonic()
+            if overloaded:
+                self._stats["overloads"] += 1
+                if now - self._last_decrease >= self.decrease_cooldown_seconds:
+                    self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+                    self._last_decrease = now
+                    self._stats["decreases"] += 1
+            else:
+                self._limit = min(float(self.max_limit), self._limit + 1 / self._limit)
+            self._condition.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the current limit, calls in flight and adjustment counters."""
+        with self._condition:
+            return {
+                "limit": int(self._limit),
+                "min_limit": self.min_limit,
+                "max_limit": self.max_limit,
+                "in_flight": self._in_flight,
+                **self._stats
+            }
+
+
+if __name__ == "__main__":
+    print("Minimalistic happy path example for TokenBucket:")
+
+    bucket = TokenBucket(rate_per_second=5, capacity=1)
+    started = time.perf_counter()
+    for _ in range(6):
+        bucket.acquire()
+    print(f"\n  6 acquisitions at 5/s took {time.perf_counter() - started:.2f}s")
+    print(f"  Stats: {bucket.stats()}")
+
+    concurrency = AdaptiveConcurrencyLimiter(max_limit=8, decrease_cooldown_seconds=0)
+    concurrency.acquire()
+    concurrency.release(overloaded=True)
+    print(f"\n  Concurrency limit after one overload: {concurrency.limit}")
+    for _ in range(8):
+        concurrency.acquire()
+        concurrency.release()
+    print(f"  Concurrency limit after 8 successes: {concurrency.limit}")
+    print("\nExample finished.")
@@ -1,6 +1,6 @@
 import os
 from typing import Dict
-from sqlalchemy import create_engine, Column, String, Text, Integer, DECIMAL, Date, DateTime, ForeignKey, PrimaryKeyConstraint, CHAR, UniqueConstraint
+from sqlalchemy import create_engine, Column, String, Text, Integer, DECIMAL, Date, DateTime, ForeignKey, PrimaryKeyConstraint, CHAR, UniqueConstraint, Index
 from sqlalchemy.orm import relationship, declarative_base
 
 Base = declarative_base()
@@ -155,6 +155,27 @@ class Occupation_Skills(Base):
         {"mysql_engine": "InnoDB", "mysql_charset": "utf8mb4", "mysql_collate": "utf8mb4_0900_ai_ci"}
     )
 
+class Occupation_Gap_Summary(Base):
+    """
+    Precomputed LV skill gap summary for every (from, to) occupation pair, using the same gap rule
+    as get_skills_gap_by_lvl. Materialized by the optional gap summary stage of the transform node.
+    """
+    __tablename__ = 'occupation_gap_summary'
+
+    from_onet_soc_code = Column(String(20), nullable=False)
+    to_onet_soc_code = Column(String(20), nullable=False)
+    gap_count = Column(Integer, nullable=False)
+    total_gap = Column(DECIMAL(7, 2), nullable=False)  # Sum of positive level differences
+    max_gap = Column(DECIMAL(5, 2), nullable=False)  # Largest single level difference
+    last_updated = Column(Date, nullable=False)
+
+    __table_args__ = (
+        PrimaryKeyConstraint('from_onet_soc_code', 'to_onet_soc_code', name='pk_occupation_gap_summary'),
+        Index('ix_gap_summary_from_total_gap', 'from_onet_soc_code', 'total_gap'),
+        Index('ix_gap_summary_from_gap_count', 'from_onet_soc_code', 'gap_count'),
+        {"mysql_engine": "InnoDB", "mysql_charset": "utf8mb4", "mysql_collate": "utf8mb4_0900_ai_ci"}
+    )
+
 class LLM_Skill_Proficiency_Requests(Base):
     __tablename__ = 'llm_skill_proficiency_requests'
     request_id = Column(String(36), index=True, nullable=False)
@@ -163,9 +184,13 @@ class LLM_Skill_Proficiency_Requests(Base):
     request_skill_element_id = Column(String(20), index=True, nullable=False)
     request_skill_name = Column(String(255), nullable=False)
     request_timestamp = Column(DateTime, nullable=False)
+    # Cache key parts (see cached_skill_proficiency_request); NULL for rows written without the cache
+    prompt_template_hash = Column(String(64), nullable=True)
+    skill_set_hash = Column(String(64), nullable=True)
 
     __table_args__ = (
         PrimaryKeyConstraint('request_id', 'request_onet_soc_code', 'request_skill_element_id', name='pk_llm_skill_proficiency_requests'),
+        Index('ix_llm_skill_proficiency_requests_cache_key', 'request_onet_soc_code', 'request_model', 'prompt_template_hash', 'skill_set_hash', 'request_timestamp'),
         {"mysql_engine": "InnoDB", "mysql_charset": "utf8mb4", "mysql_collate": "utf8mb4_0900_ai_ci"}
     )
 
@@ -190,13 +215,69 @@ class LLM_Skill_Proficiency_Replies(Base):
         {"mysql_engine": "InnoDB", "mysql_charset": "utf8mb4", "mysql_collate": "utf8mb4_0900_ai_ci"}
     )
 
+class LLM_Skill_Gap_Analysis_Cache(Base):
+    """
+    Content-addressed cache of LLM skill gap analysis responses.
+    cache_key hashes the model, the prompt template and both LLM-assessed skill profiles, so the same
+    transition with the same proficiency inputs is answered without another LLM call.
+    """
+    __tablename__ = 'llm_skill_gap_analysis_cache'
+
+    cache_key = Column(CHAR(64), primary_key=True)
+    model = Column(String(255), nullable=False)
+    from_onet_soc_code = Column(String(20), index=True, nullable=False)
+    to_onet_soc_code = Column(String(20), index=True, nullable=False)
+    raw_response = Column(Text(16777215), nullable=False)  # JSON of the parsed skill_gap_analysis response (MEDIUMTEXT on MySQL)
+    created_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        {"mysql_engine": "InnoDB", "mysql_charset": "utf8mb4", "mysql_collate": "utf8mb4_0900_ai_ci"},
+    )
+
+class Skill_Gap_LLM_Jobs(Base):
+    """
+    Background /skill-gap-llm jobs. The API inserts a 'queued' row, a worker moves it to 'running'
+    and then 'succeeded' (result holds the JSON API response) or 'failed' (error_* columns are set).
+    """
+    __tablename__ = 'skill_gap_llm_jobs'
+
+    job_id = Column(String(36), primary_key=True)
+    from_onet_soc_code = Column(String(20), nullable=False)
+    to_onet_soc_code = Column(String(20), nullable=False)
+    status = Column(String(20), index=True, nullable=False)  # 'queued', 'running', 'succeeded', 'failed'
+    result = Column(Text(16777215), nullable=True)
+    error_status_code = Column(Integer, nullable=True)
+    error_message = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        {"mysql_engine": "InnoDB", "mysql_charset": "utf8mb4", "mysql_collate": "utf8mb4_0900_ai_ci"},
+    )
+
+class Dataset_Versions(Base):
+    """
+    Version stamps written by the transform node after the downstream tables are rebuilt.
+    Readers (e.g. the API's in-memory occupation/skill cache) compare the latest stamp to detect new data.
+    """
+    __tablename__ = 'dataset_versions'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    dataset_name = Column(String(50), index=True, nullable=False)  # e.g. 'occupation_skills'
+    version = Column(String(36), nullable=False)
+    source = Column(String(50), nullable=False)  # 'text_file', 'api', or 'merged'
+    row_count = Column(Integer, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+
 # For testing use the test_env variables which can be found in the env/test_env.env file
 def get_sqlalchemy_engine(
     db_name: str = 'onet_data',
     db_user: str = 'mysql-user',
     db_password: str = '2222',
     db_host: str = 'localhost',
-    db_port: str = '3306'
+    db_port: str = '3306',
+    **engine_kwargs
 ):
     # Determine effective configuration, prioritizing explicitly passed non-default parameters
     effective_host = db_host
@@ -227,7 +308,8 @@ def get_sqlalchemy_engine(
         )
 
     engine_url = f"mysql+mysqlconnector://{effective_user}:{effective_password}@{effective_host}:{effective_port}/{effective_db_name}"
-    engine = create_engine(engine_url)
+    # Extra keyword arguments (e.g. pool_size, pool_pre_ping) are passed straight to create_engine
+    engine = create_engine(engine_url, **engine_kwargs)
     return engine
 
 
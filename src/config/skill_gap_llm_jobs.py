@@ -0,0 +1,218 @@
+"""
+Bounded background worker pool for /skill-gap-llm jobs.
+
+POST /skill-gap-llm/jobs stores a 'queued' row in Skill_Gap_LLM_Jobs and hands it to this pool, so the
+HTTP request returns immediately instead of holding a connection through three Gemini calls. Job
+state lives in the database: results can be fetched repeatedly, and init_skill_gap_llm_jobs queues
+again the jobs still queued, and the jobs left running for longer than the lease, on the next start.
+
+Several processes (API workers, replicas) may share the database and queue the same job. A worker
+only runs a job after claiming it with one conditional UPDATE (claim_skill_gap_llm_job), so each job
+runs exactly once; a 'running' job is only taken over once its lease has expired.
+
+Configuration through environment variables:
+    SKILL_GAP_LLM_JOB_WORKERS        Jobs run concurrently (default: 4)
+    SKILL_GAP_LLM_JOB_POLL_SECONDS   Database poll interval when long-polling a job run by another process (default: 1)
+    SKILL_GAP_LLM_JOB_LEASE_SECONDS  Age after which a 'running' job is presumed abandoned and run again (default: 900)
+"""
+import os
+import time
+import logging
+from datetime import datetime, timedelta
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional
+import anyio
+from sqlalchemy.engine import Engine
+
+from src.functions.create_skill_gap_llm_job import create_skill_gap_llm_job
+from src.functions.get_skill_gap_llm_jobs import get_skill_gap_llm_jobs
+from src.functions.run_skill_gap_llm_job import run_skill_gap_llm_job
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("succeeded", "failed")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_engine: Optional[Engine] = None
+_lock = threading.Lock()
+# Completion events for jobs queued in this process, so long-polls do not need to query the database
+_job_events: Dict[str, threading.Event] = {}
+
+
+def get_worker_count() -> int:
+    """Number of jobs run concurrently."""
+    return int(os.getenv("SKILL_GAP_LLM_JOB_WORKERS", "4"))
+
+
+def get_poll_interval() -> float:
+    """Database poll interval for long-polling jobs that are not run by this process."""
+    return float(os.getenv("SKILL_GAP_LLM_JOB_POLL_SECONDS", "1"))
+
+
+def get_lease_seconds() -> float:
+    """Age after which a 'running' job is presumed abandoned by its worker and may be run again."""
+    return float(os.getenv("SKILL_GAP_LLM_JOB_LEASE_SECONDS", "900"))
+
+
+def _run(job_id: str, from_onet_soc_code: str, to_onet_soc_code: str, engine: Engine, done: threading.Event) -> None:
+    try:
+        result = run_skill_gap_llm_job(job_id, from_onet_soc_code, to_onet_soc_code, engine=engine, lease_seconds=get_lease_seconds())
+        if not result["success"]:
+            logger.error(result["message"])
+    except Exception:
+        logger.exception(f"Skill gap LLM job {job_id} crashed")
+    finally:
+        done.set()
+        with _lock:
+            _job_events.pop(job_id, None)
+
+
+def _enqueue(job_id: str, from_onet_soc_code: str, to_onet_soc_code: str) -> None:
+    done = threading.Event()
+    with _lock:
+        if _executor is None:
+            raise RuntimeError("Skill gap LLM job executor is not initialised")
+        _job_events[job_id] = done
+        _executor.submit(_run, job_id, from_onet_soc_code, to_onet_soc_code, _engine, done)
+
+
+def init_skill_gap_llm_jobs(engine: Engine) -> Dict[str, Any]:
+    """
+    Start the worker pool and queue again every 'queued' job and every 'running' job older than the lease.
+    Jobs another live process is running are left alone; queued jobs it also holds are claimed by one of them.
+
+    Args:
+        engine (Engine): Engine used to read and update job state.
+
+    Returns:
+        dict: {"success": bool, "message": str, "result": {"workers": int, "requeued": int}}
+    """
+    global _executor, _engine
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=get_worker_count(), thread_name_prefix="skill-gap-llm-job")
+        _engine = engine
+
+    queued = get_skill_gap_llm_jobs(statuses=["queued"], engine=engine)
+    stale = get_skill_gap_llm_jobs(
+        statuses=["running"], started_before=datetime.now() - timedelta(seconds=get_lease_seconds()), engine=engine
+    )
+    for unfinished in (queued, stale):
+        if not unfinished["success"]:
+            logger.warning(f"Could not requeue unfinished skill gap LLM jobs: {unfinished['message']}")
+            return {"success": False, "message": unfinished["message"], "result": {"workers": get_worker_count(), "requeued": 0}}
+
+    jobs = sorted(queued["result"] + stale["result"], key=lambda job: job["created_at"])
+    for job in jobs:
+        _enqueue(job["job_id"], job["from_occupation"], job["to_occupation"])
+    if jobs:
+        logger.info(f"Requeued {len(jobs)} unfinished skill gap LLM jobs ({len(stale['result'])} with an expired lease)")
+
+    return {
+        "success": True,
+        "message": f"Skill gap LLM job executor started with {get_worker_count()} workers",
+        "result": {"workers": get_worker_count(), "requeued": len(jobs)}
+    }
+
+
+def shutdown_skill_gap_llm_jobs() -> None:
+    """Stop the worker pool without waiting. Jobs not finished yet stay queued/running in the database."""
+    global _executor, _engine
+    with _lock:
+        executor, _executor, _engine = _executor, None, None
+        _job_events.clear()
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def submit_skill_gap_llm_job(from_onet_soc_code: str, to_onet_soc_code: str) -> Dict[str, Any]:
+    """
+    Store a new job and queue it on the worker pool.
+
+    Args:
+        from_onet_soc_code (str): The O*NET-SOC code for the source occupation
+        to_onet_soc_code (str): The O*NET-SOC code for the target occupation
+
+    Returns:
+        dict: The create_skill_gap_llm_job response ({"job_id", "status", "created_at"} on success).
+    """
+    with _lock:
+        engine = _engine
+    if engine is None:
+        return {"success": False, "message": "Skill gap LLM job executor is not initialised", "result": {}}
+
+    created = create_skill_gap_llm_job(from_onet_soc_code, to_onet_soc_code, engine=engine)
+    if created["success"]:
+        _enqueue(created["result"]["job_id"], from_onet_soc_code, to_onet_soc_code)
+    return created
+
+
+def get_skill_gap_llm_job(job_id: str) -> Dict[str, Any]:
+    """
+    Read one job's state.
+
+    Returns:
+        dict: {"success": bool, "message": str, "result": job dict (see get_skill_gap_llm_jobs) or None if unknown}
+    """
+    with _lock:
+        engine = _engine
+    if engine is None:
+        return {"success": False, "message": "Skill gap LLM job executor is not initialised", "result": None}
+
+    jobs = get_skill_gap_llm_jobs(job_ids=[job_id], engine=engine)
+    if not jobs["success"]:
+        return {"success": False, "message": jobs["message"], "result": None}
+    if not jobs["result"]:
+        return {"success": True, "message": f"Skill gap LLM job {job_id} not found", "result": None}
+    return {"success": True, "message": f"Skill gap LLM job {job_id} is {jobs['result'][0]['status']}", "result": jobs["result"][0]}
+
+
+async def wait_for_skill_gap_llm_job(job_id: str, timeout: float) -> None:
+    """
+    Wait until a job may have changed state, without blocking the event loop. Callers re-read the
+    job from the database afterwards.
+
+    A job queued in this process is watched through its completion event (up to timeout seconds).
+    Any other job (e.g. one run by another API worker) is waited on for one poll interval.
+    """
+    with _lock:
+        done = _job_events.get(job_id)
+    if done is None:
+        await anyio.sleep(min(get_poll_interval(), timeout))
+        return
+
+    deadline = time.monotonic() + timeout
+    while not done.is_set() and (remaining := deadline - time.monotonic()) > 0:
+        await anyio.sleep(min(0.05, remaining))
+
+
+def get_skill_gap_llm_job_metrics() -> Dict[str, Any]:
+    """
+    Return the worker count and the number of jobs queued or running in this process.
+
+    Returns:
+        dict: {"success": bool, "message": str, "result": {"running": bool, "workers": int, "in_process_jobs": int}}
+    """
+    with _lock:
+        return {
+            "success": True,
+            "message": "Skill gap LLM job executor metrics retrieved",
+            "result": {"running": _executor is not None, "workers": get_worker_count(), "in_process_jobs": len(_job_events)}
+        }
+
+
+if __name__ == "__main__":
+    print("Minimalistic happy path example for the skill gap LLM job executor:")
+    print("This example assumes GEMINI_API_KEY and a populated database with configured environment variables.")
+
+    from src.config.schemas import get_sqlalchemy_engine
+
+    print(f"\n  Init: {init_skill_gap_llm_jobs(get_sqlalchemy_engine())['message']}")
+    job = submit_skill_gap_llm_job("11-1011.00", "15-1252.00")
+    print(f"  Submitted: {job['message']}")
+    anyio.run(wait_for_skill_gap_llm_job, job["result"]["job_id"], 60)
+    print(f"  Job: {get_skill_gap_llm_job(job['result']['job_id'])['message']}")
+
+    shutdown_skill_gap_llm_jobs()
+    print("\nExample finished.")
@@ -0,0 +1,76 @@
+"""
+Small thread-safe in-process cache with least-recently-used eviction and a per-entry time to live.
+
+Used as the memory tier in front of the database-backed LLM response caches, so repeated requests
+inside one API process do not need a database round trip either.
+"""
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class TTLLRUCache:
+    """
+    Mapping of at most `maxsize` entries. Entries older than `ttl_seconds` are treated as missing,
+    and the least recently used entry is evicted when a new one does not fit.
+
+    Args:
+        maxsize (int): Maximum number of entries. 0 disables the cache (every get is a miss).
+        ttl_seconds (float): Seconds an entry stays valid after it is set.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None if it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting the least recently used entries if the cache is full."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the configured limits, current size and hit/miss/eviction counters."""
+        with self._lock:
+            return {"maxsize": self.maxsize, "ttl_seconds": self.ttl_seconds, "size": len(self._entries), **self._stats}
+
+
+if __name__ == "__main__":
+    print("Minimalistic happy path example for TTLLRUCache:")
+
+    cache = TTLLRUCache(maxsize=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)  # Evicts "b", the least recently used entry
+    print(f"\n  a={cache.get('a')}, b={cache.get('b')}, c={cache.get('c')}")
+    print(f"  Stats: {cache.stats()}")
+    print("\nExample finished.")
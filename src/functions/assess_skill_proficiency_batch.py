@@ -0,0 +1,293 @@
+"""
+Offline LLM skill proficiency assessment for many occupations, with a bounded worker pool,
+a request rate limit, bulk loading and a resumable checkpoint file.
+"""
+import os
+import json
+import logging
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional
+from sqlalchemy.engine import Engine
+
+from src.config.schemas import get_sqlalchemy_engine
+from src.config.rate_limiter import TokenBucket
+from src.functions.cached_skill_proficiency_request import DEFAULT_MODEL, get_skill_proficiency_template_hash, get_skill_set_hash
+from src.functions.gemini_llm_request import gemini_llm_request
+from src.functions.batch_skill_proficiency_request import (
+    batch_skill_proficiency_request, plan_skill_proficiency_batches, request_skill_proficiency_within_budget
+)
+from src.functions.mysql_load_llm_skill_proficiencies import mysql_load_llm_skill_proficiencies
+
+logger = logging.getLogger(__name__)
+
+
+def _read_checkpoint(checkpoint_path: Optional[str]) -> Dict[str, Any]:
+    if not checkpoint_path or not os.path.exists(checkpoint_path):
+        return {"completed": {}, "failed": {}}
+    with open(checkpoint_path, "r") as f:
+        checkpoint = json.load(f)
+    completed = checkpoint.get("completed", {})
+    # Checkpoints of older runs list bare codes without a cache key; those occupations are assessed again
+    return {"completed": completed if isinstance(completed, dict) else {}, "failed": checkpoint.get("failed", {})}
+
+
+def _write_checkpoint(checkpoint_path: Optional[str], checkpoint: Dict[str, Any]) -> None:
+    if not checkpoint_path:
+        return
+    # Write then rename so an interrupted run never leaves a truncated checkpoint behind
+    temp_path = f"{checkpoint_path}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(checkpoint, f, indent=2)
+    os.replace(temp_path, checkpoint_path)
+
+
+def _checkpoint_entry(occupation_data: Dict[str, Any], model: str) -> Dict[str, str]:
+    """Cache key an occupation was assessed under, recorded with it in the checkpoint."""
+    return {
+        "model": model,
+        "prompt_template_hash": get_skill_proficiency_template_hash(),
+        "skill_set_hash": get_skill_set_hash(occupation_data["skills"]),
+        "completed_at": datetime.now().isoformat(timespec="seconds")
+    }
+
+
+def _is_checkpoint_current(entry: Any, occupation_data: Dict[str, Any], model: str, max_age_seconds: Optional[float]) -> bool:
+    """Whether a checkpoint entry was completed under the current cache key (and within max_age_seconds)."""
+    if not isinstance(entry, dict):
+        return False
+    current = _checkpoint_entry(occupation_data, model)
+    if any(entry.get(name) != current[name] for name in ("model", "prompt_template_hash", "skill_set_hash")):
+        return False
+    if max_age_seconds is None:
+        return True
+    try:
+        return datetime.fromisoformat(entry["completed_at"]) >= datetime.now() - timedelta(seconds=max_age_seconds)
+    except (KeyError, TypeError, ValueError):
+        return False
+
+
+def _stamp_cache_key(llm_result: Dict[str, Any], occupation_data: Dict[str, Any]) -> None:
+    """Stamp the cache key hashes used by cached_skill_proficiency_request, so the API serves these replies from its database cache."""
+    template_hash = get_skill_proficiency_template_hash()
+    skill_set_hash = get_skill_set_hash(occupation_data["skills"])
+    for request_row in llm_result["request_data"]:
+        request_row["prompt_template_hash"] = template_hash
+        request_row["skill_set_hash"] = skill_set_hash
+
+
+def _assess_occupation(occupation_data: Dict[str, Any], model: str, rate_limiter: TokenBucket) -> Dict[str, Any]:
+    """
+    Prompt the LLM for one occupation (in several prompts if it exceeds LLM_PROMPT_MAX_INPUT_TOKENS),
+    stamping the cache key hashes on the request rows.
+    """
+    def send_prompt(prompt: str, part: Dict[str, Any]) -> Dict[str, Any]:
+        prompt_skills_data = [
+            {"skill_element_id": skill["skill_element_id"], "skill_name": skill["skill_name"]}
+            for skill in part["skills"]
+        ]
+        rate_limiter.acquire()
+        return gemini_llm_request(
+            prompt=prompt,
+            request_onet_soc_code=part["onet_id"],
+            prompt_skills_data=prompt_skills_data,
+            model=model,
+            expected_response_type="skill_proficiency"
+        )
+
+    llm_response = request_skill_proficiency_within_budget(occupation_data, send_prompt)
+    if not llm_response["success"]:
+        return llm_response
+    if not llm_response["result"]["reply_data"]:
+        return {"success": False, "message": "LLM returned no skill proficiency replies", "result": {}}
+
+    _stamp_cache_key(llm_response["result"], occupation_data)
+    return llm_response
+
+
+def _assess_occupation_group(
+    occupations_data: List[Dict[str, Any]],
+    model: str,
+    rate_limiter: TokenBucket,
+    max_output_tokens: int
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Assess a group of occupations with one batched request. Occupations missing from the batched
+    reply are retried with the single-occupation prompt. Returns onet_soc_code -> response.
+    """
+    if len(occupations_data) == 1:
+        return {occupations_data[0]["onet_id"]: _assess_occupation(occupations_data[0], model, rate_limiter)}
+
+    rate_limiter.acquire()
+    batch_response = batch_skill_proficiency_request(occupations_data, model=model, max_output_tokens=max_output_tokens)
+    if not batch_response["result"]["assessments"] and not batch_response["result"]["missing"]:
+        return {occupation_data["onet_id"]: batch_response for occupation_data in occupations_data}
+
+    responses = {}
+    for occupation_data in occupations_data:
+        code = occupation_data["onet_id"]
+        llm_result = batch_response["result"]["assessments"].get(code)
+        if llm_result is None:
+            responses[code] = _assess_occupation(occupation_data, model, rate_limiter)
+            continue
+        _stamp_cache_key(llm_result, occupation_data)
+        responses[code] = {"success": True, "message": batch_response["message"], "result": llm_result}
+    return responses
+
+
+def assess_skill_proficiency_batch(
+    occupations: Dict[str, Dict[str, Any]],
+    model: str = DEFAULT_MODEL,
+    workers: int = 4,
+    requests_per_minute: float = 60,
+    flush_size: int = 20,
+    checkpoint_path: Optional[str] = None,
+    engine: Optional[Engine] = None,
+    occupations_per_request: int = 1,
+    max_output_tokens: int = 8192,
+    max_age_seconds: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Assess skill proficiencies for a set of occupations and bulk-load the results into
+    LLM_Skill_Proficiency_Requests/Replies.
+
+    Results are loaded every flush_size occupations. After each load the checkpoint file records the
+    loaded occupation codes, each with the cache key it was assessed under (model, prompt template hash,
+    skill set hash) and when, plus the failures so far. A rerun with the same checkpoint skips the
+    loaded occupations whose cache key still matches (and, with max_age_seconds, that are young
+    enough) and assesses the failed and outdated ones.
+
+    Args:
+        occupations (Dict[str, Dict[str, Any]]): onet_soc_code -> occupation data
+                                                 ({"onet_id", "name", "skills"}, see get_all_occupations_and_skills)
+        model (str, optional): The Gemini model to use. Defaults to "gemini-2.0-flash".
+        workers (int, optional): Number of concurrent LLM requests. Defaults to 4.
+        requests_per_minute (float, optional): LLM request rate limit, 0 for none. Defaults to 60.
+        flush_size (int, optional): Occupations per bulk load. Defaults to 20.
+        checkpoint_path (Optional[str]): JSON checkpoint file, or None to run without one.
+        engine (Optional[Engine]): SQLAlchemy engine to use for database operations,
+                                  or None to use the default engine
+        occupations_per_request (int, optional): Occupations assessed per batched Gemini request
+                                                 (see plan_skill_proficiency_batches). Defaults to 1.
+        max_output_tokens (int, optional): Output token budget of a batched request. Defaults to 8192.
+        max_age_seconds (Optional[float]): Checkpoint entries older than this are assessed again
+                                           (e.g. LLM_PROFICIENCY_CACHE_TTL_SECONDS), None to keep them.
+
+    Returns:
+        dict: {
+            "success": bool,  # False if a bulk load failed; individual LLM failures are only counted
+            "message": str,
+            "result": {
+                "assessed": int,                # Occupations assessed and loaded in this run
+                "skipped_checkpoint": int,      # Occupations already loaded under the current cache key according to the checkpoint
+                "failed": Dict[str, str],       # onet_soc_code -> error message
+                "requests_loaded": int,
+                "replies_loaded": int,
+                "llm_requests": int,            # Gemini requests sent (batched requests count once)
+                "rate_limit_waited_seconds": float
+            }
+        }
+    """
+    if engine is None:
+        engine = get_sqlalchemy_engine()
+
+    try:
+        checkpoint = _read_checkpoint(checkpoint_path)
+    except (OSError, ValueError) as e:
+        return {"success": False, "message": f"Error reading checkpoint {checkpoint_path}: {str(e)}", "result": {}}
+
+    completed = dict(checkpoint["completed"])
+    failed = dict(checkpoint["failed"])
+    pending = [
+        code for code, occupation_data in occupations.items()
+        if not _is_checkpoint_current(completed.get(code), occupation_data, model, max_age_seconds)
+    ]
+    rate_limiter = TokenBucket(requests_per_minute / 60)
+    counts = {"assessed": 0, "requests_loaded": 0, "replies_loaded": 0}
+    load_errors = []
+    buffer = {}
+
+    def flush() -> None:
+        if not buffer:
+            return
+        batch_output = {
+            "request_data": [row for result in buffer.values() for row in result["request_data"]],
+            "reply_data": [row for result in buffer.values() for row in result["reply_data"]]
+        }
+        load_result = mysql_load_llm_skill_proficiencies(llm_assessment_output=batch_output, engine=engine)
+        if load_result["success"]:
+            for code in buffer:
+                completed[code] = _checkpoint_entry(occupations[code], model)
+                failed.pop(code, None)
+            counts["assessed"] += len(buffer)
+            counts["requests_loaded"] += load_result["requests_loaded"] or 0
+            counts["replies_loaded"] += load_result["replies_loaded"] or 0
+        else:
+            load_errors.append(load_result["message"])
+            for code in buffer:
+                failed[code] = f"Bulk load failed: {load_result['message']}"
+        buffer.clear()
+        _write_checkpoint(checkpoint_path, {"completed": dict(sorted(completed.items())), "failed": failed})
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="llm-proficiency-batch") as executor:
+        groups = plan_skill_proficiency_batches([occupations[code] for code in pending], max(1, occupations_per_request), max_output_tokens)
+        futures = {
+            executor.submit(_assess_occupation_group, group, model, rate_limiter, max_output_tokens): group
+            for group in groups
+        }
+        for future in as_completed(futures):
+            try:
+                group_responses = future.result()
+            except Exception as e:
+                group_responses = {occupation_data["onet_id"]: {"success": False, "message": str(e), "result": {}} for occupation_data in futures[future]}
+
+            for code, llm_response in group_responses.items():
+                if llm_response["success"]:
+                    buffer[code] = llm_response["result"]
+                else:
+                    failed[code] = llm_response["message"]
+                    logger.warning(f"Skill proficiency assessment failed for {code}: {llm_response['message']}")
+
+            if len(buffer) >= flush_size:
+                flush()
+        flush()
+
+    # Record failures even when nothing was loaded
+    _write_checkpoint(checkpoint_path, {"completed": dict(sorted(completed.items())), "failed": failed})
+
+    result = {
+        "assessed": counts["assessed"],
+        "skipped_checkpoint": len(occupations) - len(pending),
+        "failed": {code: message for code, message in failed.items() if code in occupations},
+        "requests_loaded": counts["requests_loaded"],
+        "replies_loaded": counts["replies_loaded"],
+        "llm_requests": int(rate_limiter.stats()["acquired"]),
+        "rate_limit_waited_seconds": round(rate_limiter.stats()["waited_seconds_total"], 3)
+    }
+    if load_errors:
+        return {
+            "success": False,
+            "message": f"{len(load_errors)} bulk load(s) failed, first error: {load_errors[0]}",
+            "result": result
+        }
+    return {
+        "success": True,
+        "message": f"Assessed {result['assessed']} occupations ({len(result['failed'])} failed, {result['skipped_checkpoint']} skipped by checkpoint)",
+        "result": result
+    }
+
+if __name__ == "__main__":
+    print("Minimalistic happy path example for assess_skill_proficiency_batch:")
+    print("This example assumes GEMINI_API_KEY and a populated database with configured environment variables.")
+
+    from src.functions.get_all_occupations_and_skills import get_all_occupations_and_skills
+
+    all_occupations = get_all_occupations_and_skills()["result"]["occupation_data"]
+    example_occupations = {code: all_occupations[code] for code in list(all_occupations)[:2] if all_occupations[code]["skills"]}
+    result = assess_skill_proficiency_batch(example_occupations, workers=2, requests_per_minute=30)
+
+    print("\nFunction Call Result:")
+    print(f"  Success: {result['success']}")
+    print(f"  Message: {result['message']}")
+
+    print("\nExample finished.")
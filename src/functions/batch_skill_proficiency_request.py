@@ -0,0 +1,273 @@
+"""
+Assess skill proficiencies for several occupations with one Gemini request and split the reply
+back into one gemini_llm_request-style result per occupation.
+
+Configuration through environment variables:
+    LLM_PROFICIENCY_BATCH_ENABLED            Batch proficiency assessments of several occupations (default: true)
+    LLM_PROFICIENCY_BATCH_SIZE               Maximum occupations per request (default: 5)
+    LLM_PROFICIENCY_BATCH_MAX_OUTPUT_TOKENS  Output token budget of one request (default: 8192)
+
+Batches and single-occupation prompts also stay within LLM_PROMPT_MAX_INPUT_TOKENS
+(see src/config/llm_prompt_budget.py).
+"""
+import os
+import uuid
+from typing import Dict, Any, List, Optional, Callable
+
+from src.config.gemini_rate_limiter import estimate_tokens
+from src.config.llm_prompt_budget import get_prompt_max_input_tokens, split_to_token_budget, record_prompt_split
+from src.functions.generate_skill_proficiency_prompt import generate_skill_proficiency_prompt
+from src.functions.generate_batch_skill_proficiency_prompt import generate_batch_skill_proficiency_prompt
+from src.functions.gemini_llm_request import gemini_llm_request
+
+# Estimated reply size: each skill carries a description, a level and a one-paragraph explanation
+OUTPUT_TOKENS_PER_SKILL = 90
+OUTPUT_TOKENS_PER_OCCUPATION = 40
+
+
+def is_proficiency_batching_enabled() -> bool:
+    """Whether proficiency assessments of several occupations are sent as one request."""
+    return os.getenv("LLM_PROFICIENCY_BATCH_ENABLED", "true").lower() in ("1", "true", "yes")
+
+
+def get_proficiency_batch_size() -> int:
+    """Maximum occupations assessed per request."""
+    return int(os.getenv("LLM_PROFICIENCY_BATCH_SIZE", "5"))
+
+
+def get_proficiency_batch_max_output_tokens() -> int:
+    """Output token budget of one batched request."""
+    return int(os.getenv("LLM_PROFICIENCY_BATCH_MAX_OUTPUT_TOKENS", "8192"))
+
+
+def estimate_skill_proficiency_output_tokens(occupation_data: Dict[str, Any]) -> int:
+    """Estimated reply tokens for assessing one occupation's skills."""
+    skill_name_tokens = sum(estimate_tokens(skill.get("skill_name") or "") for skill in occupation_data["skills"])
+    return OUTPUT_TOKENS_PER_OCCUPATION + len(occupation_data["skills"]) * OUTPUT_TOKENS_PER_SKILL + skill_name_tokens
+
+
+def plan_skill_proficiency_batches(
+    occupations_data: List[Dict[str, Any]],
+    max_occupations: int,
+    max_output_tokens: int,
+    max_input_tokens: Optional[int] = None
+) -> List[List[Dict[str, Any]]]:
+    """
+    Group occupations, in order, into batches of at most max_occupations whose estimated reply fits
+    in max_output_tokens and whose estimated prompt fits in max_input_tokens (default:
+    LLM_PROMPT_MAX_INPUT_TOKENS). An occupation that exceeds a budget on its own gets a batch of its own.
+    """
+    if max_input_tokens is None:
+        max_input_tokens = get_prompt_max_input_tokens()
+    batches, current_batch, current_tokens = [], [], 0
+    for occupation_data in occupations_data:
+        occupation_tokens = estimate_skill_proficiency_output_tokens(occupation_data)
+        if current_batch and (
+            len(current_batch) >= max_occupations
+            or current_tokens + occupation_tokens > max_output_tokens
+            or _batch_prompt_tokens(current_batch + [occupation_data]) > max_input_tokens
+        ):
+            batches.append(current_batch)
+            current_batch, current_tokens = [], 0
+        current_batch.append(occupation_data)
+        current_tokens += occupation_tokens
+    if current_batch:
+        batches.append(current_batch)
+    return batches
+
+
+def _batch_prompt_tokens(occupations_data: List[Dict[str, Any]]) -> int:
+    return generate_batch_skill_proficiency_prompt(occupations_data)["result"]["estimated_input_tokens"]
+
+
+def split_occupation_to_prompt_budget(
+    occupation_data: Dict[str, Any],
+    max_input_tokens: Optional[int] = None,
+    template: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Split an occupation into parts with consecutive subsets of its skills, so that each part's
+    single-occupation prompt fits in max_input_tokens (default: LLM_PROMPT_MAX_INPUT_TOKENS).
+    An occupation within the budget is returned as its only part.
+    """
+    if max_input_tokens is None:
+        max_input_tokens = get_prompt_max_input_tokens()
+    prompt_tokens = generate_skill_proficiency_prompt(occupation_data, template=template)["result"]["estimated_input_tokens"]
+    if prompt_tokens <= max_input_tokens:
+        return [occupation_data]
+
+    overhead = generate_skill_proficiency_prompt({**occupation_data, "skills": []}, template=template)["result"]["estimated_input_tokens"]
+    # Each skill line costs its name plus a separator or list marker
+    skill_chunks = split_to_token_budget(
+        occupation_data["skills"], lambda skill: estimate_tokens(skill.get("skill_name") or "") + 2, overhead, max_input_tokens
+    )
+    record_prompt_split("skill_proficiency")
+    return [{**occupation_data, "skills": skills} for skills in skill_chunks]
+
+
+def merge_skill_proficiency_results(llm_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge the gemini_llm_request-style results of one occupation's parts into one result under
+    the first part's request_id, so the rows are stored and cached as a single assessment.
+    """
+    if len(llm_results) == 1:
+        return llm_results[0]
+    request_id = next(
+        (row["request_id"] for llm_result in llm_results for row in llm_result["request_data"] + llm_result["reply_data"]),
+        str(uuid.uuid4())
+    )
+    assessed_skills = [
+        assessed_skill
+        for llm_result in llm_results
+        for assessed_skill in ((llm_result.get("raw_response") or {}).get("skill_proficiency_assessment") or {}).get("assessed_skills", [])
+    ]
+    first_assessment = (llm_results[0].get("raw_response") or {}).get("skill_proficiency_assessment") or {}
+    merged = {
+        "request_data": [{**row, "request_id": request_id} for llm_result in llm_results for row in llm_result["request_data"]],
+        "reply_data": [{**row, "request_id": request_id} for llm_result in llm_results for row in llm_result["reply_data"]],
+        "raw_response": {"skill_proficiency_assessment": {**first_assessment, "assessed_skills": assessed_skills}}
+    }
+    caches = [llm_result["cache"] for llm_result in llm_results if "cache" in llm_result]
+    if caches:
+        merged["cache"] = "miss" if "miss" in caches else caches[0]
+    return merged
+
+
+def request_skill_proficiency_within_budget(
+    occupation_data: Dict[str, Any],
+    send_prompt: Callable[[str, Dict[str, Any]], Dict[str, Any]],
+    template: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Assess one occupation with the single-occupation prompt, split into several prompts when it
+    exceeds LLM_PROMPT_MAX_INPUT_TOKENS (see split_occupation_to_prompt_budget).
+
+    Args:
+        occupation_data (Dict[str, Any]): Occupation with "onet_id", "name" and "skills"
+        send_prompt (Callable[[str, Dict[str, Any]], Dict[str, Any]]): Sends the prompt for one part
+            (occupation_data with a subset of the skills) and returns a gemini_llm_request-style response
+        template (Optional[str]): "full" or "compact", or None for LLM_PROMPT_TEMPLATE
+
+    Returns:
+        dict: The response of the only part, or the first failed part's response, or the
+              successful parts merged by merge_skill_proficiency_results.
+    """
+    parts = split_occupation_to_prompt_budget(occupation_data, template=template)
+    responses = []
+    for part in parts:
+        llm_response = send_prompt(generate_skill_proficiency_prompt(part, template=template)["result"]["prompt"], part)
+        if not llm_response["success"] or len(parts) == 1:
+            return llm_response
+        responses.append(llm_response)
+    return {
+        "success": True,
+        "message": f"Assessed {len(occupation_data['skills'])} skills in {len(parts)} prompts within the input token budget",
+        "result": merge_skill_proficiency_results([llm_response["result"] for llm_response in responses])
+    }
+
+
+def _match_occupation_code(reply: Dict[str, Any], codes: List[str], names: Dict[str, str]) -> str | None:
+    """Map a reply row to a requested occupation by O*NET code, falling back to the occupation name."""
+    llm_code = str(reply.get("llm_onet_soc_code") or "").strip()
+    if llm_code in codes:
+        return llm_code
+    llm_name = str(reply.get("llm_occupation_name") or "").strip().lower()
+    return names.get(llm_name)
+
+
+def batch_skill_proficiency_request(
+    occupations_data: List[Dict[str, Any]],
+    model: str = "gemini-2.0-flash",
+    max_output_tokens: int = 8192
+) -> Dict[str, Any]:
+    """
+    Assess the skills of several occupations with one Gemini request.
+
+    Each occupation gets its own request_id, so its rows are stored and cached exactly like a
+    single-occupation gemini_llm_request result.
+
+    Args:
+        occupations_data (List[Dict[str, Any]]): Occupations to assess, each with "onet_id", "name" and "skills"
+        model (str, optional): The Gemini model to use. Defaults to "gemini-2.0-flash".
+        max_output_tokens (int, optional): maxOutputTokens of the request. Defaults to 8192.
+
+    Returns:
+        dict: {
+            "success": bool,  # False if the request failed or no requested occupation was in the reply
+            "message": str,
+            "result": {
+                "assessments": {onet_soc_code: {"request_data": [...], "reply_data": [...], "raw_response": {...}}},
+                "missing": [onet_soc_code, ...]  # Requested occupations absent from the reply (empty if the request failed)
+            }
+        }
+    """
+    prompt_result = generate_batch_skill_proficiency_prompt(occupations_data)
+    if not prompt_result["success"]:
+        return {"success": False, "message": prompt_result["message"], "result": {"assessments": {}, "missing": []}}
+
+    codes = [occupation_data["onet_id"] for occupation_data in occupations_data]
+    names = {str(occupation_data["name"]).strip().lower(): occupation_data["onet_id"] for occupation_data in occupations_data}
+    prompt_skills_data = [
+        {"skill_element_id": skill["skill_element_id"], "skill_name": skill["skill_name"], "onet_soc_code": occupation_data["onet_id"]}
+        for occupation_data in occupations_data
+        for skill in occupation_data["skills"]
+    ]
+
+    llm_response = gemini_llm_request(
+        prompt=prompt_result["result"]["prompt"],
+        request_onet_soc_code=codes[0],
+        prompt_skills_data=prompt_skills_data,
+        model=model,
+        max_tokens=max_output_tokens,
+        expected_response_type="batch_skill_proficiency"
+    )
+    if not llm_response["success"]:
+        return {"success": False, "message": llm_response["message"], "result": {"assessments": {}, "missing": []}}
+
+    # Split the shared reply into one result per occupation, each with its own request_id
+    request_ids = {code: str(uuid.uuid4()) for code in codes}
+    assessments = {code: {"request_data": [], "reply_data": [], "raw_response": None} for code in codes}
+    for request_row in llm_response["result"]["request_data"]:
+        code = request_row["request_onet_soc_code"]
+        assessments[code]["request_data"].append({**request_row, "request_id": request_ids[code]})
+    for reply in llm_response["result"]["reply_data"]:
+        code = _match_occupation_code(reply, codes, names)
+        if code is not None:
+            assessments[code]["reply_data"].append({**reply, "request_id": request_ids[code], "llm_onet_soc_code": code})
+    for raw_assessment in llm_response["result"]["raw_response"]["skill_proficiency_assessments"]:
+        code = _match_occupation_code(raw_assessment if isinstance(raw_assessment, dict) else {}, codes, names)
+        if code is not None and assessments[code]["raw_response"] is None:
+            assessments[code]["raw_response"] = {"skill_proficiency_assessment": {**raw_assessment, "llm_onet_soc_code": code}}
+
+    missing = [code for code in codes if not assessments[code]["reply_data"]]
+    assessments = {code: assessment for code, assessment in assessments.items() if code not in missing}
+    if not assessments:
+        return {
+            "success": False,
+            "message": "Batched LLM reply did not contain any of the requested occupations",
+            "result": {"assessments": {}, "missing": missing}
+        }
+
+    return {
+        "success": True,
+        "message": f"Assessed {len(assessments)} of {len(codes)} occupations in one request",
+        "result": {"assessments": assessments, "missing": missing}
+    }
+
+if __name__ == "__main__":
+    print("Minimalistic happy path example for batch_skill_proficiency_request:")
+    print("This example assumes GEMINI_API_KEY is set.")
+
+    example_occupations_data = [
+        {"onet_id": "15-1252.00", "name": "Software Developers", "skills": [{"skill_element_id": "2.B.3.e", "skill_name": "Programming"}]},
+        {"onet_id": "11-1011.00", "name": "Chief Executives", "skills": [{"skill_element_id": "2.A.1.d", "skill_name": "Speaking"}]}
+    ]
+    print(f"\n  Planned batches: {[len(batch) for batch in plan_skill_proficiency_batches(example_occupations_data, 5, 8192)]}")
+
+    result = batch_skill_proficiency_request(example_occupations_data)
+
+    print("\nFunction Call Result:")
+    print(f"  Success: {result['success']}")
+    print(f"  Message: {result['message']}")
+
+    print("\nExample finished.")
@@ -0,0 +1,100 @@
+"""
+Builds a dense occupation x skill LV proficiency matrix from occupation_data dictionaries.
+"""
+from typing import Dict, Any, Optional
+import numpy as np
+
+def build_occupation_skill_matrix(
+    occupations: Dict[str, Dict[str, Any]],
+    version: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Packs occupation_data dictionaries (as returned by get_occupation_and_skills / get_occupations_and_skills)
+    into a dense float32 matrix indexed by occupation row and skill column.
+
+    Columns are ordered by first appearance across the occupations' skill lists. Each occupation's own
+    skill order is kept in skill_position, so lists rebuilt from the matrix come out in the original order.
+    Proficiency levels are DECIMAL(5,2) values, so float32 holds them exactly enough to round-trip
+    with round(value, 2).
+
+    Args:
+        occupations (Dict[str, Dict[str, Any]]): {occupation_code: {"onet_id", "name", "skills": [
+                                                  {"skill_element_id", "skill_name", "proficiency_level"}]}}
+        version (Optional[str]): Dataset version the data was loaded at, if known
+
+    Returns:
+        dict: {
+            "success": bool,
+            "message": str,
+            "result": {
+                "version": str or None,
+                "occupation_codes": list[str],     # Row labels
+                "occupation_titles": list[str],
+                "occupation_index": dict,          # onet_soc_code -> row
+                "element_ids": list[str],          # Column labels
+                "element_names": list[str],
+                "element_index": dict,             # element_id -> column
+                "proficiency": np.ndarray,         # float32 (occupations x skills), NaN where the skill is not listed
+                "skill_position": np.ndarray       # int16 (occupations x skills), index in the occupation's skill list, -1 if not listed
+            }
+        }
+    """
+    occupation_codes = list(occupations)
+    occupation_titles = [occupations[code]["name"] for code in occupation_codes]
+    occupation_index = {code: row for row, code in enumerate(occupation_codes)}
+
+    element_ids = []
+    element_names = []
+    element_index = {}
+    for occupation in occupations.values():
+        for skill in occupation["skills"]:
+            if skill["skill_element_id"] not in element_index:
+                element_index[skill["skill_element_id"]] = len(element_ids)
+                element_ids.append(skill["skill_element_id"])
+                element_names.append(skill["skill_name"])
+
+    proficiency = np.full((len(occupation_codes), len(element_ids)), np.nan, dtype=np.float32)
+    skill_position = np.full((len(occupation_codes), len(element_ids)), -1, dtype=np.int16)
+    for row, code in enumerate(occupation_codes):
+        for position, skill in enumerate(occupations[code]["skills"]):
+            if skill["proficiency_level"] is not None:
+                column = element_index[skill["skill_element_id"]]
+                proficiency[row, column] = float(skill["proficiency_level"])
+                skill_position[row, column] = position
+
+    return {
+        "success": True,
+        "message": f"Built {len(occupation_codes)} occupations x {len(element_ids)} skills matrix",
+        "result": {
+            "version": version,
+            "occupation_codes": occupation_codes,
+            "occupation_titles": occupation_titles,
+            "occupation_index": occupation_index,
+            "element_ids": element_ids,
+            "element_names": element_names,
+            "element_index": element_index,
+            "proficiency": proficiency,
+            "skill_position": skill_position
+        }
+    }
+
+if __name__ == "__main__":
+    print("Minimalistic happy path example for build_occupation_skill_matrix:")
+
+    occupations = {
+        "11-1011.00": {"onet_id": "11-1011.00", "name": "Chief Executives", "skills": [
+            {"skill_element_id": "2.A.1.a", "skill_name": "Reading Comprehension", "proficiency_level": 4.75},
+            {"skill_element_id": "2.A.1.b", "skill_name": "Active Listening", "proficiency_level": 4.88}]},
+        "15-1252.00": {"onet_id": "15-1252.00", "name": "Software Developers", "skills": [
+            {"skill_element_id": "2.A.1.a", "skill_name": "Reading Comprehension", "proficiency_level": 4.12},
+            {"skill_element_id": "2.B.3.e", "skill_name": "Programming", "proficiency_level": 5.12}]},
+    }
+    result = build_occupation_skill_matrix(occupations)
+
+    print("\nFunction Call Result:")
+    print(f"  Success: {result['success']}")
+    print(f"  Message: {result['message']}")
+    print(f"  Columns: {result['result']['element_ids']}")
+    print(f"  Matrix:\n{result['result']['proficiency']}")
+
+    print("\nExample finished.")
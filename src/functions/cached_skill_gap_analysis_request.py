@@ -0,0 +1,221 @@
+"""
+Skill gap analysis LLM request with a content-addressed memory and database cache in front of gemini_llm_request.
+"""
+import json
+import hashlib
+import logging
+from datetime import datetime, timedelta, UTC
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Callable
+from sqlalchemy import select, delete, insert
+from sqlalchemy.engine import Engine
+
+from src.config.schemas import get_sqlalchemy_engine, LLM_Skill_Gap_Analysis_Cache
+from src.config.llm_response_cache import is_gap_analysis_cache_enabled, get_gap_analysis_cache_ttl, get_gap_analysis_memory_cache
+from src.config.llm_prompt_budget import get_prompt_template
+from src.functions.generate_skill_gap_analysis_prompt import generate_skill_gap_analysis_prompt
+from src.functions.gemini_llm_request import gemini_llm_request
+from src.functions.gemini_llm_stream_request import gemini_llm_stream_request
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "gemini-2.0-flash"
+
+
+def get_skill_gap_analysis_template_hash(template: Optional[str] = None) -> str:
+    """Hash of the skill gap analysis prompt template (default LLM_PROMPT_TEMPLATE), rendered with placeholder occupation data."""
+    return _skill_gap_analysis_template_hash(get_prompt_template(template))
+
+
+@lru_cache(maxsize=None)
+def _skill_gap_analysis_template_hash(template: str) -> str:
+    placeholder_occupation = {"onet_id": "{onet_id}", "name": "{name}", "skills": [{"skill_name": "{skill_name}", "proficiency_level": "{proficiency_level}"}]}
+    prompt = generate_skill_gap_analysis_prompt(
+        from_occupation_data=placeholder_occupation,
+        to_occupation_data=placeholder_occupation,
+        template=template
+    )["result"]["prompt"]
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+def _canonical_profile(occupation_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Occupation profile with skills sorted by name, so skill order does not change the key."""
+    return {
+        "onet_id": occupation_data["onet_id"],
+        "name": occupation_data["name"],
+        "skills": sorted(
+            ([skill["skill_name"], skill["proficiency_level"]] for skill in occupation_data["skills"]),
+            key=lambda skill: skill[0]
+        )
+    }
+
+
+def get_skill_gap_analysis_cache_key(from_occupation_data: Dict[str, Any], to_occupation_data: Dict[str, Any], model: str) -> str:
+    """
+    Content address of a skill gap analysis request.
+
+    Args:
+        from_occupation_data (Dict[str, Any]): Source profile {"onet_id", "name", "skills": [{"skill_name", "proficiency_level"}]}.
+        to_occupation_data (Dict[str, Any]): Target profile in the same shape.
+        model (str): The Gemini model the analysis is requested from.
+
+    Returns:
+        str: SHA-256 hex digest over the model, prompt template hash and both canonical profiles.
+    """
+    payload = json.dumps({
+        "model": model,
+        "template": get_skill_gap_analysis_template_hash(),
+        "from": _canonical_profile(from_occupation_data),
+        "to": _canonical_profile(to_occupation_data)
+    }, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _lookup_cached_response(engine: Engine, cache_key: str, max_age_seconds: float) -> Optional[Dict[str, Any]]:
+    cutoff = datetime.now(UTC).replace(tzinfo=None) - timedelta(seconds=max_age_seconds)
+    with engine.connect() as connection:
+        raw_response = connection.execute(
+            select(LLM_Skill_Gap_Analysis_Cache.raw_response).where(
+                LLM_Skill_Gap_Analysis_Cache.cache_key == cache_key,
+                LLM_Skill_Gap_Analysis_Cache.created_at >= cutoff
+            )
+        ).scalar_one_or_none()
+    return json.loads(raw_response) if raw_response is not None else None
+
+
+def _request_gap_analysis(
+    prompt: str,
+    to_onet_soc_code: str,
+    prompt_skills_data: List[Dict[str, str]],
+    model: str,
+    on_item: Optional[Callable[[Dict[str, Any]], None]]
+) -> Dict[str, Any]:
+    """Call Gemini for a gap analysis, streaming the skill_gaps items to on_item when one is given."""
+    if on_item is None:
+        return gemini_llm_request(
+            prompt=prompt,
+            request_onet_soc_code=to_onet_soc_code,
+            prompt_skills_data=prompt_skills_data,
+            model=model,
+            expected_response_type="skill_gap_analysis"
+        )
+    return gemini_llm_stream_request(
+        prompt=prompt,
+        request_onet_soc_code=to_onet_soc_code,
+        prompt_skills_data=prompt_skills_data,
+        model=model,
+        expected_response_type="skill_gap_analysis",
+        on_item=on_item
+    )
+
+
+def _store_response(engine: Engine, cache_key: str, model: str, from_onet_soc_code: str, to_onet_soc_code: str, raw_response: Dict[str, Any]) -> None:
+    # Delete first so an expired entry for the same key is replaced
+    with engine.begin() as connection:
+        connection.execute(delete(LLM_Skill_Gap_Analysis_Cache).where(LLM_Skill_Gap_Analysis_Cache.cache_key == cache_key))
+        connection.execute(insert(LLM_Skill_Gap_Analysis_Cache).values(
+            cache_key=cache_key,
+            model=model,
+            from_onet_soc_code=from_onet_soc_code,
+            to_onet_soc_code=to_onet_soc_code,
+            raw_response=json.dumps(raw_response),
+            created_at=datetime.now(UTC).replace(tzinfo=None)
+        ))
+
+
+def cached_skill_gap_analysis_request(
+    prompt: str,
+    from_occupation_data: Dict[str, Any],
+    to_occupation_data: Dict[str, Any],
+    prompt_skills_data: List[Dict[str, str]],
+    model: str = DEFAULT_MODEL,
+    engine: Optional[Engine] = None,
+    on_item: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """
+    Return a skill gap analysis, reusing a previous one for the same assessed skill profiles.
+
+    Lookup order:
+    1. In-process TTL/LRU memory tier
+    2. LLM_Skill_Gap_Analysis_Cache, no older than LLM_GAP_ANALYSIS_CACHE_TTL_SECONDS
+    3. gemini_llm_request (gemini_llm_stream_request when on_item is given); a successful response
+       is stored in both tiers
+
+    With LLM_GAP_ANALYSIS_CACHE_ENABLED=false this is a plain gemini_llm_request call. on_item only
+    sees items of a fresh Gemini reply; cached responses are returned whole.
+
+    Args:
+        prompt (str): Prompt from generate_skill_gap_analysis_prompt for the two profiles.
+        from_occupation_data (Dict[str, Any]): LLM-assessed source profile {"onet_id", "name", "skills": [{"skill_name", "proficiency_level"}]}.
+        to_occupation_data (Dict[str, Any]): LLM-assessed target profile in the same shape.
+        prompt_skills_data (List[Dict[str, str]]): Target skills in the prompt, each with "skill_element_id" and "skill_name".
+        model (str, optional): The Gemini model to use. Defaults to "gemini-2.0-flash".
+        engine (Optional[Engine]): SQLAlchemy engine to use for database operations,
+                                   or None to use the default engine
+        on_item (Optional[Callable[[Dict[str, Any]], None]]): Called with each skill_gaps item as soon
+                                   as it has been generated.
+
+    Returns:
+        dict: The gemini_llm_request response. Cached responses only carry "raw_response"
+              (request_data and reply_data are empty). result additionally contains
+              "cache": "memory", "database" or "miss".
+    """
+    to_onet_soc_code = to_occupation_data["onet_id"]
+    if not is_gap_analysis_cache_enabled():
+        return _request_gap_analysis(prompt, to_onet_soc_code, prompt_skills_data, model, on_item)
+
+    cache_key = get_skill_gap_analysis_cache_key(from_occupation_data, to_occupation_data, model)
+    memory_cache = get_gap_analysis_memory_cache()
+
+    raw_response = memory_cache.get(cache_key)
+    if raw_response is not None:
+        return {"success": True, "message": "Skill gap analysis served from memory cache",
+                "result": {"request_data": [], "reply_data": [], "raw_response": raw_response, "cache": "memory"}}
+
+    if engine is None:
+        engine = get_sqlalchemy_engine()
+
+    try:
+        raw_response = _lookup_cached_response(engine, cache_key, get_gap_analysis_cache_ttl())
+    except Exception as e:
+        # A cache lookup failure (e.g. the table is missing) must not block the analysis
+        logger.warning(f"Skill gap analysis cache lookup failed for {from_occupation_data['onet_id']} -> {to_onet_soc_code}: {e}")
+        raw_response = None
+
+    if raw_response is not None:
+        memory_cache.set(cache_key, raw_response)
+        return {"success": True, "message": "Skill gap analysis served from database cache",
+                "result": {"request_data": [], "reply_data": [], "raw_response": raw_response, "cache": "database"}}
+
+    llm_response = _request_gap_analysis(prompt, to_onet_soc_code, prompt_skills_data, model, on_item)
+    if not llm_response["success"] or not llm_response["result"].get("raw_response"):
+        return llm_response
+
+    raw_response = llm_response["result"]["raw_response"]
+    try:
+        _store_response(engine, cache_key, model, from_occupation_data["onet_id"], to_onet_soc_code, raw_response)
+    except Exception as e:
+        logger.warning(f"Skill gap analysis for {from_occupation_data['onet_id']} -> {to_onet_soc_code} was not cached: {e}")
+
+    memory_cache.set(cache_key, raw_response)
+    return {**llm_response, "result": {**llm_response["result"], "cache": "miss"}}
+
+
+if __name__ == "__main__":
+    print("Minimalistic happy path example for cached_skill_gap_analysis_request:")
+    print("This example assumes GEMINI_API_KEY and a configured database in the environment variables.")
+
+    example_from = {"onet_id": "11-1011.00", "name": "Chief Executives", "skills": [{"skill_name": "Programming", "proficiency_level": 2}]}
+    example_to = {"onet_id": "15-1252.00", "name": "Software Developers", "skills": [{"skill_name": "Programming", "proficiency_level": 6}]}
+    example_prompt = generate_skill_gap_analysis_prompt(from_occupation_data=example_from, to_occupation_data=example_to)["result"]["prompt"]
+
+    for attempt in range(2):
+        result = cached_skill_gap_analysis_request(
+            prompt=example_prompt,
+            from_occupation_data=example_from,
+            to_occupation_data=example_to,
+            prompt_skills_data=[{"skill_element_id": "2.B.3.e", "skill_name": "Programming"}]
+        )
+        print(f"\n  Attempt {attempt + 1}: {result['message']} (cache: {(result['result'] or {}).get('cache')})")
+
+    print("\nExample finished.")
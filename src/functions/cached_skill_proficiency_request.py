@@ -0,0 +1,346 @@
+"""
+Skill proficiency LLM request with a memory and database cache in front of gemini_llm_request.
+"""
+import hashlib
+import logging
+from datetime import datetime, timedelta, UTC
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
+from sqlalchemy import select, func
+from sqlalchemy.engine import Engine
+
+from src.config.schemas import get_sqlalchemy_engine, LLM_Skill_Proficiency_Requests, LLM_Skill_Proficiency_Replies
+from src.config.llm_response_cache import is_proficiency_cache_enabled, get_proficiency_cache_ttl, get_proficiency_memory_cache
+from src.config.llm_prompt_budget import get_prompt_template
+from src.functions.generate_skill_proficiency_prompt import generate_skill_proficiency_prompt
+from src.functions.generate_batch_skill_proficiency_prompt import generate_batch_skill_proficiency_prompt
+from src.functions.gemini_llm_request import gemini_llm_request
+from src.functions.batch_skill_proficiency_request import (
+    batch_skill_proficiency_request, plan_skill_proficiency_batches, request_skill_proficiency_within_budget,
+    get_proficiency_batch_size, get_proficiency_batch_max_output_tokens
+)
+from src.functions.mysql_load_llm_skill_proficiencies import mysql_load_llm_skill_proficiencies
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "gemini-2.0-flash"
+
+_REPLY_COLUMNS = [
+    "request_id", "llm_onet_soc_code", "llm_occupation_name", "llm_skill_name",
+    "llm_assigned_proficiency_description", "llm_assigned_proficiency_level", "llm_explanation", "assessment_timestamp"
+]
+
+
+def get_skill_proficiency_template_hash(template: Optional[str] = None) -> str:
+    """
+    Hash of the skill proficiency prompt templates. The single-occupation and batched templates are
+    rendered with placeholder occupation data; their assessments are interchangeable, so they share
+    one hash, and any change to the wording of either invalidates cached replies. The full and
+    compact variants (template, default LLM_PROMPT_TEMPLATE) hash differently.
+    """
+    return _skill_proficiency_template_hash(get_prompt_template(template))
+
+
+@lru_cache(maxsize=None)
+def _skill_proficiency_template_hash(template: str) -> str:
+    placeholder_occupation = {"onet_id": "{onet_id}", "name": "{name}", "skills": [{"skill_name": "{skill_name}"}]}
+    prompt = generate_skill_proficiency_prompt(occupation_data=placeholder_occupation, template=template)["result"]["prompt"]
+    batch_prompt = generate_batch_skill_proficiency_prompt(occupations_data=[placeholder_occupation], template=template)["result"]["prompt"]
+    return hashlib.sha256(f"{prompt}\n{batch_prompt}".encode("utf-8")).hexdigest()
+
+
+def get_skill_set_hash(prompt_skills_data: List[Dict[str, str]]) -> str:
+    """Order-independent hash of the skills included in a prompt."""
+    skill_keys = sorted(f"{skill.get('skill_element_id')}|{skill.get('skill_name')}" for skill in prompt_skills_data)
+    return hashlib.sha256("\n".join(skill_keys).encode("utf-8")).hexdigest()
+
+
+def _lookup_cached_replies(engine: Engine, cache_key: tuple, max_age_seconds: float) -> Optional[List[Dict[str, Any]]]:
+    """Return the replies of the newest stored request matching cache_key and younger than max_age_seconds."""
+    onet_soc_code, model, template_hash, skill_set_hash = cache_key
+    cutoff = datetime.now(UTC).replace(tzinfo=None) - timedelta(seconds=max_age_seconds)
+
+    latest_request = (
+        select(LLM_Skill_Proficiency_Requests.request_id)
+        .where(
+            LLM_Skill_Proficiency_Requests.request_onet_soc_code == onet_soc_code,
+            LLM_Skill_Proficiency_Requests.request_model == model,
+            LLM_Skill_Proficiency_Requests.prompt_template_hash == template_hash,
+            LLM_Skill_Proficiency_Requests.skill_set_hash == skill_set_hash,
+            LLM_Skill_Proficiency_Requests.request_timestamp >= cutoff
+        )
+        .group_by(LLM_Skill_Proficiency_Requests.request_id)
+        .order_by(func.max(LLM_Skill_Proficiency_Requests.request_timestamp).desc())
+        .limit(1)
+    )
+    replies_query = select(*[getattr(LLM_Skill_Proficiency_Replies, column) for column in _REPLY_COLUMNS]).where(
+        LLM_Skill_Proficiency_Replies.request_id == latest_request.scalar_subquery()
+    )
+
+    with engine.connect() as connection:
+        rows = connection.execute(replies_query).mappings().all()
+    return [dict(row) for row in rows] or None
+
+
+def _as_llm_result(reply_data: List[Dict[str, Any]], prompt_skills_data: List[Dict[str, str]]) -> Dict[str, Any]:
+    """Shape stored replies like a gemini_llm_request result, in the prompt's skill order."""
+    skill_order = {skill.get("skill_name"): position for position, skill in enumerate(prompt_skills_data)}
+    reply_data = sorted(reply_data, key=lambda reply: skill_order.get(reply["llm_skill_name"], len(skill_order)))
+    first_reply = reply_data[0]
+    return {
+        "request_data": [],
+        "reply_data": reply_data,
+        "raw_response": {
+            "skill_proficiency_assessment": {
+                "llm_onet_soc_code": first_reply["llm_onet_soc_code"],
+                "llm_occupation_name": first_reply["llm_occupation_name"],
+                "assessed_skills": [
+                    {column: reply[column] for column in (
+                        "llm_skill_name", "llm_assigned_proficiency_description", "llm_assigned_proficiency_level", "llm_explanation"
+                    )}
+                    for reply in reply_data
+                ]
+            }
+        }
+    }
+
+
+def cached_skill_proficiency_request(
+    prompt: str,
+    request_onet_soc_code: str,
+    prompt_skills_data: List[Dict[str, str]],
+    model: str = DEFAULT_MODEL,
+    engine: Optional[Engine] = None
+) -> Dict[str, Any]:
+    """
+    Return a skill proficiency assessment, reusing a previous one when possible.
+
+    Lookup order:
+    1. In-process TTL/LRU memory tier
+    2. LLM_Skill_Proficiency_Requests/Replies, matched on (occupation, model, prompt template hash,
+       skill set hash) and no older than LLM_PROFICIENCY_CACHE_TTL_SECONDS
+    3. gemini_llm_request; a successful reply is stored in both tiers
+
+    With LLM_PROFICIENCY_CACHE_ENABLED=false this is a plain gemini_llm_request call.
+
+    Args:
+        prompt (str): Skill proficiency prompt from generate_skill_proficiency_prompt.
+        request_onet_soc_code (str): The O*NET SOC code the prompt is about.
+        prompt_skills_data (List[Dict[str, str]]): Skills in the prompt, each with "skill_element_id" and "skill_name".
+        model (str, optional): The Gemini model to use. Defaults to "gemini-2.0-flash".
+        engine (Optional[Engine]): SQLAlchemy engine to use for database operations,
+                                   or None to use the default engine
+
+    Returns:
+        dict: The gemini_llm_request response. result additionally contains
+              "cache": "memory", "database" or "miss".
+    """
+    if not is_proficiency_cache_enabled():
+        return gemini_llm_request(
+            prompt=prompt,
+            request_onet_soc_code=request_onet_soc_code,
+            prompt_skills_data=prompt_skills_data,
+            model=model,
+            expected_response_type="skill_proficiency"
+        )
+
+    template_hash = get_skill_proficiency_template_hash()
+    skill_set_hash = get_skill_set_hash(prompt_skills_data)
+    cache_key = (request_onet_soc_code, model, template_hash, skill_set_hash)
+    memory_cache = get_proficiency_memory_cache()
+
+    cached_result = memory_cache.get(cache_key)
+    if cached_result is not None:
+        return {"success": True, "message": "Skill proficiency assessment served from memory cache", "result": {**cached_result, "cache": "memory"}}
+
+    if engine is None:
+        engine = get_sqlalchemy_engine()
+
+    try:
+        cached_replies = _lookup_cached_replies(engine, cache_key, get_proficiency_cache_ttl())
+    except Exception as e:
+        # A cache lookup failure (e.g. the table is missing) must not block the assessment
+        logger.warning(f"Skill proficiency cache lookup failed for {request_onet_soc_code}: {e}")
+        cached_replies = None
+
+    if cached_replies:
+        cached_result = _as_llm_result(cached_replies, prompt_skills_data)
+        memory_cache.set(cache_key, cached_result)
+        return {"success": True, "message": "Skill proficiency assessment served from database cache", "result": {**cached_result, "cache": "database"}}
+
+    llm_response = gemini_llm_request(
+        prompt=prompt,
+        request_onet_soc_code=request_onet_soc_code,
+        prompt_skills_data=prompt_skills_data,
+        model=model,
+        expected_response_type="skill_proficiency"
+    )
+    if not llm_response["success"] or not llm_response["result"]["reply_data"]:
+        return llm_response
+
+    llm_result = llm_response["result"]
+    _store_llm_results({cache_key: llm_result}, engine)
+    return {**llm_response, "result": {**llm_result, "cache": "miss"}}
+
+
+def _store_llm_results(llm_results: Dict[tuple, Dict[str, Any]], engine: Engine) -> None:
+    """Stamp the cache key hashes on fresh LLM results and store them in both tiers (one bulk load)."""
+    for (_, _, template_hash, skill_set_hash), llm_result in llm_results.items():
+        for request_row in llm_result["request_data"]:
+            request_row["prompt_template_hash"] = template_hash
+            request_row["skill_set_hash"] = skill_set_hash
+
+    combined_output = {
+        "request_data": [row for llm_result in llm_results.values() for row in llm_result["request_data"]],
+        "reply_data": [row for llm_result in llm_results.values() for row in llm_result["reply_data"]]
+    }
+    load_result = mysql_load_llm_skill_proficiencies(llm_assessment_output=combined_output, engine=engine)
+    if not load_result["success"]:
+        codes = ", ".join(cache_key[0] for cache_key in llm_results)
+        logger.warning(f"Skill proficiency assessments for {codes} were not cached: {load_result['message']}")
+
+    memory_cache = get_proficiency_memory_cache()
+    for cache_key, llm_result in llm_results.items():
+        memory_cache.set(cache_key, llm_result)
+
+
+def _prompt_skills(occupation_data: Dict[str, Any]) -> List[Dict[str, str]]:
+    return [{"skill_element_id": skill["skill_element_id"], "skill_name": skill["skill_name"]} for skill in occupation_data["skills"]]
+
+
+def cached_batch_skill_proficiency_request(
+    occupations_data: List[Dict[str, Any]],
+    model: str = DEFAULT_MODEL,
+    engine: Optional[Engine] = None
+) -> Dict[str, Any]:
+    """
+    Return skill proficiency assessments for several occupations, sending every cache miss in as few
+    Gemini requests as possible.
+
+    Each occupation is looked up like cached_skill_proficiency_request. The misses are grouped by
+    plan_skill_proficiency_batches (LLM_PROFICIENCY_BATCH_SIZE occupations within
+    LLM_PROFICIENCY_BATCH_MAX_OUTPUT_TOKENS and LLM_PROMPT_MAX_INPUT_TOKENS) and each group is assessed
+    with one batch_skill_proficiency_request. A lone miss, or an occupation left out of a batched reply,
+    is assessed with the single-occupation prompt, split into several prompts if it exceeds the input
+    budget. If a batched request fails, its occupations fail.
+
+    Args:
+        occupations_data (List[Dict[str, Any]]): Occupations with "onet_id", "name" and "skills"
+                                                 (each skill with "skill_element_id" and "skill_name")
+        model (str, optional): The Gemini model to use. Defaults to "gemini-2.0-flash".
+        engine (Optional[Engine]): SQLAlchemy engine to use for database operations,
+                                   or None to use the default engine
+
+    Returns:
+        dict: {
+            "success": bool,  # True only if every occupation was assessed
+            "message": str,
+            "result": {onet_soc_code: cached_skill_proficiency_request-style response}
+        }
+    """
+    if engine is None:
+        engine = get_sqlalchemy_engine()
+
+    unique_occupations = list({occupation_data["onet_id"]: occupation_data for occupation_data in occupations_data}.values())
+    responses = {}
+    misses = []
+    if is_proficiency_cache_enabled():
+        template_hash = get_skill_proficiency_template_hash()
+        memory_cache = get_proficiency_memory_cache()
+        ttl = get_proficiency_cache_ttl()
+        for occupation_data in unique_occupations:
+            code = occupation_data["onet_id"]
+            prompt_skills_data = _prompt_skills(occupation_data)
+            cache_key = (code, model, template_hash, get_skill_set_hash(prompt_skills_data))
+            cached_result = memory_cache.get(cache_key)
+            if cached_result is not None:
+                responses[code] = {"success": True, "message": "Skill proficiency assessment served from memory cache", "result": {**cached_result, "cache": "memory"}}
+                continue
+            try:
+                cached_replies = _lookup_cached_replies(engine, cache_key, ttl)
+            except Exception as e:
+                logger.warning(f"Skill proficiency cache lookup failed for {code}: {e}")
+                cached_replies = None
+            if cached_replies:
+                cached_result = _as_llm_result(cached_replies, prompt_skills_data)
+                memory_cache.set(cache_key, cached_result)
+                responses[code] = {"success": True, "message": "Skill proficiency assessment served from database cache", "result": {**cached_result, "cache": "database"}}
+            else:
+                misses.append(occupation_data)
+    else:
+        misses = unique_occupations
+
+    single_requests = []
+    if len(misses) == 1:
+        single_requests = misses
+    elif misses:
+        for batch in plan_skill_proficiency_batches(misses, get_proficiency_batch_size(), get_proficiency_batch_max_output_tokens()):
+            if len(batch) == 1:
+                single_requests.extend(batch)
+                continue
+            batch_response = batch_skill_proficiency_request(batch, model=model, max_output_tokens=get_proficiency_batch_max_output_tokens())
+            assessments = batch_response["result"]["assessments"]
+            if assessments and is_proficiency_cache_enabled():
+                template_hash = get_skill_proficiency_template_hash()
+                _store_llm_results({
+                    (occupation_data["onet_id"], model, template_hash, get_skill_set_hash(_prompt_skills(occupation_data))): assessments[occupation_data["onet_id"]]
+                    for occupation_data in batch if occupation_data["onet_id"] in assessments
+                }, engine)
+            for occupation_data in batch:
+                code = occupation_data["onet_id"]
+                if code in assessments:
+                    responses[code] = {"success": True, "message": batch_response["message"], "result": {**assessments[code], "cache": "miss"}}
+                elif code in batch_response["result"]["missing"]:
+                    single_requests.append(occupation_data)
+                else:
+                    responses[code] = {"success": False, "message": batch_response["message"], "result": {}}
+
+    for occupation_data in single_requests:
+        code = occupation_data["onet_id"]
+        prompt_skills_data = _prompt_skills(occupation_data)
+        # An occupation over the input token budget is assessed in parts, merged into one stored assessment
+        llm_response = request_skill_proficiency_within_budget(occupation_data, lambda prompt, part: gemini_llm_request(
+            prompt=prompt,
+            request_onet_soc_code=part["onet_id"],
+            prompt_skills_data=_prompt_skills(part),
+            model=model,
+            expected_response_type="skill_proficiency"
+        ))
+        if llm_response["success"] and llm_response["result"]["reply_data"]:
+            if is_proficiency_cache_enabled():
+                cache_key = (code, model, get_skill_proficiency_template_hash(), get_skill_set_hash(prompt_skills_data))
+                _store_llm_results({cache_key: llm_response["result"]}, engine)
+            llm_response = {**llm_response, "result": {**llm_response["result"], "cache": "miss"}}
+        responses[code] = llm_response
+
+    failed = [code for code, response in responses.items() if not response["success"]]
+    return {
+        "success": not failed,
+        "message": f"Assessed {len(responses) - len(failed)} of {len(responses)} occupations" + (f" (failed: {', '.join(failed)})" if failed else ""),
+        "result": responses
+    }
+
+
+if __name__ == "__main__":
+    print("Minimalistic happy path example for cached_skill_proficiency_request:")
+    print("This example assumes GEMINI_API_KEY and a populated database with configured environment variables.")
+
+    example_skills = [
+        {"skill_element_id": "2.A.1.a", "skill_name": "Reading Comprehension"},
+        {"skill_element_id": "2.A.1.b", "skill_name": "Active Listening"}
+    ]
+    example_prompt = generate_skill_proficiency_prompt(occupation_data={
+        "onet_id": "11-1011.00",
+        "name": "Chief Executives",
+        "skills": example_skills
+    })["result"]["prompt"]
+
+    for attempt in range(2):
+        result = cached_skill_proficiency_request(
+            prompt=example_prompt,
+            request_onet_soc_code="11-1011.00",
+            prompt_skills_data=example_skills
+        )
+        print(f"\n  Attempt {attempt + 1}: {result['message']} (cache: {(result['result'] or {}).get('cache')})")
+
+    print("\nExample finished.")
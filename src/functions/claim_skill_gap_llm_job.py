@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional
+from sqlalchemy import update, and_, or_
+from sqlalchemy.engine import Engine
+
+from src.config.schemas import get_sqlalchemy_engine, Skill_Gap_LLM_Jobs
+
+def claim_skill_gap_llm_job(
+    job_id: str,
+    lease_seconds: Optional[float] = None,
+    engine: Optional[Engine] = None
+) -> Dict[str, Any]:
+    """
+    Atomically moves a job to 'running' so that exactly one worker runs it, even when several processes
+    share the database and queue the same job.
+
+    The claim is a single conditional UPDATE: it only matches a 'queued' job, or, when lease_seconds is
+    given, a 'running' job whose started_at is older than the lease (its worker is presumed dead).
+    Whoever's UPDATE changes the row owns the job; everyone else gets claimed=False and skips it.
+
+    Args:
+        job_id (str): The job to claim
+        lease_seconds (Optional[float]): Age after which a 'running' job may be taken over,
+                                         or None to only claim 'queued' jobs
+        engine (Optional[Engine]): SQLAlchemy engine to use for database operations,
+                                  or None to use the default engine
+
+    Returns:
+        dict: {
+            "success": bool,
+            "message": str,
+            "result": {
+                "job_id": str,
+                "claimed": bool,
+                "started_at": datetime or None   # The claim's started_at, to check ownership on later updates
+            }
+        }
+    """
+    if engine is None:
+        engine = get_sqlalchemy_engine()
+
+    # Whole seconds, so the value compares equal after a round trip through a MySQL DATETIME column
+    started_at = datetime.now().replace(microsecond=0)
+    claimable = Skill_Gap_LLM_Jobs.status == "queued"
+    if lease_seconds is not None:
+        claimable = or_(claimable, and_(
+            Skill_Gap_LLM_Jobs.status == "running",
+            Skill_Gap_LLM_Jobs.started_at < started_at - timedelta(seconds=lease_seconds)
+        ))
+
+    try:
+        with engine.begin() as connection:
+            row_count = connection.execute(
+                update(Skill_Gap_LLM_Jobs)
+                .where(Skill_Gap_LLM_Jobs.job_id == job_id, claimable)
+                .values(status="running", started_at=started_at)
+            ).rowcount
+    except Exception as e:
+        return {
+            "success": False,
+            "message": f"Error claiming skill gap LLM job {job_id}: {str(e)}",
+            "result": {}
+        }
+
+    return {
+        "success": True,
+        "message": f"Claimed skill gap LLM job {job_id}" if row_count else f"Skill gap LLM job {job_id} is not queued or is held by another worker",
+        "result": {"job_id": job_id, "claimed": bool(row_count), "started_at": started_at if row_count else None}
+    }
+
+if __name__ == "__main__":
+    print("Minimalistic happy path example for claim_skill_gap_llm_job:")
+    print("This example assumes a reachable database and configured environment variables.")
+
+    from src.functions.create_skill_gap_llm_job import create_skill_gap_llm_job
+
+    job = create_skill_gap_llm_job("11-1011.00", "15-1252.00")
+    first = claim_skill_gap_llm_job(job["result"]["job_id"])
+    second = claim_skill_gap_llm_job(job["result"]["job_id"])
+
+    print("\nFunction Call Results:")
+    print(f"  First claim: {first['message']}")
+    print(f"  Second claim: {second['message']}")
+
+    print("\nExample finished.")
@@ -0,0 +1,156 @@
+"""
+Vectorized skill gap engine over a dense occupation x skill LV proficiency matrix.
+"""
+from typing import Dict, Any, List, Tuple
+import numpy as np
+
+GAP_TYPES = ("by_lvl", "basic")
+
+def compute_skill_gaps(
+    matrix: Dict[str, Any],
+    pairs: List[Tuple[str, str]],
+    gap_type: str = "by_lvl"
+) -> Dict[str, Any]:
+    """
+    Computes skill gaps for one or many (from, to) occupation pairs with vectorized comparisons and masking.
+
+    The per-pair results are identical to the existing functions:
+    - gap_type "by_lvl": same result as get_skills_gap_by_lvl / identify_skill_gap. A skill is a gap when the
+      target level is > 0 and the source either lacks the skill (level missing or 0, reported as int 0)
+      or has a lower level.
+    - gap_type "basic": same result as get_skills_gap. A skill is a gap when the target level is > 0 and the
+      source lacks the skill (level missing or 0). Gaps are reported as skill names.
+    Gaps are listed in the target occupation's skill order, as in the per-pair functions.
+
+    Args:
+        matrix (Dict[str, Any]): Matrix from build_occupation_skill_matrix / load_occupation_skill_matrix
+        pairs (List[Tuple[str, str]]): (from_onet_soc_code, to_onet_soc_code) pairs
+        gap_type (str): "by_lvl" (default) or "basic"
+
+    Returns:
+        dict: {
+            "success": bool,
+            "message": str,
+            "result": [  # One entry per pair, in input order, shaped like the matching single-pair function's response
+                {"success": bool, "message": str, "result": {"from_occupation_title", "to_occupation_title", "skill_gaps"}},
+                ...
+            ]
+        }
+    """
+    if gap_type not in GAP_TYPES:
+        return {"success": False, "message": f"Invalid gap_type '{gap_type}'. Expected one of {GAP_TYPES}.", "result": []}
+
+    occupation_index = matrix["occupation_index"]
+    titles = matrix["occupation_titles"]
+    element_ids = matrix["element_ids"]
+    element_names = matrix["element_names"]
+    proficiency = matrix["proficiency"]
+    skill_position = matrix["skill_position"]
+
+    results: List[Dict[str, Any]] = [None] * len(pairs)
+    valid_positions = []
+    for position, (from_code, to_code) in enumerate(pairs):
+        if from_code not in occupation_index:
+            results[position] = _missing_occupation_result("source", from_code, "Unknown")
+        elif to_code not in occupation_index:
+            results[position] = _missing_occupation_result("target", to_code, titles[occupation_index[from_code]])
+        else:
+            valid_positions.append(position)
+
+    if valid_positions:
+        from_rows = np.array([occupation_index[pairs[p][0]] for p in valid_positions], dtype=np.intp)
+        to_rows = np.array([occupation_index[pairs[p][1]] for p in valid_positions], dtype=np.intp)
+        from_levels = proficiency[from_rows]
+        to_levels = proficiency[to_rows]
+
+        # Comparisons with NaN are False, so unlisted skills drop out of both masks
+        with np.errstate(invalid="ignore"):
+            to_required = to_levels > 0
+            from_has = from_levels > 0
+            if gap_type == "by_lvl":
+                gap_mask = to_required & (~from_has | (to_levels > from_levels))
+            else:
+                gap_mask = to_required & ~from_has
+
+        for i, position in enumerate(valid_positions):
+            from_title = titles[from_rows[i]]
+            to_title = titles[to_rows[i]]
+            columns = np.flatnonzero(gap_mask[i])
+            columns = columns[np.argsort(skill_position[to_rows[i], columns], kind="stable")]
+            if gap_type == "basic":
+                results[position] = {
+                    "success": True,
+                    "message": f"Successfully identified skill gaps from '{from_title}' to '{to_title}' (excluding skills with proficiency level 0).",
+                    "result": {
+                        "from_occupation_title": from_title,
+                        "to_occupation_title": to_title,
+                        "skill_gaps": [element_names[column] for column in columns]
+                    }
+                }
+            elif not to_required[i].any():
+                results[position] = {
+                    "success": True,
+                    "message": f"No 'LV' scale skills data provided for the 'to' occupation: {to_title}. Cannot identify skill gaps towards it.",
+                    "result": {"skill_gaps": [], "from_occupation_title": from_title, "to_occupation_title": to_title}
+                }
+            else:
+                skill_gaps = [
+                    {
+                        "element_id": element_ids[column],
+                        "element_name": element_names[column],
+                        "scale_id": "LV",
+                        # Levels are DECIMAL(5,2); rounding recovers the exact float the per-pair path produces
+                        "from_data_value": round(float(from_levels[i, column]), 2) if from_has[i, column] else 0,
+                        "to_data_value": round(float(to_levels[i, column]), 2)
+                    }
+                    for column in columns
+                ]
+                results[position] = {
+                    "success": True,
+                    "message": f"Successfully identified skill gap from '{from_title}' to '{to_title}' based on 'LV' scale.",
+                    "result": {"skill_gaps": skill_gaps, "from_occupation_title": from_title, "to_occupation_title": to_title}
+                }
+
+    failed = sum(1 for result in results if not result["success"])
+    return {
+        "success": failed == 0,
+        "message": f"Computed skill gaps for {len(pairs) - failed}/{len(pairs)} occupation pairs",
+        "result": results
+    }
+
+def _missing_occupation_result(side: str, occupation_code: str, from_title: str) -> Dict[str, Any]:
+    return {
+        "success": False,
+        "message": f"Error retrieving {side} occupation data: Occupation {occupation_code} not found in skill matrix",
+        "result": {
+            "from_occupation_title": from_title,
+            "to_occupation_title": "Unknown",
+            "skill_gaps": []
+        }
+    }
+
+if __name__ == "__main__":
+    print("Minimalistic happy path example for compute_skill_gaps:")
+
+    from src.functions.build_occupation_skill_matrix import build_occupation_skill_matrix
+
+    occupations = {
+        "11-1011.00": {"onet_id": "11-1011.00", "name": "Chief Executives", "skills": [
+            {"skill_element_id": "2.A.1.a", "skill_name": "Reading Comprehension", "proficiency_level": 4.75},
+            {"skill_element_id": "2.B.3.e", "skill_name": "Programming", "proficiency_level": 0}]},
+        "15-1252.00": {"onet_id": "15-1252.00", "name": "Software Developers", "skills": [
+            {"skill_element_id": "2.A.1.a", "skill_name": "Reading Comprehension", "proficiency_level": 4.12},
+            {"skill_element_id": "2.B.3.e", "skill_name": "Programming", "proficiency_level": 5.12}]},
+    }
+    matrix = build_occupation_skill_matrix(occupations)["result"]
+    result = compute_skill_gaps(matrix, [("11-1011.00", "15-1252.00"), ("15-1252.00", "11-1011.00")])
+
+    print("\nFunction Call Result:")
+    print(f"  Success: {result['success']}")
+    print(f"  Message: {result['message']}")
+    for pair_result in result["result"]:
+        print(f"  {pair_result['message']}")
+        for gap in pair_result["result"]["skill_gaps"]:
+            print(f"    - {gap['element_name']}: {gap['from_data_value']} -> {gap['to_data_value']}")
+
+    print("\nExample finished.")
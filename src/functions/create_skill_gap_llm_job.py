@@ -0,0 +1,75 @@
+import uuid
+from datetime import datetime
+from typing import Dict, Any, Optional
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+
+from src.config.schemas import get_sqlalchemy_engine, Skill_Gap_LLM_Jobs
+
+def create_skill_gap_llm_job(
+    from_onet_soc_code: str,
+    to_onet_soc_code: str,
+    engine: Optional[Engine] = None
+) -> Dict[str, Any]:
+    """
+    Inserts a new 'queued' job into the Skill_Gap_LLM_Jobs table.
+    The table is created if it does not exist yet, so older databases do not need re-initialising.
+
+    Args:
+        from_onet_soc_code (str): The O*NET-SOC code for the source occupation
+        to_onet_soc_code (str): The O*NET-SOC code for the target occupation
+        engine (Optional[Engine]): SQLAlchemy engine to use for database operations,
+                                  or None to use the default engine
+
+    Returns:
+        dict: {
+            "success": bool,
+            "message": str,
+            "result": {"job_id": str, "status": "queued", "created_at": str}
+        }
+    """
+    if engine is None:
+        engine = get_sqlalchemy_engine()
+
+    job_id = str(uuid.uuid4())
+    created_at = datetime.now()
+
+    try:
+        Skill_Gap_LLM_Jobs.__table__.create(engine, checkfirst=True)
+        with engine.begin() as connection:
+            connection.execute(insert(Skill_Gap_LLM_Jobs).values(
+                job_id=job_id,
+                from_onet_soc_code=from_onet_soc_code,
+                to_onet_soc_code=to_onet_soc_code,
+                status="queued",
+                created_at=created_at
+            ))
+    except Exception as e:
+        return {
+            "success": False,
+            "message": f"Error creating skill gap LLM job for {from_onet_soc_code} -> {to_onet_soc_code}: {str(e)}",
+            "result": {}
+        }
+
+    return {
+        "success": True,
+        "message": f"Queued skill gap LLM job {job_id}",
+        "result": {
+            "job_id": job_id,
+            "status": "queued",
+            "created_at": created_at.isoformat()
+        }
+    }
+
+if __name__ == "__main__":
+    print("Minimalistic happy path example for create_skill_gap_llm_job:")
+    print("This example assumes a reachable database and configured environment variables.")
+
+    result = create_skill_gap_llm_job("11-1011.00", "15-1252.00")
+
+    print("\nFunction Call Result:")
+    print(f"  Success: {result['success']}")
+    print(f"  Message: {result['message']}")
+    print(f"  Result: {result['result']}")
+
+    print("\nExample finished.")
@@ -1,19 +1,21 @@
 import os
 import pandas as pd
+from functools import partial
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from src.config.schemas import OnetMappings, Onet_Occupations_Landing, Onet_Skills_Landing, Onet_Scales_Landing
-from src.functions.textfile_to_dataframe import textfile_to_dataframe
+from src.functions.textfile_to_dataframe import textfile_to_dataframe, textfile_to_dataframe_chunks
 
-def extract_occupations(file_path: Optional[str] = None) -> Dict[str, Any]:
+def extract_occupations(file_path: Optional[str] = None, chunksize: Optional[int] = None) -> Dict[str, Any]:
     """
     Extract occupations data from O*NET text file.
     
     Args:
         file_path (Optional[str]): Path to the occupations file. If None, uses default path.
+        chunksize (Optional[int]): If set, read the file lazily in chunks of this many rows.
         
     Returns:
-        Dict[str, Any]: Dictionary with 'success', 'df', and 'error' keys
+        Dict[str, Any]: Dictionary with 'success', 'df' (or 'chunks' when chunksize is set), and 'error' keys
     """
     if file_path is None:
         project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
@@ -21,21 +23,23 @@ def extract_occupations(file_path: Optional[str] = None) -> Dict[str, Any]:
     
     dtype = {col: str for col in Onet_Occupations_Landing.string_columns}
     
-    return textfile_to_dataframe(
+    read_textfile = textfile_to_dataframe if chunksize is None else partial(textfile_to_dataframe_chunks, chunksize=chunksize)
+    return read_textfile(
         file_path=file_path,
         column_rename_map=OnetMappings.OCCUPATIONS_COLUMN_RENAME_MAP,
         dtype=dtype
     )
 
-def extract_skills(file_path: Optional[str] = None) -> Dict[str, Any]:
+def extract_skills(file_path: Optional[str] = None, chunksize: Optional[int] = None) -> Dict[str, Any]:
     """
     Extract skills data from O*NET text file.
     
     Args:
         file_path (Optional[str]): Path to the skills file. If None, uses default path.
+        chunksize (Optional[int]): If set, read the file lazily in chunks of this many rows.
         
     Returns:
-        Dict[str, Any]: Dictionary with 'success', 'df', and 'error' keys
+        Dict[str, Any]: Dictionary with 'success', 'df' (or 'chunks' when chunksize is set), and 'error' keys
     """
     if file_path is None:
         project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
@@ -55,22 +59,24 @@ def extract_skills(file_path: Optional[str] = None) -> Dict[str, Any]:
         'domain_source': str
     }
     
-    return textfile_to_dataframe(
+    read_textfile = textfile_to_dataframe if chunksize is None else partial(textfile_to_dataframe_chunks, chunksize=chunksize)
+    return read_textfile(
         file_path=file_path,
         column_rename_map=OnetMappings.SKILLS_COLUMN_RENAME_MAP,
         dtype=dtype,
         date_columns=['date_recorded']
     )
 
-def extract_scales(file_path: Optional[str] = None) -> Dict[str, Any]:
+def extract_scales(file_path: Optional[str] = None, chunksize: Optional[int] = None) -> Dict[str, Any]:
     """
     Extract scales data from O*NET text file.
     
     Args:
         file_path (Optional[str]): Path to the scales file. If None, uses default path.
+        chunksize (Optional[int]): If set, read the file lazily in chunks of this many rows.
         
     Returns:
-        Dict[str, Any]: Dictionary with 'success', 'df', and 'error' keys
+        Dict[str, Any]: Dictionary with 'success', 'df' (or 'chunks' when chunksize is set), and 'error' keys
     """
     if file_path is None:
         project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
@@ -83,7 +89,8 @@ def extract_scales(file_path: Optional[str] = None) -> Dict[str, Any]:
         'maximum': 'Int64'
     }
     
-    return textfile_to_dataframe(
+    read_textfile = textfile_to_dataframe if chunksize is None else partial(textfile_to_dataframe_chunks, chunksize=chunksize)
+    return read_textfile(
         file_path=file_path,
         column_rename_map=OnetMappings.SCALES_COLUMN_RENAME_MAP,
         dtype=dtype
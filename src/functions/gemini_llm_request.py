@@ -6,9 +6,22 @@ import json
 import requests
 import uuid # Added for request_id
 import re  # Added for better JSON cleaning
+import time
+import threading
 from datetime import datetime, UTC # Added UTC for timezone-aware datetime
 from typing import Dict, Any, List # Added List for prompt_skills_data
 
+from src.config.http_session import get_http_session, get_connect_timeout
+from src.config.gemini_rate_limiter import (
+    RETRYABLE_STATUS_CODES, get_gemini_rate_limiter, get_max_retries, get_request_timeout,
+    get_backoff_delay, parse_retry_after, estimate_tokens
+)
+from src.config.gemini_structured_output import (
+    get_structured_generation_config, get_response_schema, matches_schema, record_parse_strategy
+)
+from src.config.llm_debug_sink import get_llm_debug_sink
+from src.config.llm_prompt_budget import record_prompt_tokens
+
 def gemini_llm_request(
     prompt: str,
     request_onet_soc_code: str, # Added
@@ -26,12 +39,16 @@ def gemini_llm_request(
         request_onet_soc_code (str): The O*NET SOC code for the occupation this prompt pertains to.
         prompt_skills_data (List[Dict[str, str]]): A list of skill dicts included in the prompt,
                                                    each with "skill_element_id" and "skill_name".
+                                                   An optional "onet_soc_code" overrides request_onet_soc_code
+                                                   for that skill's request row (batched prompts).
         model (str, optional): The Gemini model to use. Defaults to "gemini-2.0-flash".
         temperature (float, optional): Controls randomness of output. Defaults to 0.7.
         max_tokens (int, optional): Maximum number of tokens to generate. Defaults to 1024.
         expected_response_type (str): Type of expected response structure. Options:
                                      - "skill_proficiency": Expects skill_proficiency_assessment format
                                      - "skill_gap_analysis": Expects skill_gap_analysis format
+                                     - "batch_skill_proficiency": Expects skill_proficiency_assessments
+                                       (a list of skill_proficiency_assessment objects)
         
     Returns:
         dict: Standard response format with keys:
@@ -53,11 +70,14 @@ def gemini_llm_request(
     base_url = "https://generativelanguage.googleapis.com/v1beta/models"
     url = f"{base_url}/{model}:generateContent?key={api_key}"
     
+    # Constrain the reply to the expected JSON schema (GEMINI_STRUCTURED_OUTPUT)
+    structured_config = get_structured_generation_config(expected_response_type)
     payload = {
         "contents": [{"parts": [{"text": prompt}]}],
         "generationConfig": {
             "temperature": temperature,
-            "maxOutputTokens": max_tokens
+            "maxOutputTokens": max_tokens,
+            **structured_config
         }
     }
     
@@ -74,90 +94,30 @@ def gemini_llm_request(
     batch_request_id = str(uuid.uuid4()) 
 
     # Prepare request_data: one entry per skill in the prompt
-    request_data_list = []
-    for skill_info in prompt_skills_data:
-        request_data_list.append({
-            "request_id": batch_request_id,
-            "request_model": model,
-            "request_onet_soc_code": request_onet_soc_code,
-            "request_skill_element_id": skill_info.get("skill_element_id"),
-            "request_skill_name": skill_info.get("skill_name"),
-            "request_timestamp": current_timestamp
-        })
+    request_data_list = _build_request_data(prompt_skills_data, batch_request_id, model, request_onet_soc_code, current_timestamp)
 
     try:
-        response = requests.post(url, json=payload)
+        estimated_tokens = estimate_tokens(prompt)
+        record_prompt_tokens(expected_response_type, estimated_tokens)
+        response = _post_with_retries(url, payload, estimated_tokens)
         response_data = response.json()
+        get_gemini_rate_limiter().record_token_usage(
+            estimated_tokens, (response_data.get("usageMetadata") or {}).get("totalTokenCount")
+        )
         
         if response.status_code == 200:
             try:
                 generated_text = response_data["candidates"][0]["content"]["parts"][0]["text"]
-                
-                # Save the raw response to a file for debugging
-                debug_dir = "src/functions/llm_debug_responses"
-                if not os.path.exists(debug_dir):
-                    raise FileNotFoundError(f"Debug directory {debug_dir} does not exist")
-                if os.path.exists(debug_dir):
-                    try:
-                        response_filename = os.path.join(debug_dir, f"llm_response_{batch_request_id}_{expected_response_type}.txt")
-                        with open(response_filename, "w") as f:
-                            f.write(f"--- PROMPT SENT TO LLM ({expected_response_type} for {request_onet_soc_code}) ---\\n")
-                            f.write(prompt + "\\n\\n")
-                            f.write("--- RAW LLM RESPONSE ---\\n")
-                            f.write(generated_text)
-                        # print(f"LLM response saved to {response_filename}") # Optional: for live logging if needed
-                    except Exception as e_save:
-                        # Log or print that saving the debug file failed, but don't stop the main flow.
-                        print(f"Warning: Could not save LLM debug response to file: {e_save}")
-
-                # Enhanced JSON parsing with multiple cleaning strategies
-                llm_output_json = _parse_llm_json_response(generated_text)
-                
-                if llm_output_json is None:
-                    return {
-                        "success": False,
-                        "message": "LLM response text could not be parsed as valid JSON after all cleaning attempts",
-                        "result": {"request_data": request_data_list, "reply_data": [], "raw_llm_response": generated_text}
-                    }
-
-                # Process response based on expected type
-                if expected_response_type == "skill_proficiency":
-                    reply_data_list = _process_skill_proficiency_response(
-                        llm_output_json, batch_request_id, request_onet_soc_code, current_timestamp
-                    )
-                elif expected_response_type == "skill_gap_analysis":
-                    reply_data_list = _process_skill_gap_analysis_response(
-                        llm_output_json, batch_request_id, request_onet_soc_code, current_timestamp
-                    )
-                else:
-                    return {
-                        "success": False,
-                        "message": f"Unknown expected_response_type: {expected_response_type}",
-                        "result": {"request_data": request_data_list, "reply_data": [], "raw_response": llm_output_json}
-                    }
-                
-                if reply_data_list is None:
-                    return {
-                        "success": False,
-                        "message": f"Parsed LLM output does not match expected {expected_response_type} structure.",
-                        "result": {"request_data": request_data_list, "reply_data": [], "raw_response": llm_output_json}
-                    }
-                
-                return {
-                    "success": True,
-                    "message": "Successfully generated and parsed response from Gemini API",
-                    "result": {
-                        "request_data": request_data_list,
-                        "reply_data": reply_data_list,
-                        "raw_response": llm_output_json
-                    }
-                }
             except (KeyError, IndexError, TypeError) as e_parse: # Added TypeError for safety with .get()
                 return {
                     "success": False,
                     "message": f"Failed to parse Gemini API response structure: {str(e_parse)}",
                     "result": {"request_data": request_data_list, "reply_data": [], "raw_api_response": response_data}
                 }
+            return _build_llm_result(
+                prompt, generated_text, request_data_list, batch_request_id, request_onet_soc_code,
+                current_timestamp, expected_response_type, structured_output=bool(structured_config)
+            )
         else:
             error_message = response_data.get("error", {}).get("message", "Unknown error")
             return {
@@ -174,9 +134,177 @@ def gemini_llm_request(
         }
 
 
+def _build_request_data(
+    prompt_skills_data: List[Dict[str, str]],
+    batch_request_id: str,
+    model: str,
+    request_onet_soc_code: str,
+    current_timestamp
+) -> List[Dict[str, Any]]:
+    """One LLM_Skill_Proficiency_Requests row per skill in the prompt."""
+    return [
+        {
+            "request_id": batch_request_id,
+            "request_model": model,
+            "request_onet_soc_code": skill_info.get("onet_soc_code", request_onet_soc_code),
+            "request_skill_element_id": skill_info.get("skill_element_id"),
+            "request_skill_name": skill_info.get("skill_name"),
+            "request_timestamp": current_timestamp
+        }
+        for skill_info in prompt_skills_data
+    ]
+
+
+def _build_llm_result(
+    prompt: str,
+    generated_text: str,
+    request_data_list: List[Dict[str, Any]],
+    batch_request_id: str,
+    request_onet_soc_code: str,
+    current_timestamp,
+    expected_response_type: str,
+    structured_output: bool = False
+) -> Dict[str, Any]:
+    """
+    Parse the model's reply text and shape it as the gemini_llm_request response.
+    With structured_output, a reply that validates against the response schema skips the repair strategies.
+    """
+    # Hand a debug copy to the background sink; it samples and queues without touching the disk
+    get_llm_debug_sink().submit({
+        "timestamp": current_timestamp.isoformat(),
+        "request_id": batch_request_id,
+        "expected_response_type": expected_response_type,
+        "request_onet_soc_code": request_onet_soc_code,
+        "prompt": prompt,
+        "response_text": generated_text
+    })
+
+    llm_output_json = _parse_structured_response(generated_text, expected_response_type) if structured_output else None
+    if llm_output_json is None:
+        # Enhanced JSON parsing with multiple cleaning strategies
+        llm_output_json = _parse_llm_json_response(generated_text)
+    
+    if llm_output_json is None:
+        return {
+            "success": False,
+            "message": "LLM response text could not be parsed as valid JSON after all cleaning attempts",
+            "result": {"request_data": request_data_list, "reply_data": [], "raw_llm_response": generated_text}
+        }
+
+    # Process response based on expected type
+    try:
+        if expected_response_type == "skill_proficiency":
+            reply_data_list = _process_skill_proficiency_response(
+                llm_output_json, batch_request_id, request_onet_soc_code, current_timestamp
+            )
+        elif expected_response_type == "batch_skill_proficiency":
+            reply_data_list = _process_batch_skill_proficiency_response(
+                llm_output_json, batch_request_id, request_onet_soc_code, current_timestamp
+            )
+        elif expected_response_type == "skill_gap_analysis":
+            reply_data_list = _process_skill_gap_analysis_response(
+                llm_output_json, batch_request_id, request_onet_soc_code, current_timestamp
+            )
+        else:
+            return {
+                "success": False,
+                "message": f"Unknown expected_response_type: {expected_response_type}",
+                "result": {"request_data": request_data_list, "reply_data": [], "raw_response": llm_output_json}
+            }
+    except (KeyError, IndexError, TypeError, AttributeError) as e_parse:
+        return {
+            "success": False,
+            "message": f"Failed to parse Gemini API response structure: {str(e_parse)}",
+            "result": {"request_data": request_data_list, "reply_data": [], "raw_response": llm_output_json}
+        }
+    
+    if reply_data_list is None:
+        return {
+            "success": False,
+            "message": f"Parsed LLM output does not match expected {expected_response_type} structure.",
+            "result": {"request_data": request_data_list, "reply_data": [], "raw_response": llm_output_json}
+        }
+    
+    return {
+        "success": True,
+        "message": "Successfully generated and parsed response from Gemini API",
+        "result": {
+            "request_data": request_data_list,
+            "reply_data": reply_data_list,
+            "raw_response": llm_output_json
+        }
+    }
+
+
+def _post_with_retries(url: str, payload: Dict[str, Any], estimated_tokens: int, stream: bool = False):
+    """
+    POST to the Gemini API over the shared keep-alive session (src/config/http_session.py) and through
+    the process-wide rate limiter, retrying retryable statuses, timeouts and connection errors with
+    backoff (see src/config/gemini_rate_limiter.py).
+    Returns the last response; raises the last exception if every attempt raised.
+
+    With stream=True the body is left unread, so only failures before the first byte are retried, and
+    (response, release) is returned: the concurrency slot stays taken while the body streams, and the
+    caller must call release() once it has finished reading and closed the response.
+    """
+    limiter = get_gemini_rate_limiter()
+    limiter.start_call()
+    session = get_http_session()
+    timeout = (get_connect_timeout(), get_request_timeout())
+    max_retries = get_max_retries()
+    for attempt in range(max_retries + 1):
+        limiter.acquire(estimated_tokens)
+        try:
+            response = session.post(url, json=payload, timeout=timeout, stream=stream)
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+            limiter.release(status_code=None)
+            if attempt == max_retries:
+                raise
+            delay = get_backoff_delay(attempt)
+        else:
+            if response.status_code not in RETRYABLE_STATUS_CODES or attempt == max_retries:
+                if stream:
+                    return response, _release_once(limiter, response.status_code)
+                limiter.release(status_code=response.status_code)
+                return response
+            limiter.release(status_code=response.status_code)
+            try:
+                error_body = response.json()
+            except ValueError:
+                error_body = None
+            if stream:
+                response.close()
+            delay = get_backoff_delay(attempt, parse_retry_after(response.headers.get("Retry-After"), error_body))
+        limiter.record_retry(delay)
+        time.sleep(delay)
+
+
+def _release_once(limiter, status_code: int):
+    """Return a callback freeing the limiter slot of a streamed response; later calls do nothing."""
+    released = threading.Lock()
+
+    def release() -> None:
+        if released.acquire(blocking=False):
+            limiter.release(status_code=status_code)
+    return release
+
+
+def _parse_structured_response(generated_text: str, expected_response_type: str) -> Dict[str, Any] | None:
+    """Parse a schema-constrained reply; None if it is not valid JSON matching the response schema."""
+    try:
+        llm_output_json = json.loads(generated_text)
+    except json.JSONDecodeError:
+        return None
+    if not matches_schema(llm_output_json, get_response_schema(expected_response_type)):
+        return None
+    record_parse_strategy("structured")
+    return llm_output_json
+
+
 def _parse_llm_json_response(generated_text: str) -> Dict[str, Any] | None:
     """
     Enhanced JSON parsing with multiple cleaning strategies.
+    Each parsed reply is counted under the strategy that succeeded (see src/config/gemini_structured_output.py).
     
     Args:
         generated_text (str): Raw text response from LLM
@@ -186,7 +314,9 @@ def _parse_llm_json_response(generated_text: str) -> Dict[str, Any] | None:
     """
     # Strategy 1: Direct parsing
     try:
-        return json.loads(generated_text)
+        llm_output_json = json.loads(generated_text)
+        record_parse_strategy("direct")
+        return llm_output_json
     except json.JSONDecodeError:
         pass
     
@@ -200,7 +330,9 @@ def _parse_llm_json_response(generated_text: str) -> Dict[str, Any] | None:
         cleaned_text = cleaned_text[:-len("```")].strip()
     
     try:
-        return json.loads(cleaned_text)
+        llm_output_json = json.loads(cleaned_text)
+        record_parse_strategy("strip_fences")
+        return llm_output_json
     except json.JSONDecodeError:
         pass
     
@@ -209,7 +341,9 @@ def _parse_llm_json_response(generated_text: str) -> Dict[str, Any] | None:
     json_match = re.search(json_pattern, cleaned_text, re.DOTALL)
     if json_match:
         try:
-            return json.loads(json_match.group())
+            llm_output_json = json.loads(json_match.group())
+            record_parse_strategy("regex_block")
+            return llm_output_json
         except json.JSONDecodeError:
             pass
     
@@ -250,15 +384,20 @@ def _parse_llm_json_response(generated_text: str) -> Dict[str, Any] | None:
         fixed_text = escape_quotes_in_strings(cleaned_text)
         # Fix trailing commas
         fixed_text = re.sub(r',(\\s*[}\\]])', r'\\1', fixed_text)
-        return json.loads(fixed_text)
+        llm_output_json = json.loads(fixed_text)
+        record_parse_strategy("escape_quotes")
+        return llm_output_json
     except json.JSONDecodeError:
         # Try one more pass with the original cleaned_text after attempting to fix trailing commas only
         try:
             fixed_text_trailing_only = re.sub(r',(\\s*[}\\]])', r'\\1', cleaned_text)
-            return json.loads(fixed_text_trailing_only)
+            llm_output_json = json.loads(fixed_text_trailing_only)
+            record_parse_strategy("trailing_commas")
+            return llm_output_json
         except json.JSONDecodeError:
             pass
 
+    record_parse_strategy("failed")
     return None
 
 
@@ -295,6 +434,29 @@ def _process_skill_proficiency_response(
     return reply_data_list
 
 
+def _process_batch_skill_proficiency_response(
+    llm_output_json: Dict[str, Any],
+    batch_request_id: str,
+    request_onet_soc_code: str,
+    current_timestamp
+) -> List[Dict[str, Any]] | None:
+    """Process batched skill proficiency assessment response format (one assessment per occupation)."""
+    if not isinstance(llm_output_json, dict) or \
+       not isinstance(llm_output_json.get("skill_proficiency_assessments"), list):
+        return None
+
+    reply_data_list = []
+    for assessment in llm_output_json["skill_proficiency_assessments"]:
+        occupation_replies = _process_skill_proficiency_response(
+            {"skill_proficiency_assessment": assessment}, batch_request_id, request_onet_soc_code, current_timestamp
+        )
+        # Skip malformed occupations; the caller reports occupations missing from the reply
+        if occupation_replies:
+            reply_data_list.extend(occupation_replies)
+
+    return reply_data_list
+
+
 def _process_skill_gap_analysis_response(
     llm_output_json: Dict[str, Any], 
     batch_request_id: str, 
@@ -364,19 +526,20 @@ if __name__ == "__main__":
     print(f"\n--- Simulating LLM call for occupation: {example_onet_soc_code} ---")
     # In a real scenario, the 'prompt' arg would be from gemini_llm_prompt
     # For this __main__, we use a hardcoded example of the *expected LLM text output* 
-    # and then mock the requests.post call to return it, to test the parsing logic.
+    # and then mock the shared session's post call to return it, to test the parsing logic.
 
     class MockResponse:
         def __init__(self, json_data, status_code):
             self.json_data = json_data
             self.status_code = status_code
+            self.headers = {}
             self.text = json.dumps(json_data) # requests.Response has a .text attribute
 
         def json(self):
             return self.json_data
 
-    # This function will be used to mock requests.post
-    def mock_requests_post(url, json):
+    # This function will be used to mock the shared session's post
+    def mock_requests_post(url, json, **kwargs):
         # Simulate the Gemini API's actual response structure
         # where the 'text' is the string we defined in test_prompt
         gemini_response_structure = {
@@ -389,8 +552,9 @@ if __name__ == "__main__":
         }
         return MockResponse(gemini_response_structure, 200)
 
-    original_requests_post = requests.post
-    requests.post = mock_requests_post
+    shared_session = get_http_session()
+    original_requests_post = shared_session.post
+    shared_session.post = mock_requests_post
 
     actual_prompt_for_llm = "This is the actual prompt generated by gemini_llm_prompt for Chief Executives and its skills..."
     result = gemini_llm_request(
@@ -400,7 +564,7 @@ if __name__ == "__main__":
         model="gemini-pro" # Using the default for the example
     )
     
-    requests.post = original_requests_post # Restore original function
+    shared_session.post = original_requests_post # Restore original function
 
     print("\nFunction Call Result:")
     print(f"  Success: {result['success']}")
@@ -0,0 +1,180 @@
+"""
+Send a prompt to the Gemini streaming endpoint and hand out reply items while the reply is generated.
+"""
+import os
+import json
+import uuid
+from datetime import datetime, UTC
+from typing import Dict, Any, List, Callable, Optional
+
+from src.config.gemini_rate_limiter import get_gemini_rate_limiter, estimate_tokens
+from src.config.gemini_structured_output import get_structured_generation_config
+from src.config.incremental_json_parser import IncrementalJsonArrayParser
+from src.config.llm_prompt_budget import record_prompt_tokens
+from src.functions.gemini_llm_request import _post_with_retries, _build_request_data, _build_llm_result
+
+# Array whose items are handed out incrementally, per expected_response_type
+STREAMED_ARRAY_KEYS = {
+    "skill_proficiency": "assessed_skills",
+    "batch_skill_proficiency": "skill_proficiency_assessments",
+    "skill_gap_analysis": "skill_gaps"
+}
+
+
+def _iter_sse_events(response):
+    """Yield the JSON payload of every `data:` line of a server-sent event stream."""
+    for line in response.iter_lines():
+        if not line:
+            continue
+        text = line.decode("utf-8") if isinstance(line, bytes) else line
+        if text.startswith("data:"):
+            yield json.loads(text[len("data:"):].strip())
+
+
+def gemini_llm_stream_request(
+    prompt: str,
+    request_onet_soc_code: str,
+    prompt_skills_data: List[Dict[str, str]],
+    model: str = "gemini-2.0-flash",
+    temperature: float = 0.7,
+    max_tokens: int = 6024,
+    expected_response_type: str = "skill_proficiency",
+    on_item: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """
+    Streaming variant of gemini_llm_request using the streamGenerateContent endpoint (server-sent events).
+
+    While the reply is generated, every completed item of its main array ("assessed_skills",
+    "skill_proficiency_assessments" or "skill_gaps", see STREAMED_ARRAY_KEYS) is passed to on_item
+    as the raw dict written by the model. When the stream ends, the full reply is parsed exactly like
+    gemini_llm_request, so the return value is the same. Rate limiting and retries apply until the
+    stream starts; a stream that breaks off midway fails without a retry, because items have already
+    been handed out. The stream holds a Gemini concurrency slot until it is closed.
+
+    Args:
+        prompt (str): The text prompt to send to the model.
+        request_onet_soc_code (str): The O*NET SOC code for the occupation this prompt pertains to.
+        prompt_skills_data (List[Dict[str, str]]): Skills in the prompt, as for gemini_llm_request.
+        model (str, optional): The Gemini model to use. Defaults to "gemini-2.0-flash".
+        temperature (float, optional): Controls randomness of output. Defaults to 0.7.
+        max_tokens (int, optional): Maximum number of tokens to generate. Defaults to 6024.
+        expected_response_type (str): "skill_proficiency", "batch_skill_proficiency" or "skill_gap_analysis".
+        on_item (Optional[Callable[[Dict[str, Any]], None]]): Called from this thread with each completed item.
+
+    Returns:
+        dict: The gemini_llm_request response. result additionally contains
+              "streamed_items" (int), the number of items passed to on_item.
+    """
+    api_key = os.environ.get("GEMINI_API_KEY")
+    if not api_key:
+        return {
+            "success": False,
+            "message": "GEMINI_API_KEY not found in environment variables",
+            "result": None
+        }
+    if expected_response_type not in STREAMED_ARRAY_KEYS:
+        return {
+            "success": False,
+            "message": f"Unknown expected_response_type: {expected_response_type}",
+            "result": None
+        }
+    if not isinstance(prompt_skills_data, list) or not all(isinstance(item, dict) for item in prompt_skills_data):
+        return {
+            "success": False,
+            "message": "Invalid prompt_skills_data format. Expected a list of dictionaries.",
+            "result": None
+        }
+
+    url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:streamGenerateContent?alt=sse&key={api_key}"
+    structured_config = get_structured_generation_config(expected_response_type)
+    payload = {
+        "contents": [{"parts": [{"text": prompt}]}],
+        "generationConfig": {
+            "temperature": temperature,
+            "maxOutputTokens": max_tokens,
+            **structured_config
+        }
+    }
+
+    current_timestamp = datetime.now(UTC)
+    batch_request_id = str(uuid.uuid4())
+    request_data_list = _build_request_data(prompt_skills_data, batch_request_id, model, request_onet_soc_code, current_timestamp)
+    parser = IncrementalJsonArrayParser(STREAMED_ARRAY_KEYS[expected_response_type])
+    streamed_items = 0
+
+    try:
+        estimated_tokens = estimate_tokens(prompt)
+        record_prompt_tokens(expected_response_type, estimated_tokens)
+        response, release = _post_with_retries(url, payload, estimated_tokens, stream=True)
+        try:
+            if response.status_code != 200:
+                response_data = response.json()
+                error_message = response_data.get("error", {}).get("message", "Unknown error")
+                return {
+                    "success": False,
+                    "message": f"Gemini API returned error: {error_message}",
+                    "result": {"request_data": request_data_list, "reply_data": [], "raw_api_response_data": response_data}
+                }
+
+            text_parts = []
+            reported_tokens = None
+            for event in _iter_sse_events(response):
+                reported_tokens = (event.get("usageMetadata") or {}).get("totalTokenCount", reported_tokens)
+                for candidate in (event.get("candidates") or [])[:1]:
+                    for part in (candidate.get("content") or {}).get("parts") or []:
+                        text = part.get("text") or ""
+                        text_parts.append(text)
+                        for item in parser.feed(text):
+                            streamed_items += 1
+                            if on_item is not None:
+                                on_item(item)
+        finally:
+            response.close()
+            # The concurrency slot is held until the whole reply has streamed (GEMINI_MAX_CONCURRENCY)
+            release()
+
+        get_gemini_rate_limiter().record_token_usage(estimated_tokens, reported_tokens)
+        if not text_parts:
+            return {
+                "success": False,
+                "message": "Gemini API stream ended without any reply text",
+                "result": {"request_data": request_data_list, "reply_data": [], "streamed_items": 0}
+            }
+
+        llm_response = _build_llm_result(
+            prompt, "".join(text_parts), request_data_list, batch_request_id, request_onet_soc_code,
+            current_timestamp, expected_response_type, structured_output=bool(structured_config)
+        )
+        llm_response["result"]["streamed_items"] = streamed_items
+        return llm_response
+
+    except Exception as e_req:
+        return {
+            "success": False,
+            "message": f"Exception occurred while streaming from Gemini API: {str(e_req)}",
+            "result": {"request_data": request_data_list, "reply_data": [], "streamed_items": streamed_items}
+        }
+
+
+if __name__ == "__main__":
+    print("Minimalistic happy path example for gemini_llm_stream_request:")
+    print("This example assumes GEMINI_API_KEY environment variable is correctly set.")
+
+    example_prompt = (
+        'Reply with this JSON only: {"skill_gap_analysis": {"to_occupation": "Software Developers", "skill_gaps": '
+        '[{"skill_name": "Programming", "gap_description": "Learn to program"}, '
+        '{"skill_name": "Writing", "gap_description": "Write design documents"}]}}'
+    )
+    result = gemini_llm_stream_request(
+        prompt=example_prompt,
+        request_onet_soc_code="15-1252.00",
+        prompt_skills_data=[{"skill_element_id": "2.B.3.e", "skill_name": "Programming"}, {"skill_element_id": "2.A.1.c", "skill_name": "Writing"}],
+        expected_response_type="skill_gap_analysis",
+        on_item=lambda item: print(f"\n  Streamed item: {item}")
+    )
+
+    print("\nFunction Call Result:")
+    print(f"  Success: {result['success']}")
+    print(f"  Message: {result['message']}")
+
+    print("\nExample finished.")
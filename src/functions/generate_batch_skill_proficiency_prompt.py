@@ -0,0 +1,145 @@
+"""
+Generate a prompt for the LLM to assess skill proficiency levels for several occupations in one request.
+"""
+from typing import Dict, List, Any, Optional
+
+from src.config.gemini_rate_limiter import estimate_tokens
+from src.config.llm_prompt_budget import get_prompt_template
+
+def generate_batch_skill_proficiency_prompt(occupations_data: List[Dict[str, Any]], template: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Generate a skill proficiency assessment prompt covering several occupations.
+
+    The instructions match generate_skill_proficiency_prompt; the reply is a list with one
+    skill_proficiency_assessment object per occupation, identified by its O*NET code.
+
+    Args:
+        occupations_data (List[Dict[str, Any]]): Occupations to assess, each with "onet_id", "name" and "skills"
+        template (Optional[str]): "full" or "compact", or None for LLM_PROMPT_TEMPLATE (see src/config/llm_prompt_budget.py)
+
+    Returns:
+        dict: {"success": bool, "message": str, "result": {"prompt": str, "template": str, "estimated_input_tokens": int}}
+    """
+    if not occupations_data:
+        return {
+            "success": False,
+            "message": "No occupations provided for the batched skill proficiency prompt",
+            "result": {}
+        }
+
+    template = get_prompt_template(template)
+    if template == "compact":
+        prompt = _compact_prompt(occupations_data)
+    else:
+        prompt = _full_prompt(occupations_data)
+    prompt = prompt.strip()
+
+    return {
+        "success": True,
+        "message": f"Successfully generated batched prompt for skill proficiency assessment of {len(occupations_data)} occupations",
+        "result": {
+            "prompt": prompt,
+            "template": template,
+            "estimated_input_tokens": estimate_tokens(prompt)
+        }
+    }
+
+def _compact_prompt(occupations_data: List[Dict[str, Any]]) -> str:
+    """Compact template: one-line instructions, one line per occupation and the bare reply shape."""
+    prompt = f"""
+Rate how proficient a typical worker in each of these {len(occupations_data)} occupations is in each of its listed skills, on a 1-7 scale (1 Novice, 7 Expert), and justify each rating from the occupation's typical duties. Assess each occupation independently.
+"""
+    for position, occupation_data in enumerate(occupations_data, start=1):
+        skill_names = [skill.get('skill_name') for skill in occupation_data['skills'] if skill.get('skill_name')]
+        prompt += f"{position}. {occupation_data['onet_id']} {occupation_data['name']}: {'; '.join(skill_names) if skill_names else '(none listed)'}\n"
+    prompt += """Reply with only this JSON, one assessment per occupation in the order given (O*NET ID exactly as given), one assessed_skills entry per skill, skill names exactly as listed:
+{"skill_proficiency_assessments": [{"llm_onet_soc_code": str, "llm_occupation_name": str, "assessed_skills": [{"llm_skill_name": str, "llm_assigned_proficiency_description": str, "llm_assigned_proficiency_level": number, "llm_explanation": str}]}]}
+"""
+    return prompt
+
+def _full_prompt(occupations_data: List[Dict[str, Any]]) -> str:
+    """Full template: detailed task description and an annotated JSON example."""
+    # Build the prompt
+    prompt = f"""
+You are an expert in career transitions and occupational skill assessment.
+
+I need you to analyze skills for {len(occupations_data)} jobs and determine proficiency levels based on the information provided.
+Assess each occupation independently.
+"""
+
+    # Add each occupation and its skills
+    for position, occupation_data in enumerate(occupations_data, start=1):
+        prompt += f"""
+# Occupation {position}
+- O*NET ID: {occupation_data['onet_id']}
+- Occupation Name: {occupation_data['name']}
+- Skills Required:
+"""
+        skill_names = [skill.get('skill_name') for skill in occupation_data['skills'] if skill.get('skill_name')]
+        if skill_names:
+            for skill_name in skill_names:
+                prompt += f"  - {skill_name}\n"
+        else:
+            prompt += "  - (No specific skills listed for this occupation)\n"
+
+    # Add instructions for the LLM
+    prompt += """
+
+# Your Task:
+1. Analyze the skills of each Occupation provided.
+2. For each skill listed in an Occupation, determine a proficiency level.
+   - Use a scale of 1-7 where 1 is Novice and 7 is Expert
+   - Consider what level of proficiency would be typical/expected for someone in this occupation
+3. Provide a detailed justification/explanation for each assigned proficiency level.
+   - Your explanation should be in the context of the Occupation's typical duties and responsibilities.
+"""
+
+    # Add output format instructions
+    prompt += """
+
+# Output Format Requirements:
+Your entire response must be a single, valid JSON object with this exact schema:
+```json
+{
+  "skill_proficiency_assessments": [
+    {
+      "llm_onet_soc_code": "string (O*NET ID of the Occupation, exactly as given above)",
+      "llm_occupation_name": "string (Name of the Occupation)",
+      "assessed_skills": [
+        {
+          "llm_skill_name": "string (Name of the skill)",
+          "llm_assigned_proficiency_description": "string (e.g., 'Intermediate', 'Advanced', 'Expert')",
+          "llm_assigned_proficiency_level": number (e.g., 3.5 on the 1-7 scale),
+          "llm_explanation": "string (Your detailed reasoning for the assigned proficiency)"
+        }
+        // One object for each skill in the Occupation
+      ]
+    }
+    // One object for each Occupation, in the order given above
+  ]
+}
+```
+
+Ensure your response is properly formatted as valid JSON and includes all required fields.
+"""
+
+    return prompt
+
+if __name__ == "__main__":
+    print("Minimalistic happy path example for generate_batch_skill_proficiency_prompt:")
+
+    example_occupations_data = [
+        {"onet_id": "15-1252.00", "name": "Software Developers", "skills": [{"skill_name": "Programming"}]},
+        {"onet_id": "11-1011.00", "name": "Chief Executives", "skills": [{"skill_name": "Speaking"}]}
+    ]
+
+    prompt_result = generate_batch_skill_proficiency_prompt(occupations_data=example_occupations_data)
+
+    print("\nFunction Call Result:")
+    print(f"  Success: {prompt_result['success']}")
+    print(f"  Message: {prompt_result['message']}")
+    if prompt_result['success']:
+        print(f"  Generated Prompt (first 100 chars): {prompt_result['result']['prompt'][:100]}...")
+        print(f"  Template: {prompt_result['result']['template']}, estimated input tokens: {prompt_result['result']['estimated_input_tokens']}")
+
+    print("\nExample finished.")
@@ -3,9 +3,68 @@ Generate a prompt for the LLM to do skill gap analysis between two occupations.
 """
 from typing import Dict, List, Any, Optional
 
-def generate_skill_gap_analysis_prompt(from_occupation_data: Dict[str, Any], to_occupation_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Generate a skill gap analysis prompt comparing two occupations with their assessed proficiency levels."""
-    
+from src.config.gemini_rate_limiter import estimate_tokens
+from src.config.llm_prompt_budget import get_prompt_template
+
+def generate_skill_gap_analysis_prompt(
+    from_occupation_data: Dict[str, Any],
+    to_occupation_data: Dict[str, Any],
+    template: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Generate a skill gap analysis prompt comparing two occupations with their assessed proficiency levels.
+
+    The compact template names every skill once, with its source and target level side by side,
+    instead of repeating skills shared by both occupations in two lists.
+
+    Args:
+        from_occupation_data (Dict[str, Any]): Source profile {"onet_id", "name", "skills": [{"skill_name", "proficiency_level"}]}
+        to_occupation_data (Dict[str, Any]): Target profile in the same shape
+        template (Optional[str]): "full" or "compact", or None for LLM_PROMPT_TEMPLATE (see src/config/llm_prompt_budget.py)
+
+    Returns:
+        dict: {"success": bool, "message": str, "result": {"prompt": str, "template": str, "estimated_input_tokens": int}}
+    """
+    template = get_prompt_template(template)
+    if template == "compact":
+        prompt = _compact_prompt(from_occupation_data, to_occupation_data)
+    else:
+        prompt = _full_prompt(from_occupation_data, to_occupation_data)
+    prompt = prompt.strip()
+
+    return {
+        "success": True,
+        "message": "Successfully generated prompt for skill gap analysis",
+        "result": {
+            "prompt": prompt,
+            "template": template,
+            "estimated_input_tokens": estimate_tokens(prompt)
+        }
+    }
+
+
+def _compact_prompt(from_occupation_data: Dict[str, Any], to_occupation_data: Dict[str, Any]) -> str:
+    """Compact template: one line per skill with both levels, one-line instructions and the bare reply shape."""
+    from_levels = {skill.get('skill_name'): skill.get('proficiency_level', 'Unknown') for skill in from_occupation_data['skills'] if skill.get('skill_name')}
+    to_levels = {skill.get('skill_name'): skill.get('proficiency_level', 'Unknown') for skill in to_occupation_data['skills'] if skill.get('skill_name')}
+
+    prompt = f"""
+Analyze the skill gaps for someone moving from {from_occupation_data['name']} ({from_occupation_data['onet_id']}) to {to_occupation_data['name']} ({to_occupation_data['onet_id']}).
+Skills as "name: source level -> target level" on a 1-7 scale, "-" where the occupation does not list the skill:
+"""
+    for skill_name in list(to_levels) + [skill_name for skill_name in from_levels if skill_name not in to_levels]:
+        prompt += f"{skill_name}: {from_levels.get(skill_name, '-')} -> {to_levels.get(skill_name, '-')}\n"
+    if not from_levels and not to_levels:
+        prompt += "(No specific skills listed for either occupation)\n"
+    prompt += """For each skill the target needs at a higher level than the source (or the source lacks), describe the development needed, how to bridge the gap and why the skill matters in the target occupation. Use 0 as the source level of a missing skill.
+Reply with only this JSON, skill names exactly as listed:
+{"skill_gap_analysis": {"from_occupation": str, "to_occupation": str, "skill_gaps": [{"skill_name": str, "from_proficiency_level": number, "to_proficiency_level": number, "gap_description": str}]}}
+"""
+    return prompt
+
+
+def _full_prompt(from_occupation_data: Dict[str, Any], to_occupation_data: Dict[str, Any]) -> str:
+    """Full template: both skill lists, a detailed task description and an annotated JSON example."""
     prompt = f"""
 You are an expert in career transitions and skill gap analysis.
 
@@ -78,14 +137,7 @@ Your entire response must be a single, valid JSON object with this exact schema:
 
 Ensure your response is properly formatted as valid JSON and includes all required fields.
 """
-    
-    return {
-        "success": True,
-        "message": "Successfully generated prompt for skill gap analysis",
-        "result": {
-            "prompt": prompt.strip()
-        }
-    }
+    return prompt
 
 
 if __name__ == "__main__":
@@ -123,5 +175,6 @@ if __name__ == "__main__":
     if prompt_result['success'] and prompt_result['result']:
         # The full prompt can be very long, so we print a snippet.
         print(f"  Generated Prompt (first 100 chars): {prompt_result['result']['prompt'][:100]}...")
+        print(f"  Template: {prompt_result['result']['template']}, estimated input tokens: {prompt_result['result']['estimated_input_tokens']}")
     
     print("\nExample finished.") 
\ No newline at end of file
@@ -3,8 +3,52 @@ Generate a prompt for the LLM to assess skill proficiency levels for occupation
 """
 from typing import Dict, List, Any, Optional
 
-def generate_skill_proficiency_prompt(occupation_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Generate a skill proficiency assessment prompt for a single occupation."""
+from src.config.gemini_rate_limiter import estimate_tokens
+from src.config.llm_prompt_budget import get_prompt_template
+
+def generate_skill_proficiency_prompt(occupation_data: Dict[str, Any], template: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Generate a skill proficiency assessment prompt for a single occupation.
+
+    Args:
+        occupation_data (Dict[str, Any]): Occupation with "onet_id", "name" and "skills"
+        template (Optional[str]): "full" or "compact", or None for LLM_PROMPT_TEMPLATE (see src/config/llm_prompt_budget.py)
+
+    Returns:
+        dict: {"success": bool, "message": str, "result": {"prompt": str, "template": str, "estimated_input_tokens": int}}
+    """
+    template = get_prompt_template(template)
+    # Skip skills without a name to avoid adding "None" to the prompt
+    skill_names = [skill.get('skill_name') for skill in occupation_data['skills'] if skill.get('skill_name')]
+
+    if template == "compact":
+        prompt = _compact_prompt(occupation_data, skill_names)
+    else:
+        prompt = _full_prompt(occupation_data, skill_names)
+    prompt = prompt.strip()
+
+    return {
+        "success": True,
+        "message": "Successfully generated prompt for skill proficiency assessment",
+        "result": {
+            "prompt": prompt,
+            "template": template,
+            "estimated_input_tokens": estimate_tokens(prompt)
+        }
+    }
+
+def _compact_prompt(occupation_data: Dict[str, Any], skill_names: List[str]) -> str:
+    """Compact template: one-line instructions and the bare reply shape, skills on one line."""
+    return f"""
+Rate how proficient a typical worker in this occupation is in each listed skill, on a 1-7 scale (1 Novice, 7 Expert), and justify each rating from the occupation's typical duties.
+Occupation: {occupation_data['onet_id']} {occupation_data['name']}
+Skills: {'; '.join(skill_names) if skill_names else '(none listed)'}
+Reply with only this JSON, one assessed_skills entry per skill, skill names exactly as listed:
+{{"skill_proficiency_assessment": {{"llm_onet_soc_code": str, "llm_occupation_name": str, "assessed_skills": [{{"llm_skill_name": str, "llm_assigned_proficiency_description": str, "llm_assigned_proficiency_level": number, "llm_explanation": str}}]}}}}
+"""
+
+def _full_prompt(occupation_data: Dict[str, Any], skill_names: List[str]) -> str:
+    """Full template: detailed task description and an annotated JSON example."""
     # Build the prompt
     prompt = f"""
 You are an expert in career transitions and occupational skill assessment.
@@ -16,21 +60,14 @@ I need you to analyze skills for a job and determine proficiency levels based on
 - Occupation Name: {occupation_data['name']}
 - Skills Required:
 """
-    
+
     # Add occupation skills
-    if occupation_data['skills']:
-        for skill in occupation_data['skills']:
-            # Ensure skill_name is present and not None before adding to prompt
-            skill_name = skill.get('skill_name')
-            if skill_name:
-                prompt += f"  - {skill_name}\n"
-            else:
-                # Optionally skip or add a placeholder if a skill_name is missing
-                # For now, we'll just skip to avoid adding "None" to the prompt
-                pass 
+    if skill_names:
+        for skill_name in skill_names:
+            prompt += f"  - {skill_name}\n"
     else:
         prompt += "  - (No specific skills listed for this occupation)\n"
-    
+
     # Add instructions for the LLM
     prompt += """
 
@@ -42,7 +79,7 @@ I need you to analyze skills for a job and determine proficiency levels based on
 3. Provide a detailed justification/explanation for each assigned proficiency level.
    - Your explanation should be in the context of the Occupation's typical duties and responsibilities.
 """
-    
+
     # Add output format instructions
     prompt += """
 
@@ -68,18 +105,11 @@ Your entire response must be a single, valid JSON object with this exact schema:
 
 Ensure your response is properly formatted as valid JSON and includes all required fields.
 """
-    
-    return {
-        "success": True,
-        "message": "Successfully generated prompt for skill proficiency assessment",
-        "result": {
-            "prompt": prompt.strip()
-        }
-    }
+    return prompt
 
 if __name__ == "__main__":
     print("Minimalistic happy path example for generate_skill_proficiency_prompt:")
-    
+
     # 1. Define sample occupation data (with skills)
     example_occupation_data = {
         "onet_id": "15-1252.00",
@@ -89,10 +119,10 @@ if __name__ == "__main__":
             {"skill_name": "Problem Solving", "proficiency_level": 4.5}
         ]
     }
-    
+
     # 2. Call the function to generate the prompt
     prompt_result = generate_skill_proficiency_prompt(occupation_data=example_occupation_data)
-    
+
     # 3. Print the result summary
     print("\nFunction Call Result:")
     print(f"  Success: {prompt_result['success']}")
@@ -100,5 +130,6 @@ if __name__ == "__main__":
     if prompt_result['success'] and prompt_result['result']:
         # The full prompt can be very long, so we print a snippet.
         print(f"  Generated Prompt (first 100 chars): {prompt_result['result']['prompt'][:100]}...")
-    
-    print("\nExample finished.")
\ No newline at end of file
+        print(f"  Template: {prompt_result['result']['template']}, estimated input tokens: {prompt_result['result']['estimated_input_tokens']}")
+
+    print("\nExample finished.")
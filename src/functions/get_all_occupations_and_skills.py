@@ -0,0 +1,91 @@
+"""
+Retrieves every occupation in Onet_Occupations_Landing with its skills in two bulk queries.
+"""
+from typing import Dict, Any, Optional
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+
+from src.config.schemas import get_sqlalchemy_engine, Onet_Occupations_Landing, Occupation_Skills, Skills
+
+def get_all_occupations_and_skills(engine: Optional[Engine] = None) -> Dict[str, Any]:
+    """
+    Loads all occupations and their skills without per-occupation queries or O*NET API fallback.
+    Used by bulk consumers (the in-memory occupation/skill matrix and batch LLM pre-assessment).
+
+    Args:
+        engine (Optional[Engine]): SQLAlchemy engine to use for database operations,
+                                  or None to use the default engine
+
+    Returns:
+        dict: {
+            "success": bool,
+            "message": str,
+            "result": {
+                "occupation_data": {
+                    onet_soc_code: {
+                        "onet_id": str,
+                        "name": str,
+                        "skills": [{"skill_element_id": str, "skill_name": str, "proficiency_level": Decimal}]
+                    }
+                }  # Ordered by onet_soc_code; skills keep their Occupation_Skills order (empty if none)
+            }
+        }
+    """
+    if engine is None:
+        engine = get_sqlalchemy_engine()
+
+    occupations_query = (
+        select(Onet_Occupations_Landing.onet_soc_code, Onet_Occupations_Landing.title)
+        .order_by(Onet_Occupations_Landing.onet_soc_code)
+    )
+    # Inner join on Skills matches get_occupation_skills, which drops skills without a reference entry
+    skills_query = (
+        select(
+            Occupation_Skills.onet_soc_code,
+            Occupation_Skills.element_id,
+            Skills.element_name,
+            Occupation_Skills.proficiency_level
+        )
+        .join(Skills, Skills.element_id == Occupation_Skills.element_id)
+        .order_by(Occupation_Skills.id)
+    )
+    try:
+        with engine.connect() as connection:
+            occupation_rows = connection.execute(occupations_query).all()
+            skill_rows = connection.execute(skills_query).all()
+    except Exception as e:
+        return {
+            "success": False,
+            "message": f"Error retrieving occupations and skills: {str(e)}",
+            "result": {}
+        }
+
+    occupations = {
+        code: {"onet_id": code, "name": title, "skills": []}
+        for code, title in occupation_rows
+    }
+    for onet_soc_code, element_id, element_name, proficiency_level in skill_rows:
+        if onet_soc_code in occupations:
+            occupations[onet_soc_code]["skills"].append({
+                "skill_element_id": element_id,
+                "skill_name": element_name,
+                "proficiency_level": proficiency_level
+            })
+
+    return {
+        "success": True,
+        "message": f"Retrieved {len(occupations)} occupations with {len(skill_rows)} occupation-skill rows",
+        "result": {"occupation_data": occupations}
+    }
+
+if __name__ == "__main__":
+    print("Minimalistic happy path example for get_all_occupations_and_skills:")
+    print("This example assumes a populated database with O*NET data and configured environment variables.")
+
+    result = get_all_occupations_and_skills()
+
+    print("\nFunction Call Result:")
+    print(f"  Success: {result['success']}")
+    print(f"  Message: {result['message']}")
+
+    print("\nExample finished.")
@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta, UTC
+from typing import Dict, Any, Optional
+from sqlalchemy import select, exists
+from sqlalchemy.engine import Engine
+
+from src.config.schemas import get_sqlalchemy_engine, LLM_Skill_Proficiency_Requests, LLM_Skill_Proficiency_Replies
+
+def get_assessed_occupation_codes(
+    skill_set_hashes: Dict[str, str],
+    model: str,
+    prompt_template_hash: str,
+    max_age_seconds: float,
+    engine: Optional[Engine] = None
+) -> Dict[str, Any]:
+    """
+    Finds occupations that already have current LLM skill proficiency replies, i.e. replies that
+    cached_skill_proficiency_request would serve instead of calling the LLM.
+
+    Args:
+        skill_set_hashes (Dict[str, str]): onet_soc_code -> skill set hash of the occupation's current skills
+        model (str): The Gemini model the replies must come from
+        prompt_template_hash (str): Hash of the current skill proficiency prompt template
+        max_age_seconds (float): Replies older than this are not current
+        engine (Optional[Engine]): SQLAlchemy engine to use for database operations,
+                                  or None to use the default engine
+
+    Returns:
+        dict: {
+            "success": bool,
+            "message": str,
+            "result": {"assessed_codes": set[str]}  # Subset of skill_set_hashes' keys
+        }
+    """
+    if engine is None:
+        engine = get_sqlalchemy_engine()
+
+    cutoff = datetime.now(UTC).replace(tzinfo=None) - timedelta(seconds=max_age_seconds)
+    query = (
+        select(LLM_Skill_Proficiency_Requests.request_onet_soc_code, LLM_Skill_Proficiency_Requests.skill_set_hash)
+        .where(
+            LLM_Skill_Proficiency_Requests.request_model == model,
+            LLM_Skill_Proficiency_Requests.prompt_template_hash == prompt_template_hash,
+            LLM_Skill_Proficiency_Requests.request_timestamp >= cutoff,
+            exists().where(LLM_Skill_Proficiency_Replies.request_id == LLM_Skill_Proficiency_Requests.request_id)
+        )
+        .distinct()
+    )
+    try:
+        with engine.connect() as connection:
+            rows = connection.execute(query).all()
+    except Exception as e:
+        return {
+            "success": False,
+            "message": f"Error retrieving assessed occupations: {str(e)}",
+            "result": {}
+        }
+
+    assessed_codes = {code for code, skill_set_hash in rows if skill_set_hashes.get(code) == skill_set_hash}
+    return {
+        "success": True,
+        "message": f"{len(assessed_codes)} of {len(skill_set_hashes)} occupations have current LLM proficiency replies",
+        "result": {"assessed_codes": assessed_codes}
+    }
+
+if __name__ == "__main__":
+    print("Minimalistic happy path example for get_assessed_occupation_codes:")
+    print("This example assumes a reachable database and configured environment variables.")
+
+    from src.functions.cached_skill_proficiency_request import get_skill_proficiency_template_hash, get_skill_set_hash
+
+    example_hashes = {"11-1011.00": get_skill_set_hash([{"skill_element_id": "2.A.1.a", "skill_name": "Reading Comprehension"}])}
+    result = get_assessed_occupation_codes(example_hashes, "gemini-2.0-flash", get_skill_proficiency_template_hash(), 604800)
+
+    print("\nFunction Call Result:")
+    print(f"  Success: {result['success']}")
+    print(f"  Message: {result['message']}")
+
+    print("\nExample finished.")
@@ -0,0 +1,64 @@
+from typing import Dict, Any, Optional
+from sqlalchemy import select, inspect
+from sqlalchemy.engine import Engine
+
+from src.config.schemas import get_sqlalchemy_engine, Dataset_Versions
+
+def get_dataset_version(dataset_name: str = 'occupation_skills', engine: Optional[Engine] = None) -> Dict[str, Any]:
+    """
+    Retrieves the latest version stamp written for a dataset.
+
+    Args:
+        dataset_name (str): Name of the dataset. Default is 'occupation_skills'.
+        engine (Optional[Engine]): SQLAlchemy engine to use for database operations,
+                                  or None to use the default engine
+
+    Returns:
+        dict: {
+            "success": bool,
+            "message": str,
+            "result": {"dataset_name": str, "version": str or None}  # None if no stamp has been written yet
+        }
+    """
+    if engine is None:
+        engine = get_sqlalchemy_engine()
+
+    try:
+        with engine.connect() as connection:
+            if not inspect(connection).has_table(Dataset_Versions.__tablename__):
+                version = None
+            else:
+                query = (
+                    select(Dataset_Versions.version)
+                    .where(Dataset_Versions.dataset_name == dataset_name)
+                    .order_by(Dataset_Versions.id.desc())
+                    .limit(1)
+                )
+                version = connection.execute(query).scalar_one_or_none()
+    except Exception as e:
+        return {
+            "success": False,
+            "message": f"Error retrieving dataset version for {dataset_name}: {str(e)}",
+            "result": {}
+        }
+
+    return {
+        "success": True,
+        "message": f"Dataset {dataset_name} is at version {version}",
+        "result": {
+            "dataset_name": dataset_name,
+            "version": version
+        }
+    }
+
+if __name__ == "__main__":
+    print("Minimalistic happy path example for get_dataset_version:")
+    print("This example assumes a reachable database and configured environment variables.")
+
+    result = get_dataset_version('occupation_skills')
+
+    print("\nFunction Call Result:")
+    print(f"  Success: {result['success']}")
+    print(f"  Message: {result['message']}")
+
+    print("\nExample finished.")
@@ -0,0 +1,139 @@
+"""
+Ranks all target occupations by their LV skill gap from one source occupation.
+"""
+from typing import Optional, Dict, Any
+import numpy as np
+from sqlalchemy.engine import Engine
+
+from src.config.schemas import get_sqlalchemy_engine
+from src.config.occupation_skill_cache import get_occupation_skill_matrix
+from src.functions.load_occupation_skill_matrix import load_occupation_skill_matrix
+
+GAP_METRICS = ("sum", "count", "weighted")
+
+def get_nearest_occupations(
+    from_onet_soc_code: str,
+    metric: str = "sum",
+    limit: int = 10,
+    offset: int = 0,
+    engine: Optional[Engine] = None,
+    matrix: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Ranks every other occupation by how small the skill gap from the source occupation is,
+    in one vectorized pass over the occupation x skill matrix.
+
+    Gaps follow get_skills_gap_by_lvl: a target skill with level > 0 is a gap when the source lacks it
+    (level missing or 0) or has a lower level. Per target occupation, the score is:
+    - "sum": total of the positive level differences over the gap skills
+    - "count": number of gap skills
+    - "weighted": level differences weighted by the target occupation's IM (importance) value for the
+      skill; skills without an IM value get weight 1, the bottom of the IM scale
+    Lower scores rank first; ties keep occupation code order. Occupations without skills are skipped.
+
+    Args:
+        from_onet_soc_code (str): The O*NET-SOC code for the source occupation
+        metric (str): "sum" (default), "count" or "weighted"
+        limit (int): Maximum number of occupations to return
+        offset (int): Number of ranked occupations to skip (for paging)
+        engine (Optional[Engine]): SQLAlchemy engine used to load the matrix when the in-memory cache is not loaded,
+                                   or None to use the default engine
+        matrix (Optional[Dict[str, Any]]): Pre-loaded matrix from load_occupation_skill_matrix, if available
+
+    Returns:
+        dict: {
+            "success": bool,
+            "message": str,
+            "result": {
+                "from_occupation": {"code": str, "title": str},
+                "metric": str,
+                "total": int,  # Number of ranked target occupations
+                "limit": int,
+                "offset": int,
+                "occupations": [
+                    {"code": str, "title": str, "score": float/int, "gap_count": int, "total_gap": float},
+                    ...
+                ]
+            }
+        }
+    """
+    if metric not in GAP_METRICS:
+        return {"success": False, "message": f"Invalid metric '{metric}'. Expected one of {GAP_METRICS}.", "result": {}}
+    if limit < 1 or offset < 0:
+        return {"success": False, "message": "Invalid paging: limit must be >= 1 and offset >= 0.", "result": {}}
+
+    if matrix is None:
+        matrix = get_occupation_skill_matrix()
+    if matrix is None:
+        if engine is None:
+            engine = get_sqlalchemy_engine()
+        load_result = load_occupation_skill_matrix(engine=engine)
+        if not load_result["success"]:
+            return {"success": False, "message": load_result["message"], "result": {}}
+        matrix = load_result["result"]
+
+    from_row = matrix["occupation_index"].get(from_onet_soc_code)
+    if from_row is None:
+        return {"success": False, "message": f"Occupation {from_onet_soc_code} not found in skill matrix", "result": {}}
+
+    proficiency = matrix["proficiency"]
+    with np.errstate(invalid="ignore"):
+        from_levels = np.where(proficiency[from_row] > 0, proficiency[from_row], 0)
+        gap_mask = (proficiency > 0) & (proficiency > from_levels)
+    deltas = np.where(gap_mask, proficiency - from_levels, 0).astype(np.float64)
+
+    gap_counts = gap_mask.sum(axis=1)
+    total_gaps = deltas.sum(axis=1)
+    if metric == "sum":
+        scores = total_gaps
+    elif metric == "count":
+        scores = gap_counts
+    else:
+        weights = np.nan_to_num(matrix["importance"], nan=1.0).astype(np.float64)
+        scores = (deltas * weights).sum(axis=1)
+
+    # Skip the source itself and occupations without any listed skill
+    candidates = ~np.isnan(proficiency).all(axis=1)
+    candidates[from_row] = False
+    candidate_rows = np.flatnonzero(candidates)
+    ranked_rows = candidate_rows[np.argsort(scores[candidate_rows], kind="stable")]
+    page_rows = ranked_rows[offset:offset + limit]
+
+    occupations = [
+        {
+            "code": matrix["occupation_codes"][row],
+            "title": matrix["occupation_titles"][row],
+            "score": int(scores[row]) if metric == "count" else round(float(scores[row]), 4),
+            "gap_count": int(gap_counts[row]),
+            "total_gap": round(float(total_gaps[row]), 4)
+        }
+        for row in page_rows
+    ]
+
+    from_title = matrix["occupation_titles"][from_row]
+    return {
+        "success": True,
+        "message": f"Ranked {len(ranked_rows)} occupations by '{metric}' skill gap from '{from_title}'",
+        "result": {
+            "from_occupation": {"code": from_onet_soc_code, "title": from_title},
+            "metric": metric,
+            "total": int(len(ranked_rows)),
+            "limit": limit,
+            "offset": offset,
+            "occupations": occupations
+        }
+    }
+
+if __name__ == "__main__":
+    print("Minimalistic happy path example for get_nearest_occupations:")
+    print("This example assumes a populated database with O*NET data and configured environment variables.")
+
+    result = get_nearest_occupations("11-1011.00", metric="sum", limit=5)
+
+    print("\nFunction Call Result:")
+    print(f"  Success: {result['success']}")
+    print(f"  Message: {result['message']}")
+    for occupation in result["result"].get("occupations", []):
+        print(f"    - {occupation['code']} {occupation['title']}: score {occupation['score']} ({occupation['gap_count']} gaps)")
+
+    print("\nExample finished.")
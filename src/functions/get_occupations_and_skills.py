@@ -0,0 +1,128 @@
+"""
+Batched retrieval of occupation and LV skills data for several occupations in one round trip.
+"""
+import logging
+from typing import Dict, Any, Optional, List
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+
+from src.functions.get_occupation_and_skills import get_occupation_and_skills
+from src.config.schemas import get_sqlalchemy_engine, Onet_Occupations_Landing, Occupation_Skills, Skills
+from src.config.occupation_skill_cache import get_cached_occupations
+
+def get_occupations_and_skills(
+    occupation_codes: List[str],
+    engine: Optional[Engine] = None
+) -> Dict[str, Any]:
+    """
+    Retrieves occupation and skills data for several occupations with a single joined query
+    (Onet_Occupations_Landing -> Occupation_Skills -> Skills) on a single connection.
+
+    When the in-memory occupation/skill cache is loaded (API processes), occupations are served from it
+    without touching the database; only the remaining codes are queried.
+
+    Occupations that are not found locally, or that have no skills locally, are resolved through
+    get_occupation_and_skills so the O*NET API fallback behaves exactly as for a single occupation.
+
+    Args:
+        occupation_codes (List[str]): O*NET SOC codes to retrieve. Duplicates are fetched once.
+        engine (Optional[Engine]): SQLAlchemy engine to use for database operations,
+                                  or None to use the default engine
+
+    Returns:
+        dict: {
+            "success": bool,  # True when every requested occupation was resolved
+            "message": str,
+            "result": {
+                "occupation_data": {
+                    occupation_code: {
+                        "onet_id": str,
+                        "name": str,
+                        "skills": [{"skill_element_id": str, "skill_name": str, "proficiency_level": Decimal}]
+                    }
+                },
+                "errors": {occupation_code: str}  # Error message for each unresolved occupation
+            }
+        }
+    """
+    if engine is None:
+        engine = get_sqlalchemy_engine()
+
+    unique_codes = list(dict.fromkeys(occupation_codes))
+    occupation_data: Dict[str, Dict[str, Any]] = get_cached_occupations(unique_codes)
+    errors: Dict[str, str] = {}
+    uncached_codes = [code for code in unique_codes if code not in occupation_data]
+
+    if uncached_codes:
+        query = (
+            select(
+                Onet_Occupations_Landing.onet_soc_code,
+                Onet_Occupations_Landing.title,
+                Occupation_Skills.element_id,
+                Skills.element_name,
+                Occupation_Skills.proficiency_level
+            )
+            .select_from(Onet_Occupations_Landing)
+            .outerjoin(Occupation_Skills, Occupation_Skills.onet_soc_code == Onet_Occupations_Landing.onet_soc_code)
+            .outerjoin(Skills, Skills.element_id == Occupation_Skills.element_id)
+            .where(Onet_Occupations_Landing.onet_soc_code.in_(uncached_codes))
+            .order_by(Onet_Occupations_Landing.onet_soc_code, Occupation_Skills.id)
+        )
+        try:
+            with engine.connect() as connection:
+                rows = connection.execute(query).all()
+        except Exception as e:
+            # Treat a database failure like "not found locally" so each code goes through the fallback path
+            logging.error(f"Database error while retrieving occupations {uncached_codes}: {str(e)}")
+            rows = []
+
+        for onet_soc_code, title, element_id, element_name, proficiency_level in rows:
+            occupation = occupation_data.setdefault(onet_soc_code, {"onet_id": onet_soc_code, "name": title, "skills": []})
+            # Skill rows without a matching Skills entry are dropped, as with the inner join in get_occupation_skills
+            if element_id is None or element_name is None:
+                continue
+            occupation["skills"].append({
+                "skill_element_id": element_id,
+                "skill_name": element_name,
+                "proficiency_level": proficiency_level
+            })
+
+    # Resolve missing occupations (or occupations without local skills) through the single-occupation path
+    for code in uncached_codes:
+        if code in occupation_data and occupation_data[code]["skills"]:
+            continue
+        logging.info(f"Occupation {code} not fully available in local DB batch. Using get_occupation_and_skills fallback.")
+        occupation_data.pop(code, None)
+        fallback_result = get_occupation_and_skills(code, engine=engine)
+        if fallback_result["success"]:
+            occupation_data[code] = fallback_result["result"]["occupation_data"]
+        else:
+            errors[code] = fallback_result["message"]
+
+    # Keep the requested order regardless of which path resolved each occupation
+    occupation_data = {code: occupation_data[code] for code in unique_codes if code in occupation_data}
+
+    return {
+        "success": not errors,
+        "message": f"Retrieved {len(occupation_data)}/{len(unique_codes)} occupations with skills data."
+                   + (f" Errors for: {', '.join(errors)}." if errors else ""),
+        "result": {
+            "occupation_data": occupation_data,
+            "errors": errors
+        }
+    }
+
+if __name__ == "__main__":
+    print("Minimalistic happy path example for get_occupations_and_skills:")
+    print("This example assumes a populated database with O*NET data and configured environment variables.")
+
+    occupation_codes = ["11-1011.00", "11-2021.00"]
+    result = get_occupations_and_skills(occupation_codes)
+
+    print("\nFunction Call Result:")
+    print(f"  Success: {result['success']}")
+    print(f"  Message: {result['message']}")
+    for code, occupation in result["result"]["occupation_data"].items():
+        print(f"  {code}: {occupation['name']} ({len(occupation['skills'])} skills)")
+
+    print("\nExample finished.")
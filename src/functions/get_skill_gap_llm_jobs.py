@@ -0,0 +1,98 @@
+import json
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+from sqlalchemy import select, inspect
+from sqlalchemy.engine import Engine
+
+from src.config.schemas import get_sqlalchemy_engine, Skill_Gap_LLM_Jobs
+
+def _format_job(row) -> Dict[str, Any]:
+    """Shape a Skill_Gap_LLM_Jobs row as the job status returned by the API."""
+    return {
+        "job_id": row.job_id,
+        "status": row.status,
+        "from_occupation": row.from_onet_soc_code,
+        "to_occupation": row.to_onet_soc_code,
+        "created_at": row.created_at.isoformat() if row.created_at else None,
+        "started_at": row.started_at.isoformat() if row.started_at else None,
+        "finished_at": row.finished_at.isoformat() if row.finished_at else None,
+        "result": json.loads(row.result) if row.result is not None else None,
+        "error": {"status_code": row.error_status_code, "detail": row.error_message} if row.status == "failed" else None
+    }
+
+def get_skill_gap_llm_jobs(
+    job_ids: Optional[List[str]] = None,
+    statuses: Optional[List[str]] = None,
+    engine: Optional[Engine] = None,
+    started_before: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """
+    Retrieves skill gap LLM jobs by id, status and/or start time, oldest first.
+
+    Args:
+        job_ids (Optional[List[str]]): Only return these jobs
+        statuses (Optional[List[str]]): Only return jobs in these statuses (e.g. ['queued', 'running'])
+        engine (Optional[Engine]): SQLAlchemy engine to use for database operations,
+                                  or None to use the default engine
+        started_before (Optional[datetime]): Only return jobs started before this time (e.g. stale 'running' jobs)
+
+    Returns:
+        dict: {
+            "success": bool,
+            "message": str,
+            "result": [
+                {
+                    "job_id": str,
+                    "status": str,
+                    "from_occupation": str,
+                    "to_occupation": str,
+                    "created_at": str,
+                    "started_at": str or None,
+                    "finished_at": str or None,
+                    "result": dict or None,   # The /skill-gap-llm response once the job succeeded
+                    "error": dict or None     # {"status_code": int, "detail": str} once the job failed
+                },
+                ...
+            ]
+        }
+    """
+    if engine is None:
+        engine = get_sqlalchemy_engine()
+
+    try:
+        with engine.connect() as connection:
+            if not inspect(connection).has_table(Skill_Gap_LLM_Jobs.__tablename__):
+                rows = []
+            else:
+                query = select(Skill_Gap_LLM_Jobs).order_by(Skill_Gap_LLM_Jobs.created_at)
+                if job_ids is not None:
+                    query = query.where(Skill_Gap_LLM_Jobs.job_id.in_(job_ids))
+                if statuses is not None:
+                    query = query.where(Skill_Gap_LLM_Jobs.status.in_(statuses))
+                if started_before is not None:
+                    query = query.where(Skill_Gap_LLM_Jobs.started_at < started_before)
+                rows = connection.execute(query).all()
+    except Exception as e:
+        return {
+            "success": False,
+            "message": f"Error retrieving skill gap LLM jobs: {str(e)}",
+            "result": []
+        }
+
+    return {
+        "success": True,
+        "message": f"Retrieved {len(rows)} skill gap LLM jobs",
+        "result": [_format_job(row) for row in rows]
+    }
+
+if __name__ == "__main__":
+    print("Minimalistic happy path example for get_skill_gap_llm_jobs:")
+    print("This example assumes a reachable database and configured environment variables.")
+
+    result = get_skill_gap_llm_jobs(statuses=["queued", "running"])
+
+    print("\nFunction Call Result:")
+    print(f"  Success: {result['success']}")
+    print(f"  Message: {result['message']}")
+
+    print("\nExample finished.")
@@ -1,14 +1,14 @@
 from typing import Optional
 from sqlalchemy.engine import Engine
 from src.config.schemas import get_sqlalchemy_engine
-from src.functions.get_occupation_and_skills import get_occupation_and_skills
+from src.functions.get_occupations_and_skills import get_occupations_and_skills
 
 def get_skills_gap(from_onet_soc_code: str, to_onet_soc_code: str, engine: Optional[Engine] = None):
     """
     Identifies skills that are present in the target occupation but not in the source occupation.
     
     This function:
-    1. Retrieves skills data for both occupations using get_occupation_and_skills (with API fallback)
+    1. Retrieves skills data for both occupations with one batched get_occupations_and_skills call (with API fallback)
     2. Focuses only on skills with a proficiency level > 0 (LV scale)
     3. Identifies skills present in the target occupation but not in the source occupation
     4. Returns a list of skill names for these "gap" skills
@@ -35,15 +35,16 @@ def get_skills_gap(from_onet_soc_code: str, to_onet_soc_code: str, engine: Optio
         if engine is None:
             engine = get_sqlalchemy_engine()
             
-        # Retrieve skills data for both occupations (with API fallback)
-        from_occupation_response = get_occupation_and_skills(from_onet_soc_code, engine=engine)
-        to_occupation_response = get_occupation_and_skills(to_onet_soc_code, engine=engine)
+        # Retrieve data for both occupations in a single round trip (with API fallback)
+        occupations_response = get_occupations_and_skills([from_onet_soc_code, to_onet_soc_code], engine=engine)
+        occupations_by_code = occupations_response["result"]["occupation_data"]
+        occupation_errors = occupations_response["result"]["errors"]
         
         # Check if both queries were successful
-        if not from_occupation_response["success"]:
+        if from_onet_soc_code in occupation_errors:
             return {
                 "success": False,
-                "message": f"Error retrieving source occupation data: {from_occupation_response['message']}",
+                "message": f"Error retrieving source occupation data: {occupation_errors[from_onet_soc_code]}",
                 "result": {
                     "from_occupation_title": "Unknown",
                     "to_occupation_title": "Unknown",
@@ -51,23 +52,23 @@ def get_skills_gap(from_onet_soc_code: str, to_onet_soc_code: str, engine: Optio
                 }
             }
             
-        if not to_occupation_response["success"]:
+        if to_onet_soc_code in occupation_errors:
             return {
                 "success": False,
-                "message": f"Error retrieving target occupation data: {to_occupation_response['message']}",
+                "message": f"Error retrieving target occupation data: {occupation_errors[to_onet_soc_code]}",
                 "result": {
-                    "from_occupation_title": from_occupation_response["result"]["occupation_data"]["name"],
+                    "from_occupation_title": occupations_by_code[from_onet_soc_code]["name"],
                     "to_occupation_title": "Unknown",
                     "skill_gaps": []
                 }
             }
         
         # Extract occupation titles and skill data
-        from_occupation_title = from_occupation_response["result"]["occupation_data"]["name"]
-        to_occupation_title = to_occupation_response["result"]["occupation_data"]["name"]
+        from_occupation_title = occupations_by_code[from_onet_soc_code]["name"]
+        to_occupation_title = occupations_by_code[to_onet_soc_code]["name"]
         
-        from_skills = from_occupation_response["result"]["occupation_data"]["skills"]
-        to_skills = to_occupation_response["result"]["occupation_data"]["skills"]
+        from_skills = occupations_by_code[from_onet_soc_code]["skills"]
+        to_skills = occupations_by_code[to_onet_soc_code]["skills"]
         
         # Filter out skills with proficiency level 0 from both sets
         from_skills_filtered = [skill for skill in from_skills if float(skill.get("proficiency_level", 0)) > 0]
@@ -2,7 +2,7 @@ import os
 from typing import Optional, Dict, Any
 from sqlalchemy.engine import Engine
 from src.config.schemas import get_sqlalchemy_engine
-from src.functions.get_occupation_and_skills import get_occupation_and_skills
+from src.functions.get_occupations_and_skills import get_occupations_and_skills
 
 def get_skills_gap_by_lvl(from_onet_soc_code: str, to_onet_soc_code: str, engine: Optional[Engine] = None):
     """
@@ -10,7 +10,7 @@ def get_skills_gap_by_lvl(from_onet_soc_code: str, to_onet_soc_code: str, engine
     or where the proficiency level is lower than in the target occupation.
     
     This function:
-    1. Retrieves detailed skills data for both occupations using get_occupation_and_skills (with API fallback)
+    1. Retrieves detailed skills data for both occupations with one batched get_occupations_and_skills call (with API fallback)
     2. Transforms the data to match the structure expected by identify_skill_gap
     3. Uses identify_skill_gap to analyze the skill gap between the occupations
     4. Returns a comprehensive assessment of skill gaps with proficiency level details
@@ -46,15 +46,16 @@ def get_skills_gap_by_lvl(from_onet_soc_code: str, to_onet_soc_code: str, engine
         if engine is None:
             engine = get_sqlalchemy_engine()
             
-        # Retrieve detailed data for both occupations (with API fallback)
-        from_occupation_response = get_occupation_and_skills(from_onet_soc_code, engine=engine)
-        to_occupation_response = get_occupation_and_skills(to_onet_soc_code, engine=engine)
+        # Retrieve data for both occupations in a single round trip (with API fallback)
+        occupations_response = get_occupations_and_skills([from_onet_soc_code, to_onet_soc_code], engine=engine)
+        occupations_by_code = occupations_response["result"]["occupation_data"]
+        occupation_errors = occupations_response["result"]["errors"]
         
         # Check if both queries were successful
-        if not from_occupation_response["success"]:
+        if from_onet_soc_code in occupation_errors:
             return {
                 "success": False,
-                "message": f"Error retrieving source occupation data: {from_occupation_response['message']}",
+                "message": f"Error retrieving source occupation data: {occupation_errors[from_onet_soc_code]}",
                 "result": {
                     "from_occupation_title": "Unknown",
                     "to_occupation_title": "Unknown",
@@ -62,20 +63,20 @@ def get_skills_gap_by_lvl(from_onet_soc_code: str, to_onet_soc_code: str, engine
                 }
             }
             
-        if not to_occupation_response["success"]:
+        if to_onet_soc_code in occupation_errors:
             return {
                 "success": False,
-                "message": f"Error retrieving target occupation data: {to_occupation_response['message']}",
+                "message": f"Error retrieving target occupation data: {occupation_errors[to_onet_soc_code]}",
                 "result": {
-                    "from_occupation_title": from_occupation_response["result"]["occupation_data"]["name"],
+                    "from_occupation_title": occupations_by_code[from_onet_soc_code]["name"],
                     "to_occupation_title": "Unknown",
                     "skill_gaps": []
                 }
             }
         
         # Extract occupation titles
-        from_occupation_title = from_occupation_response["result"]["occupation_data"]["name"]
-        to_occupation_title = to_occupation_response["result"]["occupation_data"]["name"]
+        from_occupation_title = occupations_by_code[from_onet_soc_code]["name"]
+        to_occupation_title = occupations_by_code[to_onet_soc_code]["name"]
         
         # Transform data to match the structure expected by identify_skill_gap
         from_occupation_data = {
@@ -89,7 +90,7 @@ def get_skills_gap_by_lvl(from_onet_soc_code: str, to_onet_soc_code: str, engine
         }
         
         # Transform skills data for source occupation
-        for skill in from_occupation_response["result"]["occupation_data"]["skills"]:
+        for skill in occupations_by_code[from_onet_soc_code]["skills"]:
             from_occupation_data["skills"].append({
                 "element_id": skill["skill_element_id"],
                 "element_name": skill["skill_name"],
@@ -98,7 +99,7 @@ def get_skills_gap_by_lvl(from_onet_soc_code: str, to_onet_soc_code: str, engine
             })
         
         # Transform skills data for target occupation
-        for skill in to_occupation_response["result"]["occupation_data"]["skills"]:
+        for skill in occupations_by_code[to_onet_soc_code]["skills"]:
             to_occupation_data["skills"].append({
                 "element_id": skill["skill_element_id"],
                 "element_name": skill["skill_name"],
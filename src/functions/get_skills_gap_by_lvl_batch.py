@@ -0,0 +1,101 @@
+"""
+Batched skill gap by level analysis for many (from, to) occupation pairs.
+"""
+from typing import Optional, Dict, Any, List, Tuple
+from sqlalchemy.engine import Engine
+
+from src.config.schemas import get_sqlalchemy_engine
+from src.functions.get_occupations_and_skills import get_occupations_and_skills
+from src.functions.build_occupation_skill_matrix import build_occupation_skill_matrix
+from src.functions.compute_skill_gaps import compute_skill_gaps
+
+def get_skills_gap_by_lvl_batch(
+    pairs: List[Tuple[str, str]],
+    engine: Optional[Engine] = None
+) -> Dict[str, Any]:
+    """
+    Runs get_skills_gap_by_lvl for many occupation pairs at once.
+
+    This function:
+    1. Collects the distinct occupation codes across all pairs and fetches them with one
+       get_occupations_and_skills call (cache / single joined query, API fallback per missing code)
+    2. Packs the fetched occupations into a proficiency matrix
+    3. Computes every pair's gaps in one vectorized pass with compute_skill_gaps
+
+    Args:
+        pairs (List[Tuple[str, str]]): (from_onet_soc_code, to_onet_soc_code) pairs
+        engine (Optional[Engine]): SQLAlchemy engine to use for database operations,
+                                   or None to use the default engine
+
+    Returns:
+        dict: {
+            "success": bool,  # True when every pair succeeded
+            "message": str,
+            "result": [  # One get_skills_gap_by_lvl response per pair, in input order
+                {"success": bool, "message": str, "result": {"from_occupation_title", "to_occupation_title", "skill_gaps"}},
+                ...
+            ]
+        }
+    """
+    if engine is None:
+        engine = get_sqlalchemy_engine()
+
+    occupation_codes = list(dict.fromkeys(code for pair in pairs for code in pair))
+    occupations_response = get_occupations_and_skills(occupation_codes, engine=engine)
+    occupations_by_code = occupations_response["result"]["occupation_data"]
+    occupation_errors = occupations_response["result"]["errors"]
+
+    matrix = build_occupation_skill_matrix(occupations_by_code)["result"]
+    computable_positions = [
+        position for position, (from_code, to_code) in enumerate(pairs)
+        if from_code not in occupation_errors and to_code not in occupation_errors
+    ]
+    computed = compute_skill_gaps(matrix, [pairs[position] for position in computable_positions], gap_type="by_lvl")["result"]
+
+    results: List[Dict[str, Any]] = [None] * len(pairs)
+    for position, pair_result in zip(computable_positions, computed):
+        results[position] = pair_result
+
+    # Pairs with an unresolved occupation get the same error response as get_skills_gap_by_lvl
+    for position, (from_code, to_code) in enumerate(pairs):
+        if results[position] is not None:
+            continue
+        if from_code in occupation_errors:
+            results[position] = {
+                "success": False,
+                "message": f"Error retrieving source occupation data: {occupation_errors[from_code]}",
+                "result": {"from_occupation_title": "Unknown", "to_occupation_title": "Unknown", "skill_gaps": []}
+            }
+        else:
+            results[position] = {
+                "success": False,
+                "message": f"Error retrieving target occupation data: {occupation_errors[to_code]}",
+                "result": {
+                    "from_occupation_title": occupations_by_code[from_code]["name"],
+                    "to_occupation_title": "Unknown",
+                    "skill_gaps": []
+                }
+            }
+
+    failed = sum(1 for result in results if not result["success"])
+    return {
+        "success": failed == 0,
+        "message": f"Computed skill gaps for {len(pairs) - failed}/{len(pairs)} occupation pairs "
+                   f"using {len(occupation_codes)} distinct occupations",
+        "result": results
+    }
+
+if __name__ == "__main__":
+    print("Minimalistic happy path example for get_skills_gap_by_lvl_batch:")
+    print("This example assumes a populated database with O*NET data and configured environment variables.")
+
+    pairs = [("11-1011.00", "11-2021.00"), ("11-2021.00", "11-1011.00"), ("11-1011.00", "15-1252.00")]
+    result = get_skills_gap_by_lvl_batch(pairs)
+
+    print("\nFunction Call Result:")
+    print(f"  Success: {result['success']}")
+    print(f"  Message: {result['message']}")
+    for (from_code, to_code), pair_result in zip(pairs, result["result"]):
+        print(f"  {from_code} -> {to_code}: {len(pair_result['result']['skill_gaps'])} gaps ({pair_result['message']})")
+
+    print("\nExample finished.")
@@ -2,34 +2,126 @@
 LLM-Enhanced Skill Gap Analysis function that provides detailed gap descriptions.
 """
 import os
-from typing import Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Tuple, Callable
 from sqlalchemy.engine import Engine
 from src.config.schemas import get_sqlalchemy_engine
-from src.functions.get_occupation_and_skills import get_occupation_and_skills
-from src.functions.generate_skill_proficiency_prompt import generate_skill_proficiency_prompt
+from src.functions.get_occupations_and_skills import get_occupations_and_skills
 from src.functions.generate_skill_gap_analysis_prompt import generate_skill_gap_analysis_prompt
-from src.functions.gemini_llm_request import gemini_llm_request
+from src.functions.cached_skill_proficiency_request import cached_skill_proficiency_request, cached_batch_skill_proficiency_request
+from src.functions.batch_skill_proficiency_request import is_proficiency_batching_enabled, request_skill_proficiency_within_budget
+from src.functions.cached_skill_gap_analysis_request import cached_skill_gap_analysis_request
+
+def _assess_skill_proficiency(occupation_data: Dict[str, Any], onet_soc_code: str, side: str, engine: Engine) -> Dict[str, Any]:
+    """
+    Builds the skill proficiency prompt for one occupation and sends it to the LLM, reusing a
+    cached assessment when one exists. An occupation whose prompt exceeds LLM_PROMPT_MAX_INPUT_TOKENS
+    is assessed in several prompts and the results are merged. side ("source" or "target") is only
+    used in error messages.
+    """
+    def send_prompt(prompt: str, part: Dict[str, Any]) -> Dict[str, Any]:
+        # Prepare skills data for LLM request
+        prompt_skills_data = [
+            {
+                "skill_element_id": skill["skill_element_id"],
+                "skill_name": skill["skill_name"]
+            }
+            for skill in part["skills"]
+        ]
+        return cached_skill_proficiency_request(
+            prompt=prompt,
+            request_onet_soc_code=onet_soc_code,
+            prompt_skills_data=prompt_skills_data,
+            engine=engine
+        )
+
+    llm_response = request_skill_proficiency_within_budget(occupation_data, send_prompt)
+    
+    if not llm_response["success"]:
+        return {
+            "success": False,
+            "message": f"Error getting LLM assessment for {side} occupation: {llm_response['message']}",
+            "result": {}
+        }
+    
+    return llm_response
+
+def _assess_skill_proficiency_pair(
+    from_occupation_data: Dict[str, Any],
+    to_occupation_data: Dict[str, Any],
+    engine: Engine
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Assesses source and target proficiencies with one batched LLM request when neither is cached.
+    Returns (from_llm_response, to_llm_response) in the shape of _assess_skill_proficiency.
+    """
+    batch_response = cached_batch_skill_proficiency_request([from_occupation_data, to_occupation_data], engine=engine)
+    side_responses = []
+    for occupation_data, side in ((from_occupation_data, "source"), (to_occupation_data, "target")):
+        llm_response = batch_response["result"][occupation_data["onet_id"]]
+        if not llm_response["success"]:
+            llm_response = {
+                "success": False,
+                "message": f"Error getting LLM assessment for {side} occupation: {llm_response['message']}",
+                "result": {}
+            }
+        side_responses.append(llm_response)
+    return side_responses[0], side_responses[1]
+
+def _skill_gap_entry(
+    skill_name: str,
+    from_llm_skills: Dict[str, Any],
+    to_llm_skills: Dict[str, Any],
+    to_skill_elements: Dict[str, str],
+    gap_description: Optional[str]
+) -> Optional[Dict[str, Any]]:
+    """
+    Result entry for one target skill, or None if the source occupation already has it at the target level.
+    Without an LLM gap description a basic one is generated.
+    """
+    to_proficiency = to_llm_skills[skill_name]
+    from_proficiency = from_llm_skills.get(skill_name, 0)
+    
+    # Only include skills where there's a gap (to > from or skill missing from source)
+    if not to_proficiency > from_proficiency:
+        return None
+    
+    return {
+        "element_id": to_skill_elements.get(skill_name, "unknown"),
+        "skill_name": skill_name,
+        "from_proficiency_level": from_proficiency,
+        "to_proficiency_level": to_proficiency,
+        "llm_gap_description": gap_description or f"Target occupation requires {skill_name} at level {to_proficiency}/7, while source occupation has level {from_proficiency}/7. Development needed to bridge this {to_proficiency - from_proficiency} level gap."
+    }
 
 def get_skills_gap_by_lvl_llm(
     from_onet_soc_code: str, 
     to_onet_soc_code: str, 
     engine: Optional[Engine] = None, 
+    on_gap: Optional[Callable[[Dict[str, Any]], None]] = None,
 ):
     """
     Identifies skills required by the target occupation that the source occupation either does not have 
     or where the proficiency level is lower than in the target occupation, with LLM-generated descriptions.
     
     This function:
-    1. Retrieves detailed skills data for both occupations using get_occupation_and_skills (with API fallback)
-    2. Calls LLM to assess proficiency levels for both occupations
-    3. Uses LLM to generate detailed skill gap analysis with descriptions
+    1. Retrieves detailed skills data for both occupations with one batched get_occupations_and_skills call (with API fallback)
+    2. Calls LLM to assess proficiency levels for both occupations (in one batched request, or concurrently
+       with batching disabled, reusing cached assessments)
+    3. Uses LLM to generate detailed skill gap analysis with descriptions (cached by assessed skill profiles)
     4. Returns comprehensive assessment with LLM-enhanced gap descriptions
     
+    With on_gap, the gap analysis reply is streamed (gemini_llm_stream_request) and each result entry
+    is passed to on_gap as soon as the LLM has written its description. Entries without an LLM
+    description, or served from the gap analysis cache, are passed on once the analysis is complete.
+    Every entry of the returned result is passed to on_gap exactly once.
+    
     Args:
         from_onet_soc_code (str): The O*NET-SOC code for the source occupation
         to_onet_soc_code (str): The O*NET-SOC code for the target occupation
         engine (Optional[Engine]): SQLAlchemy engine to use for database operations, 
                                    or None to use the default engine
+        on_gap (Optional[Callable[[Dict[str, Any]], None]]): Called with each result entry as soon as it is known
     
     Returns:
         dict: {
@@ -52,98 +144,54 @@ def get_skills_gap_by_lvl_llm(
         if engine is None:
             engine = get_sqlalchemy_engine()
             
-        # Retrieve detailed data for both occupations (with API fallback)
-        from_occupation_response = get_occupation_and_skills(from_onet_soc_code, engine=engine)
-        to_occupation_response = get_occupation_and_skills(to_onet_soc_code, engine=engine)
+        # Retrieve data for both occupations in a single round trip (with API fallback)
+        occupations_response = get_occupations_and_skills([from_onet_soc_code, to_onet_soc_code], engine=engine)
+        occupations_by_code = occupations_response["result"]["occupation_data"]
+        occupation_errors = occupations_response["result"]["errors"]
         
         # Check if both queries were successful
-        if not from_occupation_response["success"]:
+        if from_onet_soc_code in occupation_errors:
             return {
                 "success": False,
-                "message": f"Error retrieving source occupation data: {from_occupation_response['message']}",
+                "message": f"Error retrieving source occupation data: {occupation_errors[from_onet_soc_code]}",
                 "result": []
             }
             
-        if not to_occupation_response["success"]:
+        if to_onet_soc_code in occupation_errors:
             return {
                 "success": False,
-                "message": f"Error retrieving target occupation data: {to_occupation_response['message']}",
+                "message": f"Error retrieving target occupation data: {occupation_errors[to_onet_soc_code]}",
                 "result": []
             }
         
         # Extract occupation data for LLM processing
-        from_occupation_data = from_occupation_response["result"]["occupation_data"]
-        to_occupation_data = to_occupation_response["result"]["occupation_data"]
-        
-        # Step 1: Generate LLM proficiency assessments for source occupation
-        from_prompt_result = generate_skill_proficiency_prompt(
-            occupation_data=from_occupation_data,
-        )
-        
-        if not from_prompt_result["success"]:
-            return {
-                "success": False,
-                "message": f"Error generating LLM prompt for source occupation: {from_prompt_result['message']}",
-                "result": []
-            }
-        
-        # Prepare skills data for LLM request (source occupation)
-        from_prompt_skills_data = [
-            {
-                "skill_element_id": skill["skill_element_id"],
-                "skill_name": skill["skill_name"]
-            }
-            for skill in from_occupation_data["skills"]
-        ]
-        
-        # Call LLM for source occupation proficiency assessment
-        from_llm_response = gemini_llm_request(
-            prompt=from_prompt_result["result"]["prompt"],
-            request_onet_soc_code=from_onet_soc_code,
-            prompt_skills_data=from_prompt_skills_data,
-            expected_response_type="skill_proficiency"
-        )
+        from_occupation_data = occupations_by_code[from_onet_soc_code]
+        to_occupation_data = occupations_by_code[to_onet_soc_code]
         
+        # Steps 1-2: Assess source and target proficiencies. With LLM_PROFICIENCY_BATCH_ENABLED both
+        # uncached occupations go into one Gemini request; otherwise the two independent calls run
+        # concurrently, so the gap analysis can start as soon as both have returned.
+        if is_proficiency_batching_enabled():
+            from_llm_response, to_llm_response = _assess_skill_proficiency_pair(from_occupation_data, to_occupation_data, engine)
+        else:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                from_future = executor.submit(_assess_skill_proficiency, from_occupation_data, from_onet_soc_code, "source", engine)
+                to_future = executor.submit(_assess_skill_proficiency, to_occupation_data, to_onet_soc_code, "target", engine)
+                from_llm_response = from_future.result()
+                to_llm_response = to_future.result()
+
+        # Report failures in the same order as the sequential pipeline (source first)
         if not from_llm_response["success"]:
             return {
                 "success": False,
-                "message": f"Error getting LLM assessment for source occupation: {from_llm_response['message']}",
+                "message": from_llm_response["message"],
                 "result": []
             }
-        
-        # Step 2: Generate LLM proficiency assessments for target occupation
-        to_prompt_result = generate_skill_proficiency_prompt(
-            occupation_data=to_occupation_data,
-        )
-        
-        if not to_prompt_result["success"]:
-            return {
-                "success": False,
-                "message": f"Error generating LLM prompt for target occupation: {to_prompt_result['message']}",
-                "result": []
-            }
-        
-        # Prepare skills data for LLM request (target occupation)
-        to_prompt_skills_data = [
-            {
-                "skill_element_id": skill["skill_element_id"],
-                "skill_name": skill["skill_name"]
-            }
-            for skill in to_occupation_data["skills"]
-        ]
-        
-        # Call LLM for target occupation proficiency assessment
-        to_llm_response = gemini_llm_request(
-            prompt=to_prompt_result["result"]["prompt"],
-            request_onet_soc_code=to_onet_soc_code,
-            prompt_skills_data=to_prompt_skills_data,
-            expected_response_type="skill_proficiency"
-        )
-        
+
         if not to_llm_response["success"]:
             return {
                 "success": False,
-                "message": f"Error getting LLM assessment for target occupation: {to_llm_response['message']}",
+                "message": to_llm_response["message"],
                 "result": []
             }
         
@@ -216,12 +264,25 @@ def get_skills_gap_by_lvl_llm(
             for skill in enhanced_to_data["skills"]
         ]
         
-        # Step 6: Call LLM for skill gap analysis
-        gap_llm_response = gemini_llm_request(
+        # Step 6: Call LLM for skill gap analysis (served from cache for an identical pair of assessed profiles)
+        streamed_skill_names = set()
+        
+        def on_gap_item(gap_info: Dict[str, Any]) -> None:
+            skill_name = gap_info.get("skill_name")
+            if skill_name not in to_llm_skills or skill_name in streamed_skill_names or not gap_info.get("gap_description"):
+                return
+            gap_entry = _skill_gap_entry(skill_name, from_llm_skills, to_llm_skills, to_skill_elements, gap_info["gap_description"])
+            if gap_entry is not None:
+                streamed_skill_names.add(skill_name)
+                on_gap(gap_entry)
+        
+        gap_llm_response = cached_skill_gap_analysis_request(
             prompt=gap_prompt_result["result"]["prompt"],
-            request_onet_soc_code=to_onet_soc_code,
+            from_occupation_data=enhanced_from_data,
+            to_occupation_data=enhanced_to_data,
             prompt_skills_data=gap_prompt_skills_data,
-            expected_response_type="skill_gap_analysis"
+            engine=engine,
+            on_item=on_gap_item if on_gap is not None else None
         )
         
         if not gap_llm_response["success"]:
@@ -247,26 +308,16 @@ def get_skills_gap_by_lvl_llm(
                             llm_gap_descriptions[skill_name] = gap_description
             
             # Build final result using LLM proficiency data and descriptions
-            for skill_name, to_proficiency in to_llm_skills.items():
-                from_proficiency = from_llm_skills.get(skill_name, 0)
-                
-                # Only include skills where there's a gap (to > from or skill missing from source)
-                if to_proficiency > from_proficiency:
-                    element_id = to_skill_elements.get(skill_name, "unknown")
-                    
-                    # Use LLM-generated gap description if available, otherwise create a basic one
-                    gap_description = llm_gap_descriptions.get(
-                        skill_name,
-                        f"Target occupation requires {skill_name} at level {to_proficiency}/7, while source occupation has level {from_proficiency}/7. Development needed to bridge this {to_proficiency - from_proficiency} level gap."
-                    )
-                    
-                    skill_gaps_result.append({
-                        "element_id": element_id,
-                        "skill_name": skill_name,
-                        "from_proficiency_level": from_proficiency,
-                        "to_proficiency_level": to_proficiency,
-                        "llm_gap_description": gap_description
-                    })
+            for skill_name in to_llm_skills:
+                # Use LLM-generated gap description if available, otherwise create a basic one
+                gap_entry = _skill_gap_entry(
+                    skill_name, from_llm_skills, to_llm_skills, to_skill_elements, llm_gap_descriptions.get(skill_name)
+                )
+                if gap_entry is not None:
+                    skill_gaps_result.append(gap_entry)
+                    # Streamed entries were already passed on while the reply was generated
+                    if on_gap is not None and skill_name not in streamed_skill_names:
+                        on_gap(gap_entry)
         
         except Exception as e:
             return {
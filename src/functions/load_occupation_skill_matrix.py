@@ -0,0 +1,103 @@
+"""
+Loads the occupation/skill data into a compact array-backed structure for in-memory lookups.
+"""
+from typing import Dict, Any, Optional
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+
+from src.config.schemas import get_sqlalchemy_engine, Onet_Skills_Landing
+from src.functions.get_dataset_version import get_dataset_version
+from src.functions.build_occupation_skill_matrix import build_occupation_skill_matrix
+from src.functions.get_all_occupations_and_skills import get_all_occupations_and_skills
+
+def load_occupation_skill_matrix(engine: Optional[Engine] = None) -> Dict[str, Any]:
+    """
+    Loads Onet_Occupations_Landing, Occupation_Skills and Skills into an occupation x skill matrix
+    (see build_occupation_skill_matrix), plus the matching IM (importance) values from Onet_Skills_Landing.
+
+    The dataset version is read before the data, so a transform that finishes while loading
+    is picked up on the next version check rather than being missed.
+
+    Args:
+        engine (Optional[Engine]): SQLAlchemy engine to use for database operations,
+                                  or None to use the default engine
+
+    Returns:
+        dict: {
+            "success": bool,
+            "message": str,
+            "result": {
+                "version": str or None,            # Dataset_Versions stamp for 'occupation_skills'
+                "occupation_codes": list[str],     # Row labels
+                "occupation_titles": list[str],
+                "occupation_index": dict,          # onet_soc_code -> row
+                "element_ids": list[str],          # Column labels
+                "element_names": list[str],
+                "element_index": dict,             # element_id -> column
+                "proficiency": np.ndarray,         # float32 (occupations x skills), NaN where the skill is not listed
+                "skill_position": np.ndarray,      # int16 (occupations x skills), order of the skill within the occupation
+                "importance": np.ndarray           # float32 (occupations x skills), IM scale value, NaN where not available
+            }
+        }
+    """
+    if engine is None:
+        engine = get_sqlalchemy_engine()
+
+    version_result = get_dataset_version('occupation_skills', engine=engine)
+    if not version_result["success"]:
+        return {"success": False, "message": version_result["message"], "result": {}}
+
+    importance_query = (
+        select(Onet_Skills_Landing.onet_soc_code, Onet_Skills_Landing.element_id, Onet_Skills_Landing.data_value)
+        .where(Onet_Skills_Landing.scale_id == 'IM')
+    )
+    occupations_result = get_all_occupations_and_skills(engine=engine)
+    if not occupations_result["success"]:
+        return {
+            "success": False,
+            "message": f"Error loading occupation skill matrix: {occupations_result['message']}",
+            "result": {}
+        }
+    occupations = occupations_result["result"]["occupation_data"]
+
+    try:
+        with engine.connect() as connection:
+            importance_rows = connection.execute(importance_query).all()
+    except Exception as e:
+        return {
+            "success": False,
+            "message": f"Error loading occupation skill matrix: {str(e)}",
+            "result": {}
+        }
+
+    matrix_result = build_occupation_skill_matrix(occupations, version=version_result["result"]["version"])
+    matrix = matrix_result["result"]
+
+    importance = np.full(matrix["proficiency"].shape, np.nan, dtype=np.float32)
+    for onet_soc_code, element_id, data_value in importance_rows:
+        row = matrix["occupation_index"].get(onet_soc_code)
+        column = matrix["element_index"].get(element_id)
+        if row is not None and column is not None and data_value is not None:
+            importance[row, column] = float(data_value)
+    matrix["importance"] = importance
+
+    return {
+        "success": True,
+        "message": f"{matrix_result['message']} (version {version_result['result']['version']})",
+        "result": matrix
+    }
+
+if __name__ == "__main__":
+    print("Minimalistic happy path example for load_occupation_skill_matrix:")
+    print("This example assumes a populated database with O*NET data and configured environment variables.")
+
+    result = load_occupation_skill_matrix()
+
+    print("\nFunction Call Result:")
+    print(f"  Success: {result['success']}")
+    print(f"  Message: {result['message']}")
+    if result["success"]:
+        print(f"  Matrix shape: {result['result']['proficiency'].shape}")
+
+    print("\nExample finished.")
@@ -1,17 +1,131 @@
+"""
+Load a pandas DataFrame into a table through its SQLAlchemy model.
+
+Two loader backends, selectable per call or through MYSQL_LOAD_BACKEND:
+- "infile": streams the DataFrame in chunks to a temporary TSV file and sends it with
+  LOAD DATA LOCAL INFILE, mapping the TSV fields to the model columns explicitly and writing
+  NULLs as \\N. The optional DELETE and the load run in one transaction on a dedicated connection
+  with the client-side local_infile flag set. MySQL only, and the server needs local_infile=ON.
+  When the fast path is unavailable or fails (not MySQL, local_infile off, rows rejected), the
+  transaction is rolled back and the DataFrame is loaded with the ORM backend instead.
+- "orm": converts the DataFrame to a list of dicts and calls session.bulk_insert_mappings.
+
+Configuration through environment variables:
+    MYSQL_LOAD_BACKEND          Default loader backend: "infile" or "orm" (default: infile)
+    MYSQL_LOAD_TSV_CHUNK_ROWS   DataFrame rows formatted per chunk while writing the TSV file (default: 50000)
+"""
 import os
+import time
+import tempfile
 import pandas as pd
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine, inspect
+from sqlalchemy import create_engine, inspect, delete, Integer, Date
 from sqlalchemy.exc import IntegrityError, DataError
+from sqlalchemy.pool import NullPool
 import src.config.schemas as schemas # Import the schemas module
 from src.config.schemas import Base # Keep Base for type hinting
 import logging
-from typing import Type # For type hinting SQLAlchemy model classes
+from typing import Type, Optional, List, Iterable # For type hinting SQLAlchemy model classes
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def load_data_from_dataframe(df: pd.DataFrame, model: Type[Base], engine, clear_existing: bool = True) -> dict:
+LOAD_BACKENDS = ("infile", "orm")
+
+
+def get_load_backend(backend: Optional[str] = None) -> str:
+    """Resolve a loader backend name, defaulting to MYSQL_LOAD_BACKEND."""
+    backend = (backend or os.getenv("MYSQL_LOAD_BACKEND", "infile")).lower()
+    if backend not in LOAD_BACKENDS:
+        raise ValueError(f"Unknown load backend '{backend}', expected one of {LOAD_BACKENDS}")
+    return backend
+
+
+def _tsv_field(series: pd.Series, column) -> pd.Series:
+    """Format one column as LOAD DATA text: backslash escapes for tab, newline and backslash, \\N for NULL."""
+    nulls = series.isna()
+    if isinstance(column.type, Integer) and pd.api.types.is_float_dtype(series):
+        # Integer columns read with NaNs become floats; write 8 rather than 8.0
+        series = series.astype("Int64")
+    elif isinstance(column.type, Date) and pd.api.types.is_datetime64_any_dtype(series):
+        series = series.dt.strftime("%Y-%m-%d")
+    elif pd.api.types.is_bool_dtype(series):
+        series = series.astype(int)
+    text = series.astype(str)
+    if pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+        text = (text.str.replace("\\", "\\\\", regex=False)
+                    .str.replace("\t", "\\t", regex=False)
+                    .str.replace("\n", "\\n", regex=False)
+                    .str.replace("\r", "\\r", regex=False))
+    return text.mask(nulls, "\\N")
+
+
+def write_dataframe_tsv(df: pd.DataFrame, model: Type[Base], columns: List[str], file, chunk_rows: Optional[int] = None) -> int:
+    """
+    Write the given columns of df to an open text file as LOAD DATA LOCAL INFILE input, one chunk of
+    rows at a time so only a chunk's formatted text is held in memory. Returns the number of rows written.
+    """
+    if chunk_rows is None:
+        chunk_rows = int(os.getenv("MYSQL_LOAD_TSV_CHUNK_ROWS", "50000"))
+    model_columns = {column.name: column for column in inspect(model).columns}
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        fields = [_tsv_field(chunk[name], model_columns[name]) for name in columns]
+        file.write("".join("\t".join(values) + "\n" for values in zip(*fields)))
+    return len(df)
+
+
+def _load_with_infile(df: pd.DataFrame, model: Type[Base], engine, columns: List[str], clear_existing: bool) -> int:
+    """
+    Load df with LOAD DATA LOCAL INFILE in one transaction (with the optional DELETE). Raises if the
+    backend is unavailable or not every row was loaded, leaving the table unchanged.
+    """
+    if engine.dialect.name != "mysql":
+        raise RuntimeError(f"LOAD DATA LOCAL INFILE needs MySQL, not {engine.dialect.name}")
+
+    table_name = model.__tablename__
+    temp_file = tempfile.NamedTemporaryFile("w", encoding="utf-8", newline="", suffix=".tsv", delete=False)
+    try:
+        with temp_file:
+            expected_rows = write_dataframe_tsv(df, model, columns, temp_file)
+
+        column_list = ", ".join(f"`{name}`" for name in columns)
+        file_path = temp_file.name.replace("\\", "/").replace("'", "\\'")
+        load_sql = (
+            f"LOAD DATA LOCAL INFILE '{file_path}' INTO TABLE `{table_name}` CHARACTER SET utf8mb4 "
+            r"FIELDS TERMINATED BY '\t' ESCAPED BY '\\' LINES TERMINATED BY '\n' "
+            f"({column_list})"
+        )
+        # The pooled connections were opened without the client-side local_infile flag
+        infile_engine = create_engine(engine.url, poolclass=NullPool, connect_args={"allow_local_infile": True})
+        try:
+            with infile_engine.begin() as connection:
+                if clear_existing:
+                    connection.execute(delete(model.__table__))
+                loaded_rows = connection.exec_driver_sql(load_sql).rowcount
+                if loaded_rows != expected_rows:
+                    # LOCAL loads skip duplicate keys and bad rows with a warning; treat that as a failed load
+                    raise DataError(load_sql[:200], None, Exception(f"LOAD DATA loaded {loaded_rows} of {expected_rows} rows"))
+        finally:
+            infile_engine.dispose()
+        return loaded_rows
+    finally:
+        os.remove(temp_file.name)
+
+
+def _load_stats(records_loaded: int, backend: str, elapsed: float, fallback_reason: Optional[str] = None) -> dict:
+    stats = {
+        "records_loaded": records_loaded,
+        "backend": backend,
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round(records_loaded / elapsed, 1) if elapsed > 0 else None
+    }
+    if fallback_reason:
+        stats["fallback_reason"] = fallback_reason
+    return stats
+
+
+def load_data_from_dataframe(df: pd.DataFrame, model: Type[Base], engine, clear_existing: bool = True, backend: Optional[str] = None) -> dict:
     """
     Loads data from a pandas DataFrame into the specified table using its SQLAlchemy model.
 
@@ -20,9 +134,13 @@ def load_data_from_dataframe(df: pd.DataFrame, model: Type[Base], engine, clear_
         model (Type[Base]): The SQLAlchemy model class representing the target table.
         engine (sqlalchemy.engine.base.Engine): SQLAlchemy engine for database connection.
         clear_existing (bool): Whether to clear existing data before loading. Defaults to True.
+        backend (Optional[str]): "infile" (LOAD DATA LOCAL INFILE, falling back to the ORM) or "orm".
+                                 Defaults to MYSQL_LOAD_BACKEND.
 
     Returns:
         dict: A dictionary with keys 'success' (bool), 'message' (str), and 'result' (dict).
+              result holds "records_loaded", plus on success "backend" (the loader that did the load),
+              "elapsed_seconds", "rows_per_second" and, after a fallback, "fallback_reason".
     """
     actual_table_name = model.__tablename__
 
@@ -56,6 +174,33 @@ def load_data_from_dataframe(df: pd.DataFrame, model: Type[Base], engine, clear_
         logging.error(msg)
         return {"success": False, "message": msg, "result": {}}
 
+    try:
+        backend = get_load_backend(backend)
+    except ValueError as e:
+        logging.error(str(e))
+        return {"success": False, "message": str(e), "result": {}}
+
+    started = time.perf_counter()
+    fallback_reason = None
+    if backend == "infile":
+        df_load_cols = [col for col in df.columns if col in model_column_names]
+        if engine.dialect.name != "mysql":
+            fallback_reason = f"LOAD DATA LOCAL INFILE needs MySQL, not {engine.dialect.name}"
+        elif df_load_cols:
+            try:
+                logging.info(f"Loading {len(df)} records into '{actual_table_name}' with LOAD DATA LOCAL INFILE...")
+                num_records_loaded = _load_with_infile(df, model, engine, df_load_cols, clear_existing)
+                elapsed = time.perf_counter() - started
+                logging.info(f"Successfully loaded {num_records_loaded} records into '{actual_table_name}' in {elapsed:.2f}s.")
+                return {
+                    "success": True,
+                    "message": f"Successfully loaded {num_records_loaded} records into {actual_table_name}",
+                    "result": _load_stats(num_records_loaded, "infile", elapsed)
+                }
+            except Exception as e:
+                fallback_reason = str(e)
+                logging.warning(f"LOAD DATA LOCAL INFILE into '{actual_table_name}' failed, falling back to the ORM loader: {e}")
+
     Session = sessionmaker(bind=engine)
     session = Session()
 
@@ -93,7 +238,7 @@ def load_data_from_dataframe(df: pd.DataFrame, model: Type[Base], engine, clear_
         return {
             "success": True, 
             "message": f"Successfully loaded {num_records_loaded} records into {actual_table_name}", 
-            "result": {"records_loaded": num_records_loaded}
+            "result": _load_stats(num_records_loaded, "orm", time.perf_counter() - started, fallback_reason)
         }
 
     except (IntegrityError, DataError) as db_err: # Catch specific database errors
@@ -107,13 +252,60 @@ def load_data_from_dataframe(df: pd.DataFrame, model: Type[Base], engine, clear_
     finally:
         session.close()
 
+def load_data_from_chunks(chunks: Iterable[pd.DataFrame], model: Type[Base], engine, clear_existing: bool = True, backend: Optional[str] = None) -> dict:
+    """
+    Loads DataFrame chunks into the specified table one at a time, so a lazily read file never has to
+    be held in memory as a whole. The table is cleared (if requested) before the first chunk only.
+    A failing chunk stops the load; the chunks loaded before it stay in the table.
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): DataFrames to load, e.g. from textfile_to_dataframe_chunks.
+        model (Type[Base]): The SQLAlchemy model class representing the target table.
+        engine (sqlalchemy.engine.base.Engine): SQLAlchemy engine for database connection.
+        clear_existing (bool): Whether to clear existing data before the first chunk. Defaults to True.
+        backend (Optional[str]): Loader backend for every chunk, see load_data_from_dataframe.
+
+    Returns:
+        dict: A dictionary with keys 'success' (bool), 'message' (str), and 'result' (dict with
+              "records_loaded", "chunks_loaded", "max_chunk_rows", "backends" (chunks per loader
+              backend) and "elapsed_seconds").
+    """
+    actual_table_name = model.__tablename__
+    started = time.perf_counter()
+    stats = {"records_loaded": 0, "chunks_loaded": 0, "max_chunk_rows": 0, "backends": {}}
+
+    try:
+        for chunk in chunks:
+            if chunk.empty:
+                continue
+            load_result = load_data_from_dataframe(chunk, model, engine, clear_existing=clear_existing and stats["chunks_loaded"] == 0, backend=backend)
+            if not load_result["success"]:
+                msg = f"Chunk {stats['chunks_loaded'] + 1} for {actual_table_name} failed after {stats['records_loaded']} records: {load_result['message']}"
+                logging.error(msg)
+                return {"success": False, "message": msg, "result": stats}
+            stats["records_loaded"] += load_result["result"]["records_loaded"]
+            stats["chunks_loaded"] += 1
+            stats["max_chunk_rows"] = max(stats["max_chunk_rows"], len(chunk))
+            chunk_backend = load_result["result"]["backend"]
+            stats["backends"][chunk_backend] = stats["backends"].get(chunk_backend, 0) + 1
+    except Exception as e:
+        msg = f"Error reading chunk {stats['chunks_loaded'] + 1} for {actual_table_name} after {stats['records_loaded']} records: {e}"
+        logging.error(msg)
+        return {"success": False, "message": msg, "result": stats}
+
+    stats["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+    return {
+        "success": True,
+        "message": f"Successfully loaded {stats['records_loaded']} records into {actual_table_name} in {stats['chunks_loaded']} chunks",
+        "result": stats
+    }
+
+
 if __name__ == '__main__':
     print("Minimalistic happy path example for load_data_from_dataframe.")
     print("This example loads sample data into the 'Onet_Occupations_API_landing' table using an in-memory SQLite database.")
 
     # Imports for the __main__ example
-    from sqlalchemy import create_engine # For the example engine
-    import pandas as pd # For creating a sample DataFrame
     from datetime import date # For sample date data
     # The 'schemas' module (aliased) and 'Base' are imported at the top of the file.
 
@@ -137,7 +329,8 @@ if __name__ == '__main__':
         df=sample_api_df, 
         model=schemas.Onet_Occupations_API_landing, # Accessing the model via the 'schemas' alias
         engine=example_engine, 
-        clear_existing=True
+        clear_existing=True,
+        backend="infile" # Not MySQL, so this falls back to the ORM loader
     )
     
     # 4. Print the result from the function call
@@ -0,0 +1,197 @@
+"""
+Blue/green rebuild of tables: fill empty shadow copies while the live tables keep serving reads,
+then swap all of them in at once.
+
+create_shadow_table makes an empty <table>_shadow with the live table's definition. Once the shadow
+tables are filled, swap_shadow_tables validates their row counts and, only if every check passes,
+swaps them in with one RENAME TABLE statement:
+
+    RENAME TABLE skills TO skills_old, skills_shadow TO skills, occupation_skills TO ...
+
+MySQL renames every pair atomically, so readers see either all old or all new tables, never an
+empty or partly filled one. The old tables are dropped afterwards. If a check fails, the shadow
+tables are dropped and the live tables stay as they were.
+
+Validation, per table:
+    - the shadow table holds exactly the number of rows that were built into it,
+    - it is not empty,
+    - it holds at least ETL_SWAP_MIN_RATIO times the rows of the live table, so a truncated source
+      cannot replace a full table.
+
+On SQLite (used by the tests) the shadow table copies the columns and constraints but not the
+indexes, whose names are global there, and the swap runs as one ALTER TABLE RENAME per table.
+
+Configuration through environment variables:
+    ETL_SWAP_MIN_RATIO   Smallest shadow/live row count ratio that may be swapped in (default: 0.9)
+"""
+import os
+import time
+import logging
+from typing import Any, Dict, List, Optional, Type
+
+from sqlalchemy import MetaData, Table, func, select, text
+
+from src.config.schemas import Base
+
+logger = logging.getLogger(__name__)
+
+SHADOW_SUFFIX = "_shadow"
+OLD_SUFFIX = "_old"
+
+
+def _quote(engine, name: str) -> str:
+    return engine.dialect.identifier_preparer.quote(name)
+
+
+def create_shadow_table(model: Type[Base], engine) -> Table:
+    """
+    Create an empty <table>_shadow with the definition of the model's table, replacing a shadow table
+    left over from an interrupted run.
+
+    Args:
+        model (Type[Base]): SQLAlchemy model of the live table
+        engine (sqlalchemy.engine.base.Engine): SQLAlchemy engine
+
+    Returns:
+        Table: The shadow table, to insert rows into
+    """
+    table_name = model.__tablename__
+    shadow_name = table_name + SHADOW_SUFFIX
+    shadow_table = model.__table__.to_metadata(MetaData(), name=shadow_name)
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP TABLE IF EXISTS {_quote(engine, shadow_name)}"))
+        if engine.dialect.name == "mysql":
+            # LIKE copies the indexes, unique constraints and table options of the live table
+            connection.execute(text(f"CREATE TABLE `{shadow_name}` LIKE `{table_name}`"))
+        else:
+            shadow_table.indexes.clear()
+            shadow_table.create(connection)
+    return shadow_table
+
+
+def _count(connection, engine, table_name: str) -> Optional[int]:
+    if not engine.dialect.has_table(connection, table_name):
+        return None
+    return connection.execute(select(func.count()).select_from(text(_quote(engine, table_name)))).scalar()
+
+
+def drop_shadow_tables(models: List[Type[Base]], engine) -> None:
+    """Drop the shadow tables of the given models, if they exist."""
+    with engine.begin() as connection:
+        for model in models:
+            connection.execute(text(f"DROP TABLE IF EXISTS {_quote(engine, model.__tablename__ + SHADOW_SUFFIX)}"))
+
+
+def swap_shadow_tables(
+    models: List[Type[Base]],
+    engine,
+    expected_counts: Dict[str, int],
+    min_ratio: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Validate the filled shadow tables and swap them in for the live tables in one atomic rename.
+
+    Args:
+        models (List[Type[Base]]): Models whose shadow tables are swapped in together
+        engine (sqlalchemy.engine.base.Engine): SQLAlchemy engine
+        expected_counts (Dict[str, int]): Rows built into each shadow table, by live table name
+        min_ratio (Optional[float]): Smallest shadow/live row count ratio allowed, defaults to ETL_SWAP_MIN_RATIO
+
+    Returns:
+        dict: {
+            "success": bool,        # True only if the tables were swapped
+            "message": str,
+            "result": {
+                "swapped": bool,
+                "tables": {table_name: {"expected_rows": int, "shadow_rows": int, "live_rows": int | None}},
+                "failed_checks": [str],
+                "swap_seconds": float    # Time the rename took
+            }
+        }
+    """
+    if min_ratio is None:
+        min_ratio = float(os.getenv("ETL_SWAP_MIN_RATIO", "0.9"))
+
+    tables, failed_checks = {}, []
+    with engine.connect() as connection:
+        for model in models:
+            table_name = model.__tablename__
+            shadow_rows = _count(connection, engine, table_name + SHADOW_SUFFIX)
+            live_rows = _count(connection, engine, table_name)
+            expected_rows = expected_counts.get(table_name)
+            tables[table_name] = {"expected_rows": expected_rows, "shadow_rows": shadow_rows, "live_rows": live_rows}
+
+            if shadow_rows is None:
+                failed_checks.append(f"{table_name}: no shadow table")
+            elif shadow_rows != expected_rows:
+                failed_checks.append(f"{table_name}: shadow table holds {shadow_rows} rows, {expected_rows} were built")
+            elif shadow_rows == 0:
+                failed_checks.append(f"{table_name}: shadow table is empty")
+            elif live_rows and shadow_rows < live_rows * min_ratio:
+                failed_checks.append(f"{table_name}: shadow table holds {shadow_rows} rows, under {min_ratio:.0%} of the {live_rows} live rows")
+
+    if failed_checks:
+        drop_shadow_tables(models, engine)
+        message = "Kept the live tables, validation failed: " + "; ".join(failed_checks)
+        logger.error(message)
+        return {"success": False, "message": message, "result": {"swapped": False, "tables": tables, "failed_checks": failed_checks}}
+
+    table_names = [model.__tablename__ for model in models]
+    started = time.perf_counter()
+    try:
+        with engine.begin() as connection:
+            if engine.dialect.name == "mysql":
+                renames = []
+                for name in table_names:
+                    if tables[name]["live_rows"] is not None:
+                        renames.append(f"`{name}` TO `{name}{OLD_SUFFIX}`")
+                    renames.append(f"`{name}{SHADOW_SUFFIX}` TO `{name}`")
+                connection.execute(text(f"DROP TABLE IF EXISTS {', '.join(f'`{name}{OLD_SUFFIX}`' for name in table_names)}"))
+                connection.execute(text("RENAME TABLE " + ", ".join(renames)))
+            else:
+                for name in table_names:
+                    connection.execute(text(f"DROP TABLE IF EXISTS {_quote(engine, name + OLD_SUFFIX)}"))
+                    if tables[name]["live_rows"] is not None:
+                        connection.execute(text(f"ALTER TABLE {_quote(engine, name)} RENAME TO {_quote(engine, name + OLD_SUFFIX)}"))
+                    connection.execute(text(f"ALTER TABLE {_quote(engine, name + SHADOW_SUFFIX)} RENAME TO {_quote(engine, name)}"))
+        swap_seconds = time.perf_counter() - started
+    except Exception as e:
+        message = f"Error swapping in the shadow tables, the live tables are unchanged: {e}"
+        logger.error(message)
+        return {"success": False, "message": message, "result": {"swapped": False, "tables": tables, "failed_checks": []}}
+
+    with engine.begin() as connection:
+        for name in table_names:
+            connection.execute(text(f"DROP TABLE IF EXISTS {_quote(engine, name + OLD_SUFFIX)}"))
+
+    return {
+        "success": True,
+        "message": f"Swapped in {', '.join(table_names)} ({', '.join(str(tables[name]['shadow_rows']) for name in table_names)} rows)",
+        "result": {"swapped": True, "tables": tables, "failed_checks": [], "swap_seconds": round(swap_seconds, 4)}
+    }
+
+
+if __name__ == "__main__":
+    print("Minimalistic happy path example for the shadow table swap:")
+    print("This example rebuilds the skills table of an in-memory SQLite database through a shadow table.")
+
+    from datetime import date
+    from sqlalchemy import create_engine, insert
+    from src.config.schemas import Skills
+
+    example_engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(example_engine, tables=[Skills.__table__])
+
+    shadow = create_shadow_table(Skills, example_engine)
+    with example_engine.begin() as example_connection:
+        example_connection.execute(insert(shadow), [
+            {"element_id": "2.A.1.a", "element_name": "Reading Comprehension", "source": "example", "last_updated": date.today()},
+            {"element_id": "2.A.1.b", "element_name": "Active Listening", "source": "example", "last_updated": date.today()},
+        ])
+    swap_result = swap_shadow_tables([Skills], example_engine, expected_counts={"skills": 2})
+
+    print("\nFunction Call Result:")
+    print(f"  Success: {swap_result['success']}")
+    print(f"  Message: {swap_result['message']}")
+    print(f"  Result: {swap_result['result']}")
+    print("\nExample finished.")
@@ -0,0 +1,102 @@
+"""
+Idempotent in-place upgrade of existing tables to the current model definitions.
+
+init_db drops and recreates every table, which wipes stored data such as the LLM request/reply
+history. upgrade_table_schema instead compares each existing table with its model and only adds
+what is missing:
+
+    ALTER TABLE llm_skill_proficiency_requests ADD COLUMN prompt_template_hash VARCHAR(64) NULL
+    CREATE INDEX ix_llm_skill_proficiency_requests_cache_key ON llm_skill_proficiency_requests (...)
+
+Only nullable columns without a server default are added, since existing rows need a value for
+every new column. Tables that do not exist yet are created. Running it again changes nothing.
+"""
+import logging
+from typing import Any, Dict, List, Type
+
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateColumn
+
+from src.config.schemas import Base
+
+logger = logging.getLogger(__name__)
+
+
+def upgrade_table_schema(models: List[Type[Base]], engine) -> Dict[str, Any]:
+    """
+    Add the columns and indexes of the given models that their existing tables lack.
+
+    Args:
+        models (List[Type[Base]]): Models whose tables are brought up to date
+        engine (sqlalchemy.engine.base.Engine): SQLAlchemy engine
+
+    Returns:
+        dict: {
+            "success": bool,
+            "message": str,
+            "result": {
+                "created_tables": [str],
+                "added_columns": [str],     # "<table>.<column>"
+                "added_indexes": [str]
+            }
+        }
+    """
+    created_tables, added_columns, added_indexes = [], [], []
+    try:
+        for model in models:
+            table = model.__table__
+            inspector = inspect(engine)
+            if not inspector.has_table(table.name):
+                table.create(engine)
+                created_tables.append(table.name)
+                continue
+
+            existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+            missing_columns = [column for column in table.columns if column.name not in existing_columns]
+            for column in missing_columns:
+                if not column.nullable or column.server_default is not None:
+                    raise ValueError(f"Column {table.name}.{column.name} cannot be added to existing rows, "
+                                     f"reinitialise the table with init_db")
+            with engine.begin() as connection:
+                for column in missing_columns:
+                    column_definition = CreateColumn(column).compile(dialect=engine.dialect)
+                    connection.execute(text(f"ALTER TABLE {engine.dialect.identifier_preparer.format_table(table)} ADD COLUMN {column_definition}"))
+                    added_columns.append(f"{table.name}.{column.name}")
+
+            existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    index.create(engine)
+                    added_indexes.append(index.name)
+    except Exception as e:
+        message = f"Error upgrading table schema: {e}"
+        logger.error(message)
+        return {
+            "success": False,
+            "message": message,
+            "result": {"created_tables": created_tables, "added_columns": added_columns, "added_indexes": added_indexes}
+        }
+
+    changes = created_tables + added_columns + added_indexes
+    if changes:
+        logger.info(f"Upgraded table schema: {', '.join(changes)}")
+    return {
+        "success": True,
+        "message": f"Upgraded table schema: {', '.join(changes)}" if changes else "Table schema is up to date",
+        "result": {"created_tables": created_tables, "added_columns": added_columns, "added_indexes": added_indexes}
+    }
+
+
+if __name__ == "__main__":
+    print("Minimalistic happy path example for upgrade_table_schema:")
+    print("This example assumes a reachable database and configured environment variables.")
+
+    from src.config.schemas import get_sqlalchemy_engine, LLM_Skill_Proficiency_Requests
+
+    result = upgrade_table_schema([LLM_Skill_Proficiency_Requests], get_sqlalchemy_engine())
+
+    print("\nFunction Call Result:")
+    print(f"  Success: {result['success']}")
+    print(f"  Message: {result['message']}")
+    print(f"  Result: {result['result']}")
+    print("\nExample finished.")
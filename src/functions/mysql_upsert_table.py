@@ -0,0 +1,242 @@
+"""
+Incremental (upsert) loading of a table: diff the new rows against the existing ones by key and
+apply only the changes, instead of deleting the whole table and inserting everything again.
+
+The existing rows are read once and compared column by column, after both sides are normalized to
+the column types (so 4.5 from a DataFrame equals Decimal('4.50') from a DECIMAL(5, 2) column).
+New and changed rows are written with batched INSERT ... ON DUPLICATE KEY UPDATE (ON CONFLICT DO
+UPDATE on SQLite), and rows whose key is no longer present are deleted in batches. The diff and
+every write run in one transaction, so readers see either the old or the new table, never an
+empty or half-loaded one.
+
+Configuration through environment variables:
+    ETL_UPSERT_BATCH_ROWS   Rows per INSERT ... ON DUPLICATE KEY UPDATE or DELETE statement (default: 500)
+"""
+import os
+import time
+import logging
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+import pandas as pd
+from sqlalchemy import select, delete, tuple_, inspect, Integer, Numeric, Date
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from src.config.schemas import Base
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(value: Any, column) -> Any:
+    """Bring a value to the form the column stores, so new and existing values compare equal."""
+    if value is None or (not isinstance(value, (str, bytes)) and pd.isna(value)):
+        # None, NaN, NaT and pd.NA all become NULL
+        return None
+    if isinstance(column.type, Integer):
+        return int(value)
+    if isinstance(column.type, Numeric):
+        try:
+            number = Decimal(str(value))
+        except InvalidOperation:
+            return value
+        scale = column.type.scale
+        return number.quantize(Decimal(1).scaleb(-scale)) if scale is not None else number
+    if isinstance(column.type, Date) and isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def diff_rows(
+    new_rows: Iterable[Dict[str, Any]],
+    existing_rows: Iterable[Dict[str, Any]],
+    model: Type[Base],
+    key_columns: Sequence[str],
+    compare_columns: Sequence[str]
+) -> Dict[str, Any]:
+    """
+    Compare new rows with existing rows by key.
+
+    Args:
+        new_rows (Iterable[Dict[str, Any]]): Rows the table should hold
+        existing_rows (Iterable[Dict[str, Any]]): Rows the table holds now (key and compare columns)
+        model (Type[Base]): SQLAlchemy model of the table, for the column types
+        key_columns (Sequence[str]): Columns identifying a row (primary key or unique constraint)
+        compare_columns (Sequence[str]): Columns whose change makes a row an update
+
+    Returns:
+        dict: {"upserts": rows to insert or update, "delete_keys": keys to delete,
+               "inserted": int, "updated": int, "unchanged": int, "deleted": int}
+    """
+    columns = {column.name: column for column in inspect(model).columns}
+
+    def key_of(row: Dict[str, Any]) -> Tuple:
+        return tuple(_normalize(row.get(name), columns[name]) for name in key_columns)
+
+    def values_of(row: Dict[str, Any]) -> Tuple:
+        return tuple(_normalize(row.get(name), columns[name]) for name in compare_columns)
+
+    existing = {key_of(row): values_of(row) for row in existing_rows}
+    upserts, seen = [], set()
+    inserted = updated = unchanged = 0
+    for row in new_rows:
+        key = key_of(row)
+        if key in seen:
+            # Later duplicates of a key would overwrite the earlier row in the same upsert
+            continue
+        seen.add(key)
+        if key not in existing:
+            inserted += 1
+        elif existing[key] != values_of(row):
+            updated += 1
+        else:
+            unchanged += 1
+            continue
+        upserts.append({name: _normalize(value, columns[name]) for name, value in row.items() if name in columns})
+
+    delete_keys = [key for key in existing if key not in seen]
+    return {
+        "upserts": upserts,
+        "delete_keys": delete_keys,
+        "inserted": inserted,
+        "updated": updated,
+        "unchanged": unchanged,
+        "deleted": len(delete_keys)
+    }
+
+
+def _upsert_statement(model: Type[Base], rows: List[Dict[str, Any]], key_columns: Sequence[str], dialect: str):
+    table = model.__table__
+    update_columns = sorted({name for row in rows for name in row} - set(key_columns))
+    if dialect == "mysql":
+        statement = mysql_insert(table).values(rows)
+        return statement.on_duplicate_key_update({name: statement.inserted[name] for name in update_columns})
+    if dialect == "sqlite":
+        statement = sqlite_insert(table).values(rows)
+        return statement.on_conflict_do_update(index_elements=list(key_columns), set_={name: statement.excluded[name] for name in update_columns})
+    raise ValueError(f"Upserts are not supported for the {dialect} dialect")
+
+
+def upsert_rows(
+    rows: Iterable[Dict[str, Any]],
+    model: Type[Base],
+    engine,
+    key_columns: Optional[Sequence[str]] = None,
+    ignore_columns: Sequence[str] = (),
+    delete_missing: bool = True,
+    batch_size: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Make the table hold the given rows by applying only the inserts, updates and deletes that differ.
+
+    Args:
+        rows (Iterable[Dict[str, Any]]): The rows the table should hold, as column name -> value
+        model (Type[Base]): SQLAlchemy model of the table
+        engine (sqlalchemy.engine.base.Engine): SQLAlchemy engine (MySQL, or SQLite for tests)
+        key_columns (Optional[Sequence[str]]): Columns matching new to existing rows; a primary key or
+                                               unique constraint. Defaults to the primary key.
+        ignore_columns (Sequence[str]): Columns that are written but do not make a row count as changed
+                                        (e.g. last_updated)
+        delete_missing (bool): Delete existing rows whose key is not in rows. Defaults to True.
+        batch_size (Optional[int]): Rows per statement, defaults to ETL_UPSERT_BATCH_ROWS
+
+    Returns:
+        dict: {"success": bool, "message": str, "result": {"inserted": int, "updated": int, "deleted": int,
+               "unchanged": int, "statements": int, "elapsed_seconds": float}}
+    """
+    table_name = model.__tablename__
+    if key_columns is None:
+        key_columns = [column.name for column in inspect(model).primary_key]
+    if batch_size is None:
+        batch_size = int(os.getenv("ETL_UPSERT_BATCH_ROWS", "500"))
+    rows = list(rows)
+    written_columns = sorted({name for row in rows for name in row} & {column.name for column in inspect(model).columns})
+    compare_columns = [name for name in written_columns if name not in key_columns and name not in ignore_columns]
+    table = model.__table__
+    started = time.perf_counter()
+
+    try:
+        with engine.begin() as connection:
+            existing = connection.execute(select(*[table.c[name] for name in [*key_columns, *compare_columns]])).mappings().all()
+            changes = diff_rows(rows, existing, model, key_columns, compare_columns)
+
+            statements = 0
+            upserts = changes["upserts"]
+            for start in range(0, len(upserts), batch_size):
+                connection.execute(_upsert_statement(model, upserts[start:start + batch_size], key_columns, engine.dialect.name))
+                statements += 1
+
+            delete_keys = changes["delete_keys"] if delete_missing else []
+            key_expression = table.c[key_columns[0]] if len(key_columns) == 1 else tuple_(*[table.c[name] for name in key_columns])
+            for start in range(0, len(delete_keys), batch_size):
+                batch = delete_keys[start:start + batch_size]
+                values = [key[0] for key in batch] if len(key_columns) == 1 else batch
+                connection.execute(delete(table).where(key_expression.in_(values)))
+                statements += 1
+    except Exception as e:
+        logger.error(f"Error upserting into '{table_name}': {e}")
+        return {"success": False, "message": f"Error upserting into {table_name}: {e}", "result": {}}
+
+    result = {
+        "inserted": changes["inserted"],
+        "updated": changes["updated"],
+        "deleted": changes["deleted"] if delete_missing else 0,
+        "unchanged": changes["unchanged"],
+        "statements": statements,
+        "elapsed_seconds": round(time.perf_counter() - started, 3)
+    }
+    logger.info(f"Upserted '{table_name}': {result}")
+    return {
+        "success": True,
+        "message": (f"Incrementally loaded {table_name}: {result['inserted']} inserted, {result['updated']} updated, "
+                    f"{result['deleted']} deleted, {result['unchanged']} unchanged"),
+        "result": result
+    }
+
+
+def upsert_data_from_dataframe(df: pd.DataFrame, model: Type[Base], engine, delete_missing: bool = True) -> Dict[str, Any]:
+    """
+    Incremental counterpart of load_data_from_dataframe: upsert the DataFrame's rows by the model's
+    primary key, and by default delete the rows it no longer contains.
+
+    Args:
+        df (pd.DataFrame): The DataFrame containing the data the table should hold
+        model (Type[Base]): The SQLAlchemy model class representing the target table
+        engine (sqlalchemy.engine.base.Engine): SQLAlchemy engine for database connection
+        delete_missing (bool): Delete rows whose key is not in the DataFrame. Defaults to True.
+
+    Returns:
+        dict: As upsert_rows; result also holds "records_loaded" (rows inserted or updated)
+    """
+    model_columns = {column.name for column in inspect(model).columns}
+    records = df[[name for name in df.columns if name in model_columns]].to_dict(orient="records")
+    result = upsert_rows(records, model, engine, delete_missing=delete_missing)
+    if result["success"]:
+        result["result"]["records_loaded"] = result["result"]["inserted"] + result["result"]["updated"]
+    return result
+
+
+if __name__ == "__main__":
+    print("Minimalistic happy path example for upsert_rows:")
+    print("This example upserts scales into an in-memory SQLite database twice.")
+
+    from sqlalchemy import create_engine
+    from src.config.schemas import Onet_Scales_Landing
+
+    example_engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(example_engine, tables=[Onet_Scales_Landing.__table__])
+
+    first = upsert_rows([
+        {"scale_id": "IM", "scale_name": "Importance", "minimum": 1, "maximum": 5},
+        {"scale_id": "LV", "scale_name": "Level", "minimum": 0, "maximum": 7},
+    ], Onet_Scales_Landing, example_engine)
+    second = upsert_rows([
+        {"scale_id": "IM", "scale_name": "Importance", "minimum": 1, "maximum": 5},
+        {"scale_id": "LV", "scale_name": "Level of skill", "minimum": 0, "maximum": 7},
+    ], Onet_Scales_Landing, example_engine)
+
+    print("\nFunction Call Results:")
+    print(f"  First run: {first['message']}")
+    print(f"  Second run: {second['message']}")
+    print("\nExample finished.")
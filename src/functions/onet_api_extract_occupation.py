@@ -4,6 +4,7 @@ import time, io, logging
 from typing import Dict, Any, Optional, List
 from datetime import date
 from src.config.schemas import OnetMappings
+from src.config.http_session import get_http_session, get_onet_api_timeout
 import xml.etree.ElementTree as ET
 import os
 
@@ -56,7 +57,7 @@ def onet_api_extract_occupation(
     while current_request_url:
         logging.info(f"Requesting data from: {current_request_url} (Page {page_num})")
         try:
-            response = requests.get(current_request_url, auth=(username, password), timeout=30)
+            response = get_http_session().get(current_request_url, auth=(username, password), timeout=get_onet_api_timeout())
             response.raise_for_status()
 
             if not response.text.strip():
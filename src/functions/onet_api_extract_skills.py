@@ -4,6 +4,7 @@ import time, io, logging
 from typing import Dict, Any, Optional, List
 from datetime import date, datetime
 from src.config.schemas import OnetMappings
+from src.config.http_session import get_http_session, get_onet_api_timeout
 import xml.etree.ElementTree as ET
 import os
 
@@ -41,9 +42,9 @@ def onet_api_extract_skills(
             # Only pass params dict for the initial manually constructed URL
             # Subsequent URLs from 'next' links already have params embedded.
             if page_num == 1 and request_params_for_requests_lib:
-                 response = requests.get(current_request_url, auth=(username, password), params=request_params_for_requests_lib, timeout=30)
+                 response = get_http_session().get(current_request_url, auth=(username, password), params=request_params_for_requests_lib, timeout=get_onet_api_timeout())
             else:
-                 response = requests.get(current_request_url, auth=(username, password), timeout=30) # No params arg here
+                 response = get_http_session().get(current_request_url, auth=(username, password), timeout=get_onet_api_timeout()) # No params arg here
             
             response.raise_for_status()
 
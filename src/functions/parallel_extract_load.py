@@ -0,0 +1,169 @@
+"""
+Parallel extract-and-load of several text files into their landing tables.
+
+Every file is parsed in a worker process, so the CPU-bound pandas parsing of one file does not wait
+for another. A table is loaded as soon as its file is parsed and the tables it depends on are
+loaded. Independent tables load concurrently from a thread pool, and each load checks out its own
+connection from the engine's pool, so the pool should hold at least load_workers connections.
+A failed parse or load skips every table that depends on it; other tables still load.
+"""
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from graphlib import TopologicalSorter, CycleError
+from typing import Any, Callable, Dict, List, Optional
+
+from src.functions.mysql_load_table import load_data_from_dataframe
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_file(extract_function: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """Run one extract function in a worker process and time it."""
+    started = time.perf_counter()
+    try:
+        result = extract_function()
+    except Exception as e:
+        result = {"success": False, "df": None, "error": str(e)}
+    result["parse_seconds"] = time.perf_counter() - started
+    return result
+
+
+def _load_file(df, model, engine, backend: Optional[str]) -> Dict[str, Any]:
+    started = time.perf_counter()
+    result = load_data_from_dataframe(df, model, engine, backend=backend)
+    result["load_seconds"] = time.perf_counter() - started
+    return result
+
+
+def run_parallel_extract_load(
+    files: List[Dict[str, Any]],
+    engine,
+    parse_workers: int = 3,
+    load_workers: int = 3,
+    backend: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Parse files in a process pool and load their tables concurrently, in dependency order.
+
+    Args:
+        files (List[Dict[str, Any]]): One entry per file: {"name": str, "extract": a picklable module-level
+                                      function returning {"success", "df", "error"}, "model": landing model,
+                                      "depends_on": names of files whose tables must be loaded first (optional)}
+        engine (sqlalchemy.engine.base.Engine): SQLAlchemy engine; its pool should hold load_workers connections
+        parse_workers (int): Worker processes parsing files
+        load_workers (int): Tables loaded at the same time
+        backend (Optional[str]): Loader backend, see load_data_from_dataframe
+
+    Returns:
+        dict: {
+            "success": bool,                # Every file was loaded
+            "message": str,
+            "result": {
+                "files": {name: {"status": "loaded" | "failed" | "skipped", "rows": int,
+                                 "parse_seconds": float, "load_seconds": float, "backend": str,
+                                 "failed_stage": "parse" | "load", "error": str}},
+                "elapsed_seconds": float
+            }
+        }
+    """
+    specs = {spec["name"]: spec for spec in files}
+    graph = {name: set(spec.get("depends_on", [])) for name, spec in specs.items()}
+    unknown = {dependency for dependencies in graph.values() for dependency in dependencies} - set(specs)
+    if unknown:
+        return {"success": False, "message": f"Unknown dependencies: {sorted(unknown)}", "result": {}}
+    sorter = TopologicalSorter(graph)
+    try:
+        sorter.prepare()
+    except CycleError as e:
+        return {"success": False, "message": f"Dependency cycle between files: {e.args[1]}", "result": {}}
+
+    started = time.perf_counter()
+    report = {name: {"status": "skipped", "rows": 0, "parse_seconds": None, "load_seconds": None} for name in specs}
+    parsed: Dict[str, Any] = {}
+    dependencies_loaded = set(sorter.get_ready())
+
+    with ProcessPoolExecutor(max_workers=parse_workers) as parse_pool, ThreadPoolExecutor(max_workers=load_workers, thread_name_prefix="etl-load") as load_pool:
+        pending = {parse_pool.submit(_parse_file, spec["extract"]): ("parse", name) for name, spec in specs.items()}
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, name = pending.pop(future)
+                if stage == "parse":
+                    try:
+                        parse_result = future.result()
+                    except Exception as e:
+                        # The worker process died or its result could not be sent back
+                        parse_result = {"success": False, "df": None, "error": str(e), "parse_seconds": 0.0}
+                    report[name]["parse_seconds"] = round(parse_result["parse_seconds"], 3)
+                    if parse_result["success"]:
+                        parsed[name] = parse_result["df"]
+                        logger.info(f"Parsed {name} ({len(parse_result['df'])} rows) in {parse_result['parse_seconds']:.2f}s")
+                    else:
+                        report[name].update(status="failed", failed_stage="parse", error=f"Parse failed: {parse_result['error']}")
+                        logger.error(f"Could not parse {name}: {parse_result['error']}")
+                else:
+                    load_result = future.result()
+                    report[name]["load_seconds"] = round(load_result["load_seconds"], 3)
+                    if load_result["success"]:
+                        report[name].update(status="loaded", rows=load_result["result"]["records_loaded"],
+                                            backend=load_result["result"].get("backend"))
+                        logger.info(f"Loaded {name} in {load_result['load_seconds']:.2f}s")
+                        sorter.done(name)
+                        dependencies_loaded.update(sorter.get_ready())
+                    else:
+                        report[name].update(status="failed", failed_stage="load", error=f"Load failed: {load_result['message']}")
+                        logger.error(f"Could not load {name}: {load_result['message']}")
+
+            # Start the loads whose file is parsed and whose dependencies are loaded
+            for name in [name for name in dependencies_loaded if name in parsed]:
+                dependencies_loaded.discard(name)
+                load_future = load_pool.submit(_load_file, parsed.pop(name), specs[name]["model"], engine, backend)
+                pending[load_future] = ("load", name)
+
+    for name, file_report in report.items():
+        if file_report["status"] == "skipped":
+            file_report["error"] = f"Skipped: a dependency of {name} was not loaded"
+
+    counts = {status: sum(1 for file_report in report.values() if file_report["status"] == status) for status in ("loaded", "failed", "skipped")}
+    return {
+        "success": counts["loaded"] == len(specs),
+        "message": f"Parallel extract-load finished: {counts['loaded']} loaded, {counts['failed']} failed, {counts['skipped']} skipped",
+        "result": {
+            "files": report,
+            "elapsed_seconds": round(time.perf_counter() - started, 3)
+        }
+    }
+
+
+if __name__ == '__main__':
+    print("Minimalistic happy path example for run_parallel_extract_load:")
+    print("This example parses the O*NET scales and occupations files and loads them into a temporary SQLite database.")
+
+    import os
+    import tempfile
+    from sqlalchemy import create_engine
+    from src.config.schemas import Base, Onet_Occupations_Landing, Onet_Scales_Landing
+    from src.functions.extract_onet_data import extract_occupations, extract_scales
+
+    example_dir = tempfile.mkdtemp()
+    # A file database: every load thread opens its own connection
+    example_engine = create_engine(f"sqlite:///{os.path.join(example_dir, 'example.db')}")
+    Base.metadata.create_all(example_engine, tables=[Onet_Occupations_Landing.__table__, Onet_Scales_Landing.__table__])
+
+    example_result = run_parallel_extract_load([
+        {"name": "scales.txt", "extract": extract_scales, "model": Onet_Scales_Landing},
+        {"name": "occupations.txt", "extract": extract_occupations, "model": Onet_Occupations_Landing, "depends_on": ["scales.txt"]},
+    ], example_engine, parse_workers=2, load_workers=1, backend="orm")
+
+    print("\nFunction Call Result:")
+    print(f"  Success: {example_result['success']}")
+    print(f"  Message: {example_result['message']}")
+    for file_name, file_report in example_result["result"]["files"].items():
+        print(f"  {file_name}: {file_report}")
+
+    example_engine.dispose()
+    os.remove(os.path.join(example_dir, 'example.db'))
+    os.rmdir(example_dir)
+    print("\nExample finished.")
@@ -0,0 +1,111 @@
+from datetime import datetime
+from typing import Dict, Any, Optional
+import numpy as np
+from sqlalchemy import insert, delete
+from sqlalchemy.engine import Engine
+
+from src.config.schemas import get_sqlalchemy_engine, Occupation_Gap_Summary
+from src.functions.load_occupation_skill_matrix import load_occupation_skill_matrix
+
+def populate_occupation_gap_summary(chunk_size: int = 100, engine: Optional[Engine] = None) -> Dict[str, Any]:
+    """
+    Populates the Occupation_Gap_Summary table with gap count, total positive level difference and
+    largest level difference for every ordered pair of occupations that have skills.
+
+    This function:
+    1. Loads the occupation x skill LV matrix from Occupation_Skills
+    2. Processes source occupations in chunks, computing gaps against all targets with NumPy broadcasting
+       (same gap rule as get_skills_gap_by_lvl)
+    3. Replaces the table contents with the new rows in one transaction, inserting chunk by chunk
+
+    Args:
+        chunk_size (int): Number of source occupations per chunk. Peak memory is roughly
+                          chunk_size x occupations x skills x 4 bytes.
+        engine (Optional[Engine]): SQLAlchemy engine to use for database operations,
+                                  or None to use the default engine
+
+    Returns:
+        Dict[str, Any]: A dictionary with keys:
+            - 'success' (bool): Whether the operation was successful
+            - 'message' (str): A message describing the result
+            - 'result' (Dict): {"gap_summary_count": int, "occupation_count": int}
+    """
+    if engine is None:
+        engine = get_sqlalchemy_engine()
+
+    matrix_result = load_occupation_skill_matrix(engine=engine)
+    if not matrix_result["success"]:
+        return {"success": False, "message": f"Error populating OccupationGapSummary table: {matrix_result['message']}", "result": {}}
+    matrix = matrix_result["result"]
+
+    # Only occupations with at least one listed skill take part, as in the gap endpoints
+    rows_with_skills = np.flatnonzero(~np.isnan(matrix["proficiency"]).all(axis=1))
+    proficiency = matrix["proficiency"][rows_with_skills]
+    codes = [matrix["occupation_codes"][row] for row in rows_with_skills]
+    current_date = datetime.now().date()
+
+    target_levels = proficiency[np.newaxis, :, :]
+    with np.errstate(invalid="ignore"):
+        target_required = target_levels > 0
+
+    summary_count = 0
+    try:
+        Occupation_Gap_Summary.__table__.create(engine, checkfirst=True)
+        with engine.begin() as connection:
+            connection.execute(delete(Occupation_Gap_Summary))
+
+            for start in range(0, len(codes), chunk_size):
+                source_levels = proficiency[start:start + chunk_size, np.newaxis, :]
+                with np.errstate(invalid="ignore"):
+                    source_levels = np.where(source_levels > 0, source_levels, 0)
+                    gap_mask = target_required & (target_levels > source_levels)
+                deltas = np.where(gap_mask, target_levels - source_levels, 0).astype(np.float64)
+
+                gap_counts = gap_mask.sum(axis=2)
+                total_gaps = np.round(deltas.sum(axis=2), 2)
+                max_gaps = np.round(deltas.max(axis=2), 2)
+
+                records = [
+                    {
+                        "from_onet_soc_code": codes[start + i],
+                        "to_onet_soc_code": codes[j],
+                        "gap_count": int(gap_counts[i, j]),
+                        "total_gap": float(total_gaps[i, j]),
+                        "max_gap": float(max_gaps[i, j]),
+                        "last_updated": current_date
+                    }
+                    for i in range(gap_counts.shape[0])
+                    for j in range(len(codes))
+                    if start + i != j
+                ]
+                if records:
+                    connection.execute(insert(Occupation_Gap_Summary), records)
+                summary_count += len(records)
+                print(f"Inserted gap summaries for {min(start + chunk_size, len(codes))}/{len(codes)} source occupations")
+    except Exception as e:
+        error_message = f"Error populating OccupationGapSummary table: {str(e)}"
+        print(error_message)
+        return {"success": False, "message": error_message, "result": {}}
+
+    return {
+        "success": True,
+        "message": f"Successfully populated OccupationGapSummary table for {len(codes)} occupations.",
+        "result": {
+            "gap_summary_count": summary_count,
+            "occupation_count": len(codes)
+        }
+    }
+
+if __name__ == "__main__":
+    print("Minimalistic happy path example for populate_occupation_gap_summary:")
+    print("This example assumes a populated occupation_skills table and configured environment variables.")
+
+    result = populate_occupation_gap_summary()
+
+    print("\nFunction Call Result:")
+    print(f"  Success: {result['success']}")
+    print(f"  Message: {result['message']}")
+    for key, value in result.get('result', {}).items():
+        print(f"    - {key}: {value}")
+
+    print("\nExample finished.")
@@ -1,13 +1,14 @@
 import os
 from datetime import datetime
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import select
+from sqlalchemy import select, insert, Table
 from typing import Dict, Any, Optional
 from sqlalchemy.engine import Engine
 
 from src.config.schemas import get_sqlalchemy_engine, Onet_Skills_Landing, Occupation_Skills
+from src.functions.mysql_upsert_table import upsert_rows
 
-def populate_occupation_skills(source: str = 'text_file', engine: Optional[Engine] = None) -> Dict[str, Any]:
+def populate_occupation_skills(source: str = 'text_file', engine: Optional[Engine] = None, incremental: bool = False, target_table: Optional[Table] = None) -> Dict[str, Any]:
     """
     Populates the OccupationSkills table from the raw Skills table.
     
@@ -20,12 +21,17 @@ def populate_occupation_skills(source: str = 'text_file', engine: Optional[Engin
                      Other possible values: 'api', 'merged'
         engine (Optional[Engine]): SQLAlchemy engine to use for database operations,
                                   or None to use the default engine
+        incremental (bool): Upsert only new and changed relationships (keyed by onet_soc_code and
+                            element_id) and delete removed ones, instead of clearing and refilling the table.
+        target_table (Optional[Table]): Empty table to fill instead of the OccupationSkills table, e.g. a
+                                        shadow table from create_shadow_table that is swapped in afterwards.
     
     Returns:
         Dict[str, Any]: A dictionary with keys:
             - 'success' (bool): Whether the operation was successful
             - 'message' (str): A message describing the result
-            - 'result' (Dict): Statistics about the operation
+            - 'result' (Dict): Statistics about the operation; in incremental mode also
+              'changes' with the inserted/updated/deleted/unchanged counts
     """
     try:
         # If no engine is provided, get the default one
@@ -50,6 +56,51 @@ def populate_occupation_skills(source: str = 'text_file', engine: Optional[Engin
         )
         lv_skills = session.execute(lv_skills_query).all()
         
+        if incremental:
+            upsert_result = upsert_rows(
+                [
+                    {"onet_soc_code": onet_soc_code, "element_id": element_id, "proficiency_level": data_value,
+                     "source": source, "last_updated": current_date}
+                    for onet_soc_code, element_id, data_value in lv_skills
+                    if data_value is not None
+                ],
+                Occupation_Skills, engine, key_columns=["onet_soc_code", "element_id"], ignore_columns=["last_updated"]
+            )
+            if not upsert_result["success"]:
+                raise RuntimeError(upsert_result["message"])
+            changes = upsert_result["result"]
+            skills_count = changes["inserted"] + changes["updated"] + changes["unchanged"]
+            print(upsert_result["message"])
+            return {
+                "success": True,
+                "message": f"Successfully populated OccupationSkills table from {source} data.",
+                "result": {
+                    "occupation_skills_count": skills_count,
+                    "changes": changes
+                }
+            }
+
+        if target_table is not None:
+            # The live table is left alone until the filled table is swapped in
+            occupation_skill_rows = [
+                {"onet_soc_code": onet_soc_code, "element_id": element_id, "proficiency_level": data_value,
+                 "source": source, "last_updated": current_date}
+                for onet_soc_code, element_id, data_value in lv_skills
+                if data_value is not None
+            ]
+            if occupation_skill_rows:
+                session.execute(insert(target_table), occupation_skill_rows)
+            session.commit()
+            skills_count = len(occupation_skill_rows)
+            print(f"Inserted {skills_count} occupation-skill relationships into {target_table.name}")
+            return {
+                "success": True,
+                "message": f"Successfully populated {target_table.name} table from {source} data.",
+                "result": {
+                    "occupation_skills_count": skills_count
+                }
+            }
+
         # Clear existing data in OccupationSkills if needed
         session.query(Occupation_Skills).delete()
         session.commit()
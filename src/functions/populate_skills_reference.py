@@ -1,13 +1,14 @@
 import os
 from datetime import datetime
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import select
+from sqlalchemy import select, insert, Table
 from typing import Dict, Any, Optional
 from sqlalchemy.engine import Engine
 
 from src.config.schemas import get_sqlalchemy_engine, Onet_Skills_Landing, Skills
+from src.functions.mysql_upsert_table import upsert_rows
 
-def populate_skills_reference(source: str = 'text_file', engine: Optional[Engine] = None) -> Dict[str, Any]:
+def populate_skills_reference(source: str = 'text_file', engine: Optional[Engine] = None, incremental: bool = False, target_table: Optional[Table] = None) -> Dict[str, Any]:
     """
     Populates the SkillsReference table from the raw Skills table.
     
@@ -20,12 +21,17 @@ def populate_skills_reference(source: str = 'text_file', engine: Optional[Engine
                      Other possible values: 'api', 'merged'
         engine (Optional[Engine]): SQLAlchemy engine to use for database operations,
                                   or None to use the default engine
+        incremental (bool): Upsert only new and changed skills and delete removed ones, instead of
+                            clearing and refilling the table. Unchanged rows keep their last_updated.
+        target_table (Optional[Table]): Empty table to fill instead of the Skills table, e.g. a shadow
+                                        table from create_shadow_table that is swapped in afterwards.
     
     Returns:
         Dict[str, Any]: A dictionary with keys:
             - 'success' (bool): Whether the operation was successful
             - 'message' (str): A message describing the result
-            - 'result' (Dict): Statistics about the operation
+            - 'result' (Dict): Statistics about the operation; in incremental mode also
+              'changes' with the inserted/updated/deleted/unchanged counts
     """
     try:
         # If no engine is provided, get the default one
@@ -46,6 +52,46 @@ def populate_skills_reference(source: str = 'text_file', engine: Optional[Engine
         )
         unique_skills = session.execute(unique_skills_query).all()
         
+        if incremental:
+            upsert_result = upsert_rows(
+                [
+                    {"element_id": element_id, "element_name": element_name, "source": source, "last_updated": current_date}
+                    for element_id, element_name in unique_skills
+                ],
+                Skills, engine, ignore_columns=["last_updated"]
+            )
+            if not upsert_result["success"]:
+                raise RuntimeError(upsert_result["message"])
+            skills_count = len(unique_skills)
+            print(upsert_result["message"])
+            return {
+                "success": True,
+                "message": f"Successfully populated SkillsReference table from {source} data.",
+                "result": {
+                    "skills_reference_count": skills_count,
+                    "changes": upsert_result["result"]
+                }
+            }
+
+        if target_table is not None:
+            # The live table is left alone until the filled table is swapped in
+            skill_rows = [
+                {"element_id": element_id, "element_name": element_name, "source": source, "last_updated": current_date}
+                for element_id, element_name in unique_skills
+            ]
+            if skill_rows:
+                session.execute(insert(target_table), skill_rows)
+            session.commit()
+            skills_count = len(skill_rows)
+            print(f"Inserted {skills_count} unique skills into {target_table.name}")
+            return {
+                "success": True,
+                "message": f"Successfully populated {target_table.name} table from {source} data.",
+                "result": {
+                    "skills_reference_count": skills_count
+                }
+            }
+
         # Clear existing data in SkillsReference if needed
         session.query(Skills).delete()
         session.commit()
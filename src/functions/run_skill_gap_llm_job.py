@@ -0,0 +1,107 @@
+import json
+from datetime import datetime
+from typing import Dict, Any, Optional
+from sqlalchemy.engine import Engine
+
+from src.config.schemas import get_sqlalchemy_engine
+from src.functions.get_skills_gap_by_lvl_llm import get_skills_gap_by_lvl_llm
+from src.functions.get_occupations_and_skills import get_occupations_and_skills
+from src.functions.claim_skill_gap_llm_job import claim_skill_gap_llm_job
+from src.functions.update_skill_gap_llm_job import update_skill_gap_llm_job
+
+def run_skill_gap_llm_job(
+    job_id: str,
+    from_onet_soc_code: str,
+    to_onet_soc_code: str,
+    engine: Optional[Engine] = None,
+    lease_seconds: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Runs the get_skills_gap_by_lvl_llm pipeline for a queued job and stores the outcome in Skill_Gap_LLM_Jobs.
+
+    The job is claimed first (claim_skill_gap_llm_job moves it to 'running' atomically); if another worker
+    already holds it, the job is skipped. On success the /skill-gap-llm response is stored in result and
+    the job moves to 'succeeded'; otherwise it moves to 'failed' with the status code and message the
+    synchronous endpoint would have returned. The outcome is only written while this worker still holds
+    the claim, so a worker whose job was taken over after its lease expired does not overwrite the result.
+
+    Args:
+        job_id (str): The job created by create_skill_gap_llm_job
+        from_onet_soc_code (str): The O*NET-SOC code for the source occupation
+        to_onet_soc_code (str): The O*NET-SOC code for the target occupation
+        engine (Optional[Engine]): SQLAlchemy engine to use for database operations,
+                                  or None to use the default engine
+        lease_seconds (Optional[float]): Age after which a 'running' job of another worker may be taken over,
+                                         or None to only run 'queued' jobs
+
+    Returns:
+        dict: {
+            "success": bool,   # Whether the job outcome was stored or the job was skipped (not whether the job succeeded)
+            "message": str,
+            "result": {"job_id": str, "status": "succeeded", "failed" or "skipped"}
+        }
+    """
+    if engine is None:
+        engine = get_sqlalchemy_engine()
+
+    claim = claim_skill_gap_llm_job(job_id, lease_seconds=lease_seconds, engine=engine)
+    if not claim["success"]:
+        return {"success": False, "message": claim["message"], "result": {"job_id": job_id}}
+    if not claim["result"]["claimed"]:
+        return {"success": True, "message": claim["message"], "result": {"job_id": job_id, "status": "skipped"}}
+
+    try:
+        llm_result = get_skills_gap_by_lvl_llm(from_onet_soc_code, to_onet_soc_code, engine=engine)
+        if llm_result["success"]:
+            # Titles come from the same batched lookup the pipeline used (served from the cache when loaded)
+            occupation_data = get_occupations_and_skills([from_onet_soc_code, to_onet_soc_code], engine=engine)["result"]["occupation_data"]
+            api_response = {
+                "from_occupation": {
+                    "code": from_onet_soc_code,
+                    "title": occupation_data.get(from_onet_soc_code, {}).get("name", "Unknown")
+                },
+                "to_occupation": {
+                    "code": to_onet_soc_code,
+                    "title": occupation_data.get(to_onet_soc_code, {}).get("name", "Unknown")
+                },
+                "skill_gaps": llm_result["result"]
+            }
+            values = {"status": "succeeded", "result": json.dumps(api_response, default=str)}
+        else:
+            values = {
+                "status": "failed",
+                "error_status_code": 404 if "not found" in llm_result["message"].lower() else 500,
+                "error_message": llm_result["message"]
+            }
+    except Exception as e:
+        values = {"status": "failed", "error_status_code": 500, "error_message": f"Unexpected error running skill gap LLM job: {str(e)}"}
+
+    values["finished_at"] = datetime.now()
+    finished = update_skill_gap_llm_job(
+        job_id, values, engine=engine, expected={"status": "running", "started_at": claim["result"]["started_at"]}
+    )
+    if not finished["success"]:
+        return {"success": False, "message": finished["message"], "result": {"job_id": job_id}}
+    if not finished["result"]["updated"]:
+        return {"success": False, "message": f"Skill gap LLM job {job_id} was taken over by another worker, result discarded", "result": {"job_id": job_id}}
+
+    return {
+        "success": True,
+        "message": f"Skill gap LLM job {job_id} {values['status']}",
+        "result": {"job_id": job_id, "status": values["status"]}
+    }
+
+if __name__ == "__main__":
+    print("Minimalistic happy path example for run_skill_gap_llm_job:")
+    print("This example assumes GEMINI_API_KEY and a populated database with configured environment variables.")
+
+    from src.functions.create_skill_gap_llm_job import create_skill_gap_llm_job
+
+    job = create_skill_gap_llm_job("11-1011.00", "15-1252.00")
+    result = run_skill_gap_llm_job(job["result"]["job_id"], "11-1011.00", "15-1252.00")
+
+    print("\nFunction Call Result:")
+    print(f"  Success: {result['success']}")
+    print(f"  Message: {result['message']}")
+
+    print("\nExample finished.")
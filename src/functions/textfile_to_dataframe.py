@@ -1,6 +1,35 @@
 import os
 import pandas as pd
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterator
+
+
+def _transform_dataframe(
+    df: pd.DataFrame,
+    column_rename_map: Optional[Dict[str, str]] = None,
+    date_columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """Apply the column renames, date parsing and O*NET specific cleanup to a whole file or one chunk of it."""
+    # Rename columns if a mapping is provided
+    if column_rename_map:
+        existing_renames = {k: v for k, v in column_rename_map.items() if k in df.columns}
+        df.rename(columns=existing_renames, inplace=True)
+    
+    # Process date columns
+    if date_columns:
+        for col in date_columns:
+            if col in df.columns:
+                try:
+                    # First try a specific format (for O*NET data)
+                    df[col] = pd.to_datetime(df[col], format='%Y%m', errors='coerce')
+                except Exception:
+                    # If specific format fails, try general conversion
+                    df[col] = pd.to_datetime(df[col], errors='coerce')
+    
+    # Special handling for recommend_suppress column (O*NET specific)
+    if 'recommend_suppress' in df.columns:
+        df['recommend_suppress'] = df['recommend_suppress'].astype(str).str[0]
+
+    return df
 
 
 def textfile_to_dataframe(
@@ -37,25 +66,7 @@ def textfile_to_dataframe(
         # Read the file into a DataFrame with specified data types
         df = pd.read_csv(file_path, sep=separator, dtype=dtype, low_memory=False)
         
-        # Rename columns if a mapping is provided
-        if column_rename_map:
-            existing_renames = {k: v for k, v in column_rename_map.items() if k in df.columns}
-            df.rename(columns=existing_renames, inplace=True)
-        
-        # Process date columns
-        if date_columns:
-            for col in date_columns:
-                if col in df.columns:
-                    try:
-                        # First try a specific format (for O*NET data)
-                        df[col] = pd.to_datetime(df[col], format='%Y%m', errors='coerce')
-                    except Exception:
-                        # If specific format fails, try general conversion
-                        df[col] = pd.to_datetime(df[col], errors='coerce')
-        
-        # Special handling for recommend_suppress column (O*NET specific)
-        if 'recommend_suppress' in df.columns:
-            df['recommend_suppress'] = df['recommend_suppress'].astype(str).str[0]
+        df = _transform_dataframe(df, column_rename_map, date_columns)
         
         result['success'] = True
         result['df'] = df
@@ -65,6 +76,53 @@ def textfile_to_dataframe(
         result['error'] = f"Error processing file {os.path.basename(file_path)}: {str(e)}"
         return result
 
+def textfile_to_dataframe_chunks(
+    file_path: str,
+    chunksize: int,
+    column_rename_map: Optional[Dict[str, str]] = None,
+    dtype: Optional[Dict[str, Any]] = None,
+    date_columns: Optional[List[str]] = None,
+    separator: str = '\t'
+) -> Dict[str, Any]:
+    """
+    Streaming variant of textfile_to_dataframe: read the text file chunksize rows at a time and apply
+    the same transformations to every chunk, so only one chunk is held in memory.
+
+    Args:
+        file_path (str): Path to the text file
+        chunksize (int): Number of rows per chunk
+        column_rename_map (Optional[Dict[str, str]]): Dictionary to rename columns
+        dtype (Optional[Dict[str, Any]]): Dictionary mapping columns to their data types
+        date_columns (Optional[List[str]]): List of columns to convert to date type
+        separator (str): Column separator in the file, defaults to tab
+
+    Returns:
+        Dict[str, Any]: Dictionary with keys 'success', 'chunks' (an iterator of DataFrames, read lazily;
+                        read errors are raised while iterating) and 'error'
+    """
+    result = {
+        'success': False,
+        'chunks': None,
+        'error': None
+    }
+
+    if not os.path.exists(file_path):
+        result['error'] = f"File not found: {file_path}"
+        return result
+    if chunksize < 1:
+        result['error'] = f"chunksize must be at least 1, got {chunksize}"
+        return result
+
+    def read_chunks() -> Iterator[pd.DataFrame]:
+        with pd.read_csv(file_path, sep=separator, dtype=dtype, chunksize=chunksize) as reader:
+            for chunk in reader:
+                yield _transform_dataframe(chunk, column_rename_map, date_columns)
+
+    result['success'] = True
+    result['chunks'] = read_chunks()
+    return result
+
+
 if __name__ == '__main__':
     # Minimalistic happy path example for textfile_to_dataframe.
     # This example assumes a sample tab-separated text file named 'sample_data.txt'
@@ -0,0 +1,66 @@
+from typing import Dict, Any, Optional
+from sqlalchemy import update
+from sqlalchemy.engine import Engine
+
+from src.config.schemas import get_sqlalchemy_engine, Skill_Gap_LLM_Jobs
+
+def update_skill_gap_llm_job(
+    job_id: str,
+    values: Dict[str, Any],
+    engine: Optional[Engine] = None,
+    expected: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Updates columns of one row in the Skill_Gap_LLM_Jobs table (e.g. status, result, finished_at).
+
+    Args:
+        job_id (str): The job to update
+        values (Dict[str, Any]): Column name -> new value
+        engine (Optional[Engine]): SQLAlchemy engine to use for database operations,
+                                  or None to use the default engine
+        expected (Optional[Dict[str, Any]]): Column name -> value the row must still hold, checked in the
+                                             same UPDATE (e.g. the status and started_at of a claimed job)
+
+    Returns:
+        dict: {
+            "success": bool,
+            "message": str,
+            "result": {"job_id": str, "updated": bool}  # updated is False if the job does not exist or no longer matches expected
+        }
+    """
+    if engine is None:
+        engine = get_sqlalchemy_engine()
+
+    try:
+        statement = update(Skill_Gap_LLM_Jobs).where(Skill_Gap_LLM_Jobs.job_id == job_id)
+        for column, value in (expected or {}).items():
+            statement = statement.where(getattr(Skill_Gap_LLM_Jobs, column) == value)
+        with engine.begin() as connection:
+            row_count = connection.execute(statement.values(**values)).rowcount
+    except Exception as e:
+        return {
+            "success": False,
+            "message": f"Error updating skill gap LLM job {job_id}: {str(e)}",
+            "result": {}
+        }
+
+    return {
+        "success": True,
+        "message": f"Updated skill gap LLM job {job_id}" if row_count else (f"Skill gap LLM job {job_id} not found or no longer in the expected state" if expected else f"Skill gap LLM job {job_id} not found"),
+        "result": {"job_id": job_id, "updated": bool(row_count)}
+    }
+
+if __name__ == "__main__":
+    print("Minimalistic happy path example for update_skill_gap_llm_job:")
+    print("This example assumes a reachable database and configured environment variables.")
+
+    from src.functions.create_skill_gap_llm_job import create_skill_gap_llm_job
+
+    job = create_skill_gap_llm_job("11-1011.00", "15-1252.00")
+    result = update_skill_gap_llm_job(job["result"]["job_id"], {"status": "running"})
+
+    print("\nFunction Call Result:")
+    print(f"  Success: {result['success']}")
+    print(f"  Message: {result['message']}")
+
+    print("\nExample finished.")
@@ -0,0 +1,79 @@
+import uuid
+from datetime import datetime
+from typing import Dict, Any, Optional
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import Engine
+
+from src.config.schemas import get_sqlalchemy_engine, Dataset_Versions
+
+def write_dataset_version(
+    dataset_name: str = 'occupation_skills',
+    source: str = 'text_file',
+    row_count: Optional[int] = None,
+    engine: Optional[Engine] = None
+) -> Dict[str, Any]:
+    """
+    Writes a new version stamp for a dataset into the Dataset_Versions table.
+    The table is created if it does not exist yet, so older databases do not need re-initialising.
+
+    Args:
+        dataset_name (str): Name of the dataset that was rebuilt. Default is 'occupation_skills'.
+        source (str): Source of the data. Default is 'text_file'.
+        row_count (Optional[int]): Number of rows written in the rebuilt dataset
+        engine (Optional[Engine]): SQLAlchemy engine to use for database operations,
+                                  or None to use the default engine
+
+    Returns:
+        dict: {
+            "success": bool,
+            "message": str,
+            "result": {"dataset_name": str, "version": str, "created_at": str}
+        }
+    """
+    if engine is None:
+        engine = get_sqlalchemy_engine()
+
+    version = str(uuid.uuid4())
+    created_at = datetime.now()
+
+    try:
+        Dataset_Versions.__table__.create(engine, checkfirst=True)
+        Session = sessionmaker(bind=engine)
+        with Session() as session:
+            session.add(Dataset_Versions(
+                dataset_name=dataset_name,
+                version=version,
+                source=source,
+                row_count=row_count,
+                created_at=created_at
+            ))
+            session.commit()
+    except Exception as e:
+        return {
+            "success": False,
+            "message": f"Error writing dataset version for {dataset_name}: {str(e)}",
+            "result": {}
+        }
+
+    return {
+        "success": True,
+        "message": f"Wrote version {version} for dataset {dataset_name}",
+        "result": {
+            "dataset_name": dataset_name,
+            "version": version,
+            "created_at": created_at.isoformat()
+        }
+    }
+
+if __name__ == "__main__":
+    print("Minimalistic happy path example for write_dataset_version:")
+    print("This example assumes a reachable database and configured environment variables.")
+
+    result = write_dataset_version(dataset_name='occupation_skills', source='text_file')
+
+    print("\nFunction Call Result:")
+    print(f"  Success: {result['success']}")
+    print(f"  Message: {result['message']}")
+    print(f"  Result: {result['result']}")
+
+    print("\nExample finished.")
@@ -1,31 +1,106 @@
+"""
+Extract the O*NET text files and load them into the landing tables.
+
+By default each file is streamed: it is read ETL_CHUNK_ROWS rows at a time, every chunk is
+transformed and loaded before the next one is read, so peak memory is bounded by the chunk size
+rather than the file size. ETL_CHUNK_ROWS=0 reads every file fully into memory before loading.
+
+With ETL_PARALLEL_WORKERS set, the files are instead parsed whole in that many worker processes
+and independent tables are loaded concurrently, in the order given by each file's depends_on
+(see src/functions/parallel_extract_load.py). Per-file parse and load timings are printed.
+
+With ETL_INCREMENTAL=true, each file is read whole and diffed against its table by primary key;
+only new, changed and removed rows are written, in one transaction per table, so the API never
+sees an emptied table (see src/functions/mysql_upsert_table.py).
+
+Configuration through environment variables:
+    ETL_CHUNK_ROWS         Rows read and loaded per chunk; 0 disables streaming (default: 50000)
+    ETL_PARALLEL_WORKERS   Parse processes and concurrent table loads; 0 loads files one by one (default: 0)
+    ETL_INCREMENTAL        Upsert the changes instead of clearing and reloading the tables (default: false)
+"""
 import os
 import sys
 from src.functions.extract_onet_data import extract_onet_data, extract_occupations, extract_skills, extract_scales
-from src.functions.mysql_load_table import load_data_from_dataframe
+from src.functions.mysql_load_table import load_data_from_dataframe, load_data_from_chunks
+from src.functions.parallel_extract_load import run_parallel_extract_load
+from src.functions.mysql_upsert_table import upsert_data_from_dataframe
 from src.functions.mysql_connection import get_mysql_connection # For verification step
 from src.config.schemas import get_sqlalchemy_engine, Onet_Occupations_Landing, Onet_Skills_Landing, Onet_Scales_Landing
 
-def main():
+# The landing tables have no foreign keys between them, so no file depends on another
+ONET_TEXT_FILES = [
+    {'name': 'occupations.txt', 'extract': extract_occupations, 'model': Onet_Occupations_Landing, 'table_name': 'Occupations', 'depends_on': []},
+    {'name': 'skills.txt', 'extract': extract_skills, 'model': Onet_Skills_Landing, 'table_name': 'Skills', 'depends_on': []},
+    {'name': 'scales.txt', 'extract': extract_scales, 'model': Onet_Scales_Landing, 'table_name': 'Scales', 'depends_on': []},
+]
+
+
+def stream_extract_load(engine, chunk_rows: int) -> bool:
     """
-    Main function to orchestrate the extraction of O*NET data 
-    and its loading into the MySQL database.
-    It also verifies the loaded data by checking table counts and sampling rows.
+    Extract and load every O*NET text file chunk by chunk. Returns False if a load failed;
+    files that cannot be opened are reported and skipped, as in the in-memory mode.
     """
-    print("Starting O*NET data extraction and loading process...")
+    files_loaded = 0
+    for file_config in ONET_TEXT_FILES:
+        filename, extract_function, model_to_load, table_name = file_config['name'], file_config['extract'], file_config['model'], file_config['table_name']
+        print(f"\nStreaming {filename} into the {table_name} table in chunks of {chunk_rows} rows...")
+        extract_result = extract_function(chunksize=chunk_rows)
+        if not extract_result['success']:
+            print(f"Error for {filename}: {extract_result['error']}")
+            continue
+
+        load_result = load_data_from_chunks(extract_result['chunks'], model_to_load, engine)
+        print(f"{table_name} load: {load_result['message']} (chunks per backend: {load_result['result']['backends']})")
+        if not load_result['success']:
+            print(f"CRITICAL ERROR: Stopping due to error in loading data into {table_name} table.")
+            return False
+        files_loaded += 1
+
+    if files_loaded == 0:
+        print("Warning: No data was successfully extracted from O*NET files.")
+    return True
+
+
+def incremental_extract_load(engine) -> bool:
+    """
+    Extract every O*NET text file and apply only its row changes to the table. Returns False if a load failed;
+    files that cannot be opened are reported and skipped, as in the other modes.
+    """
+    for file_config in ONET_TEXT_FILES:
+        filename, table_name = file_config['name'], file_config['table_name']
+        print(f"\nIncrementally loading {filename} into the {table_name} table...")
+        extract_result = file_config['extract']()
+        if not extract_result['success']:
+            print(f"Error for {filename}: {extract_result['error']}")
+            continue
+
+        load_result = upsert_data_from_dataframe(extract_result['df'], file_config['model'], engine)
+        print(f"{table_name} load: {load_result['message']}")
+        if not load_result['success']:
+            print(f"CRITICAL ERROR: Stopping due to error in loading data into {table_name} table.")
+            return False
+    return True
 
-    # Step 1: Get SQLAlchemy engine
-    print("\n--- Initializing Database Connection ---")
-    try:
-        engine = get_sqlalchemy_engine()
-        print("SQLAlchemy engine created successfully.")
-    except ValueError as ve:
-        print(f"ERROR: Failed to create SQLAlchemy engine: {ve}")
-        print("Ensure MYSQL_USER, MYSQL_PASSWORD, and MYSQL_DATABASE environment variables are set.")
-        sys.exit(1)
-    except Exception as e:
-        print(f"CRITICAL ERROR: Failed to create SQLAlchemy engine: {e}")
-        sys.exit(1)
 
+def parallel_extract_load(engine, workers: int) -> bool:
+    """
+    Parse the O*NET text files in worker processes and load independent tables concurrently.
+    Returns False if a load failed; files that cannot be parsed are reported and skipped, as in the other modes.
+    """
+    result = run_parallel_extract_load(ONET_TEXT_FILES, engine, parse_workers=workers, load_workers=workers)
+    print(result['message'])
+    for filename, file_report in result['result'].get('files', {}).items():
+        print(f"  {filename}: {file_report['status']}, {file_report['rows']} rows, "
+              f"parse {file_report['parse_seconds']}s, load {file_report['load_seconds']}s"
+              + (f" ({file_report['error']})" if file_report.get('error') else ""))
+    if 'files' not in result['result']:
+        return False
+    print(f"Total: {result['result']['elapsed_seconds']}s")
+    return not any(file_report.get('failed_stage') == 'load' for file_report in result['result']['files'].values())
+
+
+def load_in_memory(engine) -> None:
+    """Extract every O*NET text file fully into memory, then load the DataFrames (ETL_CHUNK_ROWS=0)."""
     # Step 2: Extract data from O*NET files
     print("\n--- Extracting O*NET Data ---")
     
@@ -55,20 +130,11 @@ def main():
             continue
         
         # Map filenames to SQLAlchemy models
-        model_to_load = None
-        table_name = None
-        if filename == 'occupations.txt':
-            model_to_load = Onet_Occupations_Landing
-            table_name = 'Occupations'
-        elif filename == 'skills.txt':
-            model_to_load = Onet_Skills_Landing
-            table_name = 'Skills'
-        elif filename == 'scales.txt':
-            model_to_load = Onet_Scales_Landing
-            table_name = 'Scales'
-        else:
+        file_config = next((config for config in ONET_TEXT_FILES if config['name'] == filename), None)
+        if file_config is None:
             print(f"Warning: Unknown file type {filename} encountered in extracted data. Skipping load.")
             continue
+        model_to_load, table_name = file_config['model'], file_config['table_name']
 
         print(f"--- Loading data into {table_name} table ---")
         load_result = load_data_from_dataframe(df, model_to_load, engine)
@@ -77,6 +143,50 @@ def main():
             print(f"CRITICAL ERROR: Stopping due to error in loading data into {table_name} table.")
             sys.exit(1)
 
+
+def main():
+    """
+    Main function to orchestrate the extraction of O*NET data 
+    and its loading into the MySQL database.
+    It also verifies the loaded data by checking table counts and sampling rows.
+    """
+    print("Starting O*NET data extraction and loading process...")
+
+    # Step 1: Get SQLAlchemy engine
+    print("\n--- Initializing Database Connection ---")
+    parallel_workers = int(os.getenv("ETL_PARALLEL_WORKERS", "0"))
+    try:
+        # Parallel loads each check out their own pooled connection
+        engine = get_sqlalchemy_engine(pool_size=max(5, parallel_workers))
+        print("SQLAlchemy engine created successfully.")
+    except ValueError as ve:
+        print(f"ERROR: Failed to create SQLAlchemy engine: {ve}")
+        print("Ensure MYSQL_USER, MYSQL_PASSWORD, and MYSQL_DATABASE environment variables are set.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"CRITICAL ERROR: Failed to create SQLAlchemy engine: {e}")
+        sys.exit(1)
+
+    chunk_rows = int(os.getenv("ETL_CHUNK_ROWS", "50000"))
+    if os.getenv("ETL_INCREMENTAL", "false").lower() in ("1", "true", "yes"):
+        # Steps 2 and 3: Extract each file and upsert only the changed rows
+        print("\n--- Incrementally Loading O*NET Data into Database ---")
+        if not incremental_extract_load(engine):
+            sys.exit(1)
+    elif parallel_workers > 0:
+        # Steps 2 and 3: Parse the files in worker processes and load the tables concurrently
+        print(f"\n--- Extracting and Loading O*NET Data with {parallel_workers} Workers ---")
+        if not parallel_extract_load(engine, parallel_workers):
+            print("CRITICAL ERROR: Stopping due to errors in the parallel extract and load.")
+            sys.exit(1)
+    elif chunk_rows > 0:
+        # Steps 2 and 3: Extract and load each file chunk by chunk
+        print("\n--- Streaming O*NET Data into Database ---")
+        if not stream_extract_load(engine, chunk_rows):
+            sys.exit(1)
+    else:
+        load_in_memory(engine)
+
     # Step 4: Verifying Data (Optional but good for a node)
     print("\n--- Verifying Loaded Data ---")
     connection_details = get_mysql_connection()
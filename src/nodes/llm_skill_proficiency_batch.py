@@ -0,0 +1,133 @@
+import os
+import sys
+from src.config.llm_response_cache import get_proficiency_cache_ttl
+from src.config.gemini_rate_limiter import get_gemini_rate_limit_metrics
+from src.functions.get_all_occupations_and_skills import get_all_occupations_and_skills
+from src.functions.get_assessed_occupation_codes import get_assessed_occupation_codes
+from src.functions.assess_skill_proficiency_batch import assess_skill_proficiency_batch
+from src.functions.batch_skill_proficiency_request import get_proficiency_batch_max_output_tokens
+from src.functions.cached_skill_proficiency_request import DEFAULT_MODEL, get_skill_proficiency_template_hash, get_skill_set_hash
+from src.functions.mysql_upgrade_tables import upgrade_table_schema
+from src.config.schemas import get_sqlalchemy_engine, LLM_Skill_Proficiency_Requests
+
+
+def main():
+    """
+    Main function to pre-assess LLM skill proficiencies for the whole occupation catalogue, so the
+    /skill-gap-llm endpoints serve them from the database cache instead of calling Gemini in-line.
+
+    This process:
+    1. Loads every occupation in Onet_Occupations_Landing with its skills
+    2. Adds the cache key columns to an LLM request table created before they existed, then
+       skips occupations without skills and occupations that already have current replies
+       (same model, prompt template and skill set, younger than LLM_PROFICIENCY_CACHE_TTL_SECONDS)
+    3. Assesses the rest with a rate-limited worker pool, bulk-loading results and checkpointing progress
+       (checkpoint entries only skip an occupation while their cache key and age are still current)
+
+    Configuration through environment variables:
+        LLM_BATCH_MODEL                 Gemini model (default: gemini-2.0-flash)
+        LLM_BATCH_WORKERS               Concurrent LLM requests (default: 4)
+        LLM_BATCH_REQUESTS_PER_MINUTE   LLM request rate limit, 0 for none (default: 60)
+        LLM_BATCH_FLUSH_SIZE            Occupations per bulk load (default: 20)
+        LLM_BATCH_CHECKPOINT_PATH       Checkpoint file (default: llm_skill_proficiency_batch_checkpoint.json)
+        LLM_BATCH_LIMIT                 Assess at most this many occupations (default: all)
+        LLM_BATCH_OCCUPATIONS_PER_REQUEST        Occupations assessed per Gemini request (default: 5)
+        LLM_PROFICIENCY_BATCH_MAX_OUTPUT_TOKENS  Output token budget of one request (default: 8192)
+    The process-wide Gemini limits and retry policy (GEMINI_* variables, see
+    src/config/gemini_rate_limiter.py) apply on top of LLM_BATCH_REQUESTS_PER_MINUTE.
+    """
+    print("Starting LLM skill proficiency batch assessment...")
+
+    model = os.getenv("LLM_BATCH_MODEL", DEFAULT_MODEL)
+    workers = int(os.getenv("LLM_BATCH_WORKERS", "4"))
+    requests_per_minute = float(os.getenv("LLM_BATCH_REQUESTS_PER_MINUTE", "60"))
+    flush_size = int(os.getenv("LLM_BATCH_FLUSH_SIZE", "20"))
+    checkpoint_path = os.getenv("LLM_BATCH_CHECKPOINT_PATH", "llm_skill_proficiency_batch_checkpoint.json")
+    limit = os.getenv("LLM_BATCH_LIMIT")
+    occupations_per_request = int(os.getenv("LLM_BATCH_OCCUPATIONS_PER_REQUEST", "5"))
+    engine = get_sqlalchemy_engine()
+
+    # Step 1: Load the occupation catalogue
+    print("\n--- Loading Occupations and Skills ---")
+    occupations_result = get_all_occupations_and_skills(engine=engine)
+    print(f"Occupations: {occupations_result['message']}")
+
+    if not occupations_result['success']:
+        print("CRITICAL ERROR: Failed to load occupations. Stopping batch assessment.")
+        sys.exit(1)
+
+    occupations = {
+        code: occupation
+        for code, occupation in occupations_result['result']['occupation_data'].items()
+        if occupation['skills']
+    }
+
+    # Step 2: Skip occupations with current replies
+    print("\n--- Checking Existing Assessments ---")
+    upgrade_result = upgrade_table_schema([LLM_Skill_Proficiency_Requests], engine)
+    print(f"Schema: {upgrade_result['message']}")
+
+    if not upgrade_result['success']:
+        print("CRITICAL ERROR: Failed to add the cache key columns to the LLM request table. Stopping batch assessment.")
+        sys.exit(1)
+
+    skill_set_hashes = {code: get_skill_set_hash(occupation['skills']) for code, occupation in occupations.items()}
+    assessed_result = get_assessed_occupation_codes(
+        skill_set_hashes,
+        model=model,
+        prompt_template_hash=get_skill_proficiency_template_hash(),
+        max_age_seconds=get_proficiency_cache_ttl(),
+        engine=engine
+    )
+    print(f"Existing assessments: {assessed_result['message']}")
+
+    if not assessed_result['success']:
+        print("CRITICAL ERROR: Failed to read existing assessments. Stopping batch assessment.")
+        sys.exit(1)
+
+    pending = {code: occupation for code, occupation in occupations.items() if code not in assessed_result['result']['assessed_codes']}
+    if limit:
+        pending = dict(list(pending.items())[:int(limit)])
+
+    # Step 3: Assess the remaining occupations
+    print(f"\n--- Assessing {len(pending)} Occupations ({workers} workers, {requests_per_minute:g} requests/minute, up to {occupations_per_request} occupations/request) ---")
+    batch_result = assess_skill_proficiency_batch(
+        pending,
+        model=model,
+        workers=workers,
+        requests_per_minute=requests_per_minute,
+        flush_size=flush_size,
+        checkpoint_path=checkpoint_path,
+        engine=engine,
+        occupations_per_request=occupations_per_request,
+        max_output_tokens=get_proficiency_batch_max_output_tokens(),
+        max_age_seconds=get_proficiency_cache_ttl()
+    )
+    print(f"Batch assessment: {batch_result['message']}")
+
+    if not batch_result['success']:
+        print(f"CRITICAL ERROR: Failed to load assessments. Rerun to resume from {checkpoint_path}.")
+        sys.exit(1)
+
+    # Step 4: Print summary
+    result = batch_result['result']
+    print("\n--- Batch Assessment Summary ---")
+    print(f"Model: {model}")
+    print(f"Occupations with skills: {len(occupations)}")
+    print(f"Already assessed: {len(assessed_result['result']['assessed_codes'])}")
+    print(f"Skipped by checkpoint: {result['skipped_checkpoint']}")
+    print(f"Assessed now: {result['assessed']} ({result['replies_loaded']} skill replies loaded)")
+    print(f"Failed: {len(result['failed'])}")
+    for code, message in sorted(result['failed'].items()):
+        print(f"  {code}: {message}")
+    print(f"Gemini requests: {result['llm_requests']}")
+    print(f"Rate limit wait: {result['rate_limit_waited_seconds']}s")
+    gemini_metrics = get_gemini_rate_limit_metrics()['result']
+    print(f"Gemini retries: {gemini_metrics['retries']} ({gemini_metrics['throttled_responses']} throttled responses, "
+          f"final concurrency limit {gemini_metrics['concurrency']['limit']})")
+
+    print("\nLLM skill proficiency batch assessment completed successfully.")
+
+
+if __name__ == '__main__':
+    main()
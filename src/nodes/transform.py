@@ -3,7 +3,10 @@ import sys
 from datetime import datetime
 from src.functions.populate_skills_reference import populate_skills_reference
 from src.functions.populate_occupation_skills import populate_occupation_skills
-from src.config.schemas import get_sqlalchemy_engine
+from src.functions.populate_occupation_gap_summary import populate_occupation_gap_summary
+from src.functions.write_dataset_version import write_dataset_version
+from src.functions.mysql_swap_tables import create_shadow_table, drop_shadow_tables, swap_shadow_tables
+from src.config.schemas import get_sqlalchemy_engine, Skills, Occupation_Skills
 
 
 def main():
@@ -14,22 +17,43 @@ def main():
     This process:
     1. Populates the SkillsReference table from unique skills in the raw Skills table
     2. Populates the OccupationSkills table from the occupation-skill relationships in the raw Skills table
+    3. Optionally (POPULATE_GAP_SUMMARY=true) materializes per-pair gap summaries into OccupationGapSummary
+    4. Writes a new 'occupation_skills' dataset version so API caches reload the rebuilt data
+
+    Steps 1 and 2 fill shadow copies of the tables while the API keeps reading the live ones, and the
+    shadow tables are swapped in with one atomic RENAME TABLE once their row counts validate, so
+    readers never see empty or partial tables (see src/functions/mysql_swap_tables.py).
+    ETL_SWAP_TABLES=false clears and refills the live tables instead.
+
+    With ETL_INCREMENTAL=true, steps 1 and 2 upsert only the changed rows into the live tables
+    instead, and report the inserted/updated/deleted/unchanged counts.
     """
     print("Starting O*NET data transformation process...")
     
     # Step 1: Get the data source info
     source = os.getenv("DATA_SOURCE", "text_file")  # Default to 'text_file' if not specified
     current_date = datetime.now().strftime("%Y-%m-%d")
+    incremental = os.getenv("ETL_INCREMENTAL", "false").lower() in ("1", "true", "yes")
+    swap_tables = not incremental and os.getenv("ETL_SWAP_TABLES", "true").lower() in ("1", "true", "yes")
     print(f"\n--- Using data source: {source} ---")
     print(f"--- Processing date: {current_date} ---")
 
+    engine = get_sqlalchemy_engine()
+    shadow_tables = {}
+    if swap_tables:
+        print("\n--- Creating Shadow Tables ---")
+        shadow_tables = {model.__tablename__: create_shadow_table(model, engine) for model in (Skills, Occupation_Skills)}
+        print(f"Building into {', '.join(table.name for table in shadow_tables.values())}; the live tables keep serving reads.")
+
     # Step 2: Populate SkillsReference table
     print("\n--- Populating SkillsReference Table ---")
-    skills_ref_result = populate_skills_reference(source=source)
+    skills_ref_result = populate_skills_reference(source=source, engine=engine, incremental=incremental, target_table=shadow_tables.get('skills'))
     print(f"SkillsReference population: {skills_ref_result['message']}")
     
     if not skills_ref_result['success']:
         print("CRITICAL ERROR: Failed to populate SkillsReference table. Stopping transformation.")
+        if swap_tables:
+            drop_shadow_tables([Skills, Occupation_Skills], engine)
         sys.exit(1)
     
     skills_count = skills_ref_result['result'].get('skills_reference_count', 0)
@@ -37,22 +61,68 @@ def main():
 
     # Step 3: Populate OccupationSkills table
     print("\n--- Populating OccupationSkills Table ---")
-    occ_skills_result = populate_occupation_skills(source=source)
+    occ_skills_result = populate_occupation_skills(source=source, engine=engine, incremental=incremental, target_table=shadow_tables.get('occupation_skills'))
     print(f"OccupationSkills population: {occ_skills_result['message']}")
     
     if not occ_skills_result['success']:
         print("CRITICAL ERROR: Failed to populate OccupationSkills table. Stopping transformation.")
+        if swap_tables:
+            drop_shadow_tables([Skills, Occupation_Skills], engine)
         sys.exit(1)
     
     relationships_count = occ_skills_result['result'].get('occupation_skills_count', 0)
     print(f"Successfully added {relationships_count} occupation-skill relationships to OccupationSkills table.")
 
-    # Step 4: Print summary
+    if swap_tables:
+        # Swap both tables in together, after their counts validate
+        print("\n--- Swapping In Shadow Tables ---")
+        swap_result = swap_shadow_tables(
+            [Skills, Occupation_Skills], engine,
+            expected_counts={'skills': skills_count, 'occupation_skills': relationships_count}
+        )
+        print(swap_result['message'])
+        if not swap_result['success']:
+            print("CRITICAL ERROR: Shadow tables failed validation. The live tables were kept. Stopping transformation.")
+            sys.exit(1)
+
+    # Step 4: Optionally materialize all-pairs gap summaries
+    gap_summary_count = None
+    if os.getenv("POPULATE_GAP_SUMMARY", "false").lower() in ("1", "true", "yes"):
+        print("\n--- Populating OccupationGapSummary Table ---")
+        chunk_size = int(os.getenv("GAP_SUMMARY_CHUNK_SIZE", "100"))
+        gap_summary_result = populate_occupation_gap_summary(chunk_size=chunk_size, engine=engine)
+        print(f"OccupationGapSummary population: {gap_summary_result['message']}")
+
+        if not gap_summary_result['success']:
+            print("CRITICAL ERROR: Failed to populate OccupationGapSummary table. Stopping transformation.")
+            sys.exit(1)
+
+        gap_summary_count = gap_summary_result['result'].get('gap_summary_count', 0)
+        print(f"Successfully added {gap_summary_count} occupation pair gap summaries to OccupationGapSummary table.")
+    else:
+        print("\n--- Skipping OccupationGapSummary Table (set POPULATE_GAP_SUMMARY=true to enable) ---")
+
+    # Step 5: Stamp a new dataset version so running APIs invalidate their occupation/skill cache
+    print("\n--- Writing Dataset Version ---")
+    version_result = write_dataset_version(dataset_name='occupation_skills', source=source, row_count=relationships_count)
+    print(f"Dataset version: {version_result['message']}")
+
+    if not version_result['success']:
+        print("CRITICAL ERROR: Failed to write dataset version. Running APIs would keep serving stale data.")
+        sys.exit(1)
+
+    # Step 6: Print summary
     print("\n--- Transformation Summary ---")
     print(f"Data source: {source}")
     print(f"Processing date: {current_date}")
     print(f"Skills reference entries: {skills_count}")
     print(f"Occupation-skill relationships: {relationships_count}")
+    if incremental:
+        print(f"Skills reference changes: {skills_ref_result['result']['changes']}")
+        print(f"Occupation-skill changes: {occ_skills_result['result']['changes']}")
+    if gap_summary_count is not None:
+        print(f"Occupation pair gap summaries: {gap_summary_count}")
+    print(f"Dataset version: {version_result['result']['version']}")
     
     print("\nO*NET data transformation process completed successfully.")
 
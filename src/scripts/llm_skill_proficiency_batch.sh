@@ -0,0 +1,32 @@
+#!/bin/bash
+set -e # Exit immediately if a command exits with a non-zero status.
+
+# Change to the project root directory using git
+cd "$(git rev-parse --show-toplevel)" || exit 1
+
+# Set env variables
+source ./env/env.env
+
+# Activate the virtual environment
+source ./.venv/bin/activate
+
+# Add project root to PYTHONPATH
+export PYTHONPATH="${PYTHONPATH}:$(pwd)"
+
+# Optional: Worker pool size and Gemini request rate limit
+export LLM_BATCH_WORKERS="${LLM_BATCH_WORKERS:-4}"
+export LLM_BATCH_REQUESTS_PER_MINUTE="${LLM_BATCH_REQUESTS_PER_MINUTE:-60}"
+
+# Optional: Occupations assessed per Gemini request (1 sends one prompt per occupation)
+export LLM_BATCH_OCCUPATIONS_PER_REQUEST="${LLM_BATCH_OCCUPATIONS_PER_REQUEST:-5}"
+
+# Optional: Checkpoint file; rerunning with the same file resumes an interrupted run
+export LLM_BATCH_CHECKPOINT_PATH="${LLM_BATCH_CHECKPOINT_PATH:-llm_skill_proficiency_batch_checkpoint.json}"
+
+# Run the batch assessment node
+python src/nodes/llm_skill_proficiency_batch.py
+
+# Deactivate the virtual environment
+deactivate
+
+echo "LLM skill proficiency batch assessment finished successfully."
@@ -16,6 +16,9 @@ export PYTHONPATH="${PYTHONPATH}:$(pwd)"
 # Optional: Set data source (defaults to text_file if not set)
 export DATA_SOURCE="${DATA_SOURCE:-text_file}"
 
+# Optional: Materialize all-pairs gap summaries into occupation_gap_summary (defaults to false)
+export POPULATE_GAP_SUMMARY="${POPULATE_GAP_SUMMARY:-false}"
+
 # Run the transform node
 python src/nodes/transform.py
 
@@ -0,0 +1,104 @@
+"""
+Fixtures providing a small, fully populated SQLite database with the O*NET landing and
+downstream skills tables. Used by tests that exercise database functions without MySQL.
+"""
+import os
+from datetime import date
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.config.schemas import Base, Onet_Occupations_Landing, Onet_Skills_Landing, Skills, Occupation_Skills
+
+SAMPLE_OCCUPATIONS = [
+    ("11-1011.00", "Chief Executives"),
+    ("11-2021.00", "Marketing Managers"),
+    ("15-1252.00", "Software Developers"),
+    ("29-1141.00", "Registered Nurses"),
+    ("99-9999.00", "Occupation Without Skills"),
+]
+
+SAMPLE_SKILLS = [
+    ("2.A.1.a", "Reading Comprehension"),
+    ("2.A.1.b", "Active Listening"),
+    ("2.A.1.c", "Writing"),
+    ("2.A.1.d", "Speaking"),
+    ("2.A.1.e", "Mathematics"),
+    ("2.B.3.e", "Programming"),
+]
+
+# (onet_soc_code, element_id, LV data_value, IM data_value)
+SAMPLE_OCCUPATION_SKILLS = [
+    ("11-1011.00", "2.A.1.a", 4.75, 4.12),
+    ("11-1011.00", "2.A.1.b", 4.88, 4.25),
+    ("11-1011.00", "2.A.1.c", 4.38, 3.88),
+    ("11-1011.00", "2.A.1.d", 5.00, 4.38),
+    ("11-1011.00", "2.A.1.e", 3.62, 3.25),
+    ("11-1011.00", "2.B.3.e", 0.00, 1.00),
+    ("11-2021.00", "2.A.1.a", 4.62, 4.00),
+    ("11-2021.00", "2.A.1.b", 4.88, 4.12),
+    ("11-2021.00", "2.A.1.c", 4.50, 4.00),
+    ("11-2021.00", "2.A.1.d", 4.75, 4.25),
+    ("11-2021.00", "2.A.1.e", 3.62, 3.00),
+    ("11-2021.00", "2.B.3.e", 1.12, 1.50),
+    ("15-1252.00", "2.A.1.a", 4.12, 3.88),
+    ("15-1252.00", "2.A.1.b", 3.88, 3.50),
+    ("15-1252.00", "2.A.1.c", 3.75, 3.38),
+    ("15-1252.00", "2.A.1.e", 4.00, 3.62),
+    ("15-1252.00", "2.B.3.e", 5.12, 4.62),
+    ("29-1141.00", "2.A.1.a", 4.00, 4.00),
+    ("29-1141.00", "2.A.1.b", 4.50, 4.38),
+    ("29-1141.00", "2.A.1.d", 4.12, 4.00),
+    ("29-1141.00", "2.A.1.e", 2.88, 2.75),
+]
+
+
+def populate_sample_skills_db(engine, include_downstream: bool = True) -> None:
+    """Create all tables on the engine and insert the sample landing (and downstream) data."""
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    skill_names = dict(SAMPLE_SKILLS)
+    today = date.today()
+    try:
+        session.add_all([
+            Onet_Occupations_Landing(onet_soc_code=code, title=title, description=f"{title} description")
+            for code, title in SAMPLE_OCCUPATIONS
+        ])
+        for code, element_id, lv_value, im_value in SAMPLE_OCCUPATION_SKILLS:
+            for scale_id, value in (("IM", im_value), ("LV", lv_value)):
+                session.add(Onet_Skills_Landing(
+                    onet_soc_code=code, element_id=element_id, element_name=skill_names[element_id],
+                    scale_id=scale_id, data_value=value
+                ))
+        if include_downstream:
+            session.add_all([
+                Skills(element_id=element_id, element_name=name, source="test", last_updated=today)
+                for element_id, name in SAMPLE_SKILLS
+            ])
+            session.add_all([
+                Occupation_Skills(onet_soc_code=code, element_id=element_id, proficiency_level=lv_value,
+                                  source="test", last_updated=today)
+                for code, element_id, lv_value, _ in SAMPLE_OCCUPATION_SKILLS
+            ])
+        session.commit()
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def sqlite_skills_engine(tmp_path):
+    """SQLite file database populated with landing and downstream skills tables."""
+    engine = create_engine(f"sqlite:///{os.path.join(tmp_path, 'skills.db')}")
+    populate_sample_skills_db(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def sqlite_landing_engine(tmp_path):
+    """SQLite file database populated with landing tables only (downstream tables empty)."""
+    engine = create_engine(f"sqlite:///{os.path.join(tmp_path, 'landing.db')}")
+    populate_sample_skills_db(engine, include_downstream=False)
+    yield engine
+    engine.dispose()
@@ -0,0 +1,80 @@
+"""
+Parity tests for the vectorized skill gap engine (compute_skill_gaps) against get_skills_gap,
+get_skills_gap_by_lvl and identify_skill_gap. Uses the SQLite sample database and seeded random data.
+"""
+import random
+from itertools import product
+from decimal import Decimal
+
+from src.functions.build_occupation_skill_matrix import build_occupation_skill_matrix
+from src.functions.load_occupation_skill_matrix import load_occupation_skill_matrix
+from src.functions.compute_skill_gaps import compute_skill_gaps
+from src.functions.get_skills_gap import get_skills_gap
+from src.functions.get_skills_gap_by_lvl import get_skills_gap_by_lvl, identify_skill_gap
+from tests.fixtures.sqlite_skills_db import sqlite_skills_engine
+
+CODES_WITH_SKILLS = ["11-1011.00", "11-2021.00", "15-1252.00", "29-1141.00"]
+
+
+def _identify_skill_gap_input(occupation):
+    """Shape occupation_data the way get_skills_gap_by_lvl does before calling identify_skill_gap."""
+    skills = [
+        {"element_id": skill["skill_element_id"], "element_name": skill["skill_name"], "scale_id": "LV",
+         "data_value": float(skill["proficiency_level"]) if skill["proficiency_level"] is not None else 0}
+        for skill in occupation["skills"]
+    ]
+    return {"occupation_title": occupation["name"], "skills": [skill for skill in skills if skill["data_value"] > 0]}
+
+
+def test_parity_with_gap_functions_on_database(sqlite_skills_engine):
+    matrix = load_occupation_skill_matrix(engine=sqlite_skills_engine)["result"]
+    pairs = list(product(CODES_WITH_SKILLS, repeat=2))
+
+    by_lvl = compute_skill_gaps(matrix, pairs, gap_type="by_lvl")
+    basic = compute_skill_gaps(matrix, pairs, gap_type="basic")
+    assert by_lvl["success"] and basic["success"]
+
+    for (from_code, to_code), by_lvl_result, basic_result in zip(pairs, by_lvl["result"], basic["result"]):
+        assert by_lvl_result == get_skills_gap_by_lvl(from_code, to_code, engine=sqlite_skills_engine), (from_code, to_code)
+        assert basic_result == get_skills_gap(from_code, to_code, engine=sqlite_skills_engine), (from_code, to_code)
+
+    print(f"\nChecked {len(pairs)} pairs against get_skills_gap_by_lvl and get_skills_gap")
+
+
+def test_parity_with_identify_skill_gap_on_random_data():
+    rng = random.Random(42)
+    element_ids = [f"2.A.{i}" for i in range(35)]
+    occupations = {}
+    for number in range(60):
+        code = f"{number:02d}-0000.00"
+        skills = []
+        for element_id in element_ids:
+            roll = rng.random()
+            if roll < 0.15:
+                continue  # Skill not listed for this occupation
+            level = Decimal("0.00") if roll < 0.3 else Decimal(rng.randint(1, 700)) / 100
+            skills.append({"skill_element_id": element_id, "skill_name": f"Skill {element_id}", "proficiency_level": level})
+        occupations[code] = {"onet_id": code, "name": f"Occupation {number}", "skills": skills}
+    # A target with no skills above level 0
+    occupations["99-0000.00"] = {"onet_id": "99-0000.00", "name": "Zero Occupation", "skills": [
+        {"skill_element_id": element_ids[0], "skill_name": f"Skill {element_ids[0]}", "proficiency_level": Decimal("0.00")}]}
+
+    matrix = build_occupation_skill_matrix(occupations)["result"]
+    pairs = [(rng.choice(list(occupations)), rng.choice(list(occupations))) for _ in range(500)]
+    pairs.append(("00-0000.00", "99-0000.00"))
+
+    results = compute_skill_gaps(matrix, pairs)["result"]
+    for (from_code, to_code), result in zip(pairs, results):
+        expected = identify_skill_gap(_identify_skill_gap_input(occupations[from_code]), _identify_skill_gap_input(occupations[to_code]))
+        assert result == expected, (from_code, to_code)
+
+    print(f"\nChecked {len(pairs)} random pairs against identify_skill_gap")
+
+
+def test_unknown_occupation(sqlite_skills_engine):
+    matrix = load_occupation_skill_matrix(engine=sqlite_skills_engine)["result"]
+    result = compute_skill_gaps(matrix, [("11-1011.00", "00-0000.00"), ("11-1011.00", "15-1252.00")])
+
+    assert not result["success"]
+    assert result["result"][0]["message"].startswith("Error retrieving target occupation data")
+    assert result["result"][1]["success"]
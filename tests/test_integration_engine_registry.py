@@ -0,0 +1,50 @@
+"""
+Integration test for the shared pooled engine registry (src/config/engine_registry.py).
+Uses a temporary SQLite file database so the pool behaviour can be verified without MySQL.
+"""
+import os
+import pytest
+from sqlalchemy import text
+
+from src.config.engine_registry import init_engine, get_engine, dispose_engine, get_pool_metrics
+
+
+@pytest.fixture
+def sqlite_engine_url(tmp_path):
+    """Initialise the registry against a temporary SQLite file and dispose of it afterwards."""
+    dispose_engine()
+    yield f"sqlite:///{os.path.join(tmp_path, 'engine_registry.db')}"
+    dispose_engine()
+
+
+def test_engine_registry_reuses_pooled_connections(sqlite_engine_url):
+    engine = init_engine(sqlite_engine_url)
+    assert get_engine() is engine, "get_engine should return the engine created by init_engine"
+    assert init_engine(sqlite_engine_url) is engine, "init_engine should not build a second engine"
+
+    before = get_pool_metrics()["result"]["counters"]
+
+    # Simulate several sequential requests using the shared engine
+    for _ in range(10):
+        with get_engine().connect() as connection:
+            assert connection.execute(text("SELECT 1")).scalar_one() == 1
+
+    metrics = get_pool_metrics()
+    assert metrics["success"], metrics["message"]
+    after = metrics["result"]["counters"]
+
+    print("\nIntegration Test Results:")
+    print(f"Pool status: {metrics['result']['pool']}")
+    print(f"Counters: {after}")
+
+    assert after["checkouts"] - before["checkouts"] == 10, "Expected one checkout per simulated request"
+    assert after["checkins"] - before["checkins"] == 10, "Expected every connection to be returned to the pool"
+    assert after["connections_created"] - before["connections_created"] == 1, "Sequential requests should reuse one pooled connection"
+    assert metrics["result"]["pool"]["checked_out"] == 0
+    assert after["checkout_wait_seconds_max"] >= 0
+
+
+def test_pool_metrics_before_initialisation():
+    dispose_engine()
+    metrics = get_pool_metrics()
+    assert metrics["success"] is False
@@ -19,7 +19,7 @@ def test_generate_skill_proficiency_prompt():
     }
     
     # Call the function
-    result = generate_skill_proficiency_prompt(occupation_data=occupation_data)
+    result = generate_skill_proficiency_prompt(occupation_data=occupation_data, template="full")
     
     # Assertions
     assert result["success"] is True
@@ -36,3 +36,15 @@ def test_generate_skill_proficiency_prompt():
     assert "Source Occupation Information" not in prompt
     assert "Your entire response must be a single, valid JSON object" in prompt
     assert "skill_proficiency_assessment" in prompt
+
+    # The compact template carries the same occupation and skills in far fewer tokens
+    compact = generate_skill_proficiency_prompt(occupation_data=occupation_data, template="compact")
+    assert compact["success"] is True
+    assert compact["result"]["template"] == "compact"
+    compact_prompt = compact["result"]["prompt"]
+    assert "15-1252.00" in compact_prompt
+    assert "Software Developer" in compact_prompt
+    assert "Programming; Problem Solving" in compact_prompt
+    assert "skill_proficiency_assessment" in compact_prompt
+    assert "Occupation Information" not in compact_prompt
+    assert compact["result"]["estimated_input_tokens"] < result["result"]["estimated_input_tokens"]
@@ -0,0 +1,74 @@
+"""
+Integration test for get_nearest_occupations and the GET /api/v1/nearest-occupations endpoint.
+Rankings are checked against scores rebuilt from get_skills_gap_by_lvl on the SQLite sample database.
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.main import app, verify_api_key
+from src.config.engine_registry import get_engine
+from src.functions.get_nearest_occupations import get_nearest_occupations
+from src.functions.get_skills_gap_by_lvl import get_skills_gap_by_lvl
+from tests.fixtures.sqlite_skills_db import sqlite_skills_engine, SAMPLE_OCCUPATION_SKILLS
+
+FROM_CODE = "11-1011.00"
+TARGET_CODES = ["11-2021.00", "15-1252.00", "29-1141.00"]
+IMPORTANCE = {(code, element_id): im_value for code, element_id, _, im_value in SAMPLE_OCCUPATION_SKILLS}
+
+
+def _expected_scores(engine):
+    """Score every target with the per-pair function, as the one-to-all ranking should."""
+    scores = {}
+    for to_code in TARGET_CODES:
+        gaps = get_skills_gap_by_lvl(FROM_CODE, to_code, engine=engine)["result"]["skill_gaps"]
+        deltas = [(gap["element_id"], gap["to_data_value"] - gap["from_data_value"]) for gap in gaps]
+        scores[to_code] = {
+            "sum": sum(delta for _, delta in deltas),
+            "count": len(deltas),
+            "weighted": sum(delta * IMPORTANCE[(to_code, element_id)] for element_id, delta in deltas),
+        }
+    return scores
+
+
+@pytest.mark.parametrize("metric", ["sum", "count", "weighted"])
+def test_ranking_matches_per_pair_gaps(sqlite_skills_engine, metric):
+    expected = _expected_scores(sqlite_skills_engine)
+    result = get_nearest_occupations(FROM_CODE, metric=metric, limit=10, engine=sqlite_skills_engine)
+
+    print(f"\n{metric}: {[(o['code'], o['score']) for o in result['result']['occupations']]}")
+    assert result["success"], result["message"]
+    assert result["result"]["total"] == len(TARGET_CODES), "Source and occupations without skills are excluded"
+
+    ranked = result["result"]["occupations"]
+    assert [o["code"] for o in ranked] == sorted(TARGET_CODES, key=lambda code: expected[code][metric])
+    for occupation in ranked:
+        assert occupation["score"] == pytest.approx(expected[occupation["code"]][metric], abs=1e-3)
+        assert occupation["gap_count"] == expected[occupation["code"]]["count"]
+
+
+def test_paging_and_unknown_occupation(sqlite_skills_engine):
+    full = get_nearest_occupations(FROM_CODE, limit=10, engine=sqlite_skills_engine)["result"]["occupations"]
+    page = get_nearest_occupations(FROM_CODE, limit=1, offset=1, engine=sqlite_skills_engine)["result"]["occupations"]
+    assert page == full[1:2]
+
+    missing = get_nearest_occupations("00-0000.00", engine=sqlite_skills_engine)
+    assert not missing["success"]
+    assert "not found" in missing["message"]
+
+
+def test_nearest_occupations_endpoint(sqlite_skills_engine):
+    app.dependency_overrides[get_engine] = lambda: sqlite_skills_engine
+    app.dependency_overrides[verify_api_key] = lambda: "test-key"
+    try:
+        client = TestClient(app)
+        response = client.get("/api/v1/nearest-occupations", params={"from_occupation": FROM_CODE, "metric": "weighted", "limit": 2})
+        missing = client.get("/api/v1/nearest-occupations", params={"from_occupation": "00-0000.00"})
+        invalid = client.get("/api/v1/nearest-occupations", params={"from_occupation": FROM_CODE, "metric": "median"})
+    finally:
+        app.dependency_overrides.clear()
+
+    print(f"\nResponse: {response.json()}")
+    assert response.status_code == 200
+    assert len(response.json()["occupations"]) == 2
+    assert missing.status_code == 404
+    assert invalid.status_code == 422
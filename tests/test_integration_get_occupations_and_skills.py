@@ -0,0 +1,69 @@
+"""
+Integration test for get_occupations_and_skills (batched occupation + skills retrieval).
+Uses the SQLite sample database so query counts and parity can be checked without MySQL.
+"""
+from sqlalchemy import event
+
+from src.functions.get_occupations_and_skills import get_occupations_and_skills
+from src.functions.get_occupation_and_skills import get_occupation_and_skills
+from src.functions.get_skills_gap import get_skills_gap
+from src.functions.get_skills_gap_by_lvl import get_skills_gap_by_lvl
+from tests.fixtures.sqlite_skills_db import sqlite_skills_engine
+
+
+def _count_queries(engine):
+    """Attach a cursor listener and return the list that collects executed statements."""
+    statements = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, parameters, context, executemany: statements.append(statement))
+    return statements
+
+
+def test_get_occupations_and_skills_single_query(sqlite_skills_engine):
+    statements = _count_queries(sqlite_skills_engine)
+
+    result = get_occupations_and_skills(["11-1011.00", "11-2021.00", "15-1252.00", "11-1011.00"], engine=sqlite_skills_engine)
+
+    print("\nIntegration Test Results:")
+    print(f"Message: {result['message']}")
+    print(f"Queries executed: {len(statements)}")
+
+    assert result["success"], result["message"]
+    assert len(statements) == 1, "Expected a single joined query for all requested occupations"
+    assert list(result["result"]["occupation_data"]) == ["11-1011.00", "11-2021.00", "15-1252.00"]
+    assert result["result"]["errors"] == {}
+
+
+def test_get_occupations_and_skills_matches_single_occupation_path(sqlite_skills_engine):
+    codes = ["11-1011.00", "11-2021.00", "15-1252.00", "29-1141.00"]
+    batched = get_occupations_and_skills(codes, engine=sqlite_skills_engine)["result"]["occupation_data"]
+
+    for code in codes:
+        single = get_occupation_and_skills(code, engine=sqlite_skills_engine)
+        assert single["success"], single["message"]
+        assert batched[code] == single["result"]["occupation_data"], f"Batched data differs for {code}"
+
+
+def test_get_occupations_and_skills_invalid_code(sqlite_skills_engine):
+    result = get_occupations_and_skills(["11-1011.00", "invalid-code"], engine=sqlite_skills_engine)
+
+    print(f"\nMessage: {result['message']}")
+    assert not result["success"]
+    assert "11-1011.00" in result["result"]["occupation_data"]
+    assert "invalid-code" in result["result"]["errors"]
+
+
+def test_skill_gap_functions_use_one_query(sqlite_skills_engine):
+    statements = _count_queries(sqlite_skills_engine)
+
+    gap_result = get_skills_gap("11-1011.00", "15-1252.00", engine=sqlite_skills_engine)
+    by_lvl_result = get_skills_gap_by_lvl("11-1011.00", "15-1252.00", engine=sqlite_skills_engine)
+
+    print(f"\nget_skills_gap: {gap_result['result']['skill_gaps']}")
+    print(f"get_skills_gap_by_lvl: {by_lvl_result['result']['skill_gaps']}")
+
+    assert gap_result["success"], gap_result["message"]
+    assert by_lvl_result["success"], by_lvl_result["message"]
+    assert len(statements) == 2, "Expected one query per gap request"
+    assert gap_result["result"]["skill_gaps"] == ["Programming"]
+    assert [gap["element_id"] for gap in by_lvl_result["result"]["skill_gaps"]] == ["2.A.1.e", "2.B.3.e"]
@@ -0,0 +1,71 @@
+"""
+Integration test for get_skills_gap_by_lvl_batch and the POST /api/v1/skill-gap-by-lvl/batch endpoint.
+Uses the SQLite sample database; the API is exercised in-process with the engine dependency overridden.
+"""
+import json
+from itertools import product
+import pytest
+from sqlalchemy import event
+from fastapi.testclient import TestClient
+
+from src.api.main import app, verify_api_key
+from src.config.engine_registry import get_engine
+from src.functions.get_skills_gap_by_lvl import get_skills_gap_by_lvl
+from src.functions.get_skills_gap_by_lvl_batch import get_skills_gap_by_lvl_batch
+from tests.fixtures.sqlite_skills_db import sqlite_skills_engine
+
+CODES_WITH_SKILLS = ["11-1011.00", "11-2021.00", "15-1252.00", "29-1141.00"]
+
+
+@pytest.fixture
+def api_client(sqlite_skills_engine):
+    """In-process API client bound to the SQLite sample database."""
+    app.dependency_overrides[get_engine] = lambda: sqlite_skills_engine
+    app.dependency_overrides[verify_api_key] = lambda: "test-key"
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_batch_matches_single_pair_function(sqlite_skills_engine):
+    pairs = list(product(CODES_WITH_SKILLS, repeat=2)) + [("11-1011.00", "invalid-code")]
+    expected = [get_skills_gap_by_lvl(from_code, to_code, engine=sqlite_skills_engine) for from_code, to_code in pairs]
+
+    statements = []
+    event.listen(sqlite_skills_engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, parameters, context, executemany: statements.append(statement))
+    result = get_skills_gap_by_lvl_batch(pairs, engine=sqlite_skills_engine)
+
+    print("\nIntegration Test Results:")
+    print(f"Message: {result['message']}")
+    print(f"Queries executed: {len(statements)}")
+
+    assert not result["success"], "The pair with an invalid code should fail"
+    assert result["result"] == expected
+    assert len(statements) == 1, "Expected one query for all distinct occupations in the batch"
+
+
+def test_batch_endpoint_streams_ndjson(api_client):
+    pairs = [("11-1011.00", "15-1252.00"), ("15-1252.00", "11-1011.00"), ("11-1011.00", "invalid-code")]
+    response = api_client.post(
+        "/api/v1/skill-gap-by-lvl/batch",
+        json={"pairs": [{"from_occupation": a, "to_occupation": b} for a, b in pairs]}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    print(f"\nStreamed {len(lines)} lines")
+    assert len(lines) == len(pairs)
+
+    for (from_code, to_code), line in zip(pairs[:2], lines[:2]):
+        single = api_client.get("/api/v1/skill-gap-by-lvl", params={"from_occupation": from_code, "to_occupation": to_code})
+        assert single.status_code == 200
+        assert line == single.json()
+
+    assert lines[2]["error"]["status_code"] in (404, 500)
+    assert lines[2]["from_occupation"] == {"code": "11-1011.00"}
+
+
+def test_batch_endpoint_rejects_empty_batch(api_client):
+    response = api_client.post("/api/v1/skill-gap-by-lvl/batch", json={"pairs": []})
+    assert response.status_code == 422
@@ -0,0 +1,72 @@
+"""
+Integration benchmark of the load_data_from_dataframe backends against the test MySQL database:
+loads the same synthetic onet_skills_landing rows with the ORM loader and with LOAD DATA LOCAL INFILE
+and prints the rows per second of each. The infile run needs local_infile=ON on the server
+(docker-compose starts MySQL with --local-infile=1); otherwise it reports the fallback to the ORM.
+"""
+import pandas as pd
+import pytest
+from sqlalchemy import func, select
+
+from src.config.schemas import get_sqlalchemy_engine, Onet_Skills_Landing
+from src.functions.mysql_init_tables import initialize_database_tables
+from src.functions.mysql_load_table import load_data_from_dataframe
+from tests.fixtures.db_config import test_db_config
+
+BENCHMARK_ROWS = 60000
+
+
+def _synthetic_skills(rows):
+    occupations = rows // 60 + 1
+    return pd.DataFrame({
+        "onet_soc_code": [f"{position // 60 % occupations:02d}-{position // 60:04d}.00" for position in range(rows)],
+        "element_id": [f"2.A.{position % 60 // 2}.{position % 60 % 2}" for position in range(rows)],
+        "element_name": [f"Skill {position % 30}\twith tab" if position % 997 == 0 else f"Skill {position % 30}" for position in range(rows)],
+        "scale_id": ["IM" if position % 2 else "LV" for position in range(rows)],
+        "data_value": [round(position % 700 / 100, 2) for position in range(rows)],
+        "n_value": [None if position % 5 == 0 else 8 for position in range(rows)],
+        "standard_error": [0.1234] * rows,
+        "lower_ci_bound": [None] * rows,
+        "upper_ci_bound": [None] * rows,
+        "recommend_suppress": ["N"] * rows,
+        "not_relevant": [None if position % 2 else "N" for position in range(rows)],
+        "date_recorded": pd.to_datetime(["2024-08-01"] * rows),
+        "domain_source": ["Analyst"] * rows,
+    })
+
+
+def test_load_backends_throughput(test_db_config):
+    engine = get_sqlalchemy_engine(
+        db_name=test_db_config['database'],
+        db_user=test_db_config['user'],
+        db_password=test_db_config['password'],
+        db_host=test_db_config['host'],
+        db_port=test_db_config['port']
+    )
+    init_result = initialize_database_tables(engine=engine)
+    if not init_result["success"]:
+        pytest.fail(f"Failed to initialize database tables: {init_result['message']}")
+
+    df = _synthetic_skills(BENCHMARK_ROWS)
+    # The ORM loader takes Python values rather than NaN and timestamps
+    orm_df = df.astype(object).where(pd.notnull(df), None)
+    orm_df["date_recorded"] = df["date_recorded"].dt.date
+
+    results = {}
+    for backend, frame in (("orm", orm_df), ("infile", df)):
+        result = load_data_from_dataframe(frame, Onet_Skills_Landing, engine, clear_existing=True, backend=backend)
+        assert result["success"], result["message"]
+        results[backend] = result["result"]
+        with engine.connect() as connection:
+            loaded = connection.execute(select(func.count()).select_from(Onet_Skills_Landing)).scalar()
+        assert loaded == BENCHMARK_ROWS
+        print(f"\n{backend}: {result['result']['records_loaded']} rows with the {result['result']['backend']} loader "
+              f"in {result['result']['elapsed_seconds']}s ({result['result']['rows_per_second']} rows/s)"
+              + (f", fell back: {result['result']['fallback_reason']}" if "fallback_reason" in result["result"] else ""))
+
+    if results["infile"]["backend"] == "infile":
+        speedup = results["infile"]["rows_per_second"] / results["orm"]["rows_per_second"]
+        print(f"LOAD DATA LOCAL INFILE speedup over the ORM loader: {speedup:.1f}x")
+
+    with engine.begin() as connection:
+        connection.execute(Onet_Skills_Landing.__table__.delete())
@@ -0,0 +1,21 @@
+#!/bin/bash
+set -e # Exit immediately if a command exits with a non-zero status.
+
+# Runs the integration test for the loader backend benchmark using the test database
+
+# Get the project root directory
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+cd "$PROJECT_ROOT"
+
+# Apply environment variables
+source env/env.env
+
+# Activate the virtual environment
+source .venv/bin/activate
+
+python -m pytest tests/test_integration_mysql_load_backends.py -v -s --capture=no --tb=short
+
+# Deactivate virtual environment
+deactivate
+
+echo "MySQL load backend benchmark completed successfully." 
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""
+Integration test for the in-memory occupation/skill cache (src/config/occupation_skill_cache.py)
+and its dataset version invalidation. Uses the SQLite sample database.
+"""
+import pytest
+from datetime import date
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+import src.config.occupation_skill_cache as cache_module
+from src.config.schemas import Occupation_Skills
+from src.config.occupation_skill_cache import (
+    init_occupation_skill_cache, clear_occupation_skill_cache, get_occupation_skill_cache_status
+)
+from src.functions.write_dataset_version import write_dataset_version
+from src.functions.get_dataset_version import get_dataset_version
+from src.functions.get_skills_gap import get_skills_gap
+from src.functions.get_skills_gap_by_lvl import get_skills_gap_by_lvl
+from src.functions.get_occupations_and_skills import get_occupations_and_skills
+from tests.fixtures.sqlite_skills_db import sqlite_skills_engine
+
+
+@pytest.fixture
+def cached_engine(sqlite_skills_engine):
+    """Stamp a dataset version and load the cache from the sample database."""
+    write_dataset_version(dataset_name='occupation_skills', source='test', engine=sqlite_skills_engine)
+    clear_occupation_skill_cache()
+    yield sqlite_skills_engine
+    clear_occupation_skill_cache()
+
+
+def test_dataset_version_round_trip(sqlite_skills_engine):
+    assert get_dataset_version(engine=sqlite_skills_engine)["result"]["version"] is None
+
+    written = write_dataset_version(dataset_name='occupation_skills', source='test', row_count=21, engine=sqlite_skills_engine)
+    assert written["success"], written["message"]
+    assert get_dataset_version(engine=sqlite_skills_engine)["result"]["version"] == written["result"]["version"]
+
+
+def test_cached_gap_results_match_database_and_need_no_queries(cached_engine):
+    pairs = [("11-1011.00", "15-1252.00"), ("15-1252.00", "29-1141.00"), ("29-1141.00", "11-2021.00")]
+    uncached = [(get_skills_gap(a, b, engine=cached_engine), get_skills_gap_by_lvl(a, b, engine=cached_engine)) for a, b in pairs]
+
+    init_result = init_occupation_skill_cache(cached_engine)
+    assert init_result["success"], init_result["message"]
+
+    statements = []
+    event.listen(cached_engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, parameters, context, executemany: statements.append(statement))
+    cached = [(get_skills_gap(a, b, engine=cached_engine), get_skills_gap_by_lvl(a, b, engine=cached_engine)) for a, b in pairs]
+
+    print("\nIntegration Test Results:")
+    print(f"Cache status: {get_occupation_skill_cache_status()['result']}")
+    print(f"Queries executed with cache loaded: {len(statements)}")
+
+    assert statements == [], "Cached gap requests should not query the database"
+    assert cached == uncached
+
+
+def test_cache_reloads_after_new_dataset_version(cached_engine, monkeypatch):
+    monkeypatch.setenv("OCCUPATION_SKILL_CACHE_CHECK_SECONDS", "0")
+    init_occupation_skill_cache(cached_engine)
+    before = get_occupations_and_skills(["15-1252.00"], engine=cached_engine)["result"]["occupation_data"]["15-1252.00"]
+
+    # Simulate a transform run that adds a skill, followed by a new version stamp
+    Session = sessionmaker(bind=cached_engine)
+    with Session() as session:
+        session.add(Occupation_Skills(onet_soc_code="15-1252.00", element_id="2.A.1.d", proficiency_level=3.50,
+                                      source="test", last_updated=date.today()))
+        session.commit()
+    write_dataset_version(dataset_name='occupation_skills', source='test', engine=cached_engine)
+
+    after = get_occupations_and_skills(["15-1252.00"], engine=cached_engine)["result"]["occupation_data"]["15-1252.00"]
+    status = get_occupation_skill_cache_status()["result"]
+
+    print(f"\nSkills before: {len(before['skills'])}, after: {len(after['skills'])}, reloads: {status['reloads']}")
+    assert len(after["skills"]) == len(before["skills"]) + 1
+    assert status["version"] == get_dataset_version(engine=cached_engine)["result"]["version"]
+
+
+def test_failed_startup_load_is_retried(cached_engine, monkeypatch):
+    monkeypatch.setenv("OCCUPATION_SKILL_CACHE_CHECK_SECONDS", "0")
+    real_load = cache_module.load_occupation_skill_matrix
+    attempts = []
+
+    def load_failing_first(engine=None):
+        attempts.append(engine)
+        if len(attempts) == 1:
+            # e.g. MySQL is not accepting connections yet when the API starts
+            return {"success": False, "message": "Can't connect to MySQL server", "result": {}}
+        return real_load(engine=engine)
+    monkeypatch.setattr(cache_module, "load_occupation_skill_matrix", load_failing_first)
+
+    init_result = init_occupation_skill_cache(cached_engine)
+    assert not init_result["success"]
+    assert not get_occupation_skill_cache_status()["result"]["loaded"]
+    reloads_before = get_occupation_skill_cache_status()["result"]["reloads"]
+
+    # The next lookup after the check interval loads the cache
+    found = cache_module.get_cached_occupations(["15-1252.00"])
+    status = get_occupation_skill_cache_status()["result"]
+
+    assert len(attempts) == 2
+    assert status["loaded"] and status["reloads"] == reloads_before + 1
+    assert status["version"] == get_dataset_version(engine=cached_engine)["result"]["version"]
+    assert found["15-1252.00"]["name"] == "Software Developers"
+
+    # Once cleared (API shutdown), nothing is loaded again
+    clear_occupation_skill_cache()
+    assert cache_module.get_cached_occupations(["15-1252.00"]) == {}
+    assert len(attempts) == 2
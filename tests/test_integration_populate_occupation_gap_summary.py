@@ -0,0 +1,50 @@
+"""
+Integration test for populate_occupation_gap_summary on the SQLite sample database.
+Each materialized row is checked against get_skills_gap_by_lvl for the same pair.
+"""
+from itertools import permutations
+from sqlalchemy import select
+
+from src.config.schemas import Occupation_Gap_Summary
+from src.functions.populate_occupation_gap_summary import populate_occupation_gap_summary
+from src.functions.get_skills_gap_by_lvl import get_skills_gap_by_lvl
+from tests.fixtures.sqlite_skills_db import sqlite_skills_engine
+
+CODES_WITH_SKILLS = ["11-1011.00", "11-2021.00", "15-1252.00", "29-1141.00"]
+
+
+def test_gap_summary_matches_per_pair_gaps(sqlite_skills_engine):
+    # A chunk size that does not divide the occupation count exercises the last partial chunk
+    result = populate_occupation_gap_summary(chunk_size=3, engine=sqlite_skills_engine)
+
+    print("\nIntegration Test Results:")
+    print(f"Message: {result['message']}")
+    print(f"Result: {result['result']}")
+
+    assert result["success"], result["message"]
+    pairs = list(permutations(CODES_WITH_SKILLS, 2))
+    assert result["result"]["gap_summary_count"] == len(pairs)
+
+    with sqlite_skills_engine.connect() as connection:
+        rows = {
+            (row.from_onet_soc_code, row.to_onet_soc_code): row
+            for row in connection.execute(select(Occupation_Gap_Summary)).all()
+        }
+    assert set(rows) == set(pairs), "Expected every ordered pair of occupations with skills, without self pairs"
+
+    for from_code, to_code in pairs:
+        gaps = get_skills_gap_by_lvl(from_code, to_code, engine=sqlite_skills_engine)["result"]["skill_gaps"]
+        deltas = [gap["to_data_value"] - gap["from_data_value"] for gap in gaps]
+        row = rows[(from_code, to_code)]
+        assert row.gap_count == len(deltas)
+        assert float(row.total_gap) == round(sum(deltas), 2)
+        assert float(row.max_gap) == round(max(deltas, default=0), 2)
+
+
+def test_gap_summary_replaces_previous_rows(sqlite_skills_engine):
+    first = populate_occupation_gap_summary(engine=sqlite_skills_engine)
+    second = populate_occupation_gap_summary(engine=sqlite_skills_engine)
+
+    with sqlite_skills_engine.connect() as connection:
+        row_count = len(connection.execute(select(Occupation_Gap_Summary.from_onet_soc_code)).all())
+    assert first["result"]["gap_summary_count"] == second["result"]["gap_summary_count"] == row_count
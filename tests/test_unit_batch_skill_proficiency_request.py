@@ -0,0 +1,93 @@
+"""
+Unit test for batching several occupations into one LLM skill proficiency request.
+Gemini is replaced with a counting stub; results are loaded into the SQLite sample database.
+"""
+import pytest
+
+import src.functions.assess_skill_proficiency_batch as batch_module
+import src.functions.batch_skill_proficiency_request as batch_request_module
+import src.functions.cached_skill_proficiency_request as cached_request_module
+from src.config.llm_response_cache import clear_llm_response_caches
+from src.functions.assess_skill_proficiency_batch import assess_skill_proficiency_batch
+from src.functions.batch_skill_proficiency_request import (
+    batch_skill_proficiency_request, plan_skill_proficiency_batches, estimate_skill_proficiency_output_tokens
+)
+from src.functions.cached_skill_proficiency_request import cached_batch_skill_proficiency_request, cached_skill_proficiency_request
+from src.functions.get_all_occupations_and_skills import get_all_occupations_and_skills
+from tests.fixtures.sqlite_skills_db import sqlite_skills_engine
+from tests.test_unit_llm_skill_proficiency_batch import BatchGemini
+
+
+@pytest.fixture
+def occupations(sqlite_skills_engine):
+    all_occupations = get_all_occupations_and_skills(engine=sqlite_skills_engine)["result"]["occupation_data"]
+    return {code: occupation for code, occupation in all_occupations.items() if occupation["skills"]}
+
+
+@pytest.fixture
+def stub_gemini(monkeypatch):
+    stub = BatchGemini()
+    for module in (batch_module, batch_request_module, cached_request_module):
+        monkeypatch.setattr(module, "gemini_llm_request", stub)
+    clear_llm_response_caches()
+    yield stub
+    clear_llm_response_caches()
+
+
+def test_plan_respects_batch_size_and_token_budget(occupations):
+    occupations_data = list(occupations.values())
+
+    assert [len(batch) for batch in plan_skill_proficiency_batches(occupations_data, 3, 100000)] == [3, 1]
+
+    # A budget for two occupations' replies forces pairs, and one too small for any still assesses each once
+    pair_budget = sum(estimate_skill_proficiency_output_tokens(occupation) for occupation in occupations_data[:2])
+    assert [len(batch) for batch in plan_skill_proficiency_batches(occupations_data, 5, pair_budget)] == [2, 2]
+    assert [len(batch) for batch in plan_skill_proficiency_batches(occupations_data, 5, 1)] == [1, 1, 1, 1]
+
+
+def test_batched_reply_is_split_per_occupation(occupations, stub_gemini):
+    requested = [occupations["11-1011.00"], occupations["15-1252.00"]]
+    result = batch_skill_proficiency_request(requested)
+
+    assert result["success"], result["message"]
+    assert result["result"]["missing"] == []
+    assessments = result["result"]["assessments"]
+    assert set(assessments) == {"11-1011.00", "15-1252.00"}
+    assert assessments["11-1011.00"]["request_data"][0]["request_id"] != assessments["15-1252.00"]["request_data"][0]["request_id"]
+    for code, assessment in assessments.items():
+        assert len(assessment["reply_data"]) == len(occupations[code]["skills"])
+        assert {row["request_onet_soc_code"] for row in assessment["request_data"]} == {code}
+        assert assessment["raw_response"]["skill_proficiency_assessment"]["llm_onet_soc_code"] == code
+    assert stub_gemini.calls["batch_skill_proficiency"] == 1
+
+
+def test_occupation_missing_from_batched_reply_falls_back_to_single_request(sqlite_skills_engine, occupations, stub_gemini):
+    stub_gemini.dropped_codes = {"15-1252.00"}
+    requested = [occupations["11-1011.00"], occupations["15-1252.00"], occupations["11-1011.00"]]
+    result = cached_batch_skill_proficiency_request(requested, engine=sqlite_skills_engine)
+
+    assert result["success"], result["message"]
+    assert set(result["result"]) == {"11-1011.00", "15-1252.00"}
+    assert stub_gemini.calls["batch_skill_proficiency"] == 1
+    assert stub_gemini.calls["skill_proficiency"] == 1
+
+    # Both assessments are cached under the single-occupation key
+    clear_llm_response_caches()
+    developer_skills = [{"skill_element_id": s["skill_element_id"], "skill_name": s["skill_name"]} for s in occupations["15-1252.00"]["skills"]]
+    served = cached_skill_proficiency_request("prompt", "15-1252.00", developer_skills, engine=sqlite_skills_engine)
+    assert served["result"]["cache"] == "database"
+    assert cached_batch_skill_proficiency_request(requested, engine=sqlite_skills_engine)["success"]
+    assert stub_gemini.calls["batch_skill_proficiency"] + stub_gemini.calls["skill_proficiency"] == 2
+
+
+def test_offline_batch_sends_fewer_requests(sqlite_skills_engine, occupations, stub_gemini):
+    result = assess_skill_proficiency_batch(
+        occupations, workers=2, requests_per_minute=0, engine=sqlite_skills_engine, occupations_per_request=2
+    )
+    print(f"\nBatch result: {result}")
+
+    assert result["success"], result["message"]
+    assert result["result"]["assessed"] == 4
+    assert result["result"]["llm_requests"] == 2
+    assert result["result"]["replies_loaded"] == sum(len(occupation["skills"]) for occupation in occupations.values())
+    assert stub_gemini.calls == {"skill_proficiency": 0, "batch_skill_proficiency": 2, "skill_gap_analysis": 0}
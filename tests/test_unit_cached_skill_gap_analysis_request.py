@@ -0,0 +1,114 @@
+"""
+Unit test for the content-addressed skill gap analysis cache in front of gemini_llm_request.
+Gemini is replaced with a counting stub; the database tier uses the SQLite sample database.
+"""
+import time
+import pytest
+from sqlalchemy import select
+
+import src.functions.cached_skill_proficiency_request as cached_request_module
+import src.functions.cached_skill_gap_analysis_request as cached_gap_module
+import src.functions.batch_skill_proficiency_request as batch_request_module
+from src.config.schemas import LLM_Skill_Gap_Analysis_Cache
+from src.config.llm_response_cache import clear_llm_response_caches
+from src.functions.cached_skill_gap_analysis_request import cached_skill_gap_analysis_request, get_skill_gap_analysis_cache_key
+from src.functions.get_skills_gap_by_lvl_llm import get_skills_gap_by_lvl_llm
+from tests.fixtures.sqlite_skills_db import sqlite_skills_engine
+from tests.test_unit_cached_skill_proficiency_request import CountingGemini
+
+FROM_PROFILE = {"onet_id": "11-1011.00", "name": "Chief Executives", "skills": [
+    {"skill_name": "Programming", "proficiency_level": 1},
+    {"skill_name": "Writing", "proficiency_level": 5},
+]}
+TO_PROFILE = {"onet_id": "15-1252.00", "name": "Software Developers", "skills": [
+    {"skill_name": "Programming", "proficiency_level": 6},
+    {"skill_name": "Writing", "proficiency_level": 4},
+]}
+PROMPT_SKILLS = [{"skill_element_id": "2.B.3.e", "skill_name": "Programming"}, {"skill_element_id": "2.A.1.c", "skill_name": "Writing"}]
+
+
+class GapAnalysisGemini(CountingGemini):
+    """CountingGemini that also returns a gap description for every prompted skill."""
+
+    def __call__(self, prompt, request_onet_soc_code, prompt_skills_data, model="gemini-2.0-flash", expected_response_type="skill_proficiency", **kwargs):
+        response = super().__call__(prompt, request_onet_soc_code, prompt_skills_data, model, expected_response_type)
+        if expected_response_type == "skill_gap_analysis":
+            response["result"]["raw_response"] = {"skill_gap_analysis": {"skill_gaps": [
+                {"skill_name": skill["skill_name"], "gap_description": f"Develop {skill['skill_name']} (call {self.calls['skill_gap_analysis']})"}
+                for skill in prompt_skills_data
+            ]}}
+        return response
+
+
+@pytest.fixture
+def stub_gemini(monkeypatch):
+    stub = GapAnalysisGemini()
+    monkeypatch.setattr(cached_request_module, "gemini_llm_request", stub)
+    monkeypatch.setattr(cached_gap_module, "gemini_llm_request", stub)
+    monkeypatch.setattr(batch_request_module, "gemini_llm_request", stub)
+    clear_llm_response_caches()
+    yield stub
+    clear_llm_response_caches()
+
+
+def _request(engine, from_profile=FROM_PROFILE, to_profile=TO_PROFILE):
+    return cached_skill_gap_analysis_request(
+        prompt="prompt", from_occupation_data=from_profile, to_occupation_data=to_profile,
+        prompt_skills_data=PROMPT_SKILLS, engine=engine
+    )
+
+
+def test_repeated_gap_analysis_served_from_memory_then_database(sqlite_skills_engine, stub_gemini):
+    first = _request(sqlite_skills_engine)
+    second = _request(sqlite_skills_engine)
+    clear_llm_response_caches()  # A new API process only has the database tier
+    third = _request(sqlite_skills_engine)
+
+    print("\nUnit Test Results:")
+    print(f"Cache sources: {first['result']['cache']}, {second['result']['cache']}, {third['result']['cache']}")
+
+    assert [first["result"]["cache"], second["result"]["cache"], third["result"]["cache"]] == ["miss", "memory", "database"]
+    assert stub_gemini.calls["skill_gap_analysis"] == 1
+    assert first["result"]["raw_response"] == second["result"]["raw_response"] == third["result"]["raw_response"]
+
+    with sqlite_skills_engine.connect() as connection:
+        stored = connection.execute(select(LLM_Skill_Gap_Analysis_Cache)).all()
+    assert [(row.cache_key, row.from_onet_soc_code, row.to_onet_soc_code) for row in stored] == [
+        (get_skill_gap_analysis_cache_key(FROM_PROFILE, TO_PROFILE, "gemini-2.0-flash"), "11-1011.00", "15-1252.00")
+    ]
+
+
+def test_cache_key_depends_on_profile_content_not_skill_order(sqlite_skills_engine, stub_gemini):
+    _request(sqlite_skills_engine)
+    reordered = {**FROM_PROFILE, "skills": list(reversed(FROM_PROFILE["skills"]))}
+    assert _request(sqlite_skills_engine, from_profile=reordered)["result"]["cache"] == "memory"
+
+    reassessed = {**FROM_PROFILE, "skills": [{"skill_name": "Programming", "proficiency_level": 2}, FROM_PROFILE["skills"][1]]}
+    assert _request(sqlite_skills_engine, from_profile=reassessed)["result"]["cache"] == "miss"
+    assert _request(sqlite_skills_engine, from_profile=TO_PROFILE, to_profile=FROM_PROFILE)["result"]["cache"] == "miss"
+    assert stub_gemini.calls["skill_gap_analysis"] == 3
+
+
+def test_expired_gap_analysis_replaced(sqlite_skills_engine, stub_gemini, monkeypatch):
+    monkeypatch.setenv("LLM_GAP_ANALYSIS_CACHE_TTL_SECONDS", "0")
+    clear_llm_response_caches()
+    _request(sqlite_skills_engine)
+    second = _request(sqlite_skills_engine)
+
+    assert second["result"]["cache"] == "miss"
+    with sqlite_skills_engine.connect() as connection:
+        assert len(connection.execute(select(LLM_Skill_Gap_Analysis_Cache.cache_key)).all()) == 1
+
+
+def test_repeated_skill_gap_llm_needs_no_llm_calls(sqlite_skills_engine, stub_gemini):
+    first = get_skills_gap_by_lvl_llm("11-1011.00", "15-1252.00", engine=sqlite_skills_engine)
+    started = time.perf_counter()
+    second = get_skills_gap_by_lvl_llm("11-1011.00", "15-1252.00", engine=sqlite_skills_engine)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    print(f"\nRepeated /skill-gap-llm pipeline served from cache in {elapsed_ms:.1f} ms")
+
+    assert first["success"] and second["success"], (first["message"], second["message"])
+    assert first["result"] == second["result"]
+    assert all(gap["llm_gap_description"].endswith("(call 1)") for gap in second["result"])
+    assert stub_gemini.calls == {"skill_proficiency": 0, "batch_skill_proficiency": 1, "skill_gap_analysis": 1}
@@ -0,0 +1,139 @@
+"""
+Unit test for the two-tier skill proficiency cache in front of gemini_llm_request.
+Gemini is replaced with a counting stub; the database tier uses the SQLite sample database.
+"""
+from datetime import datetime, UTC
+import pytest
+from sqlalchemy import select
+
+import src.functions.cached_skill_proficiency_request as cached_request_module
+import src.functions.cached_skill_gap_analysis_request as cached_gap_module
+import src.functions.batch_skill_proficiency_request as batch_request_module
+from src.config.schemas import LLM_Skill_Proficiency_Requests
+from src.config.llm_response_cache import clear_llm_response_caches, get_llm_response_cache_status
+from src.functions.cached_skill_proficiency_request import (
+    cached_skill_proficiency_request, get_skill_proficiency_template_hash, get_skill_set_hash
+)
+from src.functions.get_skills_gap_by_lvl_llm import get_skills_gap_by_lvl_llm
+from tests.fixtures.sqlite_skills_db import sqlite_skills_engine
+
+SKILLS = [
+    {"skill_element_id": "2.A.1.a", "skill_name": "Reading Comprehension"},
+    {"skill_element_id": "2.A.1.b", "skill_name": "Active Listening"},
+]
+
+
+class CountingGemini:
+    """Returns a fixed proficiency level for every prompted skill and counts calls per response type."""
+
+    def __init__(self):
+        self.calls = {"skill_proficiency": 0, "batch_skill_proficiency": 0, "skill_gap_analysis": 0}
+        self.dropped_codes = set()  # Occupations left out of batched replies
+
+    def __call__(self, prompt, request_onet_soc_code, prompt_skills_data, model="gemini-2.0-flash", expected_response_type="skill_proficiency", **kwargs):
+        self.calls[expected_response_type] += 1
+        timestamp = datetime.now(UTC)
+        if expected_response_type == "skill_gap_analysis":
+            return {"success": True, "message": "stub", "result": {"request_data": [], "reply_data": [{}], "raw_response": {}}}
+        request_id = f"req-{self.calls['skill_proficiency'] + self.calls['batch_skill_proficiency']}"
+        rows = [(skill.get("onet_soc_code", request_onet_soc_code), skill) for skill in prompt_skills_data]
+        replied_rows = [(code, skill) for code, skill in rows if code not in self.dropped_codes or expected_response_type == "skill_proficiency"]
+        result = {
+            "request_data": [
+                {
+                    "request_id": request_id,
+                    "request_model": model,
+                    "request_onet_soc_code": code,
+                    "request_skill_element_id": skill["skill_element_id"],
+                    "request_skill_name": skill["skill_name"],
+                    "request_timestamp": timestamp
+                }
+                for code, skill in rows
+            ],
+            "reply_data": [
+                {
+                    "request_id": request_id,
+                    "llm_onet_soc_code": code,
+                    "llm_occupation_name": "Stub Occupation",
+                    "llm_skill_name": skill["skill_name"],
+                    "llm_assigned_proficiency_description": "Advanced",
+                    "llm_assigned_proficiency_level": 3 if code == "11-1011.00" else 5,
+                    "llm_explanation": "Stub explanation",
+                    "assessment_timestamp": timestamp
+                }
+                for code, skill in replied_rows
+            ],
+            "raw_response": {}
+        }
+        if expected_response_type == "batch_skill_proficiency":
+            replied_codes = list(dict.fromkeys(code for code, _ in replied_rows))
+            result["raw_response"] = {"skill_proficiency_assessments": [
+                {"llm_onet_soc_code": code, "llm_occupation_name": "Stub Occupation", "assessed_skills": []}
+                for code in replied_codes
+            ]}
+        return {"success": True, "message": "stub", "result": result}
+
+
+@pytest.fixture
+def stub_gemini(monkeypatch):
+    stub = CountingGemini()
+    monkeypatch.setattr(cached_request_module, "gemini_llm_request", stub)
+    monkeypatch.setattr(cached_gap_module, "gemini_llm_request", stub)
+    monkeypatch.setattr(batch_request_module, "gemini_llm_request", stub)
+    clear_llm_response_caches()
+    yield stub
+    clear_llm_response_caches()
+
+
+def _request(engine, skills=SKILLS, model="gemini-2.0-flash"):
+    return cached_skill_proficiency_request(
+        prompt="prompt", request_onet_soc_code="11-1011.00", prompt_skills_data=skills, model=model, engine=engine
+    )
+
+
+def test_repeated_assessment_served_from_memory_then_database(sqlite_skills_engine, stub_gemini):
+    first = _request(sqlite_skills_engine)
+    second = _request(sqlite_skills_engine)
+    clear_llm_response_caches()  # A new API process only has the database tier
+    third = _request(sqlite_skills_engine)
+
+    print("\nUnit Test Results:")
+    print(f"Cache sources: {first['result']['cache']}, {second['result']['cache']}, {third['result']['cache']}")
+    print(f"Status: {get_llm_response_cache_status()['result']}")
+
+    assert [first["result"]["cache"], second["result"]["cache"], third["result"]["cache"]] == ["miss", "memory", "database"]
+    assert stub_gemini.calls["skill_proficiency"] == 1
+    assert [reply["llm_skill_name"] for reply in third["result"]["reply_data"]] == ["Reading Comprehension", "Active Listening"]
+    assert [reply["llm_assigned_proficiency_level"] for reply in third["result"]["reply_data"]] == [3, 3]
+
+    with sqlite_skills_engine.connect() as connection:
+        stored = connection.execute(select(LLM_Skill_Proficiency_Requests)).all()
+    assert {(row.prompt_template_hash, row.skill_set_hash) for row in stored} == {
+        (get_skill_proficiency_template_hash(), get_skill_set_hash(SKILLS))
+    }
+
+
+def test_cache_key_includes_skill_set_and_model(sqlite_skills_engine, stub_gemini):
+    _request(sqlite_skills_engine)
+    assert _request(sqlite_skills_engine, skills=list(reversed(SKILLS)))["result"]["cache"] == "memory", "Skill order should not matter"
+    assert _request(sqlite_skills_engine, skills=SKILLS[:1])["result"]["cache"] == "miss"
+    assert _request(sqlite_skills_engine, model="gemini-other")["result"]["cache"] == "miss"
+    assert stub_gemini.calls["skill_proficiency"] == 3
+
+
+def test_expired_assessment_is_requested_again(sqlite_skills_engine, stub_gemini, monkeypatch):
+    monkeypatch.setenv("LLM_PROFICIENCY_CACHE_TTL_SECONDS", "0")
+    clear_llm_response_caches()
+    _request(sqlite_skills_engine)
+    assert _request(sqlite_skills_engine)["result"]["cache"] == "miss"
+    assert stub_gemini.calls["skill_proficiency"] == 2
+
+
+def test_repeated_skill_gap_llm_only_calls_gap_analysis(sqlite_skills_engine, stub_gemini):
+    first = get_skills_gap_by_lvl_llm("11-1011.00", "15-1252.00", engine=sqlite_skills_engine)
+    second = get_skills_gap_by_lvl_llm("11-1011.00", "15-1252.00", engine=sqlite_skills_engine)
+
+    assert first["success"] and second["success"], (first["message"], second["message"])
+    assert first["result"] == second["result"]
+    # Both occupations are assessed in one batched request on the first run
+    assert stub_gemini.calls == {"skill_proficiency": 0, "batch_skill_proficiency": 1, "skill_gap_analysis": 2}
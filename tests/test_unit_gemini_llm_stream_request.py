@@ -0,0 +1,264 @@
+"""
+Unit test for streaming Gemini replies with incremental JSON parsing, the concurrency slot an open stream
+holds, and the SSE variant of /skill-gap-llm.
+The shared session's post is replaced by a fake server-sent event stream that releases the reply in
+timed chunks; proficiency assessments come from the counting stub. No network access.
+"""
+import json
+import time
+import threading
+import anyio
+import httpx
+import pytest
+
+import src.functions.gemini_llm_request as gemini_module
+import src.functions.batch_skill_proficiency_request as batch_request_module
+import src.functions.cached_skill_proficiency_request as cached_request_module
+from src.api.main import app, verify_api_key
+from src.config.engine_registry import get_engine
+from src.config.gemini_rate_limiter import reset_gemini_rate_limiter, get_gemini_rate_limiter
+from src.config.incremental_json_parser import IncrementalJsonArrayParser
+from src.config.llm_debug_sink import close_llm_debug_sink
+from src.config.llm_response_cache import clear_llm_response_caches
+from src.functions.gemini_llm_request import gemini_llm_request
+from src.functions.gemini_llm_stream_request import gemini_llm_stream_request
+from src.functions.get_all_occupations_and_skills import get_all_occupations_and_skills
+from src.functions.get_skills_gap_by_lvl_llm import get_skills_gap_by_lvl_llm
+from tests.fixtures.sqlite_skills_db import sqlite_skills_engine
+from tests.test_unit_cached_skill_proficiency_request import CountingGemini
+
+CHUNK_SIZE = 60
+CHUNK_DELAY_SECONDS = 0.03
+
+
+def gap_analysis_text(skill_names):
+    return json.dumps({"skill_gap_analysis": {"to_occupation": "Software Developers", "skill_gaps": [
+        {"skill_name": skill_name, "gap_description": f"Practice {skill_name} with {{braces}} and \"quotes\""}
+        for skill_name in skill_names
+    ]}}, indent=2)
+
+
+class FakeStreamResponse:
+    """Server-sent event response releasing the reply text in CHUNK_SIZE pieces, CHUNK_DELAY_SECONDS apart."""
+
+    status_code = 200
+    headers = {}
+
+    def __init__(self, text):
+        self.chunks = [text[start:start + CHUNK_SIZE] for start in range(0, len(text), CHUNK_SIZE)]
+        self.closed = False
+
+    def iter_lines(self):
+        for position, chunk in enumerate(self.chunks):
+            time.sleep(CHUNK_DELAY_SECONDS)
+            event = {"candidates": [{"content": {"parts": [{"text": chunk}]}}]}
+            if position == len(self.chunks) - 1:
+                event["usageMetadata"] = {"totalTokenCount": 321}
+            yield f"data: {json.dumps(event)}".encode()
+            yield b""
+
+    def close(self):
+        self.closed = True
+
+
+class FakeStreamPost:
+    def __init__(self, text):
+        self.text = text
+        self.urls = []
+        self.responses = []
+
+    def __call__(self, url, json, timeout=None, stream=False):
+        assert stream, "Streaming requests must not read the body up front"
+        self.urls.append(url)
+        self.responses.append(FakeStreamResponse(self.text))
+        return self.responses[-1]
+
+
+@pytest.fixture(autouse=True)
+def gemini_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setenv("LLM_DEBUG_DIR", str(tmp_path / "llm_debug_responses"))
+    close_llm_debug_sink()
+    reset_gemini_rate_limiter()
+    clear_llm_response_caches()
+    yield
+    reset_gemini_rate_limiter()
+    clear_llm_response_caches()
+    close_llm_debug_sink()
+
+
+@pytest.fixture
+def developer_skill_names(sqlite_skills_engine):
+    occupations = get_all_occupations_and_skills(engine=sqlite_skills_engine)["result"]["occupation_data"]
+    return [skill["skill_name"] for skill in occupations["15-1252.00"]["skills"]]
+
+
+@pytest.fixture
+def stub_proficiency(monkeypatch):
+    stub = CountingGemini()
+    monkeypatch.setattr(cached_request_module, "gemini_llm_request", stub)
+    monkeypatch.setattr(batch_request_module, "gemini_llm_request", stub)
+    return stub
+
+
+def test_parser_returns_items_as_they_complete():
+    text = "```json\n" + gap_analysis_text(["Programming", "Writing", "Speaking"]) + "\n```"
+    parser = IncrementalJsonArrayParser("skill_gaps")
+
+    completed_at = []
+    for position, char in enumerate(text):
+        for item in parser.feed(char):
+            completed_at.append((position, item["skill_name"]))
+
+    assert [name for _, name in completed_at] == ["Programming", "Writing", "Speaking"]
+    # Each item is available right after its closing brace, long before the document ends
+    assert text[completed_at[0][0]] == "}"
+    assert completed_at[0][0] < len(text) / 2
+    assert parser.finished
+    assert parser.feed('{"skill_gaps": [{"skill_name": "Late"}]}') == []
+
+
+def test_stream_request_hands_out_items_before_the_reply_ends(monkeypatch, developer_skill_names):
+    text = gap_analysis_text(developer_skill_names)
+    fake_post = FakeStreamPost(text)
+    monkeypatch.setattr(gemini_module.get_http_session(), "post", fake_post)
+    skills = [{"skill_element_id": f"id-{position}", "skill_name": name} for position, name in enumerate(developer_skill_names)]
+
+    started = time.perf_counter()
+    item_times = []
+    result = gemini_llm_stream_request(
+        prompt="Analyze gaps", request_onet_soc_code="15-1252.00", prompt_skills_data=skills,
+        expected_response_type="skill_gap_analysis",
+        on_item=lambda item: item_times.append((time.perf_counter() - started, item["skill_name"]))
+    )
+    total = time.perf_counter() - started
+    print(f"\nFirst streamed gap after {item_times[0][0] * 1000:.0f} ms, full reply after {total * 1000:.0f} ms "
+          f"({len(fake_post.responses[0].chunks)} chunks)")
+
+    assert result["success"], result["message"]
+    assert ":streamGenerateContent?alt=sse" in fake_post.urls[0]
+    assert fake_post.responses[0].closed
+    assert [name for _, name in item_times] == developer_skill_names
+    assert result["result"]["streamed_items"] == len(developer_skill_names)
+    assert item_times[0][0] < total / 2
+
+    # The final result matches the non-streaming request for the same reply text
+    monkeypatch.setattr(gemini_module.get_http_session(), "post", lambda url, json, timeout=None, stream=False: type(
+        "Response", (), {"status_code": 200, "headers": {}, "json": lambda self: {"candidates": [{"content": {"parts": [{"text": text}]}}]}}
+    )())
+    whole = gemini_llm_request(prompt="Analyze gaps", request_onet_soc_code="15-1252.00", prompt_skills_data=skills,
+                               expected_response_type="skill_gap_analysis")
+    assert result["result"]["raw_response"] == whole["result"]["raw_response"]
+    assert [row["llm_explanation"] for row in result["result"]["reply_data"]] == [row["llm_explanation"] for row in whole["result"]["reply_data"]]
+
+
+def test_pipeline_passes_gaps_on_while_the_analysis_streams(sqlite_skills_engine, stub_proficiency, monkeypatch, developer_skill_names):
+    monkeypatch.setattr(gemini_module.get_http_session(), "post", FakeStreamPost(gap_analysis_text(developer_skill_names)))
+
+    started = time.perf_counter()
+    gap_times = []
+    result = get_skills_gap_by_lvl_llm(
+        "11-1011.00", "15-1252.00", engine=sqlite_skills_engine,
+        on_gap=lambda gap: gap_times.append((time.perf_counter() - started, gap))
+    )
+    total = time.perf_counter() - started
+
+    assert result["success"], result["message"]
+    assert sorted(gap["skill_name"] for _, gap in gap_times) == sorted(gap["skill_name"] for gap in result["result"])
+    assert {gap["skill_name"]: gap for _, gap in gap_times} == {gap["skill_name"]: gap for gap in result["result"]}
+    assert gap_times[0][0] < total / 2
+
+    # A repeated transition is served from the cache and passed on in one go
+    gap_times.clear()
+    repeated = get_skills_gap_by_lvl_llm("11-1011.00", "15-1252.00", engine=sqlite_skills_engine, on_gap=lambda gap: gap_times.append((0, gap)))
+    assert [gap for _, gap in gap_times] == repeated["result"] == result["result"]
+
+
+class HeldStreamResponse(FakeStreamResponse):
+    """Stream that sends its first chunk, then stays open until released."""
+
+    def __init__(self, text, first_chunk_sent, release):
+        super().__init__(text)
+        self.first_chunk_sent, self.release = first_chunk_sent, release
+
+    def iter_lines(self):
+        for position, line in enumerate(super().iter_lines()):
+            if position == 2:
+                self.first_chunk_sent.set()
+                assert self.release.wait(5)
+            yield line
+
+
+def test_open_stream_holds_a_concurrency_slot(monkeypatch, developer_skill_names):
+    monkeypatch.setenv("GEMINI_MAX_CONCURRENCY", "1")
+    reset_gemini_rate_limiter()
+    text = gap_analysis_text(developer_skill_names)
+    first_chunk_sent, release = threading.Event(), threading.Event()
+    posted_at = []
+
+    def held_post(url, json, timeout=None, stream=False):
+        posted_at.append(time.perf_counter())
+        return HeldStreamResponse(text, first_chunk_sent, release)
+    monkeypatch.setattr(gemini_module.get_http_session(), "post", held_post)
+
+    skills = [{"skill_element_id": f"id-{position}", "skill_name": name} for position, name in enumerate(developer_skill_names)]
+    stream = lambda: gemini_llm_stream_request(prompt="Analyze gaps", request_onet_soc_code="15-1252.00", prompt_skills_data=skills,
+                                               expected_response_type="skill_gap_analysis")
+    results = []
+    first = threading.Thread(target=lambda: results.append(stream()))
+    first.start()
+    assert first_chunk_sent.wait(5)
+
+    # While the body is still streaming, the slot stays taken and a second stream waits for it
+    second = threading.Thread(target=lambda: results.append(stream()))
+    second.start()
+    time.sleep(0.2)
+    assert get_gemini_rate_limiter().stats()["concurrency"]["in_flight"] == 1
+    assert len(posted_at) == 1
+
+    released_at = time.perf_counter()
+    release.set()
+    first.join(5)
+    second.join(5)
+
+    assert [result["success"] for result in results] == [True, True]
+    assert posted_at[1] >= released_at
+    assert get_gemini_rate_limiter().stats()["concurrency"]["in_flight"] == 0
+
+
+def _parse_sse(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+async def _get_stream(params):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=30) as client:
+        return await client.get("/api/v1/skill-gap-llm/stream", params=params)
+
+
+def test_sse_endpoint_streams_gaps_then_done(sqlite_skills_engine, stub_proficiency, monkeypatch, developer_skill_names):
+    monkeypatch.setattr(gemini_module.get_http_session(), "post", FakeStreamPost(gap_analysis_text(developer_skill_names)))
+    monkeypatch.delenv("ONET_USERNAME", raising=False)  # An unknown occupation must not fall back to the O*NET API
+    app.dependency_overrides[get_engine] = lambda: sqlite_skills_engine
+    app.dependency_overrides[verify_api_key] = lambda: "test-key"
+    try:
+        response = anyio.run(_get_stream, {"from_occupation": "11-1011.00", "to_occupation": "15-1252.00"})
+        failed = anyio.run(_get_stream, {"from_occupation": "11-1011.00", "to_occupation": "99-0000.00"})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _parse_sse(response.text)
+    assert [name for name, _ in events] == ["gap"] * len(developer_skill_names) + ["done"]
+    assert [data["skill_name"] for _, data in events[:-1]] == developer_skill_names
+    assert events[-1][1]["to_occupation"] == {"code": "15-1252.00", "title": "Software Developers"}
+    assert events[-1][1]["skill_gap_count"] == len(developer_skill_names)
+
+    failed_events = _parse_sse(failed.text)
+    assert [name for name, _ in failed_events] == ["error"]
+    assert failed_events[0][1]["status_code"] in (404, 500)
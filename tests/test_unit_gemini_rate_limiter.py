@@ -0,0 +1,176 @@
+"""
+Unit test for the shared Gemini rate limiter and the retry/backoff policy of gemini_llm_request.
+The shared session's post is replaced by a scripted fake returning 429/503/200 responses; no network access.
+"""
+import json
+import threading
+import time
+import pytest
+import requests
+
+import src.functions.gemini_llm_request as gemini_module
+from src.config.gemini_rate_limiter import get_gemini_rate_limiter, reset_gemini_rate_limiter, parse_retry_after
+from src.config.llm_debug_sink import close_llm_debug_sink
+from src.config.rate_limiter import TokenBucket, AdaptiveConcurrencyLimiter
+from src.functions.gemini_llm_request import gemini_llm_request
+
+SKILLS = [{"skill_element_id": "2.A.1.a", "skill_name": "Reading Comprehension"}]
+LLM_TEXT = json.dumps({
+    "skill_proficiency_assessment": {
+        "llm_onet_soc_code": "11-1011.00",
+        "llm_occupation_name": "Chief Executives",
+        "assessed_skills": [{
+            "llm_skill_name": "Reading Comprehension",
+            "llm_assigned_proficiency_description": "Expert",
+            "llm_assigned_proficiency_level": 6,
+            "llm_explanation": "Reads board papers"
+        }]
+    }
+})
+
+
+class FakeResponse:
+    def __init__(self, status_code, body, headers=None):
+        self.status_code = status_code
+        self._body = body
+        self.headers = headers or {}
+
+    def json(self):
+        return self._body
+
+
+def ok_response():
+    return FakeResponse(200, {"candidates": [{"content": {"parts": [{"text": LLM_TEXT}]}}], "usageMetadata": {"totalTokenCount": 120}})
+
+
+def throttled_response(status_code=429, headers=None, body=None):
+    return FakeResponse(status_code, body or {"error": {"code": status_code, "message": "Resource has been exhausted"}}, headers)
+
+
+class ScriptedPost:
+    """Returns the scripted responses in order (raising exceptions given as such) and records call times."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.call_times = []
+        self.timeouts = []
+
+    def __call__(self, url, json, timeout=None, stream=False):
+        self.call_times.append(time.monotonic())
+        self.timeouts.append(timeout)
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.fixture(autouse=True)
+def gemini_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setenv("GEMINI_BACKOFF_BASE_SECONDS", "0.01")
+    monkeypatch.setenv("GEMINI_REQUEST_TIMEOUT_SECONDS", "5")
+    monkeypatch.setenv("LLM_DEBUG_DIR", str(tmp_path / "llm_debug_responses"))
+    close_llm_debug_sink()
+    reset_gemini_rate_limiter()
+    yield
+    reset_gemini_rate_limiter()
+    close_llm_debug_sink()
+
+
+def _request():
+    return gemini_llm_request(prompt="Assess these skills", request_onet_soc_code="11-1011.00", prompt_skills_data=SKILLS)
+
+
+def test_retries_throttled_responses_honoring_retry_after(monkeypatch):
+    fake_post = ScriptedPost([
+        throttled_response(429, headers={"Retry-After": "0.2"}),
+        throttled_response(503),
+        ok_response()
+    ])
+    monkeypatch.setattr(gemini_module.get_http_session(), "post", fake_post)
+
+    result = _request()
+    metrics = get_gemini_rate_limiter().stats()
+    print(f"\nMetrics: {metrics}")
+
+    assert result["success"], result["message"]
+    assert result["result"]["reply_data"][0]["llm_assigned_proficiency_level"] == 6
+    assert fake_post.call_times[1] - fake_post.call_times[0] >= 0.2
+    assert fake_post.timeouts == [(10.0, 5.0)] * 3
+    assert metrics["calls"] == 1
+    assert metrics["attempts"] == 3
+    assert metrics["retries"] == 2
+    assert metrics["throttled_responses"] == 2
+    assert metrics["reported_tokens_total"] == 120
+    # Two overloads within the cooldown count as one congestion event
+    assert metrics["concurrency"]["decreases"] == 1
+    assert metrics["concurrency"]["limit"] == 4
+
+
+def test_gives_up_after_max_retries(monkeypatch):
+    monkeypatch.setenv("GEMINI_MAX_RETRIES", "2")
+    fake_post = ScriptedPost([throttled_response(429)] * 3)
+    monkeypatch.setattr(gemini_module.get_http_session(), "post", fake_post)
+
+    result = _request()
+
+    assert not result["success"]
+    assert "Resource has been exhausted" in result["message"]
+    assert len(fake_post.call_times) == 3
+
+
+def test_retries_timeouts_and_does_not_retry_client_errors(monkeypatch):
+    fake_post = ScriptedPost([requests.exceptions.Timeout("read timed out"), ok_response()])
+    monkeypatch.setattr(gemini_module.get_http_session(), "post", fake_post)
+    assert _request()["success"]
+
+    fake_post = ScriptedPost([throttled_response(400, body={"error": {"message": "API key not valid"}})])
+    monkeypatch.setattr(gemini_module.get_http_session(), "post", fake_post)
+    result = _request()
+    assert not result["success"]
+    assert "API key not valid" in result["message"]
+    assert get_gemini_rate_limiter().stats()["retries"] == 1
+
+
+def test_retry_delay_from_error_body():
+    body = {"error": {"details": [{"@type": "type.googleapis.com/google.rpc.RetryInfo", "retryDelay": "23s"}]}}
+    assert parse_retry_after(None, body) == 23.0
+    assert parse_retry_after("7", body) == 7.0
+    assert parse_retry_after(None, {"error": {"message": "no hint"}}) is None
+
+
+def test_token_bucket_limits_tokens_per_second():
+    bucket = TokenBucket(rate_per_second=100, capacity=100)
+    bucket.acquire(100)
+    started = time.monotonic()
+    bucket.acquire(20)
+
+    assert time.monotonic() - started >= 0.15
+
+
+def test_concurrency_limiter_caps_in_flight_and_recovers():
+    limiter = AdaptiveConcurrencyLimiter(max_limit=4, decrease_cooldown_seconds=0)
+    limiter.acquire()
+    limiter.release(overloaded=True)
+    assert limiter.limit == 2
+
+    in_flight, max_in_flight, lock = [0], [0], threading.Lock()
+
+    def call():
+        limiter.acquire()
+        with lock:
+            in_flight[0] += 1
+            max_in_flight[0] = max(max_in_flight[0], in_flight[0])
+        time.sleep(0.05)
+        with lock:
+            in_flight[0] -= 1
+        limiter.release()
+
+    threads = [threading.Thread(target=call) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max_in_flight[0] <= 3
+    assert limiter.limit == 4
@@ -0,0 +1,134 @@
+"""
+Unit test for schema-constrained Gemini output and the parse strategy counters.
+The shared session's post is replaced by a fake that records the payload and returns a scripted reply text.
+"""
+import json
+import pytest
+from fastapi.testclient import TestClient
+
+import src.functions.gemini_llm_request as gemini_module
+from src.api.main import app
+from src.config.gemini_rate_limiter import reset_gemini_rate_limiter
+from src.config.llm_debug_sink import close_llm_debug_sink
+from src.config.gemini_structured_output import (
+    RESPONSE_SCHEMAS, matches_schema, get_llm_parse_metrics, reset_llm_parse_metrics
+)
+from src.functions.gemini_llm_request import gemini_llm_request
+
+SKILLS = [{"skill_element_id": "2.A.1.a", "skill_name": "Reading Comprehension"}]
+ASSESSMENT = {
+    "skill_proficiency_assessment": {
+        "llm_onet_soc_code": "11-1011.00",
+        "llm_occupation_name": "Chief Executives",
+        "assessed_skills": [{
+            "llm_skill_name": "Reading Comprehension",
+            "llm_assigned_proficiency_description": "Expert",
+            "llm_assigned_proficiency_level": 6,
+            "llm_explanation": "Reads board papers"
+        }]
+    }
+}
+
+
+class FakeResponse:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, text):
+        self.text = text
+
+    def json(self):
+        return {"candidates": [{"content": {"parts": [{"text": self.text}]}}]}
+
+
+class RecordingPost:
+    def __init__(self, text):
+        self.text = text
+        self.payloads = []
+
+    def __call__(self, url, json, timeout=None, stream=False):
+        self.payloads.append(json)
+        return FakeResponse(self.text)
+
+
+@pytest.fixture(autouse=True)
+def gemini_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setenv("LLM_DEBUG_DIR", str(tmp_path / "llm_debug_responses"))
+    close_llm_debug_sink()
+    reset_gemini_rate_limiter()
+    reset_llm_parse_metrics()
+    yield
+    reset_gemini_rate_limiter()
+    reset_llm_parse_metrics()
+    close_llm_debug_sink()
+
+
+def _request(monkeypatch, text):
+    fake_post = RecordingPost(text)
+    monkeypatch.setattr(gemini_module.get_http_session(), "post", fake_post)
+    result = gemini_llm_request(prompt="Assess these skills", request_onet_soc_code="11-1011.00", prompt_skills_data=SKILLS)
+    return result, fake_post.payloads[0]
+
+
+def test_schema_valid_reply_skips_the_repair_path(monkeypatch):
+    result, payload = _request(monkeypatch, json.dumps(ASSESSMENT))
+
+    assert result["success"], result["message"]
+    assert result["result"]["reply_data"][0]["llm_assigned_proficiency_level"] == 6
+    assert payload["generationConfig"]["responseMimeType"] == "application/json"
+    assert payload["generationConfig"]["responseSchema"] == RESPONSE_SCHEMAS["skill_proficiency"]
+    metrics = get_llm_parse_metrics()["result"]
+    assert metrics["strategies"]["structured"] == 1
+    assert metrics["replies"] == 1
+    assert metrics["repaired"] == 0
+
+
+@pytest.mark.parametrize("reply_text, strategy", [
+    ("```json\n" + json.dumps(ASSESSMENT) + "\n```", "strip_fences"),
+    ("Here you go: " + json.dumps(ASSESSMENT) + " Hope this helps", "regex_block"),
+    (json.dumps({"skill_proficiency_assessment": {**ASSESSMENT["skill_proficiency_assessment"], "llm_occupation_name": None}}), "direct"),
+    ("not json at all", "failed"),
+])
+def test_invalid_reply_falls_back_to_the_counted_repair_strategy(monkeypatch, reply_text, strategy):
+    result, _ = _request(monkeypatch, reply_text)
+
+    assert result["success"] == (strategy != "failed"), result["message"]
+    metrics = get_llm_parse_metrics()["result"]
+    print(f"\nParse metrics: {metrics}")
+    assert metrics["strategies"]["structured"] == 0
+    assert metrics["strategies"][strategy] == 1
+    assert metrics["replies"] == 1
+
+
+def test_structured_output_can_be_disabled(monkeypatch):
+    monkeypatch.setenv("GEMINI_STRUCTURED_OUTPUT", "false")
+    result, payload = _request(monkeypatch, json.dumps(ASSESSMENT))
+
+    assert result["success"]
+    assert "responseSchema" not in payload["generationConfig"]
+    assert get_llm_parse_metrics()["result"]["strategies"]["direct"] == 1
+
+
+def test_schemas_match_the_prompt_formats():
+    batch_reply = {"skill_proficiency_assessments": [ASSESSMENT["skill_proficiency_assessment"]] * 2}
+    gap_reply = {"skill_gap_analysis": {"from_occupation": "A", "to_occupation": "B", "skill_gaps": [
+        {"skill_name": "Programming", "from_proficiency_level": 0, "to_proficiency_level": 5.5, "gap_description": "Learn it"}
+    ]}}
+
+    assert matches_schema(ASSESSMENT, RESPONSE_SCHEMAS["skill_proficiency"])
+    assert matches_schema(batch_reply, RESPONSE_SCHEMAS["batch_skill_proficiency"])
+    assert matches_schema(gap_reply, RESPONSE_SCHEMAS["skill_gap_analysis"])
+    assert not matches_schema(gap_reply, RESPONSE_SCHEMAS["skill_proficiency"])
+
+    wrong_level = json.loads(json.dumps(ASSESSMENT))
+    wrong_level["skill_proficiency_assessment"]["assessed_skills"][0]["llm_assigned_proficiency_level"] = True
+    assert not matches_schema(wrong_level, RESPONSE_SCHEMAS["skill_proficiency"])
+
+
+def test_parse_metrics_endpoint(monkeypatch):
+    _request(monkeypatch, json.dumps(ASSESSMENT))
+    response = TestClient(app).get("/health/llm-parse")
+
+    assert response.status_code == 200
+    assert response.json()["strategies"]["structured"] == 1
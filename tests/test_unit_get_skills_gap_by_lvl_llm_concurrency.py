@@ -0,0 +1,88 @@
+"""
+Unit test for the concurrent proficiency assessments in get_skills_gap_by_lvl_llm.
+gemini_llm_request is replaced with a stub that takes LLM_DELAY_SECONDS per call; occupation data
+comes from the SQLite sample database. The LLM response caches are disabled so every call reaches the stub.
+"""
+import time
+import threading
+
+import pytest
+
+import src.functions.cached_skill_gap_analysis_request as cached_gap_module
+import src.functions.cached_skill_proficiency_request as cached_request_module
+from src.functions.get_skills_gap_by_lvl_llm import get_skills_gap_by_lvl_llm
+from tests.fixtures.sqlite_skills_db import sqlite_skills_engine
+
+LLM_DELAY_SECONDS = 0.3
+FROM_CODE = "11-1011.00"
+TO_CODE = "15-1252.00"
+
+
+class StubGemini:
+    """Records call overlap and returns canned proficiency / gap analysis replies."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = []
+
+    def __call__(self, prompt, request_onet_soc_code, prompt_skills_data, expected_response_type="skill_proficiency", **kwargs):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            self.calls.append((expected_response_type, request_onet_soc_code))
+        time.sleep(LLM_DELAY_SECONDS)
+        with self.lock:
+            self.in_flight -= 1
+
+        if expected_response_type == "skill_gap_analysis":
+            return {"success": True, "message": "stub", "result": {"raw_response": {"skill_gap_analysis": {"skill_gaps": [
+                {"skill_name": skill["skill_name"], "gap_description": f"Practice {skill['skill_name']}"}
+                for skill in prompt_skills_data
+            ]}}}}
+        level = 3 if request_onet_soc_code == FROM_CODE else 5
+        return {"success": True, "message": "stub", "result": {"reply_data": [
+            {"llm_skill_name": skill["skill_name"], "llm_assigned_proficiency_level": level}
+            for skill in prompt_skills_data
+        ]}}
+
+
+@pytest.fixture(autouse=True)
+def disable_proficiency_cache(monkeypatch):
+    monkeypatch.setenv("LLM_PROFICIENCY_CACHE_ENABLED", "false")
+    monkeypatch.setenv("LLM_GAP_ANALYSIS_CACHE_ENABLED", "false")
+    # Exercise the concurrent single-occupation path rather than one batched request
+    monkeypatch.setenv("LLM_PROFICIENCY_BATCH_ENABLED", "false")
+
+
+def test_proficiency_assessments_run_concurrently(sqlite_skills_engine, monkeypatch):
+    stub = StubGemini()
+    monkeypatch.setattr(cached_gap_module, "gemini_llm_request", stub)
+    monkeypatch.setattr(cached_request_module, "gemini_llm_request", stub)
+
+    started = time.perf_counter()
+    result = get_skills_gap_by_lvl_llm(FROM_CODE, TO_CODE, engine=sqlite_skills_engine)
+    elapsed = time.perf_counter() - started
+
+    print(f"\nElapsed: {elapsed:.2f}s for 3 LLM calls of {LLM_DELAY_SECONDS}s each (max in flight: {stub.max_in_flight})")
+    print(f"Message: {result['message']}")
+
+    assert result["success"], result["message"]
+    assert stub.max_in_flight == 2, "Source and target assessments should overlap"
+    assert stub.calls[-1] == ("skill_gap_analysis", TO_CODE), "Gap analysis should start after both assessments"
+    assert elapsed < 2.5 * LLM_DELAY_SECONDS
+    assert {gap["skill_name"] for gap in result["result"]} == {"Reading Comprehension", "Active Listening", "Writing", "Mathematics", "Programming"}
+    assert all(gap["from_proficiency_level"] == 3 and gap["to_proficiency_level"] == 5 for gap in result["result"])
+
+
+def test_source_failure_reported_first(sqlite_skills_engine, monkeypatch):
+    def failing_stub(prompt, request_onet_soc_code, prompt_skills_data, expected_response_type="skill_proficiency", **kwargs):
+        return {"success": False, "message": f"quota exceeded for {request_onet_soc_code}", "result": {}}
+
+    monkeypatch.setattr(cached_gap_module, "gemini_llm_request", failing_stub)
+    monkeypatch.setattr(cached_request_module, "gemini_llm_request", failing_stub)
+    result = get_skills_gap_by_lvl_llm(FROM_CODE, TO_CODE, engine=sqlite_skills_engine)
+
+    assert not result["success"]
+    assert result["message"] == f"Error getting LLM assessment for source occupation: quota exceeded for {FROM_CODE}"
@@ -0,0 +1,116 @@
+"""
+Unit test and benchmark for the shared keep-alive HTTP session.
+A local stub server counts TCP connections and charges HANDSHAKE_SECONDS for every new one, standing
+in for the TCP + TLS handshake round trips to the Gemini and O*NET APIs. No external network access.
+"""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import requests
+
+import src.config.http_session as http_session_module
+from src.config.http_session import get_http_session, close_http_session
+from src.functions.onet_api_extract_occupation import onet_api_extract_occupation
+
+HANDSHAKE_SECONDS = 0.02
+BENCHMARK_CALLS = 30
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep connections open between requests
+    disable_nagle_algorithm = True  # otherwise delayed ACKs add ~40 ms to every keep-alive response
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+        time.sleep(HANDSHAKE_SECONDS)
+
+    def do_GET(self):
+        if self.path.startswith("/v1.9/ws/database/rows/occupation_data"):
+            body = self._occupation_page()
+        else:
+            body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _occupation_page(self) -> bytes:
+        base = f"http://127.0.0.1:{self.server.server_port}/v1.9/ws/database/rows/occupation_data"
+        if "start=3" in self.path:
+            rows, next_link = [("15-1252.00", "Software Developers")], ""
+        else:
+            rows = [("11-1011.00", "Chief Executives"), ("11-2021.00", "Marketing Managers")]
+            next_link = f'<link rel="next" href="{base}?start=3&amp;end=4"/>'
+        row_xml = "".join(
+            f"<row><onetsoc_code>{code}</onetsoc_code><title>{title}</title><description>d</description></row>"
+            for code, title in rows
+        )
+        return f"<occupation_data>{next_link}{row_xml}</occupation_data>".encode()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.connections = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    close_http_session()
+    yield server
+    close_http_session()
+    server.shutdown()
+    server.server_close()
+
+
+def _timed_calls(call, url):
+    started = time.perf_counter()
+    for _ in range(BENCHMARK_CALLS):
+        assert call(url, timeout=5).status_code == 200
+    return (time.perf_counter() - started) / BENCHMARK_CALLS
+
+
+def test_benchmark_pooled_session_vs_per_call_connections(stub_server):
+    url = f"http://127.0.0.1:{stub_server.server_port}/ping"
+
+    per_call_latency = _timed_calls(requests.get, url)
+    per_call_connections = stub_server.connections
+
+    stub_server.connections = 0
+    pooled_latency = _timed_calls(get_http_session().get, url)
+    pooled_connections = stub_server.connections
+
+    print(f"\n{BENCHMARK_CALLS} calls, {HANDSHAKE_SECONDS * 1000:.0f} ms simulated handshake per new connection:")
+    print(f"  requests.get:        {per_call_latency * 1000:.1f} ms/call, {per_call_connections} connections")
+    print(f"  shared session.get:  {pooled_latency * 1000:.1f} ms/call, {pooled_connections} connections")
+    print(f"  saved per call:      {(per_call_latency - pooled_latency) * 1000:.1f} ms")
+
+    assert per_call_connections == BENCHMARK_CALLS
+    assert pooled_connections == 1
+    assert pooled_latency < per_call_latency
+
+
+def test_onet_pagination_reuses_one_connection(stub_server):
+    result = onet_api_extract_occupation(
+        username="user", password="pass", base_url=f"http://127.0.0.1:{stub_server.server_port}/"
+    )
+
+    assert result["success"], result["message"]
+    assert list(result["result"]["occupation_df"]["onet_soc_code"]) == ["11-1011.00", "11-2021.00", "15-1252.00"]
+    assert stub_server.connections == 1
+
+
+def test_session_is_shared_and_recreated_after_fork(monkeypatch):
+    close_http_session()
+    session = get_http_session()
+    assert get_http_session() is session
+
+    monkeypatch.setattr(http_session_module.os, "getpid", lambda: -1)
+    assert get_http_session() is not session
+    close_http_session()
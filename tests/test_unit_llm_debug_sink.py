@@ -0,0 +1,160 @@
+"""
+Unit test for the background LLM debug sink: non-blocking submit, gzip JSONL segments with rotation
+and a total size cap, sampling, and gemini_llm_request no longer depending on a debug directory.
+The shared session's post is replaced by a fake reply; no network access.
+"""
+import os
+import gzip
+import json
+import time
+import threading
+import pytest
+from fastapi.testclient import TestClient
+
+import src.functions.gemini_llm_request as gemini_module
+import src.config.llm_debug_sink as sink_module
+from src.api.main import app
+from src.config.gemini_rate_limiter import reset_gemini_rate_limiter
+from src.config.llm_debug_sink import (
+    JsonlGzipDebugSink, NullDebugSink, get_llm_debug_sink, set_llm_debug_sink, close_llm_debug_sink
+)
+from src.functions.gemini_llm_request import gemini_llm_request
+
+SKILLS = [{"skill_element_id": "2.A.1.a", "skill_name": "Reading Comprehension"}]
+REPLY = json.dumps({"skill_proficiency_assessment": {
+    "llm_onet_soc_code": "11-1011.00",
+    "llm_occupation_name": "Chief Executives",
+    "assessed_skills": [{
+        "llm_skill_name": "Reading Comprehension",
+        "llm_assigned_proficiency_description": "Expert",
+        "llm_assigned_proficiency_level": 6,
+        "llm_explanation": "Reads board papers"
+    }]
+}})
+
+
+class FakeResponse:
+    status_code = 200
+    headers = {}
+
+    def json(self):
+        return {"candidates": [{"content": {"parts": [{"text": REPLY}]}}]}
+
+
+@pytest.fixture(autouse=True)
+def debug_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setenv("LLM_DEBUG_DIR", str(tmp_path / "debug" / "not_created_yet"))
+    close_llm_debug_sink()
+    reset_gemini_rate_limiter()
+    yield
+    reset_gemini_rate_limiter()
+    close_llm_debug_sink()
+
+
+def _read_records(directory):
+    records = []
+    for name in sorted(os.listdir(directory)):
+        with gzip.open(os.path.join(directory, name), "rt", encoding="utf-8") as segment:
+            records.extend(json.loads(line) for line in segment)
+    return records
+
+
+def test_request_succeeds_without_a_debug_directory_and_the_copy_is_written_later(monkeypatch, tmp_path):
+    monkeypatch.setattr(gemini_module.get_http_session(), "post", lambda url, json, timeout=None, stream=False: FakeResponse())
+    debug_dir = tmp_path / "debug" / "not_created_yet"
+
+    result = gemini_llm_request(prompt="Assess these skills", request_onet_soc_code="11-1011.00", prompt_skills_data=SKILLS)
+
+    assert result["success"], result["message"]
+    close_llm_debug_sink()
+    records = _read_records(debug_dir)
+    assert len(records) == 1
+    assert records[0]["request_id"] == result["result"]["request_data"][0]["request_id"]
+    assert records[0]["prompt"] == "Assess these skills"
+    assert records[0]["response_text"] == REPLY
+    assert records[0]["expected_response_type"] == "skill_proficiency"
+
+
+def test_submit_does_no_file_io_on_the_calling_thread(monkeypatch, tmp_path):
+    sink = JsonlGzipDebugSink(str(tmp_path), segment_max_bytes=10 ** 9)
+    calling_thread_io = []
+    real_gzip_open = sink_module.gzip.open
+
+    def watched_gzip_open(*args, **kwargs):
+        if threading.current_thread() is threading.main_thread():
+            calling_thread_io.append(args[0])
+        return real_gzip_open(*args, **kwargs)
+
+    monkeypatch.setattr(sink_module.gzip, "open", watched_gzip_open)
+    started = time.perf_counter()
+    for position in range(2000):
+        sink.submit({"request_id": f"r{position}", "prompt": "p" * 200, "response_text": "r" * 2000})
+    submit_seconds = time.perf_counter() - started
+    sink.close()
+    print(f"\n2000 submits took {submit_seconds * 1000:.1f} ms, stats: {sink.stats()}")
+
+    assert calling_thread_io == []
+    stats = sink.stats()
+    assert stats["written"] + stats["dropped"] == 2000
+    assert stats["written"] == len(_read_records(tmp_path))
+
+
+def test_segments_rotate_and_the_oldest_are_deleted_over_the_cap(tmp_path):
+    sink = JsonlGzipDebugSink(str(tmp_path), segment_max_bytes=2000, max_total_bytes=3000)
+    for position in range(200):
+        # Random-looking text so the segments do not compress to almost nothing
+        sink.submit({"request_id": f"r{position}", "response_text": os.urandom(300).hex()})
+    sink.close()
+
+    stats = sink.stats()
+    segments = sorted(os.listdir(tmp_path))
+    assert stats["written"] == 200
+    assert stats["segments_created"] > len(segments) >= 1
+    assert stats["segments_deleted"] == stats["segments_created"] - len(segments)
+    assert sum(os.path.getsize(tmp_path / name) for name in segments) <= 3000 + 2000
+    # The newest records survive the cap
+    assert _read_records(tmp_path)[-1]["request_id"] == "r199"
+
+
+def test_sampling_and_the_null_sink(monkeypatch, tmp_path):
+    sampled_out = JsonlGzipDebugSink(str(tmp_path / "none"), sample_rate=0.0)
+    assert not sampled_out.submit({"request_id": "r"})
+    sampled_out.close()
+    assert sampled_out.stats()["sampled_out"] == 1
+
+    # Records submitted after close are rejected, not counted as sampled out
+    assert not sampled_out.submit({"request_id": "late"})
+    assert (sampled_out.stats()["sampled_out"], sampled_out.stats()["rejected_closed"]) == (1, 1)
+    assert not (tmp_path / "none").exists()
+
+    half = JsonlGzipDebugSink(str(tmp_path / "half"), sample_rate=0.5)
+    queued = sum(half.submit({"request_id": f"r{position}"}) for position in range(1000))
+    half.close()
+    assert 350 < queued < 650
+    assert len(_read_records(tmp_path / "half")) == queued
+
+    monkeypatch.setenv("LLM_DEBUG_SINK", "none")
+    close_llm_debug_sink()
+    assert isinstance(get_llm_debug_sink(), NullDebugSink)
+
+
+def test_custom_sink_and_metrics_endpoint(monkeypatch):
+    class ListSink(NullDebugSink):
+        def __init__(self):
+            self.records = []
+
+        def submit(self, record):
+            self.records.append(record)
+            return True
+
+        def stats(self):
+            return {"sink": "list", "written": len(self.records)}
+
+    custom = ListSink()
+    set_llm_debug_sink(custom)
+    monkeypatch.setattr(gemini_module.get_http_session(), "post", lambda url, json, timeout=None, stream=False: FakeResponse())
+    gemini_llm_request(prompt="Assess these skills", request_onet_soc_code="11-1011.00", prompt_skills_data=SKILLS)
+
+    assert [record["request_onet_soc_code"] for record in custom.records] == ["11-1011.00"]
+    assert TestClient(app).get("/health/llm-debug-sink").json() == {"sink": "list", "written": 1}
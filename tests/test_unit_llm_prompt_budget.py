@@ -0,0 +1,157 @@
+"""
+Unit test for prompt token budgeting: the compact and full templates with their token estimates,
+the template-specific cache hashes and the splitting of proficiency work over the input token budget.
+Gemini is replaced with the counting stub; the database tier uses the SQLite sample database.
+"""
+import pytest
+
+import src.functions.cached_skill_proficiency_request as cached_request_module
+import src.functions.batch_skill_proficiency_request as batch_request_module
+from src.config.gemini_rate_limiter import estimate_tokens
+from src.config.llm_prompt_budget import split_to_token_budget, get_llm_prompt_metrics, reset_llm_prompt_metrics
+from src.config.llm_response_cache import clear_llm_response_caches
+from src.functions.batch_skill_proficiency_request import split_occupation_to_prompt_budget, plan_skill_proficiency_batches
+from src.functions.cached_skill_proficiency_request import cached_batch_skill_proficiency_request, get_skill_proficiency_template_hash
+from src.functions.cached_skill_gap_analysis_request import get_skill_gap_analysis_template_hash
+from src.functions.generate_skill_proficiency_prompt import generate_skill_proficiency_prompt
+from src.functions.generate_batch_skill_proficiency_prompt import generate_batch_skill_proficiency_prompt
+from src.functions.generate_skill_gap_analysis_prompt import generate_skill_gap_analysis_prompt
+from src.functions.get_all_occupations_and_skills import get_all_occupations_and_skills
+from tests.fixtures.sqlite_skills_db import sqlite_skills_engine
+from tests.test_unit_cached_skill_proficiency_request import CountingGemini
+
+
+class RecordingGemini(CountingGemini):
+    """Counting stub that also keeps the prompts and skills it was sent."""
+
+    def __init__(self):
+        super().__init__()
+        self.prompts = []
+
+    def __call__(self, prompt, request_onet_soc_code, prompt_skills_data, **kwargs):
+        self.prompts.append((prompt, [skill["skill_name"] for skill in prompt_skills_data]))
+        return super().__call__(prompt, request_onet_soc_code, prompt_skills_data, **kwargs)
+
+
+@pytest.fixture
+def occupations(sqlite_skills_engine):
+    return get_all_occupations_and_skills(engine=sqlite_skills_engine)["result"]["occupation_data"]
+
+
+@pytest.fixture
+def stub_gemini(monkeypatch):
+    stub = RecordingGemini()
+    monkeypatch.setattr(cached_request_module, "gemini_llm_request", stub)
+    monkeypatch.setattr(batch_request_module, "gemini_llm_request", stub)
+    clear_llm_response_caches()
+    reset_llm_prompt_metrics()
+    yield stub
+    clear_llm_response_caches()
+    reset_llm_prompt_metrics()
+
+
+def _profile(occupation, level):
+    return {"onet_id": occupation["onet_id"], "name": occupation["name"],
+            "skills": [{"skill_name": skill["skill_name"], "proficiency_level": level} for skill in occupation["skills"]]}
+
+
+def test_compact_templates_are_smaller_and_report_their_tokens(occupations):
+    executive, developer = occupations["11-1011.00"], occupations["15-1252.00"]
+    prompts = {
+        "skill_proficiency": lambda template: generate_skill_proficiency_prompt(executive, template=template),
+        "batch_skill_proficiency": lambda template: generate_batch_skill_proficiency_prompt([executive, developer], template=template),
+        "skill_gap_analysis": lambda template: generate_skill_gap_analysis_prompt(_profile(executive, 3), _profile(developer, 5), template=template),
+    }
+
+    for prompt_type, generate in prompts.items():
+        full, compact = generate("full")["result"], generate("compact")["result"]
+        print(f"\n{prompt_type}: full {full['estimated_input_tokens']} tokens, compact {compact['estimated_input_tokens']} tokens")
+        assert full["template"] == "full" and compact["template"] == "compact"
+        assert full["estimated_input_tokens"] == estimate_tokens(full["prompt"])
+        assert compact["estimated_input_tokens"] == estimate_tokens(compact["prompt"])
+        assert compact["estimated_input_tokens"] < full["estimated_input_tokens"] * 0.7
+        for skill in executive["skills"]:
+            assert skill["skill_name"] in compact["prompt"]
+
+
+def test_compact_gap_prompt_names_each_skill_once(occupations):
+    executive = occupations["11-1011.00"]
+    shared_skill = executive["skills"][0]["skill_name"]
+    source = {"onet_id": "A", "name": "Source", "skills": [{"skill_name": shared_skill, "proficiency_level": 2}, {"skill_name": "Only Source", "proficiency_level": 4}]}
+    target = {"onet_id": "B", "name": "Target", "skills": [{"skill_name": shared_skill, "proficiency_level": 6}, {"skill_name": "Only Target", "proficiency_level": 5}]}
+
+    full = generate_skill_gap_analysis_prompt(source, target, template="full")["result"]["prompt"]
+    compact = generate_skill_gap_analysis_prompt(source, target, template="compact")["result"]["prompt"]
+
+    assert full.count(shared_skill) == 2
+    assert compact.count(shared_skill) == 1
+    assert f"{shared_skill}: 2 -> 6" in compact
+    assert "Only Target: - -> 5" in compact
+    assert "Only Source: 4 -> -" in compact
+
+
+def test_template_hashes_follow_the_configured_template(monkeypatch):
+    assert get_skill_proficiency_template_hash("full") != get_skill_proficiency_template_hash("compact")
+    assert get_skill_gap_analysis_template_hash("full") != get_skill_gap_analysis_template_hash("compact")
+
+    monkeypatch.setenv("LLM_PROMPT_TEMPLATE", "full")
+    assert get_skill_proficiency_template_hash() == get_skill_proficiency_template_hash("full")
+    monkeypatch.setenv("LLM_PROMPT_TEMPLATE", "compact")
+    assert get_skill_proficiency_template_hash() == get_skill_proficiency_template_hash("compact")
+
+
+def test_split_to_token_budget_keeps_order_and_isolates_oversized_items():
+    chunks = split_to_token_budget([3, 4, 2, 9, 1], lambda tokens: tokens, overhead_tokens=2, max_tokens=10)
+
+    assert chunks == [[3, 4], [2], [9], [1]]
+    assert split_to_token_budget([], lambda tokens: tokens, 2, 10) == [[]]
+
+
+def test_occupation_over_the_budget_is_split_and_merged_into_one_assessment(monkeypatch, sqlite_skills_engine, occupations, stub_gemini):
+    executive = occupations["11-1011.00"]
+    whole_prompt_tokens = generate_skill_proficiency_prompt(executive)["result"]["estimated_input_tokens"]
+    budget = whole_prompt_tokens - 10
+    monkeypatch.setenv("LLM_PROMPT_MAX_INPUT_TOKENS", str(budget))
+
+    parts = split_occupation_to_prompt_budget(executive)
+    assert len(parts) > 1
+    assert [skill for part in parts for skill in part["skills"]] == executive["skills"]
+    for part in parts:
+        assert generate_skill_proficiency_prompt(part)["result"]["estimated_input_tokens"] <= budget
+
+    first = cached_batch_skill_proficiency_request([executive], engine=sqlite_skills_engine)
+    assessment = first["result"]["11-1011.00"]
+    print(f"\nSplit {len(executive['skills'])} skills into {len(stub_gemini.prompts)} prompts within {budget} tokens")
+
+    assert first["success"], first["message"]
+    assert stub_gemini.calls["skill_proficiency"] == len(parts)
+    assert [name for _, names in stub_gemini.prompts for name in names] == [skill["skill_name"] for skill in executive["skills"]]
+    assert assessment["result"]["cache"] == "miss"
+    assert {row["request_id"] for row in assessment["result"]["reply_data"]} == {"req-1"}
+    assert len(assessment["result"]["reply_data"]) == len(executive["skills"])
+
+    # The merged assessment is stored under the whole occupation's cache key
+    clear_llm_response_caches()
+    repeated = cached_batch_skill_proficiency_request([executive], engine=sqlite_skills_engine)["result"]["11-1011.00"]
+    assert repeated["result"]["cache"] == "database"
+    assert stub_gemini.calls["skill_proficiency"] == len(parts)
+    assert [row["llm_skill_name"] for row in repeated["result"]["reply_data"]] == [skill["skill_name"] for skill in executive["skills"]]
+
+    metrics = get_llm_prompt_metrics()["result"]
+    assert metrics["max_input_tokens"] == budget
+    assert metrics["by_response_type"]["skill_proficiency"]["splits"] >= 1
+
+
+def test_batches_respect_the_input_budget(occupations):
+    occupation_list = list(occupations.values())
+    single_prompt_tokens = generate_batch_skill_proficiency_prompt(occupation_list[:1])["result"]["estimated_input_tokens"]
+
+    generous = plan_skill_proficiency_batches(occupation_list, max_occupations=10, max_output_tokens=100000, max_input_tokens=100000)
+    tight = plan_skill_proficiency_batches(occupation_list, max_occupations=10, max_output_tokens=100000, max_input_tokens=single_prompt_tokens + 5)
+
+    assert len(generous) == 1
+    assert len(tight) > 1
+    assert [occupation for batch in tight for occupation in batch] == occupation_list
+    for batch in tight:
+        if len(batch) > 1:
+            assert generate_batch_skill_proficiency_prompt(batch)["result"]["estimated_input_tokens"] <= single_prompt_tokens + 5
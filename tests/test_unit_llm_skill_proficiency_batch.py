@@ -0,0 +1,157 @@
+"""
+Unit test for the offline batch LLM skill proficiency assessment.
+Gemini is replaced with a counting stub; results are loaded into the SQLite sample database.
+"""
+import json
+import threading
+import pytest
+
+import src.functions.assess_skill_proficiency_batch as batch_module
+import src.functions.cached_skill_proficiency_request as cached_request_module
+from src.config.llm_response_cache import clear_llm_response_caches
+from src.functions.assess_skill_proficiency_batch import assess_skill_proficiency_batch
+from src.functions.cached_skill_proficiency_request import (
+    cached_skill_proficiency_request, get_skill_proficiency_template_hash, get_skill_set_hash
+)
+from src.functions.get_all_occupations_and_skills import get_all_occupations_and_skills
+from src.functions.get_assessed_occupation_codes import get_assessed_occupation_codes
+from tests.fixtures.sqlite_skills_db import sqlite_skills_engine
+from tests.test_unit_cached_skill_proficiency_request import CountingGemini
+
+
+class BatchGemini(CountingGemini):
+    """Thread-safe CountingGemini that fails for the occupation codes in fail_codes."""
+
+    def __init__(self, fail_codes=()):
+        super().__init__()
+        self.fail_codes = set(fail_codes)
+        self.lock = threading.Lock()
+
+    def __call__(self, prompt, request_onet_soc_code, prompt_skills_data, **kwargs):
+        with self.lock:
+            if request_onet_soc_code in self.fail_codes:
+                return {"success": False, "message": "Gemini API request failed with status 503", "result": {}}
+            return super().__call__(prompt, request_onet_soc_code, prompt_skills_data, **kwargs)
+
+
+@pytest.fixture
+def occupations(sqlite_skills_engine):
+    all_occupations = get_all_occupations_and_skills(engine=sqlite_skills_engine)["result"]["occupation_data"]
+    return {code: occupation for code, occupation in all_occupations.items() if occupation["skills"]}
+
+
+@pytest.fixture(autouse=True)
+def clean_caches():
+    clear_llm_response_caches()
+    yield
+    clear_llm_response_caches()
+
+
+def _skill_set_hashes(occupations):
+    return {code: get_skill_set_hash(occupation["skills"]) for code, occupation in occupations.items()}
+
+
+def test_batch_skips_assessed_and_api_serves_results(sqlite_skills_engine, occupations, monkeypatch):
+    stub = BatchGemini()
+    monkeypatch.setattr(batch_module, "gemini_llm_request", stub)
+    monkeypatch.setattr(cached_request_module, "gemini_llm_request", stub)
+
+    # One occupation was already assessed online
+    chief_skills = [{"skill_element_id": s["skill_element_id"], "skill_name": s["skill_name"]} for s in occupations["11-1011.00"]["skills"]]
+    cached_skill_proficiency_request("prompt", "11-1011.00", chief_skills, engine=sqlite_skills_engine)
+
+    assessed = get_assessed_occupation_codes(
+        _skill_set_hashes(occupations), "gemini-2.0-flash", get_skill_proficiency_template_hash(), 3600, engine=sqlite_skills_engine
+    )["result"]["assessed_codes"]
+    assert assessed == {"11-1011.00"}
+
+    pending = {code: occupation for code, occupation in occupations.items() if code not in assessed}
+    result = assess_skill_proficiency_batch(pending, workers=3, requests_per_minute=0, flush_size=2, engine=sqlite_skills_engine)
+    print(f"\nBatch result: {result}")
+
+    assert result["success"]
+    assert result["result"]["assessed"] == len(pending) == 3
+    assert result["result"]["replies_loaded"] == sum(len(occupation["skills"]) for occupation in pending.values())
+    assert stub.calls["skill_proficiency"] == 4
+
+    # Everything is assessed now, and the online path reads the batch results from the database
+    assert get_assessed_occupation_codes(
+        _skill_set_hashes(occupations), "gemini-2.0-flash", get_skill_proficiency_template_hash(), 3600, engine=sqlite_skills_engine
+    )["result"]["assessed_codes"] == set(occupations)
+
+    clear_llm_response_caches()
+    developer_skills = [{"skill_element_id": s["skill_element_id"], "skill_name": s["skill_name"]} for s in occupations["15-1252.00"]["skills"]]
+    served = cached_skill_proficiency_request("prompt", "15-1252.00", developer_skills, engine=sqlite_skills_engine)
+    assert served["result"]["cache"] == "database"
+    assert stub.calls["skill_proficiency"] == 4
+
+
+def test_checkpoint_resumes_and_retries_failures(sqlite_skills_engine, occupations, monkeypatch, tmp_path):
+    checkpoint_path = str(tmp_path / "checkpoint.json")
+
+    failing_stub = BatchGemini(fail_codes={"29-1141.00"})
+    monkeypatch.setattr(batch_module, "gemini_llm_request", failing_stub)
+    first = assess_skill_proficiency_batch(occupations, workers=2, requests_per_minute=0, checkpoint_path=checkpoint_path, engine=sqlite_skills_engine)
+
+    assert first["success"]
+    assert first["result"]["assessed"] == 3
+    assert set(first["result"]["failed"]) == {"29-1141.00"}
+    with open(checkpoint_path) as f:
+        checkpoint = json.load(f)
+    assert list(checkpoint["completed"]) == ["11-1011.00", "11-2021.00", "15-1252.00"]
+    assert checkpoint["completed"]["15-1252.00"]["prompt_template_hash"] == get_skill_proficiency_template_hash()
+    assert checkpoint["completed"]["15-1252.00"]["skill_set_hash"] == _skill_set_hashes(occupations)["15-1252.00"]
+    assert "503" in checkpoint["failed"]["29-1141.00"]
+
+    retry_stub = BatchGemini()
+    monkeypatch.setattr(batch_module, "gemini_llm_request", retry_stub)
+    second = assess_skill_proficiency_batch(occupations, workers=2, requests_per_minute=0, checkpoint_path=checkpoint_path, engine=sqlite_skills_engine)
+
+    assert second["success"]
+    assert second["result"]["skipped_checkpoint"] == 3
+    assert second["result"]["assessed"] == 1
+    assert second["result"]["failed"] == {}
+    assert retry_stub.calls["skill_proficiency"] == 1
+    with open(checkpoint_path) as f:
+        checkpoint = json.load(f)
+    assert (list(checkpoint["completed"]), checkpoint["failed"]) == (sorted(occupations), {})
+
+
+def test_checkpoint_entries_of_an_older_template_are_assessed_again(sqlite_skills_engine, occupations, monkeypatch, tmp_path):
+    checkpoint_path = str(tmp_path / "checkpoint.json")
+    monkeypatch.setenv("LLM_PROMPT_TEMPLATE", "full")
+    # One stub for every run, so its request ids stay unique
+    stub = BatchGemini()
+    monkeypatch.setattr(batch_module, "gemini_llm_request", stub)
+    first = assess_skill_proficiency_batch(occupations, workers=2, requests_per_minute=0, checkpoint_path=checkpoint_path, engine=sqlite_skills_engine)
+    assert first["result"]["assessed"] == len(occupations)
+
+    # The same checkpoint still skips everything under the same cache key
+    unchanged = assess_skill_proficiency_batch(occupations, workers=2, requests_per_minute=0, checkpoint_path=checkpoint_path, engine=sqlite_skills_engine)
+    assert (unchanged["result"]["skipped_checkpoint"], unchanged["result"]["assessed"]) == (len(occupations), 0)
+
+    # A new prompt template makes the stored replies outdated, so the checkpoint must not skip them
+    monkeypatch.setenv("LLM_PROMPT_TEMPLATE", "compact")
+    calls_before = stub.calls["skill_proficiency"]
+    rerun = assess_skill_proficiency_batch(occupations, workers=2, requests_per_minute=0, checkpoint_path=checkpoint_path, engine=sqlite_skills_engine)
+
+    assert (rerun["result"]["skipped_checkpoint"], rerun["result"]["assessed"]) == (0, len(occupations))
+    assert stub.calls["skill_proficiency"] - calls_before == len(occupations)
+    assert get_assessed_occupation_codes(
+        _skill_set_hashes(occupations), "gemini-2.0-flash", get_skill_proficiency_template_hash(), 3600, engine=sqlite_skills_engine
+    )["result"]["assessed_codes"] == set(occupations)
+
+    # Entries older than max_age_seconds are assessed again too
+    expired = assess_skill_proficiency_batch(occupations, workers=2, requests_per_minute=0, checkpoint_path=checkpoint_path,
+                                             engine=sqlite_skills_engine, max_age_seconds=-1)
+    assert expired["result"]["skipped_checkpoint"] == 0
+
+
+def test_rate_limit_spaces_requests(sqlite_skills_engine, occupations, monkeypatch):
+    monkeypatch.setattr(batch_module, "gemini_llm_request", BatchGemini())
+
+    # 120/minute allows a burst of 2, then one request every 0.5s
+    result = assess_skill_proficiency_batch(occupations, workers=4, requests_per_minute=120, engine=sqlite_skills_engine)
+
+    assert result["success"]
+    assert result["result"]["rate_limit_waited_seconds"] >= 0.5
@@ -0,0 +1,92 @@
+"""
+Unit test for the loader backends of load_data_from_dataframe: the LOAD DATA TSV formatting (escapes,
+NULLs, integer and date columns), backend selection and the fallback to the ORM loader. Runs against an
+in-memory SQLite database, where the infile backend is unavailable and every load falls back.
+"""
+import io
+from datetime import date
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from src.config.schemas import Base, Onet_Skills_Landing
+from src.functions.mysql_load_table import load_data_from_dataframe, write_dataframe_tsv, get_load_backend
+
+COLUMNS = ["onet_soc_code", "element_id", "element_name", "scale_id", "data_value", "n_value", "date_recorded", "domain_source"]
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine, tables=[Onet_Skills_Landing.__table__])
+    yield engine
+    engine.dispose()
+
+
+def _skills_frame(rows=3):
+    return pd.DataFrame({
+        "onet_soc_code": ["11-1011.00"] * rows,
+        "element_id": [f"2.A.1.{position}" for position in range(rows)],
+        "element_name": ["Tab\there", "Line\nbreak \\ slash", "Plain"][:rows] + ["Plain"] * max(0, rows - 3),
+        "scale_id": ["LV"] * rows,
+        "data_value": [4.75, None, 3.5][:rows] + [1.0] * max(0, rows - 3),
+        "n_value": [8, None, 12][:rows] + [1] * max(0, rows - 3),
+        "date_recorded": pd.to_datetime(["2024-08-01", None, "2023-07-15"][:rows] + ["2024-01-01"] * max(0, rows - 3)),
+        "domain_source": ["Analyst", None, "Incumbent"][:rows] + [None] * max(0, rows - 3),
+    })
+
+
+def test_tsv_escapes_special_characters_and_writes_nulls():
+    buffer = io.StringIO()
+    written = write_dataframe_tsv(_skills_frame(), Onet_Skills_Landing, COLUMNS, buffer, chunk_rows=2)
+
+    lines = buffer.getvalue().split("\n")
+    assert written == 3
+    assert lines[-1] == ""
+    assert lines[:3] == [
+        "11-1011.00\t2.A.1.0\tTab\\there\tLV\t4.75\t8\t2024-08-01\tAnalyst",
+        "11-1011.00\t2.A.1.1\tLine\\nbreak \\\\ slash\tLV\t\\N\t\\N\t\\N\t\\N",
+        "11-1011.00\t2.A.1.2\tPlain\tLV\t3.5\t12\t2023-07-15\tIncumbent",
+    ]
+
+
+def _orm_frame(rows=3):
+    # The ORM loader takes Python values: dates rather than timestamps and no NaN in numeric columns
+    frame = _skills_frame(rows).fillna({"data_value": 0.0, "n_value": 0})
+    frame["date_recorded"] = [date(2024, 8, 1)] * rows
+    return frame
+
+
+def test_infile_falls_back_to_the_orm_loader_off_mysql(engine):
+    result = load_data_from_dataframe(_orm_frame(), Onet_Skills_Landing, engine, backend="infile")
+
+    assert result["success"], result["message"]
+    assert result["result"]["records_loaded"] == 3
+    assert result["result"]["backend"] == "orm"
+    assert "sqlite" in result["result"]["fallback_reason"]
+    with sessionmaker(bind=engine)() as session:
+        rows = session.execute(select(Onet_Skills_Landing).order_by(Onet_Skills_Landing.element_id)).scalars().all()
+    assert [row.element_name for row in rows] == ["Tab\there", "Line\nbreak \\ slash", "Plain"]
+    assert [row.domain_source for row in rows] == ["Analyst", None, "Incumbent"]
+    assert rows[0].date_recorded == date(2024, 8, 1)
+
+
+def test_orm_backend_reports_throughput_without_a_fallback(engine):
+    result = load_data_from_dataframe(_orm_frame(50), Onet_Skills_Landing, engine, backend="orm")
+
+    assert result["success"], result["message"]
+    assert result["result"]["backend"] == "orm"
+    assert result["result"]["records_loaded"] == 50
+    assert "fallback_reason" not in result["result"]
+    assert result["result"]["elapsed_seconds"] >= 0
+
+
+def test_backend_selection(monkeypatch, engine):
+    monkeypatch.setenv("MYSQL_LOAD_BACKEND", "orm")
+    assert get_load_backend() == "orm"
+    assert get_load_backend("INFILE") == "infile"
+
+    result = load_data_from_dataframe(_skills_frame(), Onet_Skills_Landing, engine, backend="copy")
+    assert not result["success"]
+    assert "Unknown load backend" in result["message"]
@@ -0,0 +1,77 @@
+"""
+Unit test for the blue/green rebuild of the transform outputs: skills and occupation_skills are built
+into shadow tables while the live tables keep their rows, then swapped in together, and the validation
+counts keep the live tables when a shadow table is short. Runs on the SQLite sample database.
+"""
+from sqlalchemy import func, inspect, select, delete
+
+from src.config.schemas import Onet_Skills_Landing, Skills, Occupation_Skills
+from src.functions.mysql_swap_tables import create_shadow_table, swap_shadow_tables
+from src.functions.populate_skills_reference import populate_skills_reference
+from src.functions.populate_occupation_skills import populate_occupation_skills
+from tests.fixtures.sqlite_skills_db import sqlite_skills_engine, SAMPLE_SKILLS, SAMPLE_OCCUPATION_SKILLS
+
+MODELS = [Skills, Occupation_Skills]
+
+
+def _sources(engine, model):
+    with engine.connect() as connection:
+        return connection.execute(select(model.source, func.count()).group_by(model.source)).all()
+
+
+def _build_shadows(engine):
+    shadows = {model.__tablename__: create_shadow_table(model, engine) for model in MODELS}
+    skills = populate_skills_reference(source="text_file", engine=engine, target_table=shadows["skills"])
+    relationships = populate_occupation_skills(source="text_file", engine=engine, target_table=shadows["occupation_skills"])
+    assert skills["success"] and relationships["success"]
+    return {"skills": skills["result"]["skills_reference_count"], "occupation_skills": relationships["result"]["occupation_skills_count"]}
+
+
+def test_tables_are_built_in_shadow_and_swapped_in_together(sqlite_skills_engine):
+    expected_counts = _build_shadows(sqlite_skills_engine)
+
+    # While the shadow tables are built, readers still see the complete live tables
+    assert _sources(sqlite_skills_engine, Skills) == [("test", len(SAMPLE_SKILLS))]
+    assert _sources(sqlite_skills_engine, Occupation_Skills) == [("test", len(SAMPLE_OCCUPATION_SKILLS))]
+
+    result = swap_shadow_tables(MODELS, sqlite_skills_engine, expected_counts=expected_counts)
+    print(f"\n{result['message']}: {result['result']}")
+
+    assert result["success"], result["message"]
+    assert result["result"]["swapped"]
+    assert _sources(sqlite_skills_engine, Skills) == [("text_file", len(SAMPLE_SKILLS))]
+    assert _sources(sqlite_skills_engine, Occupation_Skills) == [("text_file", len(SAMPLE_OCCUPATION_SKILLS))]
+    table_names = set(inspect(sqlite_skills_engine).get_table_names())
+    assert not {"skills_shadow", "skills_old", "occupation_skills_shadow", "occupation_skills_old"} & table_names
+
+    # The next rebuild swaps in the same way
+    assert swap_shadow_tables(MODELS, sqlite_skills_engine, expected_counts=_build_shadows(sqlite_skills_engine))["success"]
+
+
+def test_a_short_shadow_table_keeps_the_live_tables(sqlite_skills_engine):
+    # A truncated landing table would replace most occupation skills
+    with sqlite_skills_engine.begin() as connection:
+        connection.execute(delete(Onet_Skills_Landing).where(Onet_Skills_Landing.onet_soc_code != "11-1011.00"))
+    expected_counts = _build_shadows(sqlite_skills_engine)
+
+    result = swap_shadow_tables(MODELS, sqlite_skills_engine, expected_counts=expected_counts)
+
+    assert not result["success"]
+    assert not result["result"]["swapped"]
+    assert result["result"]["failed_checks"] == [
+        f"occupation_skills: shadow table holds 6 rows, under 90% of the {len(SAMPLE_OCCUPATION_SKILLS)} live rows"
+    ]
+    assert _sources(sqlite_skills_engine, Occupation_Skills) == [("test", len(SAMPLE_OCCUPATION_SKILLS))]
+    assert _sources(sqlite_skills_engine, Skills) == [("test", len(SAMPLE_SKILLS))]
+    assert "occupation_skills_shadow" not in inspect(sqlite_skills_engine).get_table_names()
+
+
+def test_counts_must_match_what_was_built(sqlite_skills_engine):
+    expected_counts = _build_shadows(sqlite_skills_engine)
+    expected_counts["skills"] += 1
+
+    result = swap_shadow_tables(MODELS, sqlite_skills_engine, expected_counts=expected_counts)
+
+    assert not result["success"]
+    assert result["result"]["failed_checks"] == [f"skills: shadow table holds {len(SAMPLE_SKILLS)} rows, {len(SAMPLE_SKILLS) + 1} were built"]
+    assert _sources(sqlite_skills_engine, Skills) == [("test", len(SAMPLE_SKILLS))]
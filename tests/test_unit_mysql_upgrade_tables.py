@@ -0,0 +1,67 @@
+"""
+Unit test for the in-place schema upgrade: an llm_skill_proficiency_requests table created before the
+cache key columns existed gets the columns and index added, keeps its rows, and the proficiency cache
+lookups work on it afterwards. Runs on a SQLite file database.
+"""
+from datetime import datetime
+import pytest
+from sqlalchemy import MetaData, Table, create_engine, inspect, insert, select, text
+
+from src.config.schemas import LLM_Skill_Proficiency_Requests, LLM_Skill_Proficiency_Replies
+from src.functions.mysql_upgrade_tables import upgrade_table_schema
+from src.functions.get_assessed_occupation_codes import get_assessed_occupation_codes
+
+CACHE_COLUMNS = {"prompt_template_hash", "skill_set_hash"}
+CACHE_INDEX = "ix_llm_skill_proficiency_requests_cache_key"
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'llm.db'}")
+    yield engine
+    engine.dispose()
+
+
+def _create_old_table(engine):
+    """The table as it was before the cache key columns and their index were added."""
+    LLM_Skill_Proficiency_Requests.__table__.create(engine)
+    LLM_Skill_Proficiency_Replies.__table__.create(engine)
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP INDEX {CACHE_INDEX}"))
+        for name in CACHE_COLUMNS:
+            connection.execute(text(f"ALTER TABLE llm_skill_proficiency_requests DROP COLUMN {name}"))
+        old_table = Table("llm_skill_proficiency_requests", MetaData(), autoload_with=connection)
+        connection.execute(insert(old_table).values(
+            request_id="r1", request_model="gemini-2.0-flash", request_onet_soc_code="15-1252.00",
+            request_skill_element_id="2.B.3.e", request_skill_name="Programming", request_timestamp=datetime.now()
+        ))
+
+
+def test_old_table_is_upgraded_in_place(engine):
+    _create_old_table(engine)
+    assert not CACHE_COLUMNS & {column["name"] for column in inspect(engine).get_columns("llm_skill_proficiency_requests")}
+    assert not get_assessed_occupation_codes({"15-1252.00": "hash"}, "gemini-2.0-flash", "template", 3600, engine=engine)["success"]
+
+    result = upgrade_table_schema([LLM_Skill_Proficiency_Requests], engine)
+    print(f"\n{result['message']}")
+
+    assert result["success"], result["message"]
+    assert sorted(result["result"]["added_columns"]) == ["llm_skill_proficiency_requests.prompt_template_hash", "llm_skill_proficiency_requests.skill_set_hash"]
+    assert result["result"]["added_indexes"] == [CACHE_INDEX]
+    assert CACHE_INDEX in {index["name"] for index in inspect(engine).get_indexes("llm_skill_proficiency_requests")}
+    with engine.connect() as connection:
+        rows = connection.execute(select(LLM_Skill_Proficiency_Requests.request_id, LLM_Skill_Proficiency_Requests.skill_set_hash)).all()
+    assert rows == [("r1", None)]
+    assert get_assessed_occupation_codes({"15-1252.00": "hash"}, "gemini-2.0-flash", "template", 3600, engine=engine)["success"]
+
+    # Running it again changes nothing
+    again = upgrade_table_schema([LLM_Skill_Proficiency_Requests], engine)
+    assert again["success"] and again["message"] == "Table schema is up to date"
+
+
+def test_missing_table_is_created(engine):
+    result = upgrade_table_schema([LLM_Skill_Proficiency_Requests], engine)
+
+    assert result["success"], result["message"]
+    assert result["result"]["created_tables"] == ["llm_skill_proficiency_requests"]
+    assert CACHE_COLUMNS <= {column["name"] for column in inspect(engine).get_columns("llm_skill_proficiency_requests")}
@@ -0,0 +1,109 @@
+"""
+Unit test for incremental (upsert) loading: the row-level diff by key with type normalization, batched
+upserts and deletes that leave unchanged rows untouched, the DataFrame variant for landing tables and
+the incremental mode of populate_skills_reference and populate_occupation_skills.
+Runs on the SQLite sample database, which takes ON CONFLICT DO UPDATE in place of ON DUPLICATE KEY UPDATE.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+import pandas as pd
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.orm import sessionmaker
+
+from src.config.schemas import Onet_Skills_Landing, Onet_Scales_Landing, Skills, Occupation_Skills
+from src.functions.mysql_upsert_table import diff_rows, upsert_rows, upsert_data_from_dataframe
+from src.functions.populate_skills_reference import populate_skills_reference
+from src.functions.populate_occupation_skills import populate_occupation_skills
+from tests.fixtures.sqlite_skills_db import sqlite_skills_engine, sqlite_landing_engine, SAMPLE_OCCUPATION_SKILLS
+
+
+def _rows(engine, model, *order_by):
+    with sessionmaker(bind=engine)() as session:
+        return session.execute(select(model).order_by(*order_by)).scalars().all()
+
+
+def test_diff_normalizes_values_to_the_column_types():
+    existing = [
+        {"onet_soc_code": "A", "element_id": "1", "scale_id": "LV", "data_value": Decimal("4.50"), "n_value": 8, "date_recorded": date(2024, 8, 1)},
+        {"onet_soc_code": "A", "element_id": "2", "scale_id": "LV", "data_value": Decimal("3.00"), "n_value": None, "date_recorded": None},
+        {"onet_soc_code": "A", "element_id": "3", "scale_id": "LV", "data_value": Decimal("1.00"), "n_value": 1, "date_recorded": None},
+    ]
+    new = [
+        {"onet_soc_code": "A", "element_id": "1", "scale_id": "LV", "data_value": 4.5, "n_value": 8.0, "date_recorded": pd.Timestamp("2024-08-01")},
+        {"onet_soc_code": "A", "element_id": "2", "scale_id": "LV", "data_value": 3.25, "n_value": pd.NA, "date_recorded": pd.NaT},
+        {"onet_soc_code": "B", "element_id": "1", "scale_id": "LV", "data_value": float("nan"), "n_value": 2, "date_recorded": None},
+    ]
+
+    changes = diff_rows(new, existing, Onet_Skills_Landing, ["onet_soc_code", "element_id", "scale_id"], ["data_value", "n_value", "date_recorded"])
+
+    assert (changes["inserted"], changes["updated"], changes["unchanged"], changes["deleted"]) == (1, 1, 1, 1)
+    assert changes["delete_keys"] == [("A", "3", "LV")]
+    assert [(row["element_id"], row["data_value"]) for row in changes["upserts"]] == [("2", Decimal("3.25")), ("1", None)]
+
+
+def test_upsert_applies_only_the_changes_in_batches(sqlite_skills_engine):
+    original = {row.element_id: row for row in _rows(sqlite_skills_engine, Skills, Skills.element_id)}
+    yesterday = date.today() - timedelta(days=1)
+    with sqlite_skills_engine.begin() as connection:
+        connection.execute(update(Skills).values(last_updated=yesterday))
+
+    new_rows = [{"element_id": element_id, "element_name": row.element_name, "source": "test", "last_updated": date.today()}
+                for element_id, row in original.items() if element_id != "2.A.1.e"]
+    new_rows[0]["element_name"] = "Reading"
+    new_rows.append({"element_id": "2.C.1.a", "element_name": "Administration", "source": "test", "last_updated": date.today()})
+
+    result = upsert_rows(new_rows, Skills, sqlite_skills_engine, ignore_columns=["last_updated"], batch_size=1)
+    skills = {row.element_id: row for row in _rows(sqlite_skills_engine, Skills, Skills.element_id)}
+
+    assert result["success"], result["message"]
+    assert {name: result["result"][name] for name in ("inserted", "updated", "deleted", "unchanged")} == {
+        "inserted": 1, "updated": 1, "deleted": 1, "unchanged": len(original) - 2
+    }
+    assert result["result"]["statements"] == 3
+    assert set(skills) == set(original) - {"2.A.1.e"} | {"2.C.1.a"}
+    assert skills["2.A.1.a"].element_name == "Reading"
+    assert skills["2.A.1.a"].last_updated == date.today()
+    # Rows that did not change are not rewritten
+    assert skills["2.A.1.b"].last_updated == yesterday
+
+    repeated = upsert_rows(new_rows, Skills, sqlite_skills_engine, ignore_columns=["last_updated"])
+    assert repeated["result"]["unchanged"] == len(new_rows)
+    assert repeated["result"]["statements"] == 0
+
+
+def test_dataframe_upsert_of_a_landing_table(sqlite_landing_engine):
+    scales = pd.DataFrame({"scale_id": ["IM", "LV"], "scale_name": ["Importance", "Level"], "minimum": pd.array([1, 0], dtype="Int64"), "maximum": pd.array([5, 7], dtype="Int64")})
+    first = upsert_data_from_dataframe(scales, Onet_Scales_Landing, sqlite_landing_engine)
+    scales.loc[1, "maximum"] = pd.NA
+    second = upsert_data_from_dataframe(scales, Onet_Scales_Landing, sqlite_landing_engine, delete_missing=False)
+
+    assert first["result"]["records_loaded"] == 2
+    assert (second["result"]["updated"], second["result"]["unchanged"], second["result"]["records_loaded"]) == (1, 1, 1)
+    assert [(row.scale_id, row.maximum) for row in _rows(sqlite_landing_engine, Onet_Scales_Landing, Onet_Scales_Landing.scale_id)] == [("IM", 5), ("LV", None)]
+
+
+def test_incremental_transform_reports_the_changes(sqlite_skills_engine):
+    first_skills = populate_skills_reference(source="test", engine=sqlite_skills_engine, incremental=True)
+    first_relationships = populate_occupation_skills(source="test", engine=sqlite_skills_engine, incremental=True)
+    assert first_skills["result"]["changes"]["unchanged"] == first_skills["result"]["skills_reference_count"]
+    assert first_relationships["result"]["changes"]["unchanged"] == len(SAMPLE_OCCUPATION_SKILLS)
+    ids_before = {(row.onet_soc_code, row.element_id): row.id for row in _rows(sqlite_skills_engine, Occupation_Skills, Occupation_Skills.id)}
+
+    with sqlite_skills_engine.begin() as connection:
+        connection.execute(update(Onet_Skills_Landing)
+                           .where(Onet_Skills_Landing.onet_soc_code == "15-1252.00", Onet_Skills_Landing.element_id == "2.B.3.e", Onet_Skills_Landing.scale_id == "LV")
+                           .values(data_value=6.25))
+        connection.execute(Onet_Skills_Landing.__table__.delete().where(Onet_Skills_Landing.onet_soc_code == "29-1141.00"))
+
+    result = populate_occupation_skills(source="test", engine=sqlite_skills_engine, incremental=True)
+    changes = result["result"]["changes"]
+    relationships = {(row.onet_soc_code, row.element_id): row for row in _rows(sqlite_skills_engine, Occupation_Skills, Occupation_Skills.id)}
+    print(f"\n{result['message']}: {changes}")
+
+    assert result["success"], result["message"]
+    assert (changes["inserted"], changes["updated"], changes["deleted"]) == (0, 1, 4)
+    assert relationships[("15-1252.00", "2.B.3.e")].proficiency_level == Decimal("6.25")
+    assert not any(code == "29-1141.00" for code, _ in relationships)
+    # Rows are updated in place rather than deleted and inserted again
+    assert all(relationships[key].id == ids_before[key] for key in relationships)
@@ -0,0 +1,118 @@
+"""
+Unit test for the parallel extract-and-load driver: files parsed in worker processes and loaded into a
+SQLite file database, dependency ordering with concurrent loads of independent tables, skipping the
+dependents of a failed file, and rejecting cyclic or unknown dependencies.
+"""
+import os
+import time
+import threading
+from functools import partial
+import pytest
+from sqlalchemy import create_engine, func, select
+
+import src.functions.parallel_extract_load as parallel_module
+from src.config.schemas import Base, Onet_Occupations_Landing, Onet_Scales_Landing
+from src.functions.extract_onet_data import extract_occupations, extract_scales
+from src.functions.parallel_extract_load import run_parallel_extract_load
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SCALES_PATH = os.path.join(PROJECT_ROOT, 'database', 'scales.txt')
+OCCUPATIONS_PATH = os.path.join(PROJECT_ROOT, 'database', 'occupations.txt')
+
+
+@pytest.fixture
+def engine(tmp_path):
+    # A file database, so every load thread gets its own connection to the same data
+    engine = create_engine(f"sqlite:///{tmp_path / 'landing.db'}")
+    Base.metadata.create_all(engine, tables=[Onet_Occupations_Landing.__table__, Onet_Scales_Landing.__table__])
+    yield engine
+    engine.dispose()
+
+
+def _count(engine, model):
+    with engine.connect() as connection:
+        return connection.execute(select(func.count()).select_from(model)).scalar()
+
+
+def test_files_are_parsed_in_worker_processes_and_loaded(engine):
+    result = run_parallel_extract_load([
+        {"name": "occupations.txt", "extract": partial(extract_occupations, OCCUPATIONS_PATH), "model": Onet_Occupations_Landing},
+        {"name": "scales.txt", "extract": partial(extract_scales, SCALES_PATH), "model": Onet_Scales_Landing},
+    ], engine, parse_workers=2, load_workers=2, backend="orm")
+    print(f"\n{result['message']}: {result['result']}")
+
+    assert result["success"], result["message"]
+    files = result["result"]["files"]
+    assert files["occupations.txt"]["rows"] == _count(engine, Onet_Occupations_Landing) > 0
+    assert files["scales.txt"]["rows"] == _count(engine, Onet_Scales_Landing) > 0
+    for file_report in files.values():
+        assert file_report["status"] == "loaded"
+        assert file_report["parse_seconds"] >= 0 and file_report["load_seconds"] >= 0
+
+
+class RecordingLoads:
+    """Replaces the table load with a timed sleep and records when each load ran."""
+
+    def __init__(self, seconds, fail=()):
+        self.seconds, self.fail = seconds, set(fail)
+        self.spans = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, df, model, engine, backend):
+        name = df.attrs["name"]
+        started = time.perf_counter()
+        time.sleep(self.seconds.get(name, 0.0))
+        with self._lock:
+            self.spans[name] = (started, time.perf_counter())
+        if name in self.fail:
+            return {"success": False, "message": f"{name} rejected", "result": {}, "load_seconds": 0.0}
+        return {"success": True, "message": "ok", "result": {"records_loaded": len(df), "backend": "orm"}, "load_seconds": 0.0}
+
+
+def _named_scales(name):
+    result = extract_scales(SCALES_PATH)
+    result["df"].attrs["name"] = name
+    return result
+
+
+def _spec(name, depends_on=()):
+    return {"name": name, "extract": partial(_named_scales, name), "model": Onet_Scales_Landing, "depends_on": list(depends_on)}
+
+
+def test_dependents_wait_and_independent_tables_load_concurrently(monkeypatch, engine):
+    loads = RecordingLoads({"a": 0.4, "c": 0.4})
+    monkeypatch.setattr(parallel_module, "_load_file", loads)
+
+    result = run_parallel_extract_load([_spec("a"), _spec("b", ["a"]), _spec("c"), _spec("d", ["b", "c"])], engine, parse_workers=2, load_workers=3)
+
+    assert result["success"], result["message"]
+    spans = loads.spans
+    assert spans["b"][0] >= spans["a"][1]
+    assert spans["d"][0] >= max(spans["b"][1], spans["c"][1])
+    # a and c have no dependencies and overlap
+    assert spans["c"][0] < spans["a"][1] and spans["a"][0] < spans["c"][1]
+
+
+def test_failures_skip_only_their_dependents(monkeypatch, engine):
+    loads = RecordingLoads({}, fail=["b"])
+    monkeypatch.setattr(parallel_module, "_load_file", loads)
+    missing = {"name": "missing", "extract": partial(extract_scales, "/nonexistent/scales.txt"), "model": Onet_Scales_Landing}
+
+    result = run_parallel_extract_load([_spec("a"), _spec("b", ["a"]), _spec("c", ["b"]), missing, _spec("e", ["missing"])], engine, parse_workers=2, load_workers=2)
+    files = result["result"]["files"]
+
+    assert not result["success"]
+    assert result["message"] == "Parallel extract-load finished: 1 loaded, 2 failed, 2 skipped"
+    assert files["a"]["status"] == "loaded"
+    assert (files["b"]["status"], files["b"]["failed_stage"]) == ("failed", "load")
+    assert (files["missing"]["status"], files["missing"]["failed_stage"]) == ("failed", "parse")
+    assert files["c"]["status"] == files["e"]["status"] == "skipped"
+    assert set(loads.spans) == {"a", "b"}
+
+
+def test_cyclic_and_unknown_dependencies_are_rejected(engine):
+    cyclic = run_parallel_extract_load([_spec("a", ["b"]), _spec("b", ["a"])], engine)
+    unknown = run_parallel_extract_load([_spec("a", ["z"])], engine)
+
+    assert not cyclic["success"] and cyclic["message"].startswith("Dependency cycle")
+    assert not unknown["success"] and unknown["message"] == "Unknown dependencies: ['z']"
@@ -0,0 +1,82 @@
+"""
+Load test showing /skill-gap latency stays flat while slow /skill-gap-llm requests are in flight.
+The LLM pipeline is replaced by a stub that blocks for LLM_DELAY_SECONDS, standing in for a slow
+Gemini call. /skill-gap runs for real against the SQLite sample database.
+"""
+import time
+import statistics
+import anyio
+import httpx
+import pytest
+
+import src.api.routers.skill_gap as skill_gap_router
+from src.api.main import app, verify_api_key
+from src.config.engine_registry import get_engine
+from tests.fixtures.sqlite_skills_db import sqlite_skills_engine
+
+LLM_DELAY_SECONDS = 1.0
+CONCURRENT_LLM_REQUESTS = 4
+SKILL_GAP_REQUESTS = 20
+
+
+def slow_llm_stub(from_onet_soc_code, to_onet_soc_code, engine=None):
+    """Blocking stand-in for get_skills_gap_by_lvl_llm."""
+    time.sleep(LLM_DELAY_SECONDS)
+    return {"success": True, "message": "stub", "result": []}
+
+
+@pytest.fixture
+def api_app(sqlite_skills_engine, monkeypatch):
+    monkeypatch.setattr(skill_gap_router, "get_skills_gap_by_lvl_llm", slow_llm_stub)
+    app.dependency_overrides[get_engine] = lambda: sqlite_skills_engine
+    app.dependency_overrides[verify_api_key] = lambda: "test-key"
+    yield app
+    app.dependency_overrides.clear()
+
+
+async def _time_skill_gap_requests(client):
+    latencies = []
+    for _ in range(SKILL_GAP_REQUESTS):
+        started = time.perf_counter()
+        response = await client.get("/api/v1/skill-gap", params={"from_occupation": "11-1011.00", "to_occupation": "15-1252.00"})
+        latencies.append(time.perf_counter() - started)
+        assert response.status_code == 200
+    return latencies
+
+
+async def _run_load(api_app):
+    transport = httpx.ASGITransport(app=api_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=30) as client:
+        baseline = await _time_skill_gap_requests(client)
+
+        llm_statuses = []
+
+        async def llm_request():
+            response = await client.get("/api/v1/skill-gap-llm", params={"from_occupation": "11-1011.00", "to_occupation": "15-1252.00"})
+            llm_statuses.append(response.status_code)
+
+        async with anyio.create_task_group() as task_group:
+            for _ in range(CONCURRENT_LLM_REQUESTS):
+                task_group.start_soon(llm_request)
+            await anyio.sleep(0.05)  # Let the LLM requests reach their blocking call
+            started = time.perf_counter()
+            under_load = await _time_skill_gap_requests(client)
+            under_load_window = time.perf_counter() - started
+
+        return baseline, under_load, under_load_window, llm_statuses
+
+
+def test_skill_gap_latency_flat_while_llm_requests_in_flight(api_app):
+    baseline, under_load, under_load_window, llm_statuses = anyio.run(_run_load, api_app)
+
+    print("\nLoad Test Results:")
+    print(f"/skill-gap baseline: median {statistics.median(baseline) * 1000:.1f} ms, max {max(baseline) * 1000:.1f} ms")
+    print(f"/skill-gap with {CONCURRENT_LLM_REQUESTS} LLM requests in flight: "
+          f"median {statistics.median(under_load) * 1000:.1f} ms, max {max(under_load) * 1000:.1f} ms")
+    print(f"{SKILL_GAP_REQUESTS} /skill-gap requests completed in {under_load_window:.2f}s "
+          f"while each LLM request blocks for {LLM_DELAY_SECONDS}s")
+
+    assert llm_statuses == [200] * CONCURRENT_LLM_REQUESTS
+    # With the event loop blocked, the first /skill-gap request alone would wait for the LLM calls
+    assert under_load_window < LLM_DELAY_SECONDS, "/skill-gap requests were held up by in-flight LLM requests"
+    assert max(under_load) < LLM_DELAY_SECONDS / 2
@@ -0,0 +1,162 @@
+"""
+Unit test for the background /skill-gap-llm job endpoints, including two worker pools sharing one
+database, where every job must run exactly once. The LLM pipeline is replaced by a stub that blocks
+for LLM_DELAY_SECONDS; job state is stored in the SQLite sample database.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import pytest
+from fastapi.testclient import TestClient
+
+import src.functions.run_skill_gap_llm_job as run_job_module
+from src.api.main import app, verify_api_key
+from src.config.engine_registry import get_engine
+from src.config.skill_gap_llm_jobs import init_skill_gap_llm_jobs, shutdown_skill_gap_llm_jobs, get_lease_seconds
+from src.functions.create_skill_gap_llm_job import create_skill_gap_llm_job
+from src.functions.run_skill_gap_llm_job import run_skill_gap_llm_job
+from src.functions.update_skill_gap_llm_job import update_skill_gap_llm_job
+from tests.fixtures.sqlite_skills_db import sqlite_skills_engine
+
+LLM_DELAY_SECONDS = 0.3
+STUB_GAPS = [{"element_id": "2.B.3.e", "skill_name": "Programming", "from_proficiency_level": 2, "to_proficiency_level": 6, "llm_gap_description": "Learn to code"}]
+
+
+class SlowPipelineStub:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, from_onet_soc_code, to_onet_soc_code, engine=None):
+        self.calls += 1
+        time.sleep(LLM_DELAY_SECONDS)
+        if to_onet_soc_code == "00-0000.00":
+            return {"success": False, "message": "Error retrieving target occupation data: Occupation 00-0000.00 not found", "result": []}
+        return {"success": True, "message": "stub", "result": STUB_GAPS}
+
+
+@pytest.fixture
+def pipeline_stub(monkeypatch):
+    stub = SlowPipelineStub()
+    monkeypatch.setattr(run_job_module, "get_skills_gap_by_lvl_llm", stub)
+    return stub
+
+
+@pytest.fixture
+def client(sqlite_skills_engine, pipeline_stub):
+    init_skill_gap_llm_jobs(sqlite_skills_engine)
+    app.dependency_overrides[get_engine] = lambda: sqlite_skills_engine
+    app.dependency_overrides[verify_api_key] = lambda: "test-key"
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    shutdown_skill_gap_llm_jobs()
+
+
+def test_job_returns_immediately_and_result_is_stored(client, pipeline_stub):
+    started = time.perf_counter()
+    submitted = client.post("/api/v1/skill-gap-llm/jobs", json={"from_occupation": "11-1011.00", "to_occupation": "15-1252.00"})
+    submit_seconds = time.perf_counter() - started
+
+    assert submitted.status_code == 202
+    job_id = submitted.json()["job_id"]
+    assert submitted.json()["status_url"] == f"/api/v1/skill-gap-llm/jobs/{job_id}"
+    assert submit_seconds < LLM_DELAY_SECONDS, "Submitting a job should not wait for the LLM pipeline"
+
+    assert client.get(f"/api/v1/skill-gap-llm/jobs/{job_id}").json()["status"] in ("queued", "running")
+
+    finished = client.get(f"/api/v1/skill-gap-llm/jobs/{job_id}", params={"wait": 5}).json()
+    print(f"\nSubmit took {submit_seconds * 1000:.1f} ms; finished job: {finished}")
+
+    assert finished["status"] == "succeeded"
+    assert finished["error"] is None
+    assert finished["result"]["from_occupation"] == {"code": "11-1011.00", "title": "Chief Executives"}
+    assert finished["result"]["to_occupation"] == {"code": "15-1252.00", "title": "Software Developers"}
+    assert finished["result"]["skill_gaps"] == STUB_GAPS
+
+    # Fetching again reads the stored result instead of rerunning the pipeline
+    assert client.get(f"/api/v1/skill-gap-llm/jobs/{job_id}").json() == finished
+    assert pipeline_stub.calls == 1
+
+
+def test_failed_job_keeps_endpoint_status_code(client):
+    job_id = client.post("/api/v1/skill-gap-llm/jobs", json={"from_occupation": "11-1011.00", "to_occupation": "00-0000.00"}).json()["job_id"]
+    finished = client.get(f"/api/v1/skill-gap-llm/jobs/{job_id}", params={"wait": 5}).json()
+
+    assert finished["status"] == "failed"
+    assert finished["result"] is None
+    assert finished["error"]["status_code"] == 404
+    assert "not found" in finished["error"]["detail"]
+
+
+def test_long_poll_times_out_with_current_state(client):
+    job_id = client.post("/api/v1/skill-gap-llm/jobs", json={"from_occupation": "11-1011.00", "to_occupation": "15-1252.00"}).json()["job_id"]
+    started = time.perf_counter()
+    response = client.get(f"/api/v1/skill-gap-llm/jobs/{job_id}", params={"wait": LLM_DELAY_SECONDS / 3})
+
+    assert response.status_code == 200
+    assert response.json()["status"] in ("queued", "running")
+    assert time.perf_counter() - started < LLM_DELAY_SECONDS
+
+
+def test_unknown_job_returns_404(client):
+    assert client.get("/api/v1/skill-gap-llm/jobs/does-not-exist").status_code == 404
+
+
+def test_unfinished_jobs_requeued_on_startup(sqlite_skills_engine, pipeline_stub):
+    # A job left queued by a previous process
+    job_id = create_skill_gap_llm_job("11-1011.00", "15-1252.00", engine=sqlite_skills_engine)["result"]["job_id"]
+
+    init_result = init_skill_gap_llm_jobs(sqlite_skills_engine)
+    app.dependency_overrides[verify_api_key] = lambda: "test-key"
+    try:
+        finished = TestClient(app).get(f"/api/v1/skill-gap-llm/jobs/{job_id}", params={"wait": 5}).json()
+    finally:
+        app.dependency_overrides.clear()
+        shutdown_skill_gap_llm_jobs()
+
+    assert init_result["result"]["requeued"] == 1
+    assert finished["status"] == "succeeded"
+
+
+def test_jobs_shared_by_two_pools_run_exactly_once(sqlite_skills_engine, pipeline_stub):
+    # Jobs queued in a database shared by two processes, e.g. two API replicas starting together
+    job_ids = [create_skill_gap_llm_job("11-1011.00", "15-1252.00", engine=sqlite_skills_engine)["result"]["job_id"] for _ in range(6)]
+
+    # The second process runs its own pool over the same unfinished jobs
+    with ThreadPoolExecutor(max_workers=4) as other_pool:
+        other_runs = [other_pool.submit(run_skill_gap_llm_job, job_id, "11-1011.00", "15-1252.00", sqlite_skills_engine, get_lease_seconds())
+                      for job_id in job_ids]
+        init_result = init_skill_gap_llm_jobs(sqlite_skills_engine)
+        other_statuses = [run.result()["result"]["status"] for run in other_runs]
+    app.dependency_overrides[verify_api_key] = lambda: "test-key"
+    try:
+        client = TestClient(app)
+        finished = [client.get(f"/api/v1/skill-gap-llm/jobs/{job_id}", params={"wait": 5}).json() for job_id in job_ids]
+    finally:
+        app.dependency_overrides.clear()
+        shutdown_skill_gap_llm_jobs()
+
+    print(f"\nRequeued by this process: {init_result['result']['requeued']}; statuses in the other process: {other_statuses}")
+    assert all(job["status"] == "succeeded" for job in finished)
+    assert pipeline_stub.calls == len(job_ids)
+
+
+def test_only_running_jobs_past_their_lease_are_requeued(sqlite_skills_engine, pipeline_stub):
+    live_job, stale_job = [create_skill_gap_llm_job("11-1011.00", "15-1252.00", engine=sqlite_skills_engine)["result"]["job_id"] for _ in range(2)]
+    update_skill_gap_llm_job(live_job, {"status": "running", "started_at": datetime.now()}, engine=sqlite_skills_engine)
+    update_skill_gap_llm_job(stale_job, {"status": "running", "started_at": datetime.now() - timedelta(seconds=get_lease_seconds() + 60)}, engine=sqlite_skills_engine)
+
+    init_result = init_skill_gap_llm_jobs(sqlite_skills_engine)
+    app.dependency_overrides[verify_api_key] = lambda: "test-key"
+    try:
+        client = TestClient(app)
+        stale = client.get(f"/api/v1/skill-gap-llm/jobs/{stale_job}", params={"wait": 5}).json()
+        live = client.get(f"/api/v1/skill-gap-llm/jobs/{live_job}").json()
+    finally:
+        app.dependency_overrides.clear()
+        shutdown_skill_gap_llm_jobs()
+
+    assert init_result["result"]["requeued"] == 1
+    assert stale["status"] == "succeeded"
+    # The job another live process is running is not run a second time
+    assert live["status"] == "running"
+    assert pipeline_stub.calls == 1
@@ -0,0 +1,111 @@
+"""
+Unit test for the streaming extract-and-load: chunked reads apply the same transformations as whole-file
+reads, chunks are loaded one at a time with the table cleared only before the first, and a streamed load
+holds far less memory than reading the file whole. Uses a generated skills file and in-memory SQLite.
+"""
+import tracemalloc
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, func, select
+
+from src.config.schemas import Base, Onet_Skills_Landing
+from src.functions.extract_onet_data import extract_skills
+from src.functions.mysql_load_table import load_data_from_chunks
+
+HEADER = ["O*NET-SOC Code", "Element ID", "Element Name", "Scale ID", "Data Value", "N", "Standard Error",
+          "Lower CI Bound", "Upper CI Bound", "Recommend Suppress", "Not Relevant", "Date", "Domain Source"]
+
+
+def _write_skills_file(path, occupations):
+    with open(path, "w", encoding="utf-8") as skills_file:
+        skills_file.write("\t".join(HEADER) + "\n")
+        for occupation in range(occupations):
+            for skill in range(35):
+                for scale_id in ("IM", "LV"):
+                    skills_file.write("\t".join([
+                        f"{occupation // 100:02d}-{occupation:04d}.00", f"2.A.{skill}", f"Skill {skill}", scale_id,
+                        "3.25", "8" if skill % 4 else "", "0.1234", "0.0500", "0.5000", "N",
+                        "n/a" if scale_id == "IM" else "N", "08/2024" if skill % 3 == 0 else "202408", "Analyst"
+                    ]) + "\n")
+    return occupations * 70
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine, tables=[Onet_Skills_Landing.__table__])
+    yield engine
+    engine.dispose()
+
+
+def _count(engine):
+    with engine.connect() as connection:
+        return connection.execute(select(func.count()).select_from(Onet_Skills_Landing)).scalar()
+
+
+def test_chunked_read_matches_the_whole_file_read(tmp_path):
+    skills_path = tmp_path / "skills.txt"
+    rows = _write_skills_file(skills_path, occupations=30)
+
+    whole = extract_skills(str(skills_path))["df"]
+    chunked = extract_skills(str(skills_path), chunksize=500)
+    chunks = list(chunked["chunks"])
+
+    assert chunked["success"]
+    assert [len(chunk) for chunk in chunks] == [500] * (rows // 500) + [rows % 500]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), whole)
+    assert extract_skills(str(tmp_path / "missing.txt"), chunksize=500)["error"].startswith("File not found")
+
+
+def _orm_chunks(chunks):
+    # The ORM loader takes Python values rather than NaN and timestamps
+    for chunk in chunks:
+        chunk = chunk.astype(object).where(pd.notnull(chunk), None)
+        chunk["date_recorded"] = [value.date() if value is not None else None for value in chunk["date_recorded"]]
+        yield chunk
+
+
+def test_chunks_are_loaded_in_turn_and_the_table_is_cleared_once(tmp_path, engine):
+    skills_path = tmp_path / "skills.txt"
+    rows = _write_skills_file(skills_path, occupations=30)
+
+    for _ in range(2):
+        result = load_data_from_chunks(_orm_chunks(extract_skills(str(skills_path), chunksize=400)["chunks"]), Onet_Skills_Landing, engine, backend="infile")
+        assert result["success"], result["message"]
+        assert _count(engine) == rows
+
+    assert result["result"]["records_loaded"] == rows
+    assert result["result"]["chunks_loaded"] == -(-rows // 400)
+    assert result["result"]["max_chunk_rows"] == 400
+    assert result["result"]["backends"] == {"orm": result["result"]["chunks_loaded"]}
+
+
+def test_a_failing_chunk_stops_the_load(engine):
+    good = pd.DataFrame({"onet_soc_code": ["11-1011.00"], "element_id": ["2.A.1.a"], "element_name": ["Reading"], "scale_id": ["LV"]})
+    bad = good.drop(columns=["element_name"])
+
+    result = load_data_from_chunks(iter([good, bad, good]), Onet_Skills_Landing, engine, backend="orm")
+
+    assert not result["success"]
+    assert result["message"].startswith("Chunk 2 for onet_skills_landing failed after 1 records")
+    assert result["result"]["chunks_loaded"] == 1
+    assert _count(engine) == 1
+
+
+def test_streamed_read_holds_a_fraction_of_the_whole_file(tmp_path):
+    skills_path = tmp_path / "skills.txt"
+    _write_skills_file(skills_path, occupations=300)
+
+    tracemalloc.start()
+    whole = extract_skills(str(skills_path))["df"]
+    whole_peak = tracemalloc.get_traced_memory()[1]
+    del whole
+    tracemalloc.reset_peak()
+    for chunk in extract_skills(str(skills_path), chunksize=1000)["chunks"]:
+        pass
+    del chunk
+    streamed_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"\nPeak memory reading {skills_path.stat().st_size} bytes: whole {whole_peak / 1e6:.1f} MB, streamed {streamed_peak / 1e6:.1f} MB")
+
+    assert streamed_peak < whole_peak / 3